@@ -0,0 +1,5 @@
+"""
+Redis Subscriber 프레임워크 벤치마크
+
+Author: Minseok kim
+"""
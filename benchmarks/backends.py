@@ -0,0 +1,282 @@
+"""
+벤치마크용 Redis 백엔드
+
+- RedisServerBackend: 로컬 redis-server 바이너리를 임시 포트로 띄우거나 주어진 URL 사용
+- FakeRedisBackend: fakeredis로 프로세스 안에서 동작 (네트워크/서버 비용 없이 프레임워크 오버헤드만 측정)
+- MemoryBackend: MemoryTransport 사용 (Redis 명령 해석 비용도 없이 프레임워크 자체 오버헤드만 측정)
+
+Author: Minseok kim
+"""
+
+import shutil
+import socket
+import subprocess
+import time
+from typing import Any, Dict, List, Tuple
+
+import redis
+
+import redis_subscriber
+from redis_subscriber import MemoryTransport, RedisSubscriber
+
+
+class RedisServerBackend:
+    """로컬 redis-server 프로세스 또는 기존 Redis 서버"""
+
+    name = "redis-server"
+
+    def __init__(self, redis_url: str = None, binary: str = "redis-server"):
+        """
+        RedisServerBackend 초기화
+
+        Args:
+            redis_url: 사용할 Redis URL (지정하지 않으면 redis-server를 직접 실행)
+            binary: 실행할 redis-server 바이너리 경로
+        """
+        self.redis_url = redis_url
+        self.binary = binary
+        self._process = None
+
+    def start(self):
+        """redis_url이 없으면 빈 포트로 redis-server를 실행하고 응답할 때까지 대기"""
+        if self.redis_url:
+            return
+
+        executable = shutil.which(self.binary)
+        if executable is None:
+            raise RuntimeError(f"redis-server 바이너리를 찾을 수 없습니다: {self.binary}")
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        # 영속화를 끄고 측정에 영향이 없도록 실행
+        self._process = subprocess.Popen(
+            [executable, "--port", str(port), "--bind", "127.0.0.1",
+             "--save", "", "--appendonly", "no", "--daemonize", "no"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        self.redis_url = f"redis://127.0.0.1:{port}"
+
+        client = self.client()
+        deadline = time.monotonic() + 10.0
+        while True:
+            try:
+                client.ping()
+                break
+            except redis.ConnectionError:
+                if time.monotonic() >= deadline or self._process.poll() is not None:
+                    self.stop()
+                    raise RuntimeError("redis-server가 시작되지 않았습니다.")
+                time.sleep(0.05)
+            finally:
+                client.close()
+
+    def stop(self):
+        """직접 실행한 redis-server 종료"""
+        if self._process is None:
+            return
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5.0)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def client(self) -> redis.Redis:
+        """
+        메시지 적재와 정리에 사용할 클라이언트 생성
+
+        Returns:
+            Redis 클라이언트
+        """
+        return redis.from_url(self.redis_url)
+
+    def subscriber(self, **kwargs: Any) -> RedisSubscriber:
+        """
+        이 백엔드에 연결하는 RedisSubscriber 생성
+
+        Args:
+            **kwargs: RedisSubscriber에 전달할 인자
+
+        Returns:
+            RedisSubscriber 객체
+        """
+        return RedisSubscriber(redis_url=self.redis_url, **kwargs)
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        결과 파일에 기록할 백엔드 정보
+
+        Returns:
+            백엔드 이름과 서버 버전
+        """
+        client = self.client()
+        try:
+            version = client.info("server").get("redis_version")
+        finally:
+            client.close()
+        return {"name": self.name, "redis_version": version}
+
+
+class FakeRedisBackend:
+    """fakeredis 기반 프로세스 내부 백엔드 (fakeredis 패키지 필요)"""
+
+    name = "fakeredis"
+
+    def __init__(self):
+        """FakeRedisBackend 초기화"""
+        try:
+            import fakeredis
+        except ImportError:
+            raise RuntimeError("fakeredis 백엔드를 사용하려면 fakeredis 패키지를 설치해야 합니다: pip install fakeredis")
+        self._fakeredis = fakeredis
+        self._server = None
+
+    def start(self):
+        """모든 클라이언트가 공유할 가상 서버 생성"""
+        self._server = self._fakeredis.FakeServer()
+
+    def stop(self):
+        """가상 서버 정리"""
+        self._server = None
+
+    def client(self) -> redis.Redis:
+        """
+        메시지 적재와 정리에 사용할 클라이언트 생성
+
+        Returns:
+            같은 가상 서버에 연결된 fakeredis 클라이언트
+        """
+        return self._fakeredis.FakeRedis(server=self._server)
+
+    def subscriber(self, **kwargs: Any) -> RedisSubscriber:
+        """
+        가상 서버에 연결하는 RedisSubscriber 생성
+
+        Args:
+            **kwargs: RedisSubscriber에 전달할 인자
+
+        Returns:
+            RedisSubscriber 객체
+        """
+        backend = self
+
+        class FakeRedisSubscriber(RedisSubscriber):
+            def _create_client(self, dedicated: bool = False):
+                return backend._fakeredis.FakeRedis(server=backend._server, single_connection_client=dedicated)
+
+        return FakeRedisSubscriber(redis_url="redis://fakeredis", **kwargs)
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        결과 파일에 기록할 백엔드 정보
+
+        Returns:
+            백엔드 이름과 fakeredis 버전
+        """
+        return {"name": self.name, "fakeredis_version": getattr(self._fakeredis, "__version__", None)}
+
+
+class MemoryClient:
+    """MemoryTransport에 메시지를 적재하는 최소한의 Redis 클라이언트 흉내 (delete, 파이프라인 rpush)"""
+
+    def __init__(self, transport: MemoryTransport):
+        """
+        MemoryClient 초기화
+
+        Args:
+            transport: 메시지를 넣을 전송 계층
+        """
+        self.transport = transport
+        self._batches: List[Tuple[str, List[bytes]]] = []
+
+    def delete(self, *keys: str):
+        """전송 계층의 큐는 구독 시작 전에 비어 있으므로 아무것도 하지 않음"""
+
+    def pipeline(self, transaction: bool = False) -> "MemoryClient":
+        """파이프라인 대신 execute()까지 넣을 메시지를 모으는 새 클라이언트"""
+        return MemoryClient(self.transport)
+
+    def rpush(self, key: str, *messages: bytes):
+        """execute()에서 넣을 메시지 추가"""
+        self._batches.append((key, list(messages)))
+
+    def execute(self):
+        """모은 메시지를 한 번에 넣음"""
+        batches, self._batches = self._batches, []
+        self.transport.push_many(batches)
+
+    def close(self):
+        """닫을 연결이 없음"""
+
+
+class MemoryBackend:
+    """MemoryTransport 기반 프로세스 내부 백엔드"""
+
+    name = "memory"
+
+    def __init__(self):
+        """MemoryBackend 초기화"""
+        self._transport = None
+
+    def start(self):
+        """모든 클라이언트가 공유할 전송 계층 생성"""
+        self._transport = MemoryTransport()
+
+    def stop(self):
+        """전송 계층 정리"""
+        self._transport = None
+
+    def client(self) -> MemoryClient:
+        """
+        메시지 적재에 사용할 클라이언트 생성
+
+        Returns:
+            전송 계층에 메시지를 넣는 MemoryClient
+        """
+        return MemoryClient(self._transport)
+
+    def subscriber(self, **kwargs: Any) -> RedisSubscriber:
+        """
+        전송 계층을 사용하는 RedisSubscriber 생성 (시나리오마다 큐를 비우기 위해 새 전송 계층 사용)
+
+        Args:
+            **kwargs: RedisSubscriber에 전달할 인자
+
+        Returns:
+            RedisSubscriber 객체
+        """
+        self._transport = MemoryTransport()
+        return RedisSubscriber(transport=self._transport, **kwargs)
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        결과 파일에 기록할 백엔드 정보
+
+        Returns:
+            백엔드 이름과 프레임워크 버전
+        """
+        return {"name": self.name, "redis_subscriber_version": redis_subscriber.__version__}
+
+
+def make_backend(name: str, redis_url: str = None):
+    """
+    이름으로 벤치마크 백엔드 생성
+
+    Args:
+        name: "redis-server", "fakeredis" 또는 "memory"
+        redis_url: redis-server 백엔드에서 사용할 기존 Redis URL (선택사항)
+
+    Returns:
+        백엔드 객체
+    """
+    if name == "redis-server":
+        return RedisServerBackend(redis_url=redis_url)
+    if name == "fakeredis":
+        return FakeRedisBackend()
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"지원하지 않는 백엔드입니다: {name}")
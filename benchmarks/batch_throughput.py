@@ -0,0 +1,85 @@
+"""
+배치 디큐 처리량 벤치마크
+
+batch_size 값에 따른 초당 처리 메시지 수(msgs/sec)를 측정한다.
+
+사용법:
+    python -m benchmarks.batch_throughput --redis-url redis://localhost:6379
+    python -m benchmarks.batch_throughput --messages 50000 --batch-sizes 1,10,100,500
+
+Author: Minseok kim
+"""
+
+import argparse
+import threading
+import time
+
+import redis
+
+from redis_subscriber import RedisSubscriber
+
+
+def run_once(redis_url: str, queue_name: str, messages: int, batch_size: int) -> float:
+    """
+    주어진 batch_size로 메시지를 모두 처리하는 데 걸린 시간을 측정
+
+    Args:
+        redis_url: Redis 연결 URL
+        queue_name: 벤치마크에 사용할 큐 이름
+        messages: 처리할 메시지 수
+        batch_size: 구독 배치 크기
+
+    Returns:
+        초당 처리 메시지 수
+    """
+    client = redis.from_url(redis_url)
+    client.delete(queue_name)
+
+    # 메시지를 미리 적재 (적재 시간은 측정에서 제외)
+    payload = "x" * 64
+    pipe = client.pipeline(transaction=False)
+    for i in range(0, messages, 1000):
+        pipe.rpush(queue_name, *([payload] * min(1000, messages - i)))
+    pipe.execute()
+
+    subscriber = RedisSubscriber(redis_url=redis_url)
+    done = threading.Event()
+    received = 0
+
+    @subscriber.subscribe(queue_name, batch_size=batch_size)
+    def handler(msg):
+        nonlocal received
+        received += 1
+        if received >= messages:
+            done.set()
+
+    started_at = time.perf_counter()
+    threading.Thread(target=subscriber.start, daemon=True).start()
+    done.wait()
+    elapsed = time.perf_counter() - started_at
+
+    subscriber.stop()
+    client.delete(queue_name)
+    client.close()
+    return messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="batch_size별 처리량 벤치마크")
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--queue", default="bench:batch_throughput")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--batch-sizes", default="1,10,50,100,500")
+    args = parser.parse_args()
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    print(f"{'batch_size':>10} | {'msgs/sec':>12}")
+    print("-" * 25)
+    for batch_size in batch_sizes:
+        rate = run_once(args.redis_url, args.queue, args.messages, batch_size)
+        print(f"{batch_size:>10} | {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
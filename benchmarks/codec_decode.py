@@ -0,0 +1,98 @@
+"""
+코덱별 디코딩 비용 벤치마크
+
+Redis 없이 코덱만 측정한다. 같은 페이로드를 메시지 단위(decode)와
+배치 단위(decode_batch)로 변환했을 때 메시지당 소요 시간(ns/msg)을 비교하고,
+기존 방식(decode_responses=True로 UTF-8 변환 후 핸들러에서 다시 파싱)과도 비교한다.
+
+사용법:
+    python -m benchmarks.codec_decode
+    python -m benchmarks.codec_decode --messages 100000 --batch-size 100 --payload-bytes 512
+
+Author: Minseok kim
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, List
+
+from redis_subscriber.codecs import get_codec
+
+
+def make_document(payload_bytes: int) -> dict:
+    """
+    대략 payload_bytes 크기로 직렬화되는 JSON 호환 문서 생성
+
+    Args:
+        payload_bytes: 목표 직렬화 크기 (bytes)
+
+    Returns:
+        벤치마크용 문서
+    """
+    return {
+        "id": 123456,
+        "type": "order.created",
+        "tags": ["a", "b", "c"],
+        "body": "x" * max(0, payload_bytes - 80),
+    }
+
+
+def measure(func: Callable[[List[bytes]], object], batches: List[List[bytes]], messages: int) -> float:
+    """
+    모든 배치를 변환하는 데 걸린 메시지당 시간 측정
+
+    Args:
+        func: 배치 하나를 변환하는 함수
+        batches: 변환할 배치 목록
+        messages: 전체 메시지 수
+
+    Returns:
+        메시지당 소요 시간 (나노초)
+    """
+    started = time.perf_counter()
+    for batch in batches:
+        func(batch)
+    return (time.perf_counter() - started) / messages * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="코덱별 디코딩 비용 벤치마크")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--codecs", default="raw,utf8,json,msgpack")
+    args = parser.parse_args()
+
+    document = make_document(args.payload_bytes)
+
+    print(f"{'codec':>10} | {'per-message ns':>14} | {'batch ns':>10} | {'str+parse ns':>12}")
+    print("-" * 57)
+    for name in args.codecs.split(","):
+        try:
+            codec = get_codec(name)
+        except ImportError as e:
+            print(f"{name:>10} | 건너뜀: {e}")
+            continue
+
+        payload = codec.encode(json.dumps(document) if name in ("raw", "utf8") else document)
+        batches = [
+            [payload] * min(args.batch_size, args.messages - i)
+            for i in range(0, args.messages, args.batch_size)
+        ]
+
+        decode = codec.decode
+        per_message = measure(lambda batch: [decode(item) for item in batch], batches, args.messages)
+        batched = measure(codec.decode_batch, batches, args.messages)
+
+        # 기존 방식: 클라이언트가 str로 변환한 뒤 핸들러가 다시 파싱
+        baseline = "-"
+        if name == "json":
+            parse = json.loads
+            baseline = f"{measure(lambda batch: [parse(item.decode('utf-8')) for item in batch], batches, args.messages):,.0f}"
+
+        print(f"{name:>10} | {per_message:>14,.0f} | {batched:>10,.0f} | {baseline:>12}")
+
+
+if __name__ == "__main__":
+    main()
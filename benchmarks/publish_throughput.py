@@ -0,0 +1,103 @@
+"""
+발행 처리량 벤치마크
+
+메시지마다 LPUSH를 보내는 방식과 RedisPublisher의 배치 발행을 batch_size별로
+비교하여 초당 발행 메시지 수(msgs/sec)를 측정한다.
+
+사용법:
+    python -m benchmarks.publish_throughput --redis-url redis://localhost:6379
+    python -m benchmarks.publish_throughput --messages 500000 --batch-sizes 100,1000,5000 --codec json
+
+Author: Minseok kim
+"""
+
+import argparse
+import time
+
+import redis
+
+from redis_subscriber import RedisPublisher
+
+
+def run_naive(redis_url: str, queue_name: str, messages: int, payload: str) -> float:
+    """
+    메시지마다 한 번씩 왕복하는 기존 방식의 처리량 측정
+
+    Args:
+        redis_url: Redis 연결 URL
+        queue_name: 벤치마크에 사용할 큐 이름
+        messages: 발행할 메시지 수
+        payload: 발행할 메시지
+
+    Returns:
+        초당 발행 메시지 수
+    """
+    client = redis.from_url(redis_url)
+    client.delete(queue_name)
+    started_at = time.perf_counter()
+    for _ in range(messages):
+        client.lpush(queue_name, payload)
+    elapsed = time.perf_counter() - started_at
+    client.delete(queue_name)
+    client.close()
+    return messages / elapsed
+
+
+def run_batched(redis_url: str, queue_name: str, messages: int, payload: str,
+                batch_size: int, codec: str) -> float:
+    """
+    RedisPublisher로 모든 메시지를 발행하고 전송을 마칠 때까지의 처리량 측정
+
+    Args:
+        redis_url: Redis 연결 URL
+        queue_name: 벤치마크에 사용할 큐 이름
+        messages: 발행할 메시지 수
+        payload: 발행할 메시지
+        batch_size: 발행자 배치 크기
+        codec: 발행자 코덱 이름
+
+    Returns:
+        초당 발행 메시지 수
+    """
+    client = redis.from_url(redis_url)
+    client.delete(queue_name)
+    message = {"payload": payload} if codec != "utf8" and codec != "raw" else payload
+
+    publisher = RedisPublisher(redis_url, codec=codec, batch_size=batch_size)
+    started_at = time.perf_counter()
+    for _ in range(messages):
+        publisher.publish(queue_name, message)
+    publisher.flush()
+    elapsed = time.perf_counter() - started_at
+    publisher.close()
+
+    assert client.llen(queue_name) == messages
+    client.delete(queue_name)
+    client.close()
+    return messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="발행 처리량 벤치마크")
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--queue", default="bench:publish_throughput")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--naive-messages", type=int, default=20000)
+    parser.add_argument("--payload-bytes", type=int, default=64)
+    parser.add_argument("--batch-sizes", default="10,100,1000,5000")
+    parser.add_argument("--codec", default="utf8")
+    args = parser.parse_args()
+
+    payload = "x" * args.payload_bytes
+
+    print(f"{'mode':>14} | {'msgs/sec':>12}")
+    print("-" * 29)
+    rate = run_naive(args.redis_url, args.queue, args.naive_messages, payload)
+    print(f"{'lpush':>14} | {rate:>12,.0f}")
+    for batch_size in [int(size) for size in args.batch_sizes.split(",")]:
+        rate = run_batched(args.redis_url, args.queue, args.messages, payload, batch_size, args.codec)
+        print(f"{f'batch={batch_size}':>14} | {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+처리량/지연 시간 벤치마크 스위트
+
+큐 수, 메시지 크기, 핸들러 비용, concurrency, batch_size 조합마다 RedisSubscriber를
+실행하고 초당 처리 메시지 수, 종단 간 지연 시간(p50/p99), CPU 사용량, 최대 RSS를
+측정한다. 결과를 JSON으로 저장하고, 이전 결과와 비교해 처리량 저하를 검출할 수 있다.
+
+종단 간 지연 시간은 생산자가 메시지에 기록한 적재 시각부터 핸들러가 호출된 시각까지이다.
+CPU와 RSS는 벤치마크 프로세스 전체(생산자 스레드, fakeredis 백엔드의 가상 서버 포함) 기준이다.
+memory 백엔드는 MemoryTransport를 사용하므로 Redis 없이 프레임워크 자체 오버헤드만 측정한다.
+
+사용법:
+    python -m benchmarks.suite --backend fakeredis
+    python -m benchmarks.suite --backend memory
+    python -m benchmarks.suite --backend redis-server --queues 1,8 --message-bytes 64,4096 \\
+        --concurrency 1,8 --handler-cost-us 0,200 --output results/v1.1.json
+    python -m benchmarks.suite --redis-url redis://localhost:6379 --compare results/v1.0.json
+
+Author: Minseok kim
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from benchmarks.backends import make_backend
+
+
+# 메시지 앞에 기록하는 적재 시각(ns)의 자릿수
+TIMESTAMP_WIDTH = 20
+
+# 결과 비교 시 시나리오를 식별하는 매개변수
+SCENARIO_KEYS = ("queues", "message_bytes", "concurrency", "batch_size", "handler_cost_us", "handler_mode")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    정렬된 값 목록의 분위수
+
+    Args:
+        values: 오름차순으로 정렬된 값 목록
+        q: 분위수 (0.0 ~ 1.0)
+
+    Returns:
+        분위수 값 (목록이 비어 있으면 0.0)
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def make_handler_cost(cost_us: int, mode: str):
+    """
+    핸들러 비용을 흉내 내는 함수 생성
+
+    Args:
+        cost_us: 메시지당 비용 (마이크로초)
+        mode: "spin"이면 CPU를 사용하며 대기(CPU 위주 핸들러), "sleep"이면 잠들어 대기(I/O 위주 핸들러)
+
+    Returns:
+        인자 없는 함수 (비용이 0이면 None)
+    """
+    if cost_us <= 0:
+        return None
+    if mode == "sleep":
+        seconds = cost_us / 1e6
+        return lambda: time.sleep(seconds)
+
+    cost_ns = cost_us * 1000
+
+    def spin():
+        deadline = time.perf_counter_ns() + cost_ns
+        while time.perf_counter_ns() < deadline:
+            pass
+
+    return spin
+
+
+def produce(backend, queue_names: List[str], messages: int, message_bytes: int, rate: float,
+            chunk: int = 100):
+    """
+    메시지를 큐에 돌아가며 적재 (각 메시지에 적재 시각 기록)
+
+    Args:
+        backend: 벤치마크 백엔드
+        queue_names: 적재할 큐 이름 목록
+        messages: 전체 메시지 수
+        message_bytes: 메시지 크기 (bytes)
+        rate: 초당 적재 메시지 수 (0이면 제한 없음)
+        chunk: 한 번의 파이프라인으로 적재할 메시지 수
+    """
+    client = backend.client()
+    padding = b"x" * max(0, message_bytes - TIMESTAMP_WIDTH - 1)
+    started = time.perf_counter()
+    sent = 0
+    try:
+        while sent < messages:
+            count = min(chunk, messages - sent)
+            pipe = client.pipeline(transaction=False)
+            for offset in range(count):
+                stamp = str(time.time_ns()).zfill(TIMESTAMP_WIDTH).encode()
+                pipe.rpush(queue_names[(sent + offset) % len(queue_names)], stamp + b":" + padding)
+            pipe.execute()
+            sent += count
+
+            if rate > 0:
+                # 목표 속도보다 앞서 있으면 대기
+                ahead = sent / rate - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+    finally:
+        client.close()
+
+
+def run_scenario(backend, queues: int, message_bytes: int, concurrency: int, batch_size: int,
+                 handler_cost_us: int, handler_mode: str, messages: int, rate: float,
+                 timeout: float) -> Dict[str, Any]:
+    """
+    시나리오 하나를 실행하고 측정 결과 반환
+
+    Args:
+        backend: 벤치마크 백엔드
+        queues: 구독할 큐 수
+        message_bytes: 메시지 크기 (bytes)
+        concurrency: 큐별 워커 수
+        batch_size: 큐별 배치 크기
+        handler_cost_us: 메시지당 핸들러 비용 (마이크로초)
+        handler_mode: 핸들러 비용 방식 ("spin" 또는 "sleep")
+        messages: 전체 메시지 수
+        rate: 초당 적재 메시지 수 (0이면 제한 없음)
+        timeout: 시나리오 최대 실행 시간 (초)
+
+    Returns:
+        시나리오 매개변수와 측정 결과 딕셔너리
+    """
+    queue_names = [f"bench:suite:{index}" for index in range(queues)]
+    client = backend.client()
+    client.delete(*queue_names)
+    client.close()
+
+    subscriber = backend.subscriber(codec="raw")
+    cost = make_handler_cost(handler_cost_us, handler_mode)
+    latencies: List[int] = []
+    lock = threading.Lock()
+    done = threading.Event()
+    finished_at = [0.0]
+
+    def handler(msg: bytes):
+        latency = time.time_ns() - int(msg[:TIMESTAMP_WIDTH])
+        if cost is not None:
+            cost()
+        with lock:
+            latencies.append(latency)
+            if len(latencies) >= messages:
+                finished_at[0] = time.perf_counter()
+                done.set()
+
+    for queue_name in queue_names:
+        subscriber.subscribe(queue_name, batch_size=batch_size, concurrency=concurrency)(handler)
+
+    subscriber_thread = threading.Thread(target=subscriber.start, name="BenchSubscriber", daemon=True)
+    subscriber_thread.start()
+    while not subscriber._running and subscriber_thread.is_alive():
+        time.sleep(0.01)
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    started_at = time.perf_counter()
+    producer = threading.Thread(
+        target=produce, args=(backend, queue_names, messages, message_bytes, rate),
+        name="BenchProducer", daemon=True
+    )
+    producer.start()
+
+    completed = done.wait(timeout)
+    elapsed = (finished_at[0] if completed else time.perf_counter()) - started_at
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    subscriber.stop()
+    producer.join(timeout=5.0)
+    subscriber_thread.join(timeout=5.0)
+
+    with lock:
+        handled = len(latencies)
+        ordered = sorted(latencies)
+
+    cpu_seconds = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    # ru_maxrss 단위는 Linux에서 KB, macOS에서 bytes
+    rss_divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+
+    return {
+        "queues": queues,
+        "message_bytes": message_bytes,
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "handler_cost_us": handler_cost_us,
+        "handler_mode": handler_mode,
+        "messages": messages,
+        "handled": handled,
+        "completed": completed,
+        "elapsed_s": round(elapsed, 4),
+        "msgs_per_sec": round(handled / elapsed, 1) if elapsed > 0 else 0.0,
+        "latency_p50_ms": round(percentile(ordered, 0.50) / 1e6, 3),
+        "latency_p99_ms": round(percentile(ordered, 0.99) / 1e6, 3),
+        "latency_max_ms": round(ordered[-1] / 1e6, 3) if ordered else 0.0,
+        "cpu_s": round(cpu_seconds, 3),
+        "cpu_percent": round(cpu_seconds / elapsed * 100, 1) if elapsed > 0 else 0.0,
+        "max_rss_mb": round(usage_after.ru_maxrss / rss_divisor, 1),
+    }
+
+
+def scenario_key(result: Dict[str, Any]) -> tuple:
+    """
+    이전 결과와 비교할 때 시나리오를 식별하는 키
+
+    Args:
+        result: 시나리오 결과
+
+    Returns:
+        매개변수 튜플
+    """
+    return tuple(result.get(key) for key in SCENARIO_KEYS)
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> List[str]:
+    """
+    이전 결과 파일과 비교해 처리량이 threshold 이상 떨어진 시나리오 검출
+
+    Args:
+        results: 이번 실행 결과
+        baseline_path: 비교할 이전 결과 JSON 파일
+        threshold: 허용할 처리량 감소 비율 (0.1이면 10%)
+
+    Returns:
+        처리량 저하 설명 목록 (없으면 빈 목록)
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {scenario_key(result): result for result in json.load(f)["results"]}
+
+    regressions = []
+    print(f"\n비교 대상: {baseline_path}")
+    for result in results:
+        previous = baseline.get(scenario_key(result))
+        if previous is None or not previous["msgs_per_sec"]:
+            continue
+        change = result["msgs_per_sec"] / previous["msgs_per_sec"] - 1
+        p99_change = result["latency_p99_ms"] - previous["latency_p99_ms"]
+        label = ", ".join(f"{key}={result[key]}" for key in SCENARIO_KEYS)
+        print(f"  {label}: msgs/sec {change:+.1%}, p99 {p99_change:+.3f}ms")
+        if change < -threshold:
+            regressions.append(
+                f"{label}: {previous['msgs_per_sec']:,.0f} -> {result['msgs_per_sec']:,.0f} msgs/sec ({change:+.1%})"
+            )
+    return regressions
+
+
+def git_revision() -> str:
+    """
+    현재 소스의 git 커밋 (git 저장소가 아니면 None)
+
+    Returns:
+        커밋 해시
+    """
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RedisSubscriber 처리량/지연 시간 벤치마크 스위트")
+    parser.add_argument("--backend", choices=("redis-server", "fakeredis", "memory"), default="redis-server")
+    parser.add_argument("--redis-url", default=None,
+                        help="redis-server 백엔드에서 직접 실행하는 대신 사용할 Redis URL")
+    parser.add_argument("--queues", type=parse_ints, default=[1, 4])
+    parser.add_argument("--message-bytes", type=parse_ints, default=[64, 1024])
+    parser.add_argument("--concurrency", type=parse_ints, default=[1, 4])
+    parser.add_argument("--batch-size", type=parse_ints, default=[1, 100])
+    parser.add_argument("--handler-cost-us", type=parse_ints, default=[0])
+    parser.add_argument("--handler-mode", choices=("spin", "sleep"), default="spin")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--rate", type=float, default=0, help="초당 적재 메시지 수 (0이면 제한 없음)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="시나리오별 최대 실행 시간 (초)")
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="처리량 저하로 판단할 감소 비율 (기본값 0.10)")
+    args = parser.parse_args()
+
+    backend = make_backend(args.backend, args.redis_url)
+    backend.start()
+    results = []
+    try:
+        print(f"{'queues':>6} {'bytes':>6} {'conc':>4} {'batch':>5} {'cost_us':>7} | "
+              f"{'msgs/sec':>10} {'p50 ms':>8} {'p99 ms':>8} {'cpu %':>6} {'rss MB':>7}")
+        print("-" * 84)
+        for queues, message_bytes, concurrency, batch_size, cost_us in itertools.product(
+            args.queues, args.message_bytes, args.concurrency, args.batch_size, args.handler_cost_us
+        ):
+            result = run_scenario(
+                backend, queues, message_bytes, concurrency, batch_size, cost_us,
+                args.handler_mode, args.messages, args.rate, args.timeout
+            )
+            results.append(result)
+            incomplete = "" if result["completed"] else f"  (시간 초과: {result['handled']}/{result['messages']})"
+            print(f"{queues:>6} {message_bytes:>6} {concurrency:>4} {batch_size:>5} {cost_us:>7} | "
+                  f"{result['msgs_per_sec']:>10,.0f} {result['latency_p50_ms']:>8.2f} "
+                  f"{result['latency_p99_ms']:>8.2f} {result['cpu_percent']:>6.0f} "
+                  f"{result['max_rss_mb']:>7.1f}{incomplete}")
+        backend_info = backend.describe()
+    finally:
+        backend.stop()
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "backend": backend_info,
+                "messages": args.messages,
+                "rate": args.rate,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n결과 저장됨: {args.output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print("\n처리량 저하 감지:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
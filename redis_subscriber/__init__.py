@@ -7,7 +7,24 @@ Author: Minseok kim
 """
 
 from .subscriber import RedisSubscriber
+from .async_subscriber import AsyncRedisSubscriber
+from .batching import BatchResult
+from .retry import RetryPolicy
+from .transport import Transport, RedisTransport, MemoryTransport
+from .publisher import RedisPublisher, QueueFullError
+from .async_publisher import AsyncRedisPublisher
 
 __version__ = "1.0.0"
 __author__ = "Minseok kim"
-__all__ = ["RedisSubscriber"]
+__all__ = [
+    "RedisSubscriber",
+    "AsyncRedisSubscriber",
+    "RedisPublisher",
+    "AsyncRedisPublisher",
+    "QueueFullError",
+    "BatchResult",
+    "RetryPolicy",
+    "Transport",
+    "RedisTransport",
+    "MemoryTransport",
+]
@@ -0,0 +1,399 @@
+"""
+Redis Queue 발행자 - asyncio 구현
+
+Author: Minseok kim
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import redis.asyncio as aioredis
+from redis.asyncio.cluster import RedisCluster
+
+from .codecs import Codec, get_codec
+from .sharding import shard_for, shard_name
+from .publisher import BOUNDED_PUSH_SCRIPT, FULL_RETRY_INTERVAL, QueueFullError
+
+
+class AsyncRedisPublisher:
+    """
+    redis.asyncio 기반으로 큐에 메시지를 묶어서 발행하는 발행자
+
+    RedisPublisher와 같은 조건(batch_size, batch_bytes, linger_ms)으로 큐별 버퍼를
+    하나의 다중 값 RPUSH로 전송한다. 대기 시간 조건은 이벤트 루프의 태스크가
+    처리하며, 전송은 잠금으로 직렬화하여 같은 큐의 배치 순서를 유지한다.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        codec: Union[str, Codec] = "utf8",
+        batch_size: int = 1000,
+        batch_bytes: int = 1024 * 1024,
+        linger_ms: float = 5.0,
+        max_queue_length: Optional[int] = None,
+        full_timeout: float = 0.0,
+        shards: Optional[Dict[str, int]] = None,
+        cluster: bool = False,
+    ) -> None:
+        """
+        AsyncRedisPublisher 초기화
+
+        Args:
+            redis_url: Redis 연결 URL (예: "redis://localhost:6379")
+            username: Redis 사용자명 (선택사항)
+            password: Redis 비밀번호 (선택사항)
+            codec: 메시지를 변환할 코덱 (기본값 "utf8", 구독자와 같은 코덱을 사용해야 함)
+            batch_size: 큐별로 한 번에 전송할 최대 메시지 수 (기본값 1000)
+            batch_bytes: 큐별 버퍼가 이 크기(bytes) 이상이면 바로 전송 (기본값 1MB)
+            linger_ms: 버퍼의 첫 메시지가 전송을 기다릴 최대 시간 (밀리초, 기본값 5)
+                0이면 크기 조건과 flush()로만 전송한다.
+            max_queue_length: 큐 길이 상한 (선택사항)
+            full_timeout: 큐가 가득 찼을 때 자리가 날 때까지 다시 시도할 최대 시간
+                (초, 기본값 0이면 바로 QueueFullError 발생)
+            shards: 샤딩된 논리 큐 이름별 샤드 수 (선택사항, 구독자의 shards와 같아야 함)
+                이 큐로 발행하면 key의 CRC32로 샤드를 고르고, key가 없으면 돌아가며 보낸다.
+            cluster: Redis Cluster에 연결 (기본값 False)
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+        if max_queue_length is not None and max_queue_length < 1:
+            raise ValueError(
+                f"max_queue_length는 1 이상이어야 합니다: {max_queue_length}"
+            )
+        for name, count in (shards or {}).items():
+            if count < 1:
+                raise ValueError(
+                    f"샤드 수는 1 이상이어야 합니다 [{name}]: {count}"
+                )
+
+        self.redis_url = redis_url
+        self.username = username
+        self.password = password
+        self.codec = get_codec(codec)
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.linger_ms = linger_ms
+        self.max_queue_length = max_queue_length
+        self.full_timeout = full_timeout
+        self.shards = dict(shards or {})
+        self.cluster = cluster
+        # key 없이 발행한 메시지를 샤드에 돌아가며 배분하기 위한 큐별 카운터
+        self._shard_counters: Dict[str, Iterator[int]] = {
+            name: itertools.count() for name in self.shards
+        }
+        self._buffers: Dict[str, List[bytes]] = {}
+        self._buffer_bytes: Dict[str, int] = {}
+        self._buffer_since: Dict[str, float] = {}
+        self._send_lock: Optional[asyncio.Lock] = None
+        self._linger_task: Optional[asyncio.Task] = None
+        self._linger_wakeup: Optional[asyncio.Event] = None
+        self._closed = False
+
+        # Redis 클라이언트 생성 (인증 정보 포함, 연결은 첫 명령에서 이루어짐)
+        connection_kwargs: Dict[str, Any] = {"decode_responses": False}
+        if self.username:
+            connection_kwargs["username"] = self.username
+        if self.password:
+            connection_kwargs["password"] = self.password
+        self._redis_client: Any
+        if self.cluster:
+            self._redis_client = RedisCluster.from_url(
+                self.redis_url, **connection_kwargs
+            )
+        else:
+            self._redis_client = aioredis.from_url(
+                self.redis_url, **connection_kwargs
+            )
+        self._bounded_push = self._redis_client.register_script(
+            BOUNDED_PUSH_SCRIPT
+        )
+
+        # 로깅 설정
+        self.logger = logging.getLogger(__name__)
+
+    async def __aenter__(self) -> "AsyncRedisPublisher":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def publish(
+        self, queue_name: str, message: Any, key: Any = None
+    ) -> None:
+        """
+        메시지를 큐의 버퍼에 추가하고, 배치 조건이 되면 전송
+
+        Args:
+            queue_name: 메시지를 추가할 큐 이름
+            message: 코덱으로 변환할 메시지
+            key: 샤딩된 큐의 파티션 키 (같은 key는 항상 같은 샤드로 감)
+        """
+        await self.publish_many(queue_name, (message,), key)
+
+    async def publish_many(
+        self, queue_name: str, messages: Iterable[Any], key: Any = None
+    ) -> None:
+        """
+        여러 메시지를 한 번에 큐의 버퍼에 추가하고, 배치 조건이 되면 전송
+
+        Args:
+            queue_name: 메시지를 추가할 큐 이름
+            messages: 코덱으로 변환할 메시지 목록
+            key: 샤딩된 큐의 파티션 키 (모든 메시지가 같은 샤드로 감)
+        """
+        if self._closed:
+            raise RuntimeError("닫힌 발행자입니다.")
+        if queue_name in self.shards:
+            queue_name = self._shard_target(queue_name, key)
+        encode = self.codec.encode
+        payloads = [encode(message) for message in messages]
+        if not payloads:
+            return
+
+        buffer = self._buffers.get(queue_name)
+        if buffer is None:
+            buffer = self._buffers[queue_name] = []
+            self._buffer_bytes[queue_name] = 0
+            self._buffer_since[queue_name] = time.monotonic()
+            self._ensure_linger()
+        buffer.extend(payloads)
+        self._buffer_bytes[queue_name] += sum(
+            len(payload) for payload in payloads
+        )
+
+        if (
+            len(buffer) >= self.batch_size
+            or self._buffer_bytes[queue_name] >= self.batch_bytes
+        ):
+            await self.flush(queue_name)
+
+    async def flush(self, queue_name: Optional[str] = None) -> None:
+        """
+        버퍼에 쌓인 메시지를 전송
+
+        Args:
+            queue_name: 전송할 큐 이름 (None이면 모든 큐)
+        """
+        await self._flush([queue_name] if queue_name is not None else None)
+
+    def pending(self) -> int:
+        """
+        아직 전송하지 않은 메시지 수
+
+        Returns:
+            모든 큐 버퍼의 메시지 수 합계
+        """
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def _shard_target(self, queue_name: str, key: Any) -> str:
+        """
+        샤딩된 논리 큐에서 메시지를 보낼 샤드 키 선택
+
+        Args:
+            queue_name: 논리 큐 이름
+            key: 파티션 키 (None이면 샤드를 돌아가며 선택)
+
+        Returns:
+            샤드 키 이름
+        """
+        shards = self.shards[queue_name]
+        index = (
+            next(self._shard_counters[queue_name]) % shards
+            if key is None
+            else shard_for(key, shards)
+        )
+        return shard_name(queue_name, index)
+
+    async def close(self) -> None:
+        """남은 메시지를 모두 전송하고 연결 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._linger_task is not None and self._linger_wakeup is not None:
+            # 전송 중에 취소하면 중복 전송될 수 있으므로 태스크가 스스로 끝나도록 깨움
+            self._linger_wakeup.set()
+            await asyncio.gather(self._linger_task, return_exceptions=True)
+            self._linger_task = None
+        try:
+            await self.flush()
+        finally:
+            close = (
+                getattr(self._redis_client, "aclose", None)
+                or self._redis_client.close
+            )
+            await close()
+
+    def _ensure_linger(self) -> None:
+        """대기 시간 조건을 처리할 태스크를 필요할 때 시작하고 새 버퍼를 알림"""
+        if self.linger_ms <= 0:
+            return
+        wakeup = self._linger_wakeup
+        if self._linger_task is None or wakeup is None:
+            self._send_lock = self._send_lock or asyncio.Lock()
+            wakeup = self._linger_wakeup = asyncio.Event()
+            self._linger_task = asyncio.create_task(
+                self._linger_loop(wakeup), name="PublisherLinger"
+            )
+        wakeup.set()
+
+    async def _flush(self, queue_names: Optional[List[str]] = None) -> None:
+        """
+        버퍼를 꺼내 전송 - 전송 잠금으로 같은 큐의 배치가 순서대로 전송되도록 보장
+
+        Args:
+            queue_names: 전송할 큐 이름 목록 (None이면 모든 큐)
+        """
+        if self._send_lock is None:
+            self._send_lock = asyncio.Lock()
+        async with self._send_lock:
+            names = (
+                list(self._buffers)
+                if queue_names is None
+                else [name for name in queue_names if name in self._buffers]
+            )
+            batches = {}
+            for name in names:
+                batches[name] = self._buffers.pop(name)
+                del self._buffer_bytes[name]
+                del self._buffer_since[name]
+            if batches:
+                await self._send(batches)
+
+    def _restore(self, batches: Dict[str, List[bytes]]) -> None:
+        """
+        전송하지 못한 메시지를 버퍼의 앞쪽에 되돌림
+
+        Args:
+            batches: 큐 이름별 메시지 목록
+        """
+        for name, payloads in batches.items():
+            buffer = self._buffers.get(name)
+            if buffer is None:
+                self._buffers[name] = payloads
+                self._buffer_bytes[name] = sum(
+                    len(payload) for payload in payloads
+                )
+                self._buffer_since[name] = time.monotonic()
+            else:
+                buffer[:0] = payloads
+                self._buffer_bytes[name] += sum(
+                    len(payload) for payload in payloads
+                )
+
+    async def _send(self, batches: Dict[str, List[bytes]]) -> None:
+        """
+        큐별 배치를 batch_size개씩 나누어 하나의 파이프라인으로 전송
+
+        Args:
+            batches: 큐 이름별 메시지 목록
+        """
+        if self.max_queue_length is not None:
+            await self._send_bounded(batches, self.max_queue_length)
+            return
+
+        try:
+            pipe = self._redis_client.pipeline(transaction=False)
+            for name, payloads in batches.items():
+                for start in range(0, len(payloads), self.batch_size):
+                    end = start + self.batch_size
+                    pipe.rpush(name, *payloads[start:end])
+            await pipe.execute()
+        except BaseException:
+            # 일부가 이미 추가되었을 수 있지만 유실되지 않도록 다음 전송에서 다시 보냄 (at-least-once)
+            self._restore(batches)
+            raise
+
+    async def _send_bounded(
+        self, batches: Dict[str, List[bytes]], limit: int
+    ) -> None:
+        """
+        큐 길이 상한을 지키며 전송 - 한도를 넘는 큐는 full_timeout 동안 다시 시도
+
+        Args:
+            batches: 큐 이름별 메시지 목록
+            limit: 큐 길이 상한
+        """
+        deadline = time.monotonic() + self.full_timeout
+        while batches:
+            names = list(batches)
+            try:
+                if self.cluster:
+                    # 클러스터 파이프라인은 스크립트를 지원하지 않으므로 큐마다 따로 실행
+                    results = [
+                        await self._bounded_push(
+                            keys=[name],
+                            args=[limit] + batches[name][: self.batch_size],
+                        )
+                        for name in names
+                    ]
+                else:
+                    pipe = self._redis_client.pipeline(transaction=False)
+                    for name in names:
+                        await self._bounded_push(
+                            keys=[name],
+                            args=[limit] + batches[name][: self.batch_size],
+                            client=pipe,
+                        )
+                    results = await pipe.execute()
+            except BaseException:
+                self._restore(batches)
+                raise
+
+            rejected = None
+            for name, result in zip(names, results):
+                if result < 0:
+                    rejected = (name, -result - 1)
+                    continue
+                # 자리가 부족하면 앞쪽 일부만 추가되므로 나머지는 다음 왕복에서 보냄
+                del batches[name][:result]
+                if not batches[name]:
+                    del batches[name]
+
+            if rejected is None:
+                continue
+            if time.monotonic() >= deadline:
+                self._restore(batches)
+                raise QueueFullError(rejected[0], rejected[1], limit)
+            try:
+                await asyncio.sleep(FULL_RETRY_INTERVAL)
+            except BaseException:
+                self._restore(batches)
+                raise
+
+    async def _linger_loop(self, wakeup: asyncio.Event) -> None:
+        """
+        대기 시간 조건 처리 태스크 - 첫 메시지가 linger_ms 이상 기다린 버퍼를 전송
+
+        Args:
+            wakeup: 새 버퍼가 생기거나 닫을 때 설정되는 이벤트
+        """
+        linger = self.linger_ms / 1000
+        while not self._closed:
+            if not self._buffer_since:
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+
+            wait = min(self._buffer_since.values()) + linger - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            now = time.monotonic()
+            expired = [
+                name
+                for name, since in self._buffer_since.items()
+                if now - since >= linger
+            ]
+            try:
+                await self._flush(expired)
+            except Exception as e:
+                # 메시지는 버퍼에 남아 있으므로 다음 전송에서 다시 시도
+                self.logger.error(f"메시지 전송 실패: {e}")
+                await asyncio.sleep(linger)
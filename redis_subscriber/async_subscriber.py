@@ -0,0 +1,536 @@
+"""
+Redis Subscriber 프레임워크 - asyncio 구현
+
+Author: Minseok kim
+"""
+
+import asyncio
+import inspect
+import logging
+import signal
+from typing import Dict, Callable, Any, List, Optional, Set, Tuple, Union
+
+import redis.asyncio as aioredis
+
+from .backoff import Backoff
+from .codecs import Codec, DecodeError, decode_each, get_codec
+
+
+class AsyncRedisSubscriber:
+    """
+    redis.asyncio 기반으로 Redis Queue에서 메시지를 구독하고 처리하는 프레임워크
+
+    큐마다 OS 스레드 대신 하나의 수신 태스크를 사용하며, 핸들러는 큐별 세마포어
+    한도 안에서 동시에 여러 개가 실행된다. `async def` 핸들러는 이벤트 루프에서
+    직접 실행되고, 일반 함수 핸들러는 기본 executor에서 실행된다.
+
+    수신 태스크는 BLPOP으로 대기하는 동안 연결 풀의 연결 하나를 계속 사용하므로,
+    큐가 많으면 fetchers를 지정해 여러 큐를 하나의 다중 키 BLPOP으로 대기한다.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        codec: Union[str, Codec] = "utf8",
+        block_timeout: float = 5.0,
+        reconnect_backoff: Tuple[float, float] = (0.1, 30.0),
+        fetchers: Optional[int] = None,
+    ) -> None:
+        """
+        AsyncRedisSubscriber 초기화
+
+        Args:
+            redis_url: Redis 연결 URL (예: "redis://localhost:6379")
+            username: Redis 사용자명 (선택사항)
+            password: Redis 비밀번호 (선택사항)
+            codec: 메시지를 핸들러에 전달하기 전에 변환할 기본 코덱 (기본값 "utf8")
+            block_timeout: 수신 태스크의 BLPOP 블로킹 대기 시간 (초, 0이면 무제한)
+                stop()은 수신 태스크를 취소하므로 길게 잡아도 종료가 늦어지지 않는다.
+            reconnect_backoff: 수신 에러 후 다시 시도하기 전 대기 시간의 (시작값, 상한) (초)
+                수신 태스크는 에러가 나도 종료되지 않고 지터가 있는 지수 백오프로 기다린다.
+            fetchers: 다중 키 BLPOP을 수행할 수신 태스크 수 (선택사항)
+                지정하면 start() 시 구독한 큐를 fetchers개의 태스크에 나누어 하나의
+                BLPOP으로 여러 큐를 동시에 대기하므로, 블로킹 대기에 사용하는 연결 수가
+                큐 수와 관계없이 fetchers개로 유지된다. 핸들러 한도에 도달한 큐는 빈
+                슬롯이 생길 때까지 대기 키에서 제외한다. start() 이후에 등록한 큐는
+                전용 수신 태스크를 사용한다.
+        """
+        Backoff(*reconnect_backoff)  # 잘못된 값이면 ValueError
+        if fetchers is not None and fetchers < 1:
+            raise ValueError(f"fetchers는 1 이상이어야 합니다: {fetchers}")
+        self.redis_url = redis_url
+        self.username = username
+        self.password = password
+        self.codec = get_codec(codec)
+        self.block_timeout = block_timeout
+        self.reconnect_backoff = reconnect_backoff
+        self.fetchers = fetchers
+        self._handlers: Dict[str, Callable[[str], Any]] = {}
+        self._options: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Set[asyncio.Task] = set()
+        self._running = False
+        self._redis_client: Any = None
+        # 이벤트는 start()에서 실행 중인 이벤트 루프에 만듦
+        self._stopped: asyncio.Event
+        # 핸들러가 끝나 세마포어 슬롯이 반환될 때마다 설정 (다중 큐 수신 태스크가 대기)
+        self._released: asyncio.Event
+
+        # 로깅 설정
+        self.logger = logging.getLogger(__name__)
+
+    def subscribe(
+        self,
+        queue_name: str,
+        batch_size: int = 1,
+        concurrency: int = 1,
+        codec: Optional[Union[str, Codec]] = None,
+    ) -> Callable[[Callable[[str], Any]], Callable[[str], Any]]:
+        """
+        Queue 구독을 위한 데코레이터
+
+        start() 이후에 등록하면 해당 큐의 수신 태스크가 바로 시작된다.
+
+        Args:
+            queue_name: 구독할 Redis Queue 이름
+            batch_size: 한 번의 블로킹 대기 후 가져올 최대 메시지 수 (기본값 1)
+            concurrency: 큐별로 동시에 실행할 수 있는 핸들러 수 (기본값 1)
+                실행 중인 핸들러가 한도에 도달하면 수신 태스크는 Redis에서
+                메시지를 더 가져오지 않는다.
+            codec: 이 큐의 메시지 코덱 (기본값은 AsyncRedisSubscriber의 codec)
+
+        Returns:
+            데코레이터 함수
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+        if concurrency < 1:
+            raise ValueError(
+                f"concurrency는 1 이상이어야 합니다: {concurrency}"
+            )
+        queue_codec = self.codec if codec is None else get_codec(codec)
+
+        def decorator(func: Callable[[str], Any]) -> Callable[[str], Any]:
+            """
+            데코레이터 함수
+
+            Args:
+                func: 등록할 핸들러 함수 (async def 또는 일반 함수)
+
+            Returns:
+                원본 함수
+            """
+            if self._running and queue_name in self._handlers:
+                raise ValueError(
+                    "이미 실행 중인 큐입니다. unsubscribe()로 해제한 뒤 "
+                    f"다시 등록하세요: {queue_name}"
+                )
+
+            self._handlers[queue_name] = func
+            self._options[queue_name] = {
+                "batch_size": batch_size,
+                "concurrency": concurrency,
+                "codec": queue_codec,
+            }
+            self.logger.info(f"핸들러 등록됨: {queue_name} -> {func.__name__}")
+            if self._running:
+                # 실행 중이면 다시 시작하지 않고 이 큐만 바로 수신 시작
+                self._start_listener(queue_name)
+            return func
+
+        return decorator
+
+    async def unsubscribe(self, queue_name: str) -> None:
+        """
+        큐 구독 해제 - 실행 중이면 수신 태스크만 취소하고, 이미 꺼낸 메시지의 핸들러는 마저 실행
+
+        Args:
+            queue_name: 해제할 큐 이름
+        """
+        if queue_name not in self._handlers:
+            raise ValueError(f"구독하지 않은 큐입니다: {queue_name}")
+        if self._running and queue_name not in self._tasks:
+            raise ValueError(
+                f"다른 큐와 함께 수신 중인 큐는 실행 중에 해제할 수 없습니다: {queue_name}"
+            )
+
+        task = self._tasks.pop(queue_name, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._semaphores.pop(queue_name, None)
+        del self._handlers[queue_name]
+        del self._options[queue_name]
+        self.logger.info(f"구독 해제됨: {queue_name}")
+
+    async def start(self) -> None:
+        """프레임워크 시작 - 모든 큐의 수신 태스크를 시작하고 즉시 반환"""
+        if self._running:
+            self.logger.warning("프레임워크가 이미 실행 중입니다.")
+            return
+
+        # Redis 클라이언트 연결 (인증 정보 포함)
+        # 응답은 bytes 그대로 받고 핸들러에 전달하기 직전에 큐별 코덱으로 변환
+        connection_kwargs: Dict[str, Any] = {"decode_responses": False}
+
+        # 인증 정보가 제공된 경우 추가
+        if self.username:
+            connection_kwargs["username"] = self.username
+        if self.password:
+            connection_kwargs["password"] = self.password
+
+        self._redis_client = aioredis.from_url(
+            self.redis_url, **connection_kwargs
+        )
+        try:
+            await self._redis_client.ping()  # 연결 테스트
+        except Exception as e:
+            self.logger.error(f"프레임워크 시작 실패: {e}")
+            await self._close_client()
+            raise
+
+        self._running = True
+        self._stopped = asyncio.Event()
+        self._released = asyncio.Event()
+
+        if not self.fetchers:
+            # 각 큐별로 수신 태스크 시작
+            for queue_name in self._options:
+                self._start_listener(queue_name)
+        else:
+            # 큐를 수신 태스크에 고르게 분배
+            queue_names = list(self._options)
+            for queue_name in queue_names:
+                self._semaphores[queue_name] = asyncio.Semaphore(
+                    self._options[queue_name]["concurrency"]
+                )
+            step = self.fetchers
+            for index in range(min(step, len(queue_names))):
+                assigned = queue_names[index::step]
+                self._tasks[f"fetcher-{index}"] = asyncio.create_task(
+                    self._multiplex_listener(assigned),
+                    name=f"QueueFetcher-{index}",
+                )
+                self.logger.info(
+                    f"다중 큐 수신 태스크 시작됨: fetcher-{index} ({len(assigned)}개 큐)"
+                )
+
+        self.logger.info("Async Redis Subscriber 프레임워크가 시작되었습니다.")
+
+    def _start_listener(self, queue_name: str) -> None:
+        """
+        큐의 세마포어와 수신 태스크 시작
+
+        Args:
+            queue_name: 수신할 큐 이름
+        """
+        self._semaphores[queue_name] = asyncio.Semaphore(
+            self._options[queue_name]["concurrency"]
+        )
+        self._tasks[queue_name] = asyncio.create_task(
+            self._queue_listener(queue_name),
+            name=f"QueueListener-{queue_name}",
+        )
+        self.logger.info(f"큐 리스너 태스크 시작됨: {queue_name}")
+
+    async def run(self) -> None:
+        """프레임워크를 시작하고 stop() 또는 SIGINT/SIGTERM 수신 시까지 대기"""
+        await self.start()
+
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(
+                    signum, lambda: asyncio.ensure_future(self.stop())
+                )
+            except (NotImplementedError, RuntimeError):
+                # 메인 스레드가 아니거나 지원하지 않는 플랫폼
+                pass
+
+        await self._stopped.wait()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        프레임워크 종료 - 수신을 멈추고 실행 중인 핸들러가 끝날 때까지 대기
+
+        Args:
+            timeout: 실행 중인 핸들러를 기다릴 최대 시간 (초)
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self.logger.info("프레임워크 종료 중...")
+
+        # 수신 태스크는 블로킹 대기 중이므로 즉시 취소
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        # 실행 중인 핸들러 완료 대기
+        if self._in_flight:
+            done, pending = await asyncio.wait(
+                set(self._in_flight), timeout=timeout
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                self.logger.warning(
+                    f"종료 시간 초과로 취소된 핸들러: {len(pending)}개"
+                )
+        self._in_flight.clear()
+        self._semaphores.clear()
+
+        await self._close_client()
+        self._stopped.set()
+        self.logger.info("Async Redis Subscriber 프레임워크가 종료되었습니다.")
+
+    async def _close_client(self) -> None:
+        """Redis 연결 종료"""
+        if self._redis_client is None:
+            return
+        close = (
+            getattr(self._redis_client, "aclose", None)
+            or self._redis_client.close
+        )
+        await close()
+        self._redis_client = None
+
+    async def _queue_listener(self, queue_name: str) -> None:
+        """
+        Queue 수신 태스크
+
+        Args:
+            queue_name: 리스닝할 큐 이름
+        """
+        semaphore = self._semaphores[queue_name]
+        backoff = Backoff(*self.reconnect_backoff)
+
+        while self._running:
+            # 빈 슬롯이 생길 때까지 수신하지 않음 (백프레셔)
+            await semaphore.acquire()
+            try:
+                # BLPOP으로 메시지 대기 (종료 시 태스크 취소로 즉시 해제됨)
+                _, messages, cancelled = await self._pop([queue_name])
+            except asyncio.CancelledError:
+                semaphore.release()
+                raise
+            except Exception as e:
+                semaphore.release()
+                if not self._running:  # 의도적인 종료 중 연결이 닫힌 경우
+                    break
+                # 연결 풀이 다음 명령에서 다시 연결하므로 백오프 후 계속 수신
+                delay = backoff.next_delay()
+                self.logger.error(
+                    f"큐 리스너 에러 [{queue_name}]: {e} - {delay:.2f}초 후 다시 시도합니다."
+                )
+                await asyncio.sleep(delay)
+                continue
+            if not messages:
+                semaphore.release()
+                continue
+            backoff.reset()
+            # 첫 메시지는 이미 확보한 슬롯을 사용
+            await self._deliver(queue_name, messages, cancelled, acquired=True)
+
+        self.logger.debug(f"큐 리스너 태스크 종료됨: {queue_name}")
+
+    async def _multiplex_listener(self, queue_names: List[str]) -> None:
+        """
+        다중 큐 수신 태스크 - 하나의 BLPOP으로 여러 큐를 동시에 대기
+
+        BLPOP은 키 순서상 가장 앞의 비어 있지 않은 큐에서 꺼내므로, 매 호출마다
+        키 순서를 회전시켜 메시지가 많은 큐가 다른 큐를 굶기지 않도록 한다.
+
+        Args:
+            queue_names: 이 태스크가 담당할 큐 이름 목록
+        """
+        keys = list(queue_names)
+        backoff = Backoff(*self.reconnect_backoff)
+
+        while self._running:
+            # 핸들러 한도에 도달한 큐는 빈 슬롯이 생길 때까지 대기 키에서 제외 (백프레셔)
+            self._released.clear()
+            ready = [
+                queue_name
+                for queue_name in keys
+                if not self._semaphores[queue_name].locked()
+            ]
+            if not ready:
+                await self._released.wait()
+                continue
+            try:
+                queue_name, messages, cancelled = await self._pop(ready)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not self._running:
+                    break
+                delay = backoff.next_delay()
+                self.logger.error(
+                    f"다중 큐 수신 에러 {queue_names}: {e} - {delay:.2f}초 후 다시 시도합니다."
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            # 공정성을 위해 다음 호출의 키 순서를 회전
+            keys.append(keys.pop(0))
+            if queue_name is None:
+                continue
+            backoff.reset()
+            await self._deliver(
+                queue_name, messages, cancelled, acquired=False
+            )
+
+        self.logger.debug(f"다중 큐 수신 태스크 종료됨: {queue_names}")
+
+    async def _pop(
+        self, keys: List[str]
+    ) -> Tuple[Optional[str], List[bytes], bool]:
+        """
+        BLPOP으로 메시지를 기다린 뒤 배치 모드이면 대기 중인 메시지를 한 번의 왕복으로 추가 수신
+
+        BLPOP이 반환된 뒤에 태스크가 취소되면, 이미 보낸 LPOP의 결과까지 받은 뒤
+        취소 여부를 함께 반환하므로 꺼낸 메시지를 잃지 않는다.
+
+        Args:
+            keys: 대기할 큐 이름 목록
+
+        Returns:
+            (큐 이름, 원본 메시지 목록, 수신 중 취소 여부) - 시간 초과이면 (None, [], False)
+        """
+        result = await self._redis_client.blpop(
+            keys, timeout=self.block_timeout
+        )
+        if result is None:
+            return None, [], False
+
+        # result는 (queue_name, message) 튜플
+        key, message = result
+        queue_name = key.decode() if isinstance(key, bytes) else key
+        messages = [message]
+        batch_size = self._options[queue_name]["batch_size"]
+        cancelled = False
+        if batch_size > 1:
+            lpop = asyncio.ensure_future(
+                self._redis_client.lpop(queue_name, batch_size - 1)
+            )
+            try:
+                await asyncio.shield(lpop)
+            except asyncio.CancelledError:
+                cancelled = True
+                await asyncio.wait([lpop])
+            except Exception:
+                pass
+            try:
+                extra = lpop.result()
+            except Exception as e:
+                # BLPOP으로 꺼낸 메시지는 그대로 처리
+                self.logger.error(f"추가 메시지 수신 실패 [{queue_name}]: {e}")
+                extra = None
+            if extra:
+                messages.extend(extra)
+        return queue_name, messages, cancelled
+
+    async def _deliver(
+        self,
+        queue_name: str,
+        messages: List[bytes],
+        cancelled: bool,
+        acquired: bool,
+    ) -> None:
+        """
+        수신한 메시지를 디코딩해 세마포어 한도 안에서 핸들러 태스크로 전달
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            messages: 원본 메시지 목록
+            cancelled: 수신 중 태스크가 취소되었는지 여부 (True이면 모두 전달한 뒤 취소를 이어감)
+            acquired: 첫 메시지를 위한 세마포어 슬롯을 이미 확보했는지 여부
+        """
+        handler = self._handlers[queue_name]
+        semaphore = self._semaphores[queue_name]
+        decoded = decode_each(self._options[queue_name]["codec"], messages)
+        for index, message in enumerate(decoded):
+            if index == 0 and acquired:
+                self._spawn(queue_name, handler, message, semaphore)
+                continue
+            if cancelled:
+                # 이미 큐에서 꺼낸 메시지는 한도를 넘더라도 모두 처리
+                self._spawn(queue_name, handler, message, None)
+                continue
+            try:
+                await semaphore.acquire()
+            except asyncio.CancelledError:
+                for remaining in decoded[index:]:
+                    self._spawn(queue_name, handler, remaining, None)
+                raise
+            self._spawn(queue_name, handler, message, semaphore)
+        if cancelled:
+            raise asyncio.CancelledError()
+
+    def _spawn(
+        self,
+        queue_name: str,
+        handler: Callable[[Any], Any],
+        message: Any,
+        semaphore: Optional[asyncio.Semaphore],
+    ) -> None:
+        """
+        핸들러 태스크 생성 - 완료되면 세마포어 슬롯 반환
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            handler: 호출할 핸들러 함수
+            message: 디코딩된 메시지
+            semaphore: 핸들러 완료 시 반환할 큐의 세마포어 (None이면 반환하지 않음)
+        """
+        task = asyncio.create_task(
+            self._handle_message(queue_name, handler, message)
+        )
+        self._in_flight.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            self._in_flight.discard(finished)
+            if semaphore is not None:
+                semaphore.release()
+                self._released.set()
+
+        task.add_done_callback(_done)
+
+    async def _handle_message(
+        self, queue_name: str, handler: Callable[[Any], Any], message: Any
+    ) -> None:
+        """
+        단일 메시지를 핸들러에 전달
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            handler: 호출할 핸들러 함수
+            message: 디코딩된 메시지 (디코딩에 실패했으면 DecodeError 객체)
+        """
+        # 핫 패스이므로 로그 메시지는 디버그 레벨이 켜진 경우에만 포맷
+        self.logger.debug("메시지 수신됨 [%s]: %s", queue_name, message)
+
+        if type(message) is DecodeError:
+            self.logger.error(
+                "메시지 디코딩 실패 [%s]: %s", queue_name, message
+            )
+            return
+
+        # 핸들러 함수 호출
+        try:
+            if inspect.iscoroutinefunction(handler):
+                await handler(message)
+            else:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, handler, message)
+        except Exception as e:
+            self.logger.error(
+                "핸들러 실행 중 에러 발생 [%s]: %s", queue_name, e
+            )
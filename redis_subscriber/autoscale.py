@@ -0,0 +1,115 @@
+"""
+큐 길이와 핸들러 지연에 따른 워커 수 자동 조절
+
+오토스케일러 스레드는 주기마다 자동 조절 대상인 모든 큐의 길이를 하나의 파이프라인
+LLEN으로 조회하고, 지표에 쌓인 처리 수와 핸들러 실행 시간을 함께 QueueScaler에
+넘긴다. QueueScaler는 두 표본 사이의 변화량으로 메시지 유입 속도와 메시지당 처리
+시간을 구하고, 이를 바쁜 워커 수로 환산한 부하와 현재 워커 수를 비교해 새 워커 수를 정한다.
+
+Author: Minseok kim
+"""
+
+import math
+from typing import Optional, Tuple
+
+# 부하가 워커 수의 이 비율을 넘으면 늘림
+SCALE_UP_UTILIZATION = 0.8
+
+# 부하가 워커 수의 이 비율보다 낮으면 줄임 (늘리는 기준과의 사이는 그대로 유지하는 구간)
+SCALE_DOWN_UTILIZATION = 0.3
+
+# 워커 수를 바꿀 때 목표로 하는 워커당 부하
+TARGET_UTILIZATION = 0.6
+
+# 밀린 메시지를 이 시간(초) 안에 비울 수 있도록 워커를 더 배정
+DRAIN_SECONDS = 10.0
+
+
+class QueueScaler:
+    """
+    큐 하나의 워커 수 결정
+
+    부하 = 유입 속도 x 메시지당 처리 시간 + 큐 길이 x 메시지당 처리 시간 / DRAIN_SECONDS
+    (유입을 따라가는 데 필요한 워커 수 + 밀린 메시지를 비우는 데 필요한 워커 수)
+
+    부하가 워커 수 x SCALE_UP_UTILIZATION을 넘거나 워커 수 x SCALE_DOWN_UTILIZATION
+    보다 낮을 때만 워커당 부하가 TARGET_UTILIZATION이 되도록 바꾸고(히스테리시스),
+    바꾼 뒤 cooldown초 동안은 다시 바꾸지 않는다.
+    """
+
+    def __init__(
+        self, minimum: int, maximum: int, cooldown: float = 30.0
+    ) -> None:
+        """
+        QueueScaler 초기화
+
+        Args:
+            minimum: 최소 워커 수
+            maximum: 최대 워커 수
+            cooldown: 워커 수를 바꾼 뒤 다시 바꾸지 않는 시간 (초)
+        """
+        if minimum < 1 or maximum < minimum:
+            raise ValueError(
+                "1 <= minimum <= maximum 이어야 합니다: "
+                f"minimum={minimum}, maximum={maximum}"
+            )
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.service_time: Optional[float] = None
+        self.load = 0.0
+        self._sample: Optional[Tuple[float, int, int, float]] = None
+        self._changed = float("-inf")
+
+    def observe(
+        self, now: float, workers: int, depth: int, completed: int, busy: float
+    ) -> Optional[int]:
+        """
+        표본을 기록하고 바꿀 워커 수 결정
+
+        Args:
+            now: 표본 시각 (time.monotonic)
+            workers: 현재 워커 수
+            depth: Redis와 로컬 버퍼에 남아 있는 메시지 수
+            completed: 지금까지 처리한 메시지 수 (성공과 실패 합계, 누적값)
+            busy: 지금까지의 핸들러 실행 시간 합계 (초, 누적값)
+
+        Returns:
+            새 워커 수, 바꿀 필요가 없으면 None
+        """
+        previous, self._sample = self._sample, (now, depth, completed, busy)
+        if previous is None:
+            return None
+
+        elapsed = now - previous[0]
+        done = completed - previous[2]
+        if done > 0:
+            self.service_time = (busy - previous[3]) / done
+        if self.service_time is None or elapsed <= 0:
+            # 처리한 메시지가 아직 없어 처리 시간을 모름
+            return None
+
+        # 처리한 수 + 늘어난 큐 길이 = 들어온 수
+        arrival = max(0.0, (done + depth - previous[1]) / elapsed)
+        self.load = (
+            arrival * self.service_time
+            + depth * self.service_time / DRAIN_SECONDS
+        )
+
+        if now - self._changed < self.cooldown:
+            return None
+        if (
+            SCALE_DOWN_UTILIZATION * workers
+            <= self.load
+            <= SCALE_UP_UTILIZATION * workers
+        ):
+            return None
+
+        desired = min(
+            self.maximum,
+            max(self.minimum, math.ceil(self.load / TARGET_UTILIZATION)),
+        )
+        if desired == workers:
+            return None
+        self._changed = now
+        return desired
@@ -0,0 +1,48 @@
+"""
+재연결 대기 시간 계산
+
+Author: Minseok kim
+"""
+
+import random
+
+
+class Backoff:
+    """
+    지터가 있는 지수 백오프
+
+    n번째 연속 실패 후의 대기 시간은 min(cap, base * 2^n)의 절반에서 전체 사이의
+    임의 값이다. 여러 리스너가 같은 장애를 동시에 겪어도 재연결 시점이 흩어지고,
+    최소한 절반은 기다리므로 장애 중인 서버에 연결을 몰아치지 않는다.
+    """
+
+    def __init__(self, base: float = 0.1, cap: float = 30.0) -> None:
+        """
+        Backoff 초기화
+
+        Args:
+            base: 첫 실패 후 최대 대기 시간 (초)
+            cap: 대기 시간 상한 (초)
+        """
+        if base <= 0 or cap < base:
+            raise ValueError(
+                f"0 < base <= cap 이어야 합니다: base={base}, cap={cap}"
+            )
+        self.base = base
+        self.cap = cap
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        """
+        실패를 기록하고 다음 시도까지 기다릴 시간 반환
+
+        Returns:
+            대기 시간 (초)
+        """
+        ceiling = min(self.cap, self.base * (2 ** min(self.attempts, 32)))
+        self.attempts += 1
+        return random.uniform(ceiling / 2, ceiling)
+
+    def reset(self) -> None:
+        """연속 실패 횟수 초기화"""
+        self.attempts = 0
@@ -0,0 +1,80 @@
+"""
+배치 핸들러의 메시지별 처리 결과
+
+Author: Minseok kim
+"""
+
+from typing import Iterable, Set, Tuple
+
+
+class BatchResult:
+    """
+    배치 핸들러가 반환하는 부분 실패 결과
+
+    핸들러는 전달받은 메시지 목록의 위치(인덱스)로 다시 처리할 메시지와 데드레터
+    큐로 보낼 메시지를 지정한다. 지정하지 않은 메시지는 성공으로 처리되며,
+    핸들러가 None을 반환하면 배치 전체가 성공한 것으로 본다.
+
+    예:
+        result = BatchResult()
+        for index, row in enumerate(rows):
+            if not valid(row):
+                result.dead_letter(index)
+        ...
+        return result
+    """
+
+    __slots__ = ("_retry", "_dead")
+
+    def __init__(
+        self, retry: Iterable[int] = (), dead_letter: Iterable[int] = ()
+    ) -> None:
+        """
+        BatchResult 초기화
+
+        Args:
+            retry: 다시 처리할 메시지의 인덱스 목록 (큐의 뒤쪽으로 되돌림)
+            dead_letter: 데드레터 큐로 보낼 메시지의 인덱스 목록
+        """
+        self._retry: Set[int] = set(retry)
+        self._dead: Set[int] = set(dead_letter)
+
+    def retry(self, index: int) -> "BatchResult":
+        """
+        메시지를 다시 처리하도록 표시
+
+        Args:
+            index: 배치에서의 메시지 위치
+
+        Returns:
+            자기 자신 (연속 호출용)
+        """
+        self._retry.add(index)
+        return self
+
+    def dead_letter(self, index: int) -> "BatchResult":
+        """
+        메시지를 데드레터 큐로 보내도록 표시 (retry보다 우선)
+
+        Args:
+            index: 배치에서의 메시지 위치
+
+        Returns:
+            자기 자신 (연속 호출용)
+        """
+        self._dead.add(index)
+        return self
+
+    def partition(self, count: int) -> Tuple[Set[int], Set[int]]:
+        """
+        배치 크기 안의 인덱스만 남겨 재시도/데드레터 인덱스로 나눔
+
+        Args:
+            count: 배치의 메시지 수
+
+        Returns:
+            (재시도 인덱스, 데드레터 인덱스) - 두 집합은 겹치지 않음
+        """
+        dead = {index for index in self._dead if 0 <= index < count}
+        retry = {index for index in self._retry if 0 <= index < count} - dead
+        return retry, dead
@@ -0,0 +1,304 @@
+"""
+메시지 코덱
+
+Redis 클라이언트는 응답을 bytes 그대로 받고, 핸들러에 전달하기 직전에 큐별
+코덱으로 한 번만 변환한다. 한 번에 수신한 배치는 decode_batch()로 한 번에 변환한다.
+
+Author: Minseok kim
+"""
+
+import json
+import zlib
+from typing import Any, Dict, List, Type, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover - 선택 의존성
+    msgpack = None
+
+
+class DecodeError(Exception):
+    """
+    메시지 디코딩 실패
+
+    decode_each()는 디코딩에 실패한 메시지 자리에 이 예외 객체를 넣어 반환하며,
+    구독자는 핸들러를 호출하지 않고 처리 실패로 기록한다.
+    """
+
+    def __init__(self, payload: Any, cause: Exception) -> None:
+        """
+        DecodeError 초기화
+
+        Args:
+            payload: 디코딩하지 못한 원본 메시지
+            cause: 코덱에서 발생한 예외
+        """
+        super().__init__(f"{type(cause).__name__}: {cause}")
+        self.payload = payload
+        self.cause = cause
+
+
+class Codec:
+    """
+    메시지 코덱 기본 클래스
+
+    사용자 코덱은 이 클래스를 상속해 decode()와 encode()를 구현한다.
+    배치를 더 효율적으로 변환할 수 있으면 decode_batch()도 재정의한다.
+    """
+
+    name = "codec"
+
+    def decode(self, data: bytes) -> Any:
+        """
+        Redis에서 받은 메시지를 핸들러에 전달할 값으로 변환
+
+        Args:
+            data: 원본 메시지
+
+        Returns:
+            변환된 값
+        """
+        raise NotImplementedError
+
+    def decode_batch(self, data: List[bytes]) -> List[Any]:
+        """
+        한 번에 수신한 메시지 목록을 변환
+
+        Args:
+            data: 원본 메시지 목록
+
+        Returns:
+            변환된 값 목록 (순서 유지)
+        """
+        decode = self.decode
+        return [decode(item) for item in data]
+
+    def encode(self, value: Any) -> bytes:
+        """
+        값을 Redis에 저장할 메시지로 변환
+
+        Args:
+            value: 변환할 값
+
+        Returns:
+            메시지 bytes
+        """
+        raise NotImplementedError
+
+
+class RawCodec(Codec):
+    """변환하지 않는 코덱 - 핸들러는 Redis가 반환한 bytes를 복사 없이 그대로 받는다"""
+
+    name = "raw"
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+    def decode_batch(self, data: List[bytes]) -> List[bytes]:
+        return data
+
+    def encode(self, value: Union[bytes, bytearray, memoryview, str]) -> bytes:
+        if isinstance(value, str):
+            return value.encode("utf-8")
+        return bytes(value)
+
+
+class Utf8Codec(Codec):
+    """UTF-8 문자열 코덱 (기본값)"""
+
+    name = "utf8"
+
+    def decode(self, data: bytes) -> str:
+        return data.decode("utf-8")
+
+    def decode_batch(self, data: List[bytes]) -> List[str]:
+        return [item.decode("utf-8") for item in data]
+
+    def encode(self, value: Any) -> bytes:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        return str(value).encode("utf-8")
+
+
+class JsonCodec(Codec):
+    """JSON 코덱 - orjson이 설치되어 있으면 orjson 사용"""
+
+    name = "json"
+
+    def __init__(self) -> None:
+        """JsonCodec 초기화 - 사용할 JSON 구현 선택"""
+        if orjson is not None:
+            self._loads = orjson.loads
+            self._dumps = orjson.dumps
+        else:
+            # json.loads는 bytes를 직접 받을 수 있음
+            self._loads = json.loads
+            self._dumps = lambda value: json.dumps(
+                value, ensure_ascii=False
+            ).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return self._loads(data)
+
+    def decode_batch(self, data: List[bytes]) -> List[Any]:
+        loads = self._loads
+        return [loads(item) for item in data]
+
+    def encode(self, value: Any) -> bytes:
+        return self._dumps(value)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack 코덱 (msgpack 패키지 필요)"""
+
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        """MsgpackCodec 초기화"""
+        if msgpack is None:
+            raise ImportError(
+                "msgpack 코덱을 사용하려면 msgpack 패키지를 설치해야 합니다: pip install msgpack"
+            )
+        self._packer = msgpack.Packer(use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+    def decode_batch(self, data: List[bytes]) -> List[Any]:
+        unpackb = msgpack.unpackb
+        return [unpackb(item, raw=False) for item in data]
+
+    def encode(self, value: Any) -> bytes:
+        packed: bytes = msgpack.packb(value, use_bin_type=True)
+        return packed
+
+
+class CompressedCodec(Codec):
+    """
+    큰 메시지를 zlib으로 압축하는 코덱 래퍼
+
+    encode()는 내부 코덱으로 변환한 결과가 threshold 이상이면 압축하고 앞에
+    COMPRESSED_PREFIX를 붙인다. decode()는 접두사가 있는 메시지만 압축을 풀기
+    때문에, 압축하지 않은 기존 메시지와 섞여 있어도 읽을 수 있다.
+    "zlib+json"처럼 이름 앞에 "zlib+"를 붙여 지정할 수도 있다.
+    """
+
+    # 압축된 메시지 표시 (일반 텍스트/JSON/msgpack 메시지가 이 값으로 시작하지 않도록 선택)
+    COMPRESSED_PREFIX = b"\x00\x01Z"
+
+    def __init__(
+        self,
+        inner: Union[str, Codec] = "utf8",
+        threshold: int = 1024,
+        level: int = 1,
+    ) -> None:
+        """
+        CompressedCodec 초기화
+
+        Args:
+            inner: 압축 전후에 사용할 코덱 이름 또는 객체 (기본값 "utf8")
+            threshold: 압축할 최소 메시지 크기 (bytes, 기본값 1024)
+            level: zlib 압축 수준 (기본값 1, 속도 우선)
+        """
+        self.inner = get_codec(inner)
+        self.threshold = threshold
+        self.level = level
+        self.name = f"zlib+{self.inner.name}"
+
+    def decode(self, data: bytes) -> Any:
+        return self.inner.decode(self._decompress(data))
+
+    def decode_batch(self, data: List[bytes]) -> List[Any]:
+        decompress = self._decompress
+        return self.inner.decode_batch([decompress(item) for item in data])
+
+    def encode(self, value: Any) -> bytes:
+        data = self.inner.encode(value)
+        if len(data) < self.threshold:
+            return data
+        return self.COMPRESSED_PREFIX + zlib.compress(data, self.level)
+
+    def _decompress(self, data: bytes) -> bytes:
+        if data[:3] == self.COMPRESSED_PREFIX:
+            return zlib.decompress(data[3:])
+        return data
+
+
+# 이름으로 지정할 수 있는 코덱 (register_codec()으로 추가)
+_CODECS: Dict[str, Union[Codec, Type[Codec]]] = {
+    "raw": RawCodec,
+    "utf8": Utf8Codec,
+    "json": JsonCodec,
+    "msgpack": MsgpackCodec,
+}
+
+
+def register_codec(name: str, codec: Union[Codec, Type[Codec]]) -> None:
+    """
+    이름으로 지정할 수 있도록 사용자 코덱 등록
+
+    Args:
+        name: 코덱 이름 (subscribe(codec=name)에 사용)
+        codec: Codec 객체 또는 인자 없이 생성할 수 있는 Codec 클래스
+    """
+    _CODECS[name] = codec
+
+
+def get_codec(codec: Union[str, Codec]) -> Codec:
+    """
+    코덱 이름 또는 객체를 Codec 객체로 변환
+
+    Args:
+        codec: 코덱 이름("raw", "utf8", "json", "msgpack" 또는 등록한 이름)
+            또는 decode()를 가진 코덱 객체. 이름 앞에 "zlib+"를 붙이면
+            CompressedCodec으로 감싼다. (예: "zlib+json")
+
+    Returns:
+        Codec 객체
+    """
+    if isinstance(codec, str):
+        if codec.startswith("zlib+") and codec not in _CODECS:
+            return CompressedCodec(codec.partition("+")[2])
+        factory = _CODECS.get(codec)
+        if factory is None:
+            raise ValueError(
+                f"지원하지 않는 코덱입니다: {codec} (지원: {', '.join(_CODECS)})"
+            )
+        return factory() if isinstance(factory, type) else factory
+
+    if not callable(getattr(codec, "decode", None)):
+        raise TypeError(f"코덱은 decode()를 구현해야 합니다: {codec!r}")
+    if not callable(getattr(codec, "decode_batch", None)):
+        raise TypeError(
+            f"코덱은 decode_batch()를 구현해야 합니다 (Codec을 상속하세요): {codec!r}"
+        )
+    return codec
+
+
+def decode_each(codec: Codec, data: List[bytes]) -> List[Any]:
+    """
+    배치를 한 번에 변환하고, 실패하면 메시지별로 다시 변환
+
+    Args:
+        codec: 사용할 코덱
+        data: 원본 메시지 목록
+
+    Returns:
+        변환된 값 목록 (변환에 실패한 자리에는 DecodeError 객체)
+    """
+    try:
+        return codec.decode_batch(data)
+    except Exception:
+        # 배치 안의 어떤 메시지가 실패했는지 알 수 없으므로 하나씩 다시 변환
+        decoded = []
+        for item in data:
+            try:
+                decoded.append(codec.decode(item))
+            except Exception as e:
+                decoded.append(DecodeError(item, e))
+        return decoded
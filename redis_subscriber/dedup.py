@@ -0,0 +1,343 @@
+"""
+중복 메시지 제거
+
+dedup_key를 지정한 큐는 수신한 배치를 핸들러에 넘기기 전에 메시지마다 키를 구해
+이미 처리했거나 처리 중인 키의 메시지를 버린다. 최근 키는 크기가 제한된 로컬 LRU
+캐시에서 먼저 확인하고, 캐시에 없는 키만 모아 한 번의 왕복으로 Redis에서 확인한다.
+
+- SET 방식(기본값): 키마다 "{prefix}:dedup:{key}"에 SET NX EX를 파이프라인으로 보내
+  처음 받은 컨슈머만 처리한다. 핸들러가 실패하면 키를 지워 다시 처리할 수 있게 한다.
+- 블룸 필터 방식(bloom_bits 지정): 키 공간이 매우 클 때 키마다 Redis 키를 만들지 않고
+  ttl마다 바뀌는 비트맵 두 개(현재/이전 세대)에 기록한다. 처리에 성공한 키만 기록하며,
+  기록은 다음 확인과 같은 스크립트 호출로 보낸다. 드물게 처음 받은 메시지를 중복으로
+  판단할 수 있다(거짓 양성).
+
+Author: Minseok kim
+"""
+
+import hashlib
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .codecs import DecodeError
+
+# 블룸 필터에서 키마다 설정하는 비트 수
+BLOOM_HASHES = 7
+
+# LRU 캐시 항목 하나의 키 문자열 외 메모리 추정치 (OrderedDict 노드와 만료 시각, 바이트)
+CACHE_ENTRY_OVERHEAD = 100
+
+# 블룸 필터 확인/기록 스크립트
+# KEYS[1]: 현재 세대 비트맵, KEYS[2]: 이전 세대 비트맵
+# ARGV[1]: 비트맵 만료 시간(초), ARGV[2]: 기록할 키 수, 이후 기록할 키들과 확인할 키들의 비트 위치
+# (키마다 BLOOM_HASHES개) - 확인한 키마다 이미 본 키이면 1을 반환
+BLOOM_SCRIPT = """
+local k = %d
+local added = tonumber(ARGV[2])
+local offset = 2
+for i = 1, added * k do
+    redis.call('SETBIT', KEYS[1], ARGV[offset + i], 1)
+end
+if added > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+offset = offset + added * k
+local result = {}
+for i = 0, (#ARGV - offset) / k - 1 do
+    local current = 1
+    local previous = 1
+    for j = 1, k do
+        local bit = ARGV[offset + i * k + j]
+        if current == 1 and redis.call('GETBIT', KEYS[1], bit) == 0 then
+            current = 0
+        end
+        if previous == 1 and redis.call('GETBIT', KEYS[2], bit) == 0 then
+            previous = 0
+        end
+    end
+    result[i + 1] = math.max(current, previous)
+end
+return result
+""" % BLOOM_HASHES
+
+
+class Deduplicator:
+    """
+    큐 하나의 중복 메시지 판별
+
+    check()로 배치의 중복 여부를 판별하고, 중복이 아닌 메시지의 처리가 끝나면
+    done()으로 결과를 알린다. SET 방식은 처리 중인 키도 Redis에 남아 있으므로 같은
+    키의 메시지가 여러 컨슈머에서 동시에 두 번 처리되지 않는다. 블룸 필터 방식은 실패한
+    키를 지울 수 없어 처리에 성공한 키만 기록하므로, 처리 중인 키는 이 프로세스의 로컬
+    캐시로만 막고 다른 컨슈머는 같은 키를 동시에 처리할 수 있다.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str,
+        key_func: Callable[[Any], Hashable],
+        ttl: float,
+        cache_size: int = 10000,
+        bloom_bits: Optional[int] = None,
+    ) -> None:
+        """
+        Deduplicator 초기화
+
+        Args:
+            redis_client: Redis 클라이언트
+            prefix: Redis 키 접두사 (샤딩된 큐는 논리 큐 이름을 사용해 모든 샤드가 공유)
+            key_func: 메시지에서 중복 판별 키를 추출하는 함수 (None을 반환하면 판별하지 않음)
+            ttl: 키를 기억할 시간 (초)
+            cache_size: 로컬 LRU 캐시의 최대 키 수 (0이면 캐시를 사용하지 않음)
+            bloom_bits: 블룸 필터 비트맵 크기 (선택사항, 지정하면 SET 대신 블룸 필터 사용)
+        """
+        if ttl <= 0:
+            raise ValueError(f"dedup_ttl은 0보다 커야 합니다: {ttl}")
+        if cache_size < 0:
+            raise ValueError(
+                f"dedup_cache_size는 0 이상이어야 합니다: {cache_size}"
+            )
+        if bloom_bits is not None and not 0 < bloom_bits <= 2**32:
+            raise ValueError(
+                f"dedup_bloom_bits는 1 ~ 2^32 사이여야 합니다: {bloom_bits}"
+            )
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.key_func = key_func
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.bloom_bits = bloom_bits
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, float]" = OrderedDict()
+        self._cache_bytes = 0
+        self._added: List[str] = []
+        self._lock = threading.Lock()
+        self._bloom = (
+            None
+            if bloom_bits is None
+            else redis_client.register_script(BLOOM_SCRIPT)
+        )
+        self.logger = logging.getLogger(__name__)
+
+    def key(self, message: Any) -> Optional[str]:
+        """
+        메시지의 중복 판별 키
+
+        Args:
+            message: 디코딩된 메시지
+
+        Returns:
+            키 문자열, 판별하지 않을 메시지이면 None (디코딩 실패, 키 함수 예외 또는 None 반환)
+        """
+        if type(message) is DecodeError:
+            return None
+        try:
+            key = self.key_func(message)
+        except Exception as e:
+            self.logger.error(
+                "중복 판별 키 추출 실패 [%s]: %s", self.prefix, e
+            )
+            return None
+        if key is None:
+            return None
+        return (
+            key.decode("utf-8", "replace")
+            if isinstance(key, bytes)
+            else str(key)
+        )
+
+    def check(self, messages: List[Any]) -> List[bool]:
+        """
+        배치의 메시지별 중복 여부 판별 - 로컬 캐시에 없는 키만 한 번의 왕복으로 확인
+
+        같은 배치 안에서 키가 반복되면 두 번째부터 중복이다. Redis 확인에 실패하면
+        메시지를 버리지 않도록 캐시에 없던 메시지는 모두 중복이 아닌 것으로 본다.
+
+        Args:
+            messages: 디코딩된 메시지 목록
+
+        Returns:
+            메시지별 중복 여부 목록
+        """
+        keys = [self.key(message) for message in messages]
+        duplicates = [False] * len(messages)
+        pending: Dict[str, int] = {}
+        now = time.monotonic()
+        with self._lock:
+            for index, key in enumerate(keys):
+                if key is None:
+                    continue
+                if key in pending:
+                    duplicates[index] = True
+                    self.local_hits += 1
+                    continue
+                expires = self._cache.get(key)
+                if expires is not None and expires > now:
+                    self._cache.move_to_end(key)
+                    duplicates[index] = True
+                    self.local_hits += 1
+                    continue
+                pending[key] = index
+            added, self._added = self._added, []
+
+        if not pending and not added:
+            return duplicates
+        try:
+            seen = self._check_shared(list(pending), added)
+        except Exception as e:
+            self.logger.error("중복 확인 실패 [%s]: %s", self.prefix, e)
+            with self._lock:
+                self._added[:0] = added
+            seen = [False] * len(pending)
+
+        with self._lock:
+            for (key, index), hit in zip(pending.items(), seen):
+                if hit:
+                    duplicates[index] = True
+                    self.shared_hits += 1
+                else:
+                    self.misses += 1
+                # 처리 중인 키도 기억해야 이 프로세스에서 같은 키가 동시에 처리되지 않음
+                # (다른 컨슈머와의 동시 처리는 SET 방식에서만 Redis 키로 막음)
+                self._remember(key, now)
+        return duplicates
+
+    def done(self, message: Any, succeeded: bool) -> None:
+        """
+        중복이 아닌 메시지의 처리 결과 기록
+
+        성공하면 블룸 필터에 기록할 키로 보관하고, 실패하면 다시 전달된 메시지를
+        처리할 수 있도록 로컬 캐시와 Redis에서 키를 지운다. 실패한 메시지는 곧바로
+        재전달될 수 있으므로 SET 방식의 키는 여기서 바로 지운다.
+
+        Args:
+            message: 디코딩된 메시지
+            succeeded: 핸들러 성공 여부
+        """
+        key = self.key(message)
+        if key is None:
+            return
+        if succeeded:
+            if self._bloom is not None:
+                with self._lock:
+                    self._added.append(key)
+            return
+
+        with self._lock:
+            expires = self._cache.pop(key, None)
+            if expires is not None:
+                self._cache_bytes -= sys.getsizeof(key) + CACHE_ENTRY_OVERHEAD
+        if self._bloom is None:
+            try:
+                self.redis_client.delete(f"{self.prefix}:dedup:{key}")
+            except Exception as e:
+                self.logger.error(
+                    "중복 판별 키 삭제 실패 [%s]: %s", self.prefix, e
+                )
+
+    def flush(self) -> None:
+        """보관한 블룸 필터 기록 전송 (종료 시)"""
+        with self._lock:
+            added, self._added = self._added, []
+        if added:
+            self._check_shared([], added)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        중복 제거 지표 반환
+
+        Returns:
+            지표 이름별 값 딕셔너리
+                - dedup_local_hits, dedup_shared_hits: 로컬 캐시/Redis에서 찾은 중복 수
+                - dedup_misses: Redis까지 확인했지만 처음 본 키 수
+                - dedup_hit_rate: 확인한 키 중 중복 비율
+                - dedup_cache_size, dedup_cache_bytes: 로컬 캐시의 키 수와 메모리 추정치
+                - dedup_bloom_bytes: 블룸 필터 비트맵의 Redis 메모리 (두 세대 합계)
+        """
+        with self._lock:
+            hits = self.local_hits + self.shared_hits
+            checked = hits + self.misses
+            values = {
+                "dedup_local_hits": self.local_hits,
+                "dedup_shared_hits": self.shared_hits,
+                "dedup_misses": self.misses,
+                "dedup_hit_rate": hits / checked if checked else 0.0,
+                "dedup_cache_size": len(self._cache),
+                "dedup_cache_bytes": self._cache_bytes,
+            }
+        if self.bloom_bits is not None:
+            values["dedup_bloom_bytes"] = 2 * ((self.bloom_bits + 7) // 8)
+        return values
+
+    def _remember(self, key: str, now: float) -> None:
+        """
+        키를 로컬 캐시의 가장 최근 위치에 기록하고 넘치는 만큼 오래된 키 제거 - _lock 안에서 호출
+
+        Args:
+            key: 기록할 키
+            now: 기준 시각 (time.monotonic)
+        """
+        if not self.cache_size:
+            return
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._cache_bytes += sys.getsizeof(key) + CACHE_ENTRY_OVERHEAD
+        self._cache[key] = now + self.ttl
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._cache_bytes -= sys.getsizeof(evicted) + CACHE_ENTRY_OVERHEAD
+
+    def _check_shared(self, keys: List[str], added: List[str]) -> List[bool]:
+        """
+        Redis에서 키를 확인 - SET 방식은 SET NX EX 파이프라인, 블룸 필터는 스크립트 한 번
+
+        Args:
+            keys: 확인할 키 목록 (SET 방식은 처음 본 키를 함께 기록)
+            added: 블룸 필터에 기록할 처리 성공 키 목록
+
+        Returns:
+            키별 이미 본 키인지 여부 목록
+        """
+        if self._bloom is None or self.bloom_bits is None:
+            pipe = self.redis_client.pipeline(transaction=False)
+            ttl = max(1, int(self.ttl))
+            for key in keys:
+                pipe.set(f"{self.prefix}:dedup:{key}", 1, nx=True, ex=ttl)
+            return [not created for created in pipe.execute()]
+
+        generation = int(time.time() // self.ttl)
+        args = [int(self.ttl * 2) + 1, len(added)]
+        for key in added + keys:
+            args.extend(self._offsets(key, self.bloom_bits))
+        seen = self._bloom(
+            keys=[
+                f"{{{self.prefix}}}:dedup:bloom:{generation}",
+                f"{{{self.prefix}}}:dedup:bloom:{generation - 1}",
+            ],
+            args=args,
+        )
+        return [bool(hit) for hit in seen]
+
+    def _offsets(self, key: str, bits: int) -> List[int]:
+        """
+        블룸 필터에서 키가 차지하는 비트 위치 (이중 해싱)
+
+        Args:
+            key: 중복 판별 키
+            bits: 블룸 필터 비트맵 크기
+
+        Returns:
+            BLOOM_HASHES개의 비트 위치
+        """
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % bits for i in range(BLOOM_HASHES)]
@@ -0,0 +1,111 @@
+"""
+핸들러 출력을 다음 단계 큐로 전달
+
+emit_to를 지정한 큐의 핸들러가 반환한 값(제너레이터이면 생성한 값 각각)을 인코딩해
+모아 두었다가, 대상 큐마다 다중 값 RPUSH 하나로 전송한다. 신뢰성 큐와 스트림은
+출력을 확인 결과와 함께 보관했다가 확인(LREM/XACK)과 같은 MULTI에서 전송하므로,
+입력을 확인했는데 출력이 유실되거나 출력만 보내고 입력이 다시 처리되는 일이 없다.
+
+Author: Minseok kim
+"""
+
+import inspect
+import threading
+from typing import Any, List
+
+from .codecs import Codec
+from .transport import Transport
+
+
+class Forwarder:
+    """
+    큐 하나의 핸들러 출력 전달
+
+    일반 큐는 add()로 모은 출력을 flush()로 전송한다. 여러 워커가 동시에 flush()를
+    호출하면 한 스레드만 전송하고, 그동안 쌓인 출력은 전송이 끝난 뒤 이어서 한 번에
+    보낸다. 신뢰성 큐/스트림은 출력을 직접 보관하고 write()로 파이프라인에 추가한다.
+    """
+
+    def __init__(
+        self, transport: Transport, targets: List[str], codec: Codec
+    ) -> None:
+        """
+        Forwarder 초기화
+
+        Args:
+            transport: 일반 큐의 출력을 보낼 전송 계층
+            targets: 출력을 보낼 큐 이름 목록 (출력마다 모든 큐로 보냄)
+            codec: 출력을 메시지로 변환할 코덱
+        """
+        self.transport = transport
+        self.targets = targets
+        self.codec = codec
+        self._outputs: List[bytes] = []
+        self._lock = threading.Lock()
+        self._sending = threading.Lock()
+
+    def encode(self, result: Any) -> List[bytes]:
+        """
+        핸들러 반환값을 전달할 메시지 목록으로 변환
+
+        제너레이터는 여기서 끝까지 실행되므로 핸들러 호출과 같은 예외 처리 안에서 호출한다.
+
+        Args:
+            result: 핸들러 반환값 (None이면 출력 없음, 제너레이터이면 생성한 값 각각)
+
+        Returns:
+            인코딩된 메시지 목록
+        """
+        if result is None:
+            return []
+        if inspect.isgenerator(result):
+            return [
+                self.codec.encode(value)
+                for value in result
+                if value is not None
+            ]
+        return [self.codec.encode(result)]
+
+    def add(self, outputs: List[bytes]) -> None:
+        """
+        처리에 성공한 메시지의 출력을 다음 flush()까지 보관
+
+        Args:
+            outputs: 인코딩된 메시지 목록
+        """
+        with self._lock:
+            self._outputs.extend(outputs)
+
+    def write(self, pipe: Any, outputs: List[bytes]) -> None:
+        """
+        출력을 대상 큐마다 다중 값 RPUSH 하나로 파이프라인에 추가
+
+        Args:
+            pipe: 명령을 추가할 Redis 파이프라인
+            outputs: 인코딩된 메시지 목록
+        """
+        for target in self.targets:
+            pipe.rpush(target, *outputs)
+
+    def flush(self) -> None:
+        """보관한 출력을 한 번에 전송 (다른 스레드가 전송 중이면 그 스레드에 맡김)"""
+        while self._outputs:
+            if not self._sending.acquire(blocking=False):
+                # 전송 중인 스레드가 끝난 뒤 남은 출력을 다시 확인함
+                return
+            try:
+                with self._lock:
+                    outputs, self._outputs = self._outputs, []
+                if not outputs:
+                    continue
+                try:
+                    self.transport.push_many(
+                        [(target, outputs) for target in self.targets]
+                    )
+                except Exception:
+                    # 다음 flush()에서 다시 보내도록 앞쪽에 되돌림
+                    with self._lock:
+                        self._outputs[:0] = outputs
+                    raise
+            finally:
+                self._sending.release()
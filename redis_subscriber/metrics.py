@@ -0,0 +1,484 @@
+"""
+큐별 처리 지표 수집과 Prometheus 텍스트 노출
+
+Author: Minseok kim
+"""
+
+import bisect
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 지연 시간 히스토그램 버킷 상한 (초)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# 현재 상태를 나타내는 지표 - 종료된 워커의 누적 통계에는 합산하지 않음
+GAUGES = frozenset(
+    (
+        "in_flight",
+        "workers",
+        "prefetched",
+        "prefetch_target",
+        "queue_depth",
+        "dedup_hit_rate",
+        "dedup_cache_size",
+        "dedup_cache_bytes",
+        "dedup_bloom_bytes",
+    )
+)
+
+
+class Histogram:
+    """고정 버킷 히스토그램 - 잠금은 소유한 QueueMetrics가 담당"""
+
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self) -> None:
+        """Histogram 초기화 - 마지막 버킷은 상한 없음(+Inf)"""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        값 기록
+
+        Args:
+            value: 기록할 값 (초)
+        """
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        합산 가능한 형태의 스냅샷 반환
+
+        Returns:
+            {'count', 'sum', 'buckets'} 딕셔너리 (buckets는 누적되지 않은 버킷별 건수)
+        """
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": list(self.counts),
+        }
+
+
+class QueueMetrics:
+    """큐 하나의 처리 지표"""
+
+    def __init__(self) -> None:
+        """QueueMetrics 초기화"""
+        self._lock = threading.Lock()
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.fetches = 0
+        self.empty_polls = 0
+        self.in_flight = 0
+        self.slow_handlers = 0
+        self.unrouted = 0
+        self.handler_latency = Histogram()
+        self.fetch_latency = Histogram()
+        self.wait_latency = Histogram()
+
+    def record_fetch(self, count: int, elapsed: float) -> None:
+        """
+        메시지 수신 기록
+
+        Args:
+            count: 수신한 메시지 수 (0이면 빈 폴링)
+            elapsed: 수신에 걸린 시간 (블로킹 대기 포함, 초)
+        """
+        with self._lock:
+            self.fetches += 1
+            if count:
+                self.received += count
+                self.fetch_latency.observe(elapsed)
+            else:
+                self.empty_polls += 1
+
+    def handle_started(self, wait: Optional[float] = None) -> None:
+        """
+        핸들러 실행 시작 기록
+
+        Args:
+            wait: 메시지를 수신해 전달하기 시작한 뒤 핸들러가 시작될 때까지 기다린 시간
+                (초, 선택사항)
+        """
+        with self._lock:
+            self.in_flight += 1
+            if wait is not None:
+                self.wait_latency.observe(wait)
+
+    def handle_finished(self, elapsed: float, succeeded: bool) -> None:
+        """
+        핸들러 실행 종료 기록
+
+        Args:
+            elapsed: 핸들러 실행 시간 (초)
+            succeeded: 핸들러 성공 여부
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if succeeded:
+                self.processed += 1
+            else:
+                self.failed += 1
+            self.handler_latency.observe(elapsed)
+
+    def handle_batch_finished(
+        self, elapsed: float, processed: int, failed: int
+    ) -> None:
+        """
+        배치 핸들러 실행 종료 기록 - 핸들러 지연은 배치 한 번으로 기록
+
+        Args:
+            elapsed: 핸들러 실행 시간 (초)
+            processed: 성공한 메시지 수
+            failed: 실패한 메시지 수 (재시도, 데드레터 포함)
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self.processed += processed
+            self.failed += failed
+            self.handler_latency.observe(elapsed)
+
+    def record_retries(self, retried: int, dead_lettered: int) -> None:
+        """
+        실패한 메시지의 후속 처리 기록
+
+        Args:
+            retried: 다시 처리하도록 되돌리거나 재시도를 예약한 메시지 수
+            dead_lettered: 데드레터 큐로 보낸 메시지 수
+        """
+        with self._lock:
+            self.retried += retried
+            self.dead_lettered += dead_lettered
+
+    def record_slow(self) -> None:
+        """slow_handler_threshold를 넘긴 핸들러 호출 기록"""
+        with self._lock:
+            self.slow_handlers += 1
+
+    def record_unrouted(self) -> None:
+        """라우트에 맞는 핸들러가 없는 메시지 기록"""
+        with self._lock:
+            self.unrouted += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        합산 가능한 형태의 스냅샷 반환
+
+        Returns:
+            지표 이름별 값 딕셔너리
+        """
+        with self._lock:
+            return {
+                "received": self.received,
+                "processed": self.processed,
+                "failed": self.failed,
+                "retried": self.retried,
+                "dead_lettered": self.dead_lettered,
+                "fetches": self.fetches,
+                "empty_polls": self.empty_polls,
+                "in_flight": self.in_flight,
+                "slow_handlers": self.slow_handlers,
+                "unrouted": self.unrouted,
+                "handler_latency": self.handler_latency.snapshot(),
+                "fetch_latency": self.fetch_latency.snapshot(),
+                "wait_latency": self.wait_latency.snapshot(),
+            }
+
+
+class MetricsRegistry:
+    """큐별 QueueMetrics 저장소"""
+
+    def __init__(self) -> None:
+        """MetricsRegistry 초기화"""
+        self._queues: Dict[str, QueueMetrics] = {}
+        self._lock = threading.Lock()
+
+    def queue(self, queue_name: str) -> QueueMetrics:
+        """
+        큐의 지표 객체 반환 (없으면 생성)
+
+        Args:
+            queue_name: 큐 이름
+
+        Returns:
+            QueueMetrics 객체
+        """
+        metrics = self._queues.get(queue_name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._queues.setdefault(queue_name, QueueMetrics())
+        return metrics
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        모든 큐의 합산 가능한 스냅샷 반환
+
+        Returns:
+            큐 이름별 지표 딕셔너리
+        """
+        with self._lock:
+            queues = list(self._queues.items())
+        return {
+            queue_name: metrics.snapshot() for queue_name, metrics in queues
+        }
+
+
+def merge_stats(
+    target: Dict[str, Dict[str, Any]],
+    source: Dict[str, Dict[str, Any]],
+    counters_only: bool = False,
+) -> None:
+    """
+    큐별 지표 스냅샷을 target에 합산
+
+    숫자는 더하고, 히스토그램 버킷 목록은 같은 위치끼리 더한다.
+
+    Args:
+        target: 합산 결과를 담을 지표 딕셔너리
+        source: 더할 지표 딕셔너리
+        counters_only: True이면 GAUGES의 지표는 더하지 않음 (종료된 워커의 마지막
+            스냅샷처럼 더 이상 현재 상태가 아닌 스냅샷을 누적할 때 사용)
+    """
+    for key, value in source.items():
+        if isinstance(value, dict):
+            merge_stats(target.setdefault(key, {}), value, counters_only)
+        elif counters_only and key in GAUGES:
+            continue
+        elif isinstance(value, list):
+            merged = target.get(key)
+            target[key] = (
+                list(value)
+                if merged is None
+                else [a + b for a, b in zip(merged, value)]
+            )
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def quantile(histogram: Dict[str, Any], q: float) -> float:
+    """
+    히스토그램 스냅샷에서 분위수 근사값 계산
+
+    Args:
+        histogram: Histogram.snapshot() 결과
+        q: 분위수 (0.0 ~ 1.0)
+
+    Returns:
+        해당 분위수가 속한 버킷의 상한 (초, 기록이 없으면 0.0)
+    """
+    if not histogram["count"]:
+        return 0.0
+
+    rank = q * histogram["count"]
+    cumulative = 0
+    for index, count in enumerate(histogram["buckets"]):
+        cumulative += count
+        if cumulative >= rank:
+            return (
+                LATENCY_BUCKETS[index]
+                if index < len(LATENCY_BUCKETS)
+                else float("inf")
+            )
+    return float("inf")
+
+
+def summarize(
+    snapshot: Dict[str, Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    합산된 스냅샷의 히스토그램에 평균과 p50/p99 근사값 추가
+
+    Args:
+        snapshot: 큐 이름별 지표 딕셔너리 (직접 수정됨)
+
+    Returns:
+        같은 딕셔너리
+    """
+    for counters in snapshot.values():
+        for name in ("handler_latency", "fetch_latency", "wait_latency"):
+            histogram = counters.get(name)
+            if not histogram:
+                continue
+            histogram["mean"] = (
+                histogram["sum"] / histogram["count"]
+                if histogram["count"]
+                else 0.0
+            )
+            histogram["p50"] = quantile(histogram, 0.50)
+            histogram["p99"] = quantile(histogram, 0.99)
+    return snapshot
+
+
+def render_prometheus(snapshot: Dict[str, Dict[str, Any]]) -> str:
+    """
+    지표 스냅샷을 Prometheus 텍스트 형식으로 변환
+
+    Args:
+        snapshot: 큐 이름별 지표 딕셔너리
+
+    Returns:
+        Prometheus 텍스트 노출 형식 문자열
+    """
+    lines: List[str] = []
+    counters = (
+        ("received", "redis_subscriber_messages_received_total", "counter"),
+        ("processed", "redis_subscriber_messages_processed_total", "counter"),
+        ("failed", "redis_subscriber_messages_failed_total", "counter"),
+        ("retried", "redis_subscriber_messages_retried_total", "counter"),
+        (
+            "dead_lettered",
+            "redis_subscriber_messages_dead_lettered_total",
+            "counter",
+        ),
+        ("fetches", "redis_subscriber_fetches_total", "counter"),
+        ("empty_polls", "redis_subscriber_empty_polls_total", "counter"),
+        ("in_flight", "redis_subscriber_in_flight", "gauge"),
+        ("slow_handlers", "redis_subscriber_slow_handlers_total", "counter"),
+        ("unrouted", "redis_subscriber_messages_unrouted_total", "counter"),
+        ("queue_depth", "redis_subscriber_queue_depth", "gauge"),
+        ("prefetched", "redis_subscriber_prefetched", "gauge"),
+        ("workers", "redis_subscriber_workers", "gauge"),
+        (
+            "dedup_local_hits",
+            "redis_subscriber_dedup_local_hits_total",
+            "counter",
+        ),
+        (
+            "dedup_shared_hits",
+            "redis_subscriber_dedup_shared_hits_total",
+            "counter",
+        ),
+        ("dedup_misses", "redis_subscriber_dedup_misses_total", "counter"),
+        ("dedup_cache_size", "redis_subscriber_dedup_cache_size", "gauge"),
+        ("dedup_cache_bytes", "redis_subscriber_dedup_cache_bytes", "gauge"),
+    )
+    for key, metric, kind in counters:
+        lines.append(f"# TYPE {metric} {kind}")
+        for queue_name, values in snapshot.items():
+            if key in values:
+                lines.append(
+                    f'{metric}{{queue="{_escape(queue_name)}"}} {values[key]}'
+                )
+
+    histograms = (
+        ("handler_latency", "redis_subscriber_handler_latency_seconds"),
+        ("fetch_latency", "redis_subscriber_fetch_latency_seconds"),
+        ("wait_latency", "redis_subscriber_wait_latency_seconds"),
+    )
+    for key, metric in histograms:
+        lines.append(f"# TYPE {metric} histogram")
+        for queue_name, values in snapshot.items():
+            histogram = values.get(key)
+            if not histogram:
+                continue
+            label = _escape(queue_name)
+            cumulative = 0
+            for bound, count in zip(
+                LATENCY_BUCKETS + (float("inf"),), histogram["buckets"]
+            ):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f'{metric}_bucket{{queue="{label}",le="{le}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(f'{metric}_sum{{queue="{label}"}} {histogram["sum"]}')
+            lines.append(
+                f'{metric}_count{{queue="{label}"}} {histogram["count"]}'
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """
+    Prometheus 레이블 값 이스케이프
+
+    Args:
+        value: 레이블 값
+
+    Returns:
+        이스케이프된 문자열
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """Prometheus 텍스트 지표를 노출하는 HTTP 서버"""
+
+    def __init__(
+        self,
+        collect: Callable[[], Dict[str, Dict[str, Any]]],
+        host: str = "0.0.0.0",
+        port: int = 9100,
+    ) -> None:
+        """
+        MetricsServer 초기화 - 백그라운드 스레드에서 즉시 서비스 시작
+
+        Args:
+            collect: 지표 스냅샷을 반환하는 함수
+            host: 바인딩할 주소
+            port: 바인딩할 포트 (0이면 임의 포트)
+        """
+        self.logger = logging.getLogger(__name__)
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler) -> None:
+                if handler.path.split("?")[0] not in ("/", "/metrics"):
+                    handler.send_error(404)
+                    return
+                body = render_prometheus(collect()).encode("utf-8")
+                handler.send_response(200)
+                handler.send_header(
+                    "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+                )
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format: str, *args: Any) -> None:
+                # 요청마다 stderr에 출력하지 않음
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="MetricsServer",
+            daemon=True,
+        )
+        self._thread.start()
+        self.logger.info(
+            f"지표 HTTP 서버 시작됨: http://{host}:{self.port}/metrics"
+        )
+
+    def close(self) -> None:
+        """HTTP 서버 종료"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=1.0)
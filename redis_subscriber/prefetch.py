@@ -0,0 +1,193 @@
+"""
+큐별 적응형 프리페치 버퍼
+
+리스너 스레드가 로컬 버퍼를 미리 채워 두고, 디스패처 스레드가 버퍼에서 꺼내
+핸들러로 전달한다. 네트워크 왕복과 핸들러 실행이 겹치도록 하면서, 버퍼의 목표
+깊이는 측정한 수신 왕복 시간과 핸들러 처리 시간에 맞춰 조정한다.
+
+Author: Minseok kim
+"""
+
+import math
+import threading
+import time
+import logging
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+# 측정값 지수 이동 평균의 가중치
+EWMA_ALPHA = 0.2
+
+
+class PrefetchBuffer:
+    """
+    큐 하나의 프리페치 버퍼와 디스패처 스레드
+
+    목표 깊이는 "수신 왕복 한 번 동안 핸들러가 처리하는 메시지 수"의 두 배로,
+    버퍼가 목표의 절반 이하로 줄면 리스너가 빈 자리만큼 다시 가져온다.
+    처음에는 측정값이 없으므로 max_depth에서 시작한다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_depth: int,
+        dispatch: Callable[[List[Any]], Any],
+        batch_size: int = 1,
+    ) -> None:
+        """
+        PrefetchBuffer 초기화
+
+        Args:
+            name: 스레드 이름에 사용할 버퍼 이름 (보통 큐 이름)
+            max_depth: 버퍼에 담아 둘 최대 메시지 수
+            dispatch: 디스패처 스레드가 꺼낸 메시지 목록을 전달할 함수
+            batch_size: 디스패처가 한 번에 꺼내 전달할 최대 메시지 수
+        """
+        self.name = name
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self._dispatch = dispatch
+        self._buffer: deque = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._target = max_depth
+        self._fetch_rtt: Optional[float] = None
+        self._handle_time: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def target(self) -> int:
+        """현재 목표 깊이"""
+        return self._target
+
+    def start(self) -> None:
+        """디스패처 스레드 시작"""
+        self._thread = threading.Thread(
+            target=self._dispatcher,
+            name=f"PrefetchDispatcher-{self.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def reserve(self) -> int:
+        """
+        버퍼를 다시 채울 때까지 대기
+
+        Returns:
+            가져올 메시지 수 (버퍼가 닫혔으면 0)
+        """
+        with self._condition:
+            while not self._closed and len(self._buffer) > self._target // 2:
+                self._condition.wait()
+            if self._closed:
+                return 0
+            return max(1, self._target - len(self._buffer))
+
+    def put(self, messages: List[Any]) -> None:
+        """
+        수신한 메시지를 버퍼에 추가 (닫힌 뒤에도 추가하여 종료 시 반환 대상에 포함)
+
+        Args:
+            messages: 수신한 메시지 목록
+        """
+        with self._condition:
+            self._buffer.extend(messages)
+            self._condition.notify_all()
+
+    def observe_fetch(self, elapsed: float) -> None:
+        """
+        수신 왕복 시간 기록
+
+        Args:
+            elapsed: 대기 없이 응답한 수신 호출의 소요 시간 (초)
+        """
+        self._fetch_rtt = self._ewma(self._fetch_rtt, elapsed)
+        self._adjust()
+
+    def close(self) -> None:
+        """새 메시지 전달과 수신 요청 중단 - 디스패처는 실행 중인 배치만 마치고 종료"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        디스패처 스레드 종료 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            기한 안에 종료되었는지 여부
+        """
+        if self._thread is None:
+            return True
+        self._thread.join(timeout=timeout)
+        return not self._thread.is_alive()
+
+    def drain(self) -> List[Any]:
+        """
+        아직 전달하지 않은 메시지를 모두 꺼냄
+
+        Returns:
+            수신 순서대로 정렬된 메시지 목록
+        """
+        with self._condition:
+            remaining = list(self._buffer)
+            self._buffer.clear()
+            return remaining
+
+    def _dispatcher(self) -> None:
+        """디스패처 스레드 메서드 - 버퍼에서 batch_size개씩 꺼내 전달하고 처리 시간 측정"""
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    break
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.batch_size, len(self._buffer)))
+                ]
+                # 빈 자리가 생겼으므로 리스너에 알림
+                self._condition.notify_all()
+
+            started = time.perf_counter()
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                self.logger.error(f"프리페치 디스패처 에러 [{self.name}]: {e}")
+            self._handle_time = self._ewma(
+                self._handle_time, (time.perf_counter() - started) / len(batch)
+            )
+            self._adjust()
+
+        self.logger.debug(f"프리페치 디스패처 스레드 종료됨: {self.name}")
+
+    def _adjust(self) -> None:
+        """수신 왕복 시간과 메시지당 처리 시간으로 목표 깊이 재계산"""
+        if self._fetch_rtt is None or not self._handle_time:
+            return
+        target = math.ceil(2 * self._fetch_rtt / self._handle_time)
+        self._target = max(1, min(self.max_depth, target))
+
+    @staticmethod
+    def _ewma(current: Optional[float], sample: float) -> float:
+        """
+        지수 이동 평균 갱신
+
+        Args:
+            current: 현재 평균 (없으면 None)
+            sample: 새 측정값
+
+        Returns:
+            갱신된 평균
+        """
+        if current is None:
+            return sample
+        return current + EWMA_ALPHA * (sample - current)
@@ -0,0 +1,458 @@
+"""
+느린 핸들러 감시와 요청 시 프로파일링
+
+HandlerMonitor는 실행 중인 핸들러 호출을 스레드별로 기록한다. 감시 스레드는 기준 시간보다
+오래 실행 중인 호출을 찾아 sys._current_frames()로 해당 워커 스레드의 스택을 잡아 보고하고,
+ProfileSession은 정해진 시간 동안 핸들러별 프로파일을 모아 집계한다.
+
+- sample 모드(기본값): 샘플링 스레드가 주기적으로 실행 중인 핸들러의 스택을 읽는다.
+  핸들러 스레드에는 비용이 없고 여러 워커 스레드를 동시에 측정할 수 있다.
+- cprofile 모드: 핸들러 호출마다 cProfile을 켜서 함수별 호출 수와 시간을 정확히 잰다.
+  Python 3.12부터는 한 번에 한 스레드에서만 켤 수 있어 동시에 실행된 호출은 측정하지 않는다.
+
+감시와 프로파일링을 모두 사용하지 않으면 RedisSubscriber는 모니터를 만들지 않으므로
+핸들러 호출마다 None 확인 외의 비용이 없다.
+
+Author: Minseok kim
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# 보고에 포함할 메시지 미리보기의 최대 길이
+PAYLOAD_PREVIEW = 200
+
+# 샘플링 프로파일러의 스택 샘플링 간격 (초)
+SAMPLE_INTERVAL = 0.005
+
+# 프로파일 보고서에 포함할 함수 수
+PROFILE_TOP = 25
+
+# 프로파일 종료 시 cProfile을 켠 채 실행 중인 핸들러를 기다릴 최대 시간 (초)
+PROFILE_DRAIN_TIMEOUT = 5.0
+
+PROFILE_MODES = ("sample", "cprofile")
+
+
+class SlowCall(NamedTuple):
+    """기준 시간을 넘겨 실행 중인 핸들러 호출"""
+
+    queue_name: str
+    payload: str
+    elapsed: float
+    thread_name: str
+    stack: str
+
+
+def preview(payload: Any, limit: int = PAYLOAD_PREVIEW) -> str:
+    """
+    보고용 메시지 미리보기
+
+    Args:
+        payload: 메시지 (배치 핸들러는 메시지 목록)
+        limit: 최대 길이
+
+    Returns:
+        repr 문자열 (limit보다 길면 잘라서 "..." 추가)
+    """
+    text = repr(payload)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+class HandlerMonitor:
+    """
+    실행 중인 핸들러 호출 추적
+
+    핸들러를 실행하는 스레드가 enter()/exit()로 호출을 알리면, threshold를 지정한 경우
+    감시 스레드가 오래 걸리는 호출을 한 번씩 report로 보고한다. 프로파일 세션이 진행
+    중이면 enter()/exit()에서 세션에 호출을 넘긴다.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        report: Optional[Callable[[SlowCall], Any]] = None,
+    ) -> None:
+        """
+        HandlerMonitor 초기화
+
+        Args:
+            threshold: 느린 핸들러로 보고할 실행 시간 (초, None이면 감시하지 않음)
+            report: 느린 호출을 받을 함수 (감시 스레드에서 호출)
+        """
+        if threshold is not None and threshold <= 0:
+            raise ValueError(
+                f"slow_handler_threshold는 0보다 커야 합니다: {threshold}"
+            )
+        self.threshold = threshold
+        self.report = report
+        self.session: Optional["ProfileSession"] = None
+        # 스레드 ID -> [큐 이름, 메시지, 시작 시각, 보고 여부, 호출한 프레임, (세션, cProfile 객체)]
+        self._calls: Dict[int, List[Any]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+
+    def enter(self, queue_name: str, payload: Any) -> None:
+        """
+        현재 스레드에서 핸들러 호출 시작
+
+        Args:
+            queue_name: 큐 이름
+            payload: 핸들러에 넘기는 메시지 (배치 핸들러는 메시지 목록)
+        """
+        session = self.session
+        profile = None if session is None else session.enable(queue_name)
+        # 딕셔너리 항목 하나의 대입/제거는 GIL 아래에서 원자적이므로 잠금이 필요 없음
+        self._calls[threading.get_ident()] = [
+            queue_name,
+            payload,
+            time.perf_counter(),
+            False,
+            sys._getframe(1),
+            None if profile is None else (session, profile),
+        ]
+
+    def exit(self) -> None:
+        """현재 스레드의 핸들러 호출 종료"""
+        entry = self._calls.pop(threading.get_ident(), None)
+        if entry is not None and entry[5] is not None:
+            # 호출 중에 세션이 끝났을 수 있으므로 켤 때의 세션에 돌려줌
+            session, profile = entry[5]
+            session.disable(profile)
+
+    def active(self) -> bool:
+        """
+        모니터가 아직 필요한지 여부
+
+        Returns:
+            느린 핸들러를 감시하거나 프로파일 세션이 진행 중이면 True
+        """
+        return self.threshold is not None or self.session is not None
+
+    def start(self) -> None:
+        """threshold를 지정했으면 감시 스레드 시작"""
+        if (
+            self.threshold is None
+            or self.report is None
+            or self._thread is not None
+        ):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch,
+            args=(self.threshold, self.report),
+            name="HandlerWatchdog",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """감시 스레드 종료"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def check(self) -> List[SlowCall]:
+        """
+        threshold를 넘긴 호출을 찾아 스택과 함께 반환 (호출마다 한 번만)
+
+        Returns:
+            새로 찾은 느린 호출 목록
+        """
+        now = time.perf_counter()
+        frames = None
+        threads: Dict[Optional[int], str] = {}
+        slow = []
+        for ident, entry in list(self._calls.items()):
+            elapsed = now - entry[2]
+            if entry[3] or elapsed < self.threshold:
+                continue
+            entry[3] = True
+            if frames is None:
+                frames = sys._current_frames()
+                threads = {
+                    thread.ident: thread.name
+                    for thread in threading.enumerate()
+                }
+            frame = frames.get(ident)
+            stack = (
+                "".join(traceback.format_stack(frame))
+                if frame is not None
+                else ""
+            )
+            slow.append(
+                SlowCall(
+                    entry[0],
+                    preview(entry[1]),
+                    elapsed,
+                    threads.get(ident, str(ident)),
+                    stack,
+                )
+            )
+        return slow
+
+    def sample(self) -> List[Tuple[str, List[str]]]:
+        """
+        실행 중인 핸들러의 현재 스택 (핸들러를 호출한 프레임 위쪽만)
+
+        Returns:
+            (큐 이름, 가장 안쪽부터의 함수 위치 목록) 목록
+        """
+        calls = list(self._calls.items())
+        if not calls:
+            return []
+        frames = sys._current_frames()
+        samples = []
+        for ident, entry in calls:
+            frame = frames.get(ident)
+            stack = []
+            while frame is not None and frame is not entry[4]:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+                )
+                frame = frame.f_back
+            if stack:
+                samples.append((entry[0], stack))
+        return samples
+
+    def _watch(
+        self, threshold: float, report: Callable[[SlowCall], Any]
+    ) -> None:
+        """
+        감시 스레드 메서드 - threshold의 절반 간격으로 확인
+
+        Args:
+            threshold: 느린 호출로 보고할 실행 시간 (초)
+            report: 느린 호출을 넘길 함수
+        """
+        interval = min(threshold / 2, 1.0)
+        while not self._stop.wait(interval):
+            try:
+                for call in self.check():
+                    report(call)
+            except Exception as e:
+                self.logger.error(f"느린 핸들러 감시 에러: {e}")
+
+
+class ProfileSession:
+    """
+    정해진 시간 동안의 핸들러 프로파일
+
+    run()이 seconds 동안 프로파일을 모은 뒤 큐별 보고서를 만들고 on_finish를 호출한다.
+    wait()로 끝날 때까지 기다려 보고서를 받을 수 있다.
+    """
+
+    def __init__(
+        self,
+        monitor: HandlerMonitor,
+        seconds: float,
+        mode: str = "sample",
+        on_finish: Optional[Callable[["ProfileSession"], Any]] = None,
+    ) -> None:
+        """
+        ProfileSession 초기화
+
+        Args:
+            monitor: 실행 중인 핸들러 호출을 추적하는 모니터
+            seconds: 프로파일 시간 (초)
+            mode: "sample"(스택 샘플링) 또는 "cprofile"(호출마다 cProfile)
+            on_finish: 보고서를 만든 뒤 호출할 함수
+        """
+        if seconds <= 0:
+            raise ValueError(f"seconds는 0보다 커야 합니다: {seconds}")
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"지원하지 않는 프로파일 모드입니다: {mode} (지원: {', '.join(PROFILE_MODES)})"
+            )
+        self.monitor = monitor
+        self.seconds = seconds
+        self.mode = mode
+        self.on_finish = on_finish
+        self.reports: Dict[str, str] = {}
+        self.finished = threading.Event()
+        self._cancel = threading.Event()
+        self._collecting = True
+        self._lock = threading.Condition()
+        self._profiles: Dict[Tuple[str, int], cProfile.Profile] = {}
+        self._running: Dict[cProfile.Profile, str] = {}
+        self._samples: Dict[str, int] = Counter()
+        self._leaf: Dict[str, Counter] = {}
+        self._total: Dict[str, Counter] = {}
+        self.skipped = 0
+
+    def enable(self, queue_name: str) -> Optional[cProfile.Profile]:
+        """
+        cprofile 모드에서 현재 스레드의 큐별 프로파일을 켬
+
+        Args:
+            queue_name: 큐 이름
+
+        Returns:
+            켠 cProfile 객체 (sample 모드이거나 켤 수 없으면 None)
+        """
+        if self.mode != "cprofile" or not self._collecting:
+            return None
+        key = (queue_name, threading.get_ident())
+        with self._lock:
+            if not self._collecting:
+                return None
+            profile = self._profiles.get(key)
+            if profile is None:
+                profile = self._profiles[key] = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # 다른 스레드가 이미 켠 경우 (Python 3.12+)
+                self.skipped += 1
+                return None
+            self._running[profile] = queue_name
+        return profile
+
+    def disable(self, profile: cProfile.Profile) -> None:
+        """
+        enable()로 켠 프로파일을 끔
+
+        Args:
+            profile: enable()이 반환한 cProfile 객체
+        """
+        profile.disable()
+        with self._lock:
+            self._running.pop(profile, None)
+            self._lock.notify_all()
+
+    def run(self) -> None:
+        """seconds 동안 프로파일을 모은 뒤 보고서 생성 (별도 스레드에서 실행)"""
+        deadline = time.monotonic() + self.seconds
+        try:
+            if self.mode == "sample":
+                while time.monotonic() < deadline and not self._cancel.wait(
+                    SAMPLE_INTERVAL
+                ):
+                    self._record(self.monitor.sample())
+            else:
+                self._cancel.wait(self.seconds)
+            with self._lock:
+                self._collecting = False
+                # 켜 둔 채 실행 중인 핸들러가 끝나야 측정값을 읽을 수 있음
+                self._lock.wait_for(
+                    lambda: not self._running, timeout=PROFILE_DRAIN_TIMEOUT
+                )
+                profiles = {
+                    key: profile
+                    for key, profile in self._profiles.items()
+                    if profile not in self._running
+                }
+            self.reports = (
+                self._report_samples()
+                if self.mode == "sample"
+                else self._report_profiles(profiles)
+            )
+        finally:
+            self._collecting = False
+            try:
+                if self.on_finish is not None:
+                    self.on_finish(self)
+            finally:
+                # wait()가 반환될 때는 보고서 출력까지 끝나 있음
+                self.finished.set()
+
+    def cancel(self) -> None:
+        """남은 시간을 기다리지 않고 지금까지 모은 프로파일로 보고서 생성 (종료 시)"""
+        self._cancel.set()
+
+    def wait(
+        self, timeout: Optional[float] = None
+    ) -> Optional[Dict[str, str]]:
+        """
+        프로파일이 끝날 때까지 대기
+
+        Args:
+            timeout: 최대 대기 시간 (초, 기본값은 무제한)
+
+        Returns:
+            큐 이름별 보고서, 시간 안에 끝나지 않았으면 None
+        """
+        if not self.finished.wait(timeout):
+            return None
+        return self.reports
+
+    def _record(self, samples: List[Tuple[str, List[str]]]) -> None:
+        """
+        스택 샘플 집계
+
+        Args:
+            samples: HandlerMonitor.sample() 결과
+        """
+        for queue_name, stack in samples:
+            self._samples[queue_name] += 1
+            self._leaf.setdefault(queue_name, Counter())[stack[0]] += 1
+            # 재귀 호출은 샘플 하나에서 한 번만 셈
+            self._total.setdefault(queue_name, Counter()).update(set(stack))
+
+    def _report_samples(self) -> Dict[str, str]:
+        """
+        큐별 샘플링 보고서 생성
+
+        Returns:
+            큐 이름별 보고서 (누적 비율 순 상위 PROFILE_TOP개 함수)
+        """
+        reports = {}
+        for queue_name, count in self._samples.items():
+            leaf = self._leaf[queue_name]
+            lines = [
+                f"{count} samples ({SAMPLE_INTERVAL * 1000:g}ms interval)",
+                "  total%   self%  function",
+            ]
+            for function, total in self._total[queue_name].most_common(
+                PROFILE_TOP
+            ):
+                own = leaf[function]
+                lines.append(
+                    f"  {100 * total / count:6.1f}  {100 * own / count:6.1f}"
+                    f"  {function}"
+                )
+            reports[queue_name] = "\n".join(lines)
+        return reports
+
+    def _report_profiles(
+        self, profiles: Dict[Tuple[str, int], cProfile.Profile]
+    ) -> Dict[str, str]:
+        """
+        큐별 cProfile 보고서 생성 (스레드별 프로파일을 합산)
+
+        Args:
+            profiles: (큐 이름, 스레드 ID)별 cProfile 객체
+
+        Returns:
+            큐 이름별 보고서 (누적 시간 순 상위 PROFILE_TOP개 함수)
+        """
+        by_queue: Dict[str, List[cProfile.Profile]] = {}
+        for (queue_name, _), profile in profiles.items():
+            by_queue.setdefault(queue_name, []).append(profile)
+        reports = {}
+        for queue_name, queue_profiles in by_queue.items():
+            stream = io.StringIO()
+            stats = None
+            for profile in queue_profiles:
+                try:
+                    loaded = pstats.Stats(profile, stream=stream)
+                except TypeError:
+                    # 켰지만 아직 호출을 기록하지 못한 프로파일
+                    continue
+                stats = loaded if stats is None else stats.add(loaded)
+            if stats is None:
+                continue
+            stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+            reports[queue_name] = stream.getvalue().strip()
+        return reports
@@ -0,0 +1,476 @@
+"""
+Redis Queue 발행자
+
+메시지를 큐별로 모아 두었다가 개수, 크기 또는 대기 시간 조건이 되면 하나의
+다중 값 RPUSH로 보낸다. 여러 큐의 배치는 하나의 파이프라인으로 전송한다.
+
+Author: Minseok kim
+"""
+
+import itertools
+import redis
+import threading
+import time
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from redis.cluster import RedisCluster
+
+from .codecs import Codec, get_codec
+from .sharding import shard_for, shard_name
+
+# 큐 길이 상한 안에서 들어갈 수 있는 만큼만 앞에서부터 추가하는 스크립트
+# 반환값: 추가한 메시지 수, 자리가 없으면 -(현재 길이) - 1
+BOUNDED_PUSH_SCRIPT = """
+local length = redis.call('LLEN', KEYS[1])
+local room = tonumber(ARGV[1]) - length
+if room <= 0 then
+    return -length - 1
+end
+local last = math.min(#ARGV, room + 1)
+redis.call('RPUSH', KEYS[1], unpack(ARGV, 2, last))
+return last - 1
+"""
+
+# 큐가 가득 찼을 때 다시 시도하기 전 대기 시간 (초)
+FULL_RETRY_INTERVAL = 0.01
+
+
+class QueueFullError(Exception):
+    """max_queue_length를 넘어 메시지를 추가할 수 없음"""
+
+    def __init__(self, queue_name: str, length: int, limit: int) -> None:
+        """
+        QueueFullError 초기화
+
+        Args:
+            queue_name: 가득 찬 큐 이름
+            length: 마지막으로 확인한 큐 길이
+            limit: 큐 길이 상한
+        """
+        super().__init__(
+            f"큐가 가득 찼습니다 [{queue_name}]: {length}/{limit}"
+        )
+        self.queue_name = queue_name
+        self.length = length
+        self.limit = limit
+
+
+class RedisPublisher:
+    """
+    RedisSubscriber가 구독하는 큐에 메시지를 묶어서 발행하는 발행자
+
+    publish()는 메시지를 큐별 버퍼에 넣기만 하고, 다음 조건 중 하나가 되면 전송한다.
+    - 큐의 버퍼가 batch_size개 또는 batch_bytes 이상이 됨
+    - 버퍼의 첫 메시지가 linger_ms 이상 기다림 (백그라운드 스레드)
+    - flush() 또는 close() 호출
+
+    max_queue_length를 지정하면 Lua 스크립트로 LLEN 확인과 RPUSH를 원자적으로
+    수행하여 남은 자리만큼만 추가하고, 큐가 가득 차면 full_timeout 동안 다시
+    시도한 뒤 QueueFullError를 발생시킨다. 전송하지 못한 메시지는 버퍼의 앞쪽에
+    남으므로 다음 flush()에서 순서대로 다시 보낸다.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        codec: Union[str, Codec] = "utf8",
+        batch_size: int = 1000,
+        batch_bytes: int = 1024 * 1024,
+        linger_ms: float = 5.0,
+        max_queue_length: Optional[int] = None,
+        full_timeout: float = 0.0,
+        shards: Optional[Dict[str, int]] = None,
+        cluster: bool = False,
+    ) -> None:
+        """
+        RedisPublisher 초기화
+
+        Args:
+            redis_url: Redis 연결 URL (예: "redis://localhost:6379")
+            username: Redis 사용자명 (선택사항)
+            password: Redis 비밀번호 (선택사항)
+            codec: 메시지를 변환할 코덱 (기본값 "utf8", 구독자와 같은 코덱을 사용해야 함)
+                "zlib+json"처럼 지정하면 큰 메시지를 압축한다.
+            batch_size: 큐별로 한 번에 전송할 최대 메시지 수 (기본값 1000)
+            batch_bytes: 큐별 버퍼가 이 크기(bytes) 이상이면 바로 전송 (기본값 1MB)
+            linger_ms: 버퍼의 첫 메시지가 전송을 기다릴 최대 시간 (밀리초, 기본값 5)
+                0이면 백그라운드 전송 없이 크기 조건과 flush()로만 전송한다.
+            max_queue_length: 큐 길이 상한 (선택사항)
+            full_timeout: 큐가 가득 찼을 때 자리가 날 때까지 다시 시도할 최대 시간
+                (초, 기본값 0이면 바로 QueueFullError 발생)
+            shards: 샤딩된 논리 큐 이름별 샤드 수 (선택사항, 구독자의 shards와 같아야 함)
+                이 큐로 발행하면 key의 CRC32로 샤드를 고르고, key가 없으면 돌아가며 보낸다.
+            cluster: Redis Cluster에 연결 (기본값 False)
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+        if max_queue_length is not None and max_queue_length < 1:
+            raise ValueError(
+                f"max_queue_length는 1 이상이어야 합니다: {max_queue_length}"
+            )
+        for name, count in (shards or {}).items():
+            if count < 1:
+                raise ValueError(
+                    f"샤드 수는 1 이상이어야 합니다 [{name}]: {count}"
+                )
+
+        self.redis_url = redis_url
+        self.username = username
+        self.password = password
+        self.codec = get_codec(codec)
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.linger_ms = linger_ms
+        self.max_queue_length = max_queue_length
+        self.full_timeout = full_timeout
+        self.shards = dict(shards or {})
+        self.cluster = cluster
+        # key 없이 발행한 메시지를 샤드에 돌아가며 배분하기 위한 큐별 카운터
+        self._shard_counters: Dict[str, Iterator[int]] = {
+            name: itertools.count() for name in self.shards
+        }
+        self._buffers: Dict[str, List[bytes]] = {}
+        self._buffer_bytes: Dict[str, int] = {}
+        self._buffer_since: Dict[str, float] = {}
+        # 버퍼 변경용 잠금과 전송 순서 보장용 잠금을 분리하여 전송 중에도 publish() 가능
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        # 새 버퍼가 생기거나 닫힐 때 백그라운드 전송 스레드를 깨움
+        self._condition = threading.Condition(self._lock)
+        self._closed = False
+        self._linger_thread = None
+        self._redis_client = self._create_client()
+        self._bounded_push = self._redis_client.register_script(
+            BOUNDED_PUSH_SCRIPT
+        )
+
+        # 로깅 설정
+        self.logger = logging.getLogger(__name__)
+
+        if linger_ms > 0:
+            self._linger_thread = threading.Thread(
+                target=self._linger_loop, name="PublisherLinger", daemon=True
+            )
+            self._linger_thread.start()
+
+    def __enter__(self) -> "RedisPublisher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def publish(self, queue_name: str, message: Any, key: Any = None) -> None:
+        """
+        메시지를 큐의 버퍼에 추가하고, 배치 조건이 되면 전송
+
+        Args:
+            queue_name: 메시지를 추가할 큐 이름
+            message: 코덱으로 변환할 메시지
+            key: 샤딩된 큐의 파티션 키 (같은 key는 항상 같은 샤드로 감)
+        """
+        # 메시지 하나씩 호출되는 경로이므로 publish_many()의 목록 처리 없이 바로 추가
+        payload = self.codec.encode(message)
+        if queue_name in self.shards:
+            queue_name = self._shard_target(queue_name, key)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("닫힌 발행자입니다.")
+            buffer = self._buffers.get(queue_name)
+            if buffer is None:
+                buffer = self._buffers[queue_name] = []
+                self._buffer_bytes[queue_name] = 0
+                self._buffer_since[queue_name] = time.monotonic()
+                self._condition.notify()
+            buffer.append(payload)
+            size = self._buffer_bytes[queue_name] = self._buffer_bytes[
+                queue_name
+            ] + len(payload)
+            ready = len(buffer) >= self.batch_size or size >= self.batch_bytes
+
+        if ready:
+            self.flush(queue_name)
+
+    def publish_many(
+        self, queue_name: str, messages: Iterable[Any], key: Any = None
+    ) -> None:
+        """
+        여러 메시지를 한 번에 큐의 버퍼에 추가하고, 배치 조건이 되면 전송
+
+        Args:
+            queue_name: 메시지를 추가할 큐 이름
+            messages: 코덱으로 변환할 메시지 목록
+            key: 샤딩된 큐의 파티션 키 (모든 메시지가 같은 샤드로 감)
+        """
+        encode = self.codec.encode
+        payloads = [encode(message) for message in messages]
+        if not payloads:
+            return
+        if queue_name in self.shards:
+            queue_name = self._shard_target(queue_name, key)
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("닫힌 발행자입니다.")
+            buffer = self._buffers.get(queue_name)
+            if buffer is None:
+                buffer = self._buffers[queue_name] = []
+                self._buffer_bytes[queue_name] = 0
+                self._buffer_since[queue_name] = time.monotonic()
+                self._condition.notify()
+            buffer.extend(payloads)
+            self._buffer_bytes[queue_name] += sum(
+                len(payload) for payload in payloads
+            )
+            ready = (
+                len(buffer) >= self.batch_size
+                or self._buffer_bytes[queue_name] >= self.batch_bytes
+            )
+
+        if ready:
+            self.flush(queue_name)
+
+    def flush(self, queue_name: Optional[str] = None) -> None:
+        """
+        버퍼에 쌓인 메시지를 전송
+
+        Args:
+            queue_name: 전송할 큐 이름 (None이면 모든 큐)
+        """
+        self._flush([queue_name] if queue_name is not None else None)
+
+    def pending(self) -> int:
+        """
+        아직 전송하지 않은 메시지 수
+
+        Returns:
+            모든 큐 버퍼의 메시지 수 합계
+        """
+        with self._lock:
+            return sum(len(buffer) for buffer in self._buffers.values())
+
+    def _shard_target(self, queue_name: str, key: Any) -> str:
+        """
+        샤딩된 논리 큐에서 메시지를 보낼 샤드 키 선택
+
+        Args:
+            queue_name: 논리 큐 이름
+            key: 파티션 키 (None이면 샤드를 돌아가며 선택)
+
+        Returns:
+            샤드 키 이름
+        """
+        shards = self.shards[queue_name]
+        # itertools.count의 next()는 GIL 아래에서 원자적이므로 잠금 없이 사용
+        index = (
+            next(self._shard_counters[queue_name]) % shards
+            if key is None
+            else shard_for(key, shards)
+        )
+        return shard_name(queue_name, index)
+
+    def close(self) -> None:
+        """남은 메시지를 모두 전송하고 연결 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        if self._linger_thread is not None:
+            self._linger_thread.join()
+            self._linger_thread = None
+        try:
+            self.flush()
+        finally:
+            self._redis_client.close()
+
+    def _create_client(self) -> Any:
+        """
+        Redis 클라이언트 생성 (인증 정보 포함)
+
+        Returns:
+            Redis 클라이언트
+        """
+        connection_kwargs: Dict[str, Any] = {"decode_responses": False}
+
+        # 인증 정보가 제공된 경우 추가
+        if self.username:
+            connection_kwargs["username"] = self.username
+        if self.password:
+            connection_kwargs["password"] = self.password
+
+        if self.cluster:
+            return RedisCluster.from_url(self.redis_url, **connection_kwargs)
+        return redis.from_url(self.redis_url, **connection_kwargs)
+
+    def _flush(self, queue_names: Optional[List[str]] = None) -> None:
+        """
+        버퍼를 꺼내 전송 - 전송 잠금으로 같은 큐의 배치가 순서대로 전송되도록 보장
+
+        Args:
+            queue_names: 전송할 큐 이름 목록 (None이면 모든 큐)
+        """
+        with self._send_lock:
+            batches = self._take(queue_names)
+            if batches:
+                self._send(batches)
+
+    def _take(
+        self, queue_names: Optional[List[str]] = None
+    ) -> Dict[str, List[bytes]]:
+        """
+        버퍼에서 전송할 메시지를 꺼냄
+
+        Args:
+            queue_names: 꺼낼 큐 이름 목록 (None이면 모든 큐)
+
+        Returns:
+            큐 이름별 메시지 목록
+        """
+        with self._lock:
+            names = (
+                list(self._buffers)
+                if queue_names is None
+                else [name for name in queue_names if name in self._buffers]
+            )
+            batches = {}
+            for name in names:
+                batches[name] = self._buffers.pop(name)
+                del self._buffer_bytes[name]
+                del self._buffer_since[name]
+            return batches
+
+    def _restore(self, batches: Dict[str, List[bytes]]) -> None:
+        """
+        전송하지 못한 메시지를 버퍼의 앞쪽에 되돌림
+
+        Args:
+            batches: 큐 이름별 메시지 목록
+        """
+        with self._lock:
+            for name, payloads in batches.items():
+                buffer = self._buffers.get(name)
+                if buffer is None:
+                    self._buffers[name] = payloads
+                    self._buffer_bytes[name] = sum(
+                        len(payload) for payload in payloads
+                    )
+                    self._buffer_since[name] = time.monotonic()
+                else:
+                    buffer[:0] = payloads
+                    self._buffer_bytes[name] += sum(
+                        len(payload) for payload in payloads
+                    )
+
+    def _send(self, batches: Dict[str, List[bytes]]) -> None:
+        """
+        큐별 배치를 batch_size개씩 나누어 하나의 파이프라인으로 전송
+
+        Args:
+            batches: 큐 이름별 메시지 목록
+        """
+        if self.max_queue_length is not None:
+            self._send_bounded(batches, self.max_queue_length)
+            return
+
+        try:
+            pipe = self._redis_client.pipeline(transaction=False)
+            for name, payloads in batches.items():
+                for start in range(0, len(payloads), self.batch_size):
+                    end = start + self.batch_size
+                    pipe.rpush(name, *payloads[start:end])
+            pipe.execute()
+        except Exception:
+            # 일부가 이미 추가되었을 수 있지만 유실되지 않도록 다음 전송에서 다시 보냄 (at-least-once)
+            self._restore(batches)
+            raise
+
+    def _send_bounded(
+        self, batches: Dict[str, List[bytes]], limit: int
+    ) -> None:
+        """
+        큐 길이 상한을 지키며 전송 - 한도를 넘는 큐는 full_timeout 동안 다시 시도
+
+        큐별 순서를 지키기 위해 왕복마다 큐별로 batch_size개씩만 보내고,
+        거절된 묶음은 다음 왕복에서 같은 위치부터 다시 보낸다.
+
+        Args:
+            batches: 큐 이름별 메시지 목록
+            limit: 큐 길이 상한
+        """
+        deadline = time.monotonic() + self.full_timeout
+        while batches:
+            names = list(batches)
+            try:
+                if self.cluster:
+                    # 클러스터 파이프라인은 스크립트를 지원하지 않으므로 큐마다 따로 실행
+                    results = [
+                        self._bounded_push(
+                            keys=[name],
+                            args=[limit] + batches[name][: self.batch_size],
+                        )
+                        for name in names
+                    ]
+                else:
+                    pipe = self._redis_client.pipeline(transaction=False)
+                    for name in names:
+                        self._bounded_push(
+                            keys=[name],
+                            args=[limit] + batches[name][: self.batch_size],
+                            client=pipe,
+                        )
+                    results = pipe.execute()
+            except Exception:
+                self._restore(batches)
+                raise
+
+            rejected = None
+            for name, result in zip(names, results):
+                if result < 0:
+                    rejected = (name, -result - 1)
+                    continue
+                # 자리가 부족하면 앞쪽 일부만 추가되므로 나머지는 다음 왕복에서 보냄
+                del batches[name][:result]
+                if not batches[name]:
+                    del batches[name]
+
+            if rejected is None:
+                continue
+            if time.monotonic() >= deadline:
+                self._restore(batches)
+                raise QueueFullError(rejected[0], rejected[1], limit)
+            time.sleep(FULL_RETRY_INTERVAL)
+
+    def _linger_loop(self) -> None:
+        """백그라운드 전송 스레드 메서드 - 첫 메시지가 linger_ms 이상 기다린 버퍼를 전송"""
+        linger = self.linger_ms / 1000
+        while True:
+            with self._condition:
+                while not self._closed and not self._buffer_since:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                wait = (
+                    min(self._buffer_since.values())
+                    + linger
+                    - time.monotonic()
+                )
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                now = time.monotonic()
+                expired = [
+                    name
+                    for name, since in self._buffer_since.items()
+                    if now - since >= linger
+                ]
+
+            try:
+                self._flush(expired)
+            except Exception as e:
+                # 메시지는 버퍼에 남아 있으므로 다음 전송에서 다시 시도
+                self.logger.error(f"메시지 전송 실패: {e}")
+                with self._condition:
+                    self._condition.wait(linger)
@@ -0,0 +1,294 @@
+"""
+큐별 처리 속도 제한과 동시 처리 수 상한
+
+리스너는 메시지를 가져오기 전에 QueueLimiter에서 가져올 수 있는 수를 먼저
+확보한다. 토큰이나 처리 중 자리가 없으면 Redis에서 꺼내지 않고 기다리므로,
+제한에 걸린 메시지는 로컬에 쌓이지 않고 큐에 남아 다른 컨슈머가 가져갈 수 있다.
+
+Author: Minseok kim
+"""
+
+import re
+import threading
+import time
+from typing import Any, Optional, Tuple, Union
+
+# 공유 토큰 버킷 스크립트 - 서버 시각으로 토큰을 채운 뒤 요청한 만큼(있는 만큼) 가져감
+# 반환값: {가져간 토큰 수, 토큰이 없으면 다음 토큰까지 기다릴 시간(밀리초)}
+SHARED_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+if granted > 0 then
+    return {granted, 0}
+end
+return {0, math.ceil((1 - tokens) / rate * 1000)}
+"""
+
+# 공유 토큰 버킷에서 한 번에 빌려 올 토큰 양 (초당 속도 대비 시간, 초)
+LEASE_SECONDS = 0.1
+
+_RATE_PATTERN = re.compile(
+    r"^\s*([0-9]*\.?[0-9]+)\s*"
+    r"(?:/\s*([0-9]*\.?[0-9]*)\s*(s|sec|m|min|h|hour)?)?\s*$"
+)
+_UNIT_SECONDS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600}
+
+
+def parse_rate(rate: Union[str, float, int]) -> float:
+    """
+    처리 속도 표기를 초당 메시지 수로 변환
+
+    Args:
+        rate: 초당 메시지 수 또는 "500/s", "1000/m", "10/2s" 같은 문자열
+
+    Returns:
+        초당 메시지 수
+    """
+    if isinstance(rate, (int, float)):
+        per_second = float(rate)
+    else:
+        match = _RATE_PATTERN.match(rate)
+        if match is None:
+            raise ValueError(
+                f'처리 속도 형식이 잘못되었습니다: {rate!r} (예: "500/s", "1000/m")'
+            )
+        count, multiple, unit = match.groups()
+        seconds = float(multiple or 1) * _UNIT_SECONDS[unit or "s"]
+        per_second = float(count) / seconds
+    if per_second <= 0:
+        raise ValueError(f"처리 속도는 0보다 커야 합니다: {rate!r}")
+    return per_second
+
+
+class TokenBucket:
+    """
+    프로세스 안의 토큰 버킷
+
+    초당 rate개씩 토큰이 채워지며 최대 burst개까지 쌓인다.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        TokenBucket 초기화
+
+        Args:
+            rate: 초당 토큰 수
+            burst: 최대 토큰 수 (기본값은 1초 분량, 최소 1)
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self, count: int) -> Tuple[int, float]:
+        """
+        토큰을 있는 만큼(최대 count개) 가져감
+
+        Args:
+            count: 가져올 최대 토큰 수
+
+        Returns:
+            (가져간 토큰 수, 가져가지 못했으면 다음 토큰까지 기다릴 시간(초))
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            granted = min(count, int(self._tokens))
+            if granted:
+                self._tokens -= granted
+                return granted, 0.0
+            return 0, (1 - self._tokens) / self.rate
+
+    def refund(self, count: int) -> None:
+        """
+        사용하지 않은 토큰 반환
+
+        Args:
+            count: 반환할 토큰 수
+        """
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + count)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Redis에 상태를 두고 모든 컨슈머 프로세스가 함께 쓰는 토큰 버킷
+
+    Lua 스크립트로 토큰을 한 번에 LEASE_SECONDS 분량씩 빌려 와 로컬에 두고 나누어
+    쓰므로 메시지마다 Redis 왕복이 생기지 않는다. 빌려 온 토큰은 최대 그만큼
+    순간적으로 먼저 쓰일 수 있지만 전체 속도는 rate를 넘지 않는다.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        key: str,
+        rate: float,
+        burst: Optional[int] = None,
+    ) -> None:
+        """
+        SharedTokenBucket 초기화
+
+        Args:
+            redis_client: Redis 클라이언트
+            key: 버킷 상태를 저장할 해시 키
+            rate: 모든 컨슈머를 합친 초당 토큰 수
+            burst: 최대 토큰 수 (기본값은 1초 분량, 최소 1)
+        """
+        super().__init__(rate, burst)
+        self.key = key
+        self.lease = max(1, int(rate * LEASE_SECONDS))
+        self._tokens = 0.0
+        self._take = redis_client.register_script(SHARED_BUCKET_SCRIPT)
+
+    def try_take(self, count: int) -> Tuple[int, float]:
+        """
+        로컬에 빌려 둔 토큰을 먼저 쓰고, 없으면 Redis에서 빌려 옴
+
+        Args:
+            count: 가져올 최대 토큰 수
+
+        Returns:
+            (가져간 토큰 수, 가져가지 못했으면 다음 토큰까지 기다릴 시간(초))
+        """
+        with self._lock:
+            if self._tokens < 1:
+                granted, wait_ms = self._take(
+                    keys=[self.key],
+                    args=[self.rate, self.burst, max(count, self.lease)],
+                )
+                if not granted:
+                    return 0, wait_ms / 1000
+                self._tokens += granted
+            granted = min(count, int(self._tokens))
+            self._tokens -= granted
+            return granted, 0.0
+
+    def refund(self, count: int) -> None:
+        """
+        사용하지 않은 토큰을 로컬에 반환 (다음 수신에서 먼저 사용)
+
+        Args:
+            count: 반환할 토큰 수
+        """
+        with self._lock:
+            self._tokens += count
+
+
+class QueueLimiter:
+    """
+    큐 하나의 처리 속도 제한(토큰 버킷)과 처리 중 메시지 수 상한
+
+    리스너는 수신 전에 acquire()로 가져올 수를 확보하고, 실제로 받지 못한 만큼
+    unused()로 돌려준다. 처리 중 자리는 핸들러가 끝날 때 done()으로 반환된다.
+    """
+
+    def __init__(
+        self,
+        bucket: Optional[TokenBucket] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        """
+        QueueLimiter 초기화
+
+        Args:
+            bucket: 처리 속도를 제한할 토큰 버킷 (선택사항)
+            max_in_flight: 수신했지만 처리가 끝나지 않은 메시지 수 상한 (선택사항)
+        """
+        self.bucket = bucket
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._condition = threading.Condition()
+        self._closed = threading.Event()
+
+    def acquire(self, count: int) -> int:
+        """
+        처리 중 자리와 토큰이 생길 때까지 대기한 뒤 가져올 수 있는 만큼 확보
+
+        Args:
+            count: 가져오려는 최대 메시지 수
+
+        Returns:
+            확보한 수 (1 ~ count, 닫혔으면 0)
+        """
+        with self._condition:
+            while (
+                self.max_in_flight is not None
+                and self.in_flight >= self.max_in_flight
+            ):
+                if self._closed.is_set():
+                    return 0
+                self._condition.wait()
+            if self._closed.is_set():
+                return 0
+            if self.max_in_flight is not None:
+                count = min(count, self.max_in_flight - self.in_flight)
+            self.in_flight += count
+
+        if self.bucket is None:
+            return count
+        while True:
+            granted, wait = self.bucket.try_take(count)
+            if granted:
+                self._release(count - granted)
+                return granted
+            # 토큰이 생길 때까지 대기하되 close() 시 바로 깨어남
+            if self._closed.wait(wait):
+                self._release(count)
+                return 0
+
+    def unused(self, count: int) -> None:
+        """
+        확보했지만 수신하지 못한 만큼 처리 중 자리와 토큰 반환
+
+        Args:
+            count: 반환할 수
+        """
+        if count <= 0:
+            return
+        if self.bucket is not None:
+            self.bucket.refund(count)
+        self._release(count)
+
+    def done(self, count: int = 1) -> None:
+        """
+        처리가 끝난 메시지의 처리 중 자리 반환
+
+        Args:
+            count: 처리가 끝난 메시지 수
+        """
+        self._release(count)
+
+    def close(self) -> None:
+        """대기 중인 acquire()를 깨우고 이후 호출은 0을 반환"""
+        self._closed.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _release(self, count: int) -> None:
+        """
+        처리 중 자리 반환 후 대기 중인 리스너를 깨움
+
+        Args:
+            count: 반환할 수
+        """
+        if not count:
+            return
+        with self._condition:
+            self.in_flight -= count
+            self._condition.notify_all()
@@ -0,0 +1,309 @@
+"""
+신뢰성 큐 모드 (at-least-once)
+
+메시지를 BLMOVE로 컨슈머별 처리 중 리스트에 옮긴 뒤, 핸들러가 성공한 경우에만
+처리 중 리스트에서 제거한다. 핸들러가 실패한 메시지는 시도 횟수를 기록해 원래 큐의
+뒤쪽으로 되돌리고, max_attempts번 실패하면 데드레터 큐로 보낸다. 죽은 컨슈머의 처리 중
+리스트는 다른 컨슈머가 원래 큐로 되돌린다.
+
+Author: Minseok kim
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+import logging
+from typing import Any, List, Optional, Tuple
+
+from .forwarding import Forwarder
+from .retry import (
+    ATTEMPTS_DIGITS,
+    RETRY_PREFIX,
+    RetryQueue,
+    next_attempt,
+    unwrap,
+)
+
+# 처리 중 리스트의 메시지를 원래 큐의 앞쪽으로 순서대로 되돌리고 컨슈머 등록 해제
+# ARGV[3](최대 시도 횟수)이 0보다 크면 되돌리는 메시지를 한 번의 시도로 세어 재전달 봉투의
+# 시도 횟수를 늘리고, 시도 횟수를 모두 쓴 메시지는 봉투를 벗겨 KEYS[4] 데드레터 리스트로 보냄
+# 되돌린 메시지 수와 데드레터 리스트로 보낸 메시지 수를 반환
+REQUEUE_SCRIPT = """
+local prefix = ARGV[2]
+local limit = tonumber(ARGV[3])
+local max_digits = tonumber(ARGV[4])
+local moved = 0
+local dead = 0
+while true do
+    local message = redis.call('RPOP', KEYS[1])
+    if not message then
+        break
+    end
+    if limit == 0 then
+        redis.call('LPUSH', KEYS[2], message)
+        moved = moved + 1
+    else
+        local payload = message
+        local attempts = 0
+        if string.sub(message, 1, #prefix) == prefix then
+            local digits = string.match(message, '^(%d+):', #prefix + 1)
+            if digits and #digits <= max_digits then
+                attempts = tonumber(digits)
+                payload = string.sub(message, #prefix + #digits + 2)
+            end
+        end
+        attempts = attempts + 1
+        if attempts >= limit then
+            redis.call('RPUSH', KEYS[4], payload)
+            dead = dead + 1
+        else
+            redis.call('LPUSH', KEYS[2], prefix .. attempts .. ':' .. payload)
+            moved = moved + 1
+        end
+    end
+end
+redis.call('ZREM', KEYS[3], ARGV[1])
+return {moved, dead}
+"""
+
+
+def make_consumer_id() -> str:
+    """
+    프로세스마다 고유한 컨슈머 ID 생성
+
+    Returns:
+        "호스트명:pid:임의값" 형식의 컨슈머 ID
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class ReliableQueue:
+    """
+    신뢰성 큐 하나에 대한 수신/확인(ack) 처리
+
+    확인 결과는 바로 Redis로 보내지 않고 모아 두었다가 flush() 시 하나의
+    파이프라인으로 전송하므로, 신뢰성 모드에서도 메시지당 왕복 수가 늘지 않는다.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        queue_name: str,
+        consumer_id: str,
+        retry: Optional[RetryQueue] = None,
+        forwarder: Optional[Forwarder] = None,
+        max_attempts: int = 5,
+        dead_letter: Optional[str] = None,
+    ) -> None:
+        """
+        ReliableQueue 초기화
+
+        Args:
+            redis_client: Redis 클라이언트
+            queue_name: 원본 큐 이름
+            consumer_id: 이 프로세스의 컨슈머 ID
+            retry: 재시도 정책을 적용할 RetryQueue (선택사항)
+                지정하면 flush() 시 재시도 예약과 데드레터 메시지를 확인 결과와
+                같은 MULTI로 전송한다.
+            forwarder: 핸들러 출력을 전달할 Forwarder (선택사항)
+                지정하면 ack()와 함께 받은 출력을 확인 결과와 같은 MULTI로 전송한다.
+            max_attempts: retry 없이 nack()으로 되돌릴 때 처음 처리를 포함한 최대 시도 횟수
+                (기본값 5, 이 횟수만큼 실패하면 데드레터 큐로 보냄)
+            dead_letter: 데드레터 큐 이름 (기본값 "{queue_name}:dead")
+        """
+        self.redis_client = redis_client
+        self.queue_name = queue_name
+        self.consumer_id = consumer_id
+        self.retry = retry
+        self.forwarder = forwarder
+        self.max_attempts = max_attempts
+        self.dead_letter = dead_letter or f"{queue_name}:dead"
+        self.processing_key = f"{queue_name}:processing:{consumer_id}"
+        self.consumers_key = f"{queue_name}:consumers"
+        # (처리 중 리스트에서 제거할 원본 메시지, 옮길 큐 이름, 옮길 메시지) - 큐 이름이 None이면 처리 성공
+        self._pending: List[Tuple[bytes, Optional[str], Optional[bytes]]] = []
+        self._outputs: List[bytes] = []
+        self._lock = threading.Lock()
+        self._requeue = redis_client.register_script(REQUEUE_SCRIPT)
+        self.logger = logging.getLogger(__name__)
+
+    def fetch(
+        self, timeout: float, batch_size: int = 1, client: Any = None
+    ) -> List[bytes]:
+        """
+        메시지를 처리 중 리스트로 옮기면서 수신
+
+        Args:
+            timeout: 블로킹 대기 시간 (초, 0이면 무제한)
+            batch_size: 한 번에 옮길 최대 메시지 수
+            client: 블로킹 명령에 사용할 클라이언트 (기본값은 redis_client)
+
+        Returns:
+            수신한 원본 메시지 목록 (타임아웃이면 빈 목록)
+        """
+        client = client or self.redis_client
+        message = client.blmove(
+            self.queue_name, self.processing_key, timeout, "LEFT", "RIGHT"
+        )
+        if message is None:
+            return []
+
+        messages = [message]
+        if batch_size > 1:
+            # 대기 중인 메시지를 한 번의 왕복으로 추가 이동
+            pipe = client.pipeline(transaction=False)
+            for _ in range(batch_size - 1):
+                pipe.lmove(
+                    self.queue_name, self.processing_key, "LEFT", "RIGHT"
+                )
+            messages.extend(
+                moved for moved in pipe.execute() if moved is not None
+            )
+        return messages
+
+    def ack(
+        self, message: bytes, outputs: Optional[List[bytes]] = None
+    ) -> None:
+        """
+        처리 성공 - 다음 flush() 때 처리 중 리스트에서 제거
+
+        Args:
+            message: 처리한 원본 메시지 (LREM으로 찾기 위해 디코딩 전 값)
+            outputs: 확인과 함께 다음 단계 큐로 보낼 핸들러 출력 (forwarder 지정 시)
+        """
+        with self._lock:
+            self._pending.append((message, None, None))
+            if outputs:
+                self._outputs.extend(outputs)
+
+    def nack(self, message: bytes) -> bool:
+        """
+        처리 실패 - 다음 flush() 때 원래 큐의 뒤쪽으로 옮김 (시도 횟수를 모두 썼으면 데드레터 큐로 보냄)
+
+        되돌리는 메시지는 RetryQueue와 같은 재전달 봉투로 감싸 시도 횟수를 함께 기록한다.
+
+        Args:
+            message: 처리에 실패한 원본 메시지 (재전달 봉투 포함 가능)
+
+        Returns:
+            원래 큐로 되돌렸으면 True, 데드레터 큐로 보냈으면 False
+        """
+        moved, requeue = next_attempt(message, self.max_attempts)
+        with self._lock:
+            self._pending.append(
+                (
+                    message,
+                    self.queue_name if requeue else self.dead_letter,
+                    moved,
+                )
+            )
+        return requeue
+
+    def dead(self, message: bytes) -> None:
+        """
+        시도 횟수와 관계없이 다음 flush() 때 데드레터 큐로 옮김
+
+        Args:
+            message: 원본 메시지 (재전달 봉투 포함 가능)
+        """
+        with self._lock:
+            self._pending.append(
+                (message, self.dead_letter, unwrap(message)[0])
+            )
+
+    def flush(self) -> None:
+        """모아 둔 확인 결과를 하나의 파이프라인으로 전송"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            outputs, self._outputs = self._outputs, []
+        if not pending:
+            return
+
+        pipe = self.redis_client.pipeline(transaction=True)
+        for message, target, moved in pending:
+            pipe.lrem(self.processing_key, 1, message)
+            if target is not None:
+                pipe.rpush(target, moved)
+        if outputs and self.forwarder is not None:
+            self.forwarder.write(pipe, outputs)
+        if self.retry is not None:
+            self.retry.write(pipe)
+        pipe.execute()
+
+    def heartbeat(self, pipe: Any) -> None:
+        """
+        컨슈머 생존 신호 기록
+
+        Args:
+            pipe: 명령을 추가할 Redis 파이프라인
+        """
+        pipe.zadd(self.consumers_key, {self.consumer_id: time.time()})
+
+    def reap(self, dead_after: float) -> Tuple[int, int]:
+        """
+        생존 신호가 끊긴 다른 컨슈머의 처리 중 메시지를 원래 큐로 되돌림
+
+        처리 중에 프로세스를 죽게 만드는 메시지가 끝없이 재전달되지 않도록, 되돌리는
+        메시지는 한 번의 시도로 세고 시도 횟수를 모두 쓴 메시지는 데드레터 큐로 보낸다.
+
+        Args:
+            dead_after: 이 시간(초) 이상 생존 신호가 없으면 죽은 컨슈머로 간주
+
+        Returns:
+            (되돌린 메시지 수, 데드레터 큐로 보낸 메시지 수)
+        """
+        dead_consumers = self.redis_client.zrangebyscore(
+            self.consumers_key, "-inf", time.time() - dead_after
+        )
+        # 재시도 정책이 있으면 정책의 최대 시도 횟수를 사용
+        limit = (
+            self.max_attempts
+            if self.retry is None
+            else self.retry.policy.max_attempts
+        )
+        recovered = 0
+        dead = 0
+        for consumer_id in dead_consumers:
+            # 클라이언트가 응답을 bytes로 받으므로 키 조합 전에 문자열로 변환
+            consumer_id = (
+                consumer_id.decode("utf-8")
+                if isinstance(consumer_id, bytes)
+                else consumer_id
+            )
+            if consumer_id == self.consumer_id:
+                continue
+            moved, dead_lettered = self._requeue(
+                keys=[
+                    f"{self.queue_name}:processing:{consumer_id}",
+                    self.queue_name,
+                    self.consumers_key,
+                    self.dead_letter,
+                ],
+                args=[consumer_id, RETRY_PREFIX, limit, ATTEMPTS_DIGITS],
+            )
+            recovered += moved
+            dead += dead_lettered
+        return recovered, dead
+
+    def release(self) -> int:
+        """
+        종료 시 이 컨슈머의 처리 중 리스트를 원래 큐로 되돌리고 등록 해제
+
+        처리하지 못한 메시지이므로 시도 횟수는 늘리지 않는다.
+
+        Returns:
+            되돌린 메시지 수
+        """
+        self.flush()
+        moved: int = self._requeue(
+            keys=[
+                self.processing_key,
+                self.queue_name,
+                self.consumers_key,
+                self.dead_letter,
+            ],
+            args=[self.consumer_id, RETRY_PREFIX, 0, ATTEMPTS_DIGITS],
+        )[0]
+        return moved
@@ -0,0 +1,303 @@
+"""
+재시도 정책과 지연 재전달
+
+처리에 실패한 메시지는 바로 큐로 되돌리지 않고 "{queue_name}:retry" 정렬 집합에
+재전달 시각을 점수로 넣어 둔다. 재시도 스케줄러 스레드 하나가 주기마다 큐별로
+Lua 스크립트를 한 번씩 실행하여, 시각이 지난 메시지를 한 번에 큐의 뒤쪽으로 옮긴다.
+재시도 횟수를 모두 쓴 메시지는 데드레터 리스트로 보낸다.
+
+재전달되는 메시지는 wrap()으로 RETRY_PREFIX + "시도 횟수:" + 원본 메시지 형태의 봉투로
+감싸서 시도 횟수를 메시지와 함께 전달하며, 수신 시 unwrap()으로 벗겨낸 뒤 디코딩한다.
+
+Author: Minseok kim
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+
+# 재전달 봉투 접두사 - 발행자의 메시지와 겹치지 않도록 NUL 바이트와 라이브러리 고유 태그로 구성
+RETRY_PREFIX = b"\x00\x01redis-subscriber/retry\x00"
+
+# 봉투의 시도 횟수 최대 자릿수 (이보다 길면 봉투가 아닌 메시지로 봄)
+ATTEMPTS_DIGITS = 10
+
+# 정렬 집합 멤버를 고유하게 만드는 16진수 토큰 길이 (같은 메시지가 동시에 여러 번 실패할 수 있음)
+TOKEN_LENGTH = 8
+
+# 재전달 시각이 지난 메시지를 최대 ARGV[2]개까지 큐의 뒤쪽으로 옮기는 스크립트
+# 멤버 앞의 토큰을 떼어낸 봉투를 큐에 넣고, 옮긴 메시지 수를 반환
+MOVE_DUE_SCRIPT = """
+local due = redis.call(
+    'ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2])
+)
+if #due == 0 then
+    return 0
+end
+local messages = {}
+for i, member in ipairs(due) do
+    messages[i] = string.sub(member, tonumber(ARGV[3]) + 1)
+end
+redis.call('ZREM', KEYS[1], unpack(due))
+redis.call('RPUSH', KEYS[2], unpack(messages))
+return #due
+"""
+
+# 한 번의 스크립트 실행으로 옮길 최대 메시지 수 (Lua unpack 인자 수 제한 안쪽)
+MOVE_LIMIT = 1000
+
+
+def wrap(payload: bytes, attempts: int) -> bytes:
+    """
+    원본 메시지를 시도 횟수와 함께 재전달 봉투로 감쌈
+
+    Args:
+        payload: 원본 메시지
+        attempts: 지금까지의 시도 횟수
+
+    Returns:
+        봉투로 감싼 메시지
+    """
+    return RETRY_PREFIX + b"%d:" % attempts + payload
+
+
+def unwrap(message: bytes) -> Tuple[bytes, int]:
+    """
+    재전달 봉투를 벗겨 원본 메시지와 지금까지의 시도 횟수 반환
+
+    Args:
+        message: 큐에서 받은 메시지
+
+    Returns:
+        (원본 메시지, 시도 횟수) - 봉투가 없거나 봉투 형식이 아니면 받은 메시지 그대로와 시도 횟수 0
+    """
+    if not message.startswith(RETRY_PREFIX):
+        return message, 0
+    start = len(RETRY_PREFIX)
+    separator = message.find(b":", start, start + ATTEMPTS_DIGITS + 1)
+    attempts = message[start:separator]
+    if separator < 0 or not attempts.isdigit():
+        return message, 0
+    payload = separator + 1
+    return message[payload:], int(attempts)
+
+
+def next_attempt(message: bytes, max_attempts: int) -> Tuple[bytes, bool]:
+    """
+    실패한 메시지를 바로 되돌릴 때 시도 횟수를 하나 늘린 봉투 생성
+
+    Args:
+        message: 처리에 실패한 메시지 (재전달 봉투 포함 가능)
+        max_attempts: 처음 처리를 포함한 최대 시도 횟수
+
+    Returns:
+        (되돌릴 메시지, True) 또는 시도 횟수를 모두 썼으면 (봉투를 벗긴 원본 메시지, False)
+    """
+    payload, attempts = unwrap(message)
+    attempts += 1
+    if attempts >= max_attempts:
+        return payload, False
+    return wrap(payload, attempts), True
+
+
+class RetryPolicy:
+    """
+    재시도 정책 - 최대 시도 횟수와 지수 백오프 지연
+
+    n번째 재시도의 지연은 min(max_delay, base_delay * multiplier^(n-1))이며,
+    jitter=True이면 그 절반에서 전체 사이의 임의 값이다(Backoff와 같은 방식).
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+    ) -> None:
+        """
+        RetryPolicy 초기화
+
+        Args:
+            max_attempts: 처음 처리를 포함한 최대 시도 횟수 (기본값 5)
+                이 횟수만큼 실패하면 데드레터 큐로 보낸다. 1이면 재시도하지 않는다.
+            base_delay: 첫 재시도까지의 지연 (초, 기본값 1.0)
+            max_delay: 재시도 지연 상한 (초, 기본값 300)
+            multiplier: 재시도마다 지연에 곱할 값 (기본값 2.0)
+            jitter: 지연을 절반에서 전체 사이로 흩뜨릴지 여부 (기본값 True)
+        """
+        if max_attempts < 1:
+            raise ValueError(
+                f"max_attempts는 1 이상이어야 합니다: {max_attempts}"
+            )
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError(
+                "0 <= base_delay <= max_delay 이어야 합니다: "
+                f"base_delay={base_delay}, max_delay={max_delay}"
+            )
+        if multiplier < 1:
+            raise ValueError(f"multiplier는 1 이상이어야 합니다: {multiplier}")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def delay(self, attempts: int) -> Optional[float]:
+        """
+        실패 후 다음 재시도까지의 지연
+
+        Args:
+            attempts: 방금 실패한 시도를 포함한 시도 횟수
+
+        Returns:
+            지연 (초), 시도 횟수를 모두 썼으면 None
+        """
+        if attempts >= self.max_attempts:
+            return None
+        ceiling = min(
+            self.max_delay,
+            self.base_delay * (self.multiplier ** min(attempts - 1, 64)),
+        )
+        return random.uniform(ceiling / 2, ceiling) if self.jitter else ceiling
+
+
+class RetryQueue:
+    """
+    큐 하나의 재시도 예약과 데드레터 처리
+
+    schedule()은 Redis로 바로 보내지 않고 모아 두었다가 flush() 또는 write() 시
+    하나의 파이프라인으로 전송한다. 신뢰성 큐는 확인(LREM)과 같은 MULTI 안에서
+    write()를 호출하여 처리 중 리스트 제거와 재시도 예약을 함께 적용한다.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        queue_name: str,
+        policy: RetryPolicy,
+        dead_letter: str,
+    ) -> None:
+        """
+        RetryQueue 초기화
+
+        Args:
+            redis_client: Redis 클라이언트
+            queue_name: 원본 큐 이름
+            policy: 재시도 정책
+            dead_letter: 데드레터 큐 이름
+        """
+        self.redis_client = redis_client
+        self.queue_name = queue_name
+        self.policy = policy
+        self.dead_letter = dead_letter
+        self.retry_key = f"{queue_name}:retry"
+        self._retries: List[Tuple[bytes, float]] = []
+        self._dead: List[bytes] = []
+        self._lock = threading.Lock()
+        self._move_due = redis_client.register_script(MOVE_DUE_SCRIPT)
+
+    def schedule(self, message: bytes) -> bool:
+        """
+        처리에 실패한 메시지의 재시도 예약 (시도 횟수를 모두 썼으면 데드레터 큐로 보냄)
+
+        Args:
+            message: 큐에서 받은 메시지 (재전달 봉투 포함 가능)
+
+        Returns:
+            재시도를 예약했으면 True, 데드레터 큐로 보냈으면 False
+        """
+        payload, attempts = unwrap(message)
+        delay = self.policy.delay(attempts + 1)
+        if delay is None:
+            with self._lock:
+                self._dead.append(payload)
+            return False
+
+        member = os.urandom(TOKEN_LENGTH // 2).hex().encode() + wrap(
+            payload, attempts + 1
+        )
+        with self._lock:
+            self._retries.append((member, time.time() + delay))
+        return True
+
+    def dead(self, message: bytes) -> None:
+        """
+        시도 횟수와 관계없이 메시지를 데드레터 큐로 보냄
+
+        Args:
+            message: 큐에서 받은 메시지 (재전달 봉투 포함 가능)
+        """
+        with self._lock:
+            self._dead.append(unwrap(message)[0])
+
+    def write(self, pipe: Any) -> None:
+        """
+        모아 둔 재시도 예약과 데드레터 메시지를 파이프라인에 추가
+
+        Args:
+            pipe: 명령을 추가할 Redis 파이프라인
+        """
+        self._append(pipe, *self._take())
+
+    def flush(self) -> None:
+        """모아 둔 재시도 예약과 데드레터 메시지를 하나의 파이프라인으로 전송"""
+        retries, dead = self._take()
+        if not retries and not dead:
+            return
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._append(pipe, retries, dead)
+        try:
+            pipe.execute()
+        except Exception:
+            # 다음 flush()에서 다시 보내도록 앞쪽에 되돌림
+            with self._lock:
+                self._retries[:0] = retries
+                self._dead[:0] = dead
+            raise
+
+    def _take(self) -> Tuple[List[Tuple[bytes, float]], List[bytes]]:
+        """
+        모아 둔 재시도 예약과 데드레터 메시지를 꺼냄
+
+        Returns:
+            (재시도 (멤버, 재전달 시각) 목록, 데드레터 메시지 목록)
+        """
+        with self._lock:
+            retries, self._retries = self._retries, []
+            dead, self._dead = self._dead, []
+        return retries, dead
+
+    def _append(
+        self, pipe: Any, retries: List[Tuple[bytes, float]], dead: List[bytes]
+    ) -> None:
+        """
+        재시도 예약(ZADD)과 데드레터 전송(RPUSH) 명령을 파이프라인에 추가
+
+        Args:
+            pipe: 명령을 추가할 Redis 파이프라인
+            retries: (멤버, 재전달 시각) 목록
+            dead: 데드레터 메시지 목록
+        """
+        if retries:
+            pipe.zadd(self.retry_key, dict(retries))
+        if dead:
+            pipe.rpush(self.dead_letter, *dead)
+
+    def move_due(self, pipe: Any, now: float) -> None:
+        """
+        재전달 시각이 지난 메시지를 큐로 옮기는 스크립트를 파이프라인에 추가
+
+        Args:
+            pipe: 명령을 추가할 Redis 파이프라인
+            now: 기준 시각 (time.time)
+        """
+        self._move_due(
+            keys=[self.retry_key, self.queue_name],
+            args=[now, MOVE_LIMIT, TOKEN_LENGTH],
+            client=pipe,
+        )
@@ -0,0 +1,233 @@
+"""
+큐 하나에 여러 핸들러를 등록하는 내용 기반 라우팅
+
+같은 큐에 route를 지정해 여러 핸들러를 등록하면 start() 시 큐마다 Router를 만든다.
+"필드=값" 라우트는 필드별 딕셔너리 디스패치 테이블로 컴파일되므로, 메시지마다 라우트를
+차례로 검사하지 않고 필드 값 조회 한 번으로 호출할 핸들러 목록을 찾는다. 여러 핸들러가
+맞으면 등록한 순서대로 모두 호출한다(프로세스 안 팬아웃).
+
+Author: Minseok kim
+"""
+
+import inspect
+import logging
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+Route = Union[str, Callable[[Any], bool], None]
+
+
+def parse_route(
+    route: Route,
+) -> Union[Tuple[str, str], Callable[[Any], bool], None]:
+    """
+    subscribe()의 route 값 검증 및 변환
+
+    Args:
+        route: "필드=값" 문자열, 메시지를 받아 참/거짓을 반환하는 함수 또는 None
+
+    Returns:
+        (필드, 값) 튜플, 함수 또는 None (모든 메시지)
+    """
+    if route is None or callable(route):
+        return route
+    if isinstance(route, str):
+        field, separator, value = route.partition("=")
+        field = field.strip()
+        if separator and field:
+            return field, value.strip()
+    raise ValueError(
+        f'route는 "필드=값" 문자열이나 함수여야 합니다: {route!r}'
+    )
+
+
+class Router:
+    """
+    큐 하나의 핸들러 디스패치 테이블
+
+    핸들러처럼 호출하며, 메시지에 맞는 핸들러를 모두 호출한다. 맞는 핸들러가 없는
+    메시지는 on_unrouted에 넘긴다. 팬아웃 중 실패한 핸들러가 있어도 나머지
+    핸들러를 모두 호출한 뒤 첫 번째 예외를 다시 발생시키며, 성공한 핸들러를 기록하지
+    않으므로 다시 처리할 때는 맞는 핸들러를 모두 다시 호출한다.
+    """
+
+    def __init__(
+        self,
+        queue_name: str,
+        routes: List[Tuple[Any, Callable[[Any], Any]]],
+        on_unrouted: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        """
+        Router 초기화 - 라우트를 디스패치 테이블로 컴파일
+
+        Args:
+            queue_name: 큐 이름 (로그용)
+            routes: 등록한 순서의 (parse_route() 결과, 핸들러) 목록
+            on_unrouted: 맞는 핸들러가 없는 메시지를 받을 함수 (선택사항, 기본값은 경고 로그만 남김)
+                예외를 발생시키면 메시지는 처리에 실패한 것으로 기록된다.
+        """
+        self.queue_name = queue_name
+        self.on_unrouted = on_unrouted
+        self.logger = logging.getLogger(__name__)
+        # 같은 함수를 여러 라우트로 등록했으면 처음 등록한 순서를 사용하고 한 번만 호출
+        order: Dict[int, int] = {}
+        for index, (_, handler) in enumerate(routes):
+            order.setdefault(id(handler), index)
+
+        # 라우트 없이 등록한 핸들러는 모든 메시지에 호출
+        always = [handler for route, handler in routes if route is None]
+        self._predicates = [
+            (route, handler) for route, handler in routes if callable(route)
+        ]
+
+        # 필드마다 값 -> 핸들러 튜플 (모든 메시지용 핸들러를 등록 순서대로 합쳐 둠)
+        tables: Dict[str, Dict[str, List[Callable[[Any], Any]]]] = {}
+        for route, handler in routes:
+            if isinstance(route, tuple):
+                field, value = route
+                tables.setdefault(field, {}).setdefault(value, []).append(
+                    handler
+                )
+        self._order = order
+        self._tables = [
+            (
+                field,
+                {
+                    value: self._unique(handlers + always)
+                    for value, handlers in table.items()
+                },
+            )
+            for field, table in tables.items()
+        ]
+        self._always = self._unique(always)
+        # 필드 하나의 테이블만 있으면 조회 결과를 그대로 사용
+        self._single = (
+            self._tables[0]
+            if len(self._tables) == 1 and not self._predicates
+            else None
+        )
+
+    def _unique(
+        self, handlers: List[Callable[[Any], Any]]
+    ) -> Tuple[Callable[[Any], Any], ...]:
+        """
+        중복을 제거한 등록 순서의 핸들러 튜플
+
+        Args:
+            handlers: 핸들러 목록 (같은 함수가 여러 번 있을 수 있음)
+
+        Returns:
+            처음 등록한 순서대로 한 번씩 담은 튜플
+        """
+        unique = {id(handler): handler for handler in handlers}
+        return tuple(
+            sorted(
+                unique.values(), key=lambda handler: self._order[id(handler)]
+            )
+        )
+
+    def match(self, message: Any) -> Tuple[Callable[[Any], Any], ...]:
+        """
+        메시지에 맞는 핸들러 목록
+
+        Args:
+            message: 디코딩된 메시지 ("필드=값" 라우트는 딕셔너리 메시지의 필드 값과 비교)
+
+        Returns:
+            등록 순서의 핸들러 튜플
+        """
+        if self._single is not None:
+            field, table = self._single
+            value = _field_value(message, field)
+            if value is None:
+                return self._always
+            return table.get(value, self._always)
+
+        matched = list(self._always)
+        for field, table in self._tables:
+            value = _field_value(message, field)
+            handlers = None if value is None else table.get(value)
+            if handlers is not None:
+                matched.extend(handlers)
+        for predicate, handler in self._predicates:
+            if handler not in matched and predicate(message):
+                matched.append(handler)
+        return self._unique(matched) if len(matched) > 1 else tuple(matched)
+
+    def __call__(self, message: Any) -> Any:
+        """
+        메시지에 맞는 핸들러 호출
+
+        Args:
+            message: 디코딩된 메시지
+
+        Returns:
+            핸들러 반환값 (여러 핸들러가 맞으면 None이 아닌 반환값을 모두 생성하는 제너레이터)
+        """
+        handlers = self.match(message)
+        if len(handlers) == 1:
+            return handlers[0](message)
+        if not handlers:
+            if self.on_unrouted is not None:
+                return self.on_unrouted(message)
+            self.logger.warning(
+                "라우트에 맞는 핸들러가 없는 메시지 [%s]: %s",
+                self.queue_name,
+                message,
+            )
+            return None
+
+        results = []
+        error: Optional[Exception] = None
+        for handler in handlers:
+            try:
+                result = handler(message)
+            except Exception as e:
+                if error is None:
+                    error = e
+                continue
+            if result is not None:
+                results.append(result)
+        if error is not None:
+            raise error
+        return _chain(results) if results else None
+
+
+def _field_value(message: Any, field: str) -> Optional[str]:
+    """
+    라우팅에 사용할 메시지 필드 값
+
+    Args:
+        message: 디코딩된 메시지
+        field: 필드 이름
+
+    Returns:
+        필드 값 문자열 (딕셔너리가 아니거나 필드가 없으면 None)
+    """
+    try:
+        value = message[field]
+    except (KeyError, TypeError, IndexError):
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def _chain(results: List[Any]) -> Iterator[Any]:
+    """
+    팬아웃한 핸들러들의 반환값을 하나의 제너레이터로 연결 (제너레이터 반환값은 펼침)
+
+    Args:
+        results: None이 아닌 핸들러 반환값 목록
+    """
+    for result in results:
+        if inspect.isgenerator(result):
+            yield from result
+        else:
+            yield result
@@ -0,0 +1,106 @@
+"""
+우선순위 큐 그룹의 수신 순서 스케줄러
+
+BLPOP은 키 목록에서 가장 앞의 비어 있지 않은 키에서 꺼내므로, 매 호출마다
+키 순서만 정해 주면 비어 있는 키 때문에 기다리는 일 없이 우선순위나 가중치를
+적용할 수 있다.
+
+Author: Minseok kim
+"""
+
+from typing import Dict, List, Optional
+
+
+class PriorityScheduler:
+    """
+    우선순위 그룹의 BLPOP 키 순서 결정
+
+    - weights가 없으면 엄격한 우선순위: 항상 앞쪽 키부터 꺼낸다. 어떤 키가
+      starvation_limit번 연속으로 꺼내지지 않으면 다음 호출에서 맨 앞에 둔다.
+    - weights가 있으면 가중 라운드 로빈(smooth weighted round-robin): 모든 키에
+      메시지가 쌓여 있을 때 키별로 가중치 비율만큼 꺼낸다. 차례가 된 키가 비어
+      있어 다른 키에서 꺼냈다면 실제로 꺼낸 키의 몫을 차감한다.
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        weights: Optional[List[int]] = None,
+        starvation_limit: int = 100,
+    ) -> None:
+        """
+        PriorityScheduler 초기화
+
+        Args:
+            keys: 우선순위가 높은 순서의 큐 이름 목록
+            weights: 키별 가중치 (선택사항, 지정하면 가중 라운드 로빈)
+            starvation_limit: 엄격한 우선순위에서 낮은 키를 맨 앞으로 올리기 전까지
+                연속으로 건너뛸 수 있는 호출 수
+        """
+        self.keys = list(keys)
+        self.weights = dict(zip(self.keys, weights)) if weights else None
+        self.starvation_limit = starvation_limit
+        self._credit: Dict[str, int] = {key: 0 for key in self.keys}
+        self._skipped: Dict[str, int] = {key: 0 for key in self.keys}
+        self._last_order = self.keys
+
+    def order(self) -> List[str]:
+        """
+        다음 BLPOP에 사용할 키 순서
+
+        Returns:
+            키 목록 (앞쪽 키부터 꺼냄)
+        """
+        weights = self.weights
+        if weights:
+            # 이번 차례의 몫이 큰 키부터, 같으면 우선순위 순서
+            order = sorted(
+                self.keys,
+                key=lambda key: self._credit[key] + weights[key],
+                reverse=True,
+            )
+        else:
+            starved = [
+                key
+                for key in self.keys
+                if self._skipped[key] >= self.starvation_limit
+            ]
+            order = self.keys
+            if starved:
+                # 가장 오래 건너뛴 키를 맨 앞에 두고 나머지는 우선순위 순서 유지
+                first = max(starved, key=lambda key: self._skipped[key])
+                order = [first] + [key for key in self.keys if key != first]
+
+        self._last_order = order
+        return order
+
+    def served(self, key: str) -> None:
+        """
+        실제로 메시지를 꺼낸 키 기록
+
+        BLPOP은 앞쪽 키부터 확인하므로, 마지막 순서에서 key보다 앞에 있던 키는
+        비어 있었다는 뜻이다. 비어 있던 키는 몫을 쌓거나 굶은 것으로 세지 않는다.
+
+        Args:
+            key: BLPOP이 반환한 키
+        """
+        order = self._last_order
+        position = order.index(key)
+
+        if self.weights:
+            # 메시지가 있었을 수 있는 키끼리만 몫을 나눔
+            contenders = order[position:]
+            for other in contenders:
+                self._credit[other] += self.weights[other]
+            self._credit[key] -= sum(
+                self.weights[other] for other in contenders
+            )
+            for other in order[:position]:
+                self._credit[other] = 0
+            return
+
+        served = position + 1
+        for other in order[:served]:
+            self._skipped[other] = 0
+        for other in order[served:]:
+            self._skipped[other] += 1
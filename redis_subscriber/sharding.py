@@ -0,0 +1,61 @@
+"""
+샤딩된 논리 큐의 키 이름과 파티셔닝
+
+논리 큐 "events"를 shards=N으로 나누면 실제 키는 "events:{0}" ... "events:{N-1}"이다.
+중괄호 안의 샤드 번호가 Redis Cluster의 해시 태그가 되므로 샤드는 서로 다른 슬롯에
+흩어지고, 클러스터의 여러 노드에 나누어 저장된다.
+
+Author: Minseok kim
+"""
+
+import zlib
+from typing import Any, List
+
+
+def shard_name(queue_name: str, index: int) -> str:
+    """
+    샤드 키 이름
+
+    Args:
+        queue_name: 논리 큐 이름
+        index: 샤드 번호
+
+    Returns:
+        "{queue_name}:{{index}}" 형태의 키 이름
+    """
+    return f"{queue_name}:{{{index}}}"
+
+
+def shard_names(queue_name: str, shards: int) -> List[str]:
+    """
+    논리 큐의 모든 샤드 키 이름
+
+    Args:
+        queue_name: 논리 큐 이름
+        shards: 샤드 수
+
+    Returns:
+        샤드 번호 순서의 키 이름 목록
+    """
+    return [shard_name(queue_name, index) for index in range(shards)]
+
+
+def shard_for(key: Any, shards: int) -> int:
+    """
+    파티션 키로 샤드 번호 선택
+
+    프로세스마다 값이 달라지는 hash() 대신 CRC32를 사용하므로, 같은 키는 어느
+    발행자에서 보내도 항상 같은 샤드로 들어가 샤드 안에서 순서가 유지된다.
+
+    Args:
+        key: 파티션 키 (str, bytes 또는 str()로 변환할 수 있는 값)
+        shards: 샤드 수
+
+    Returns:
+        샤드 번호 (0 ~ shards - 1)
+    """
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    elif not isinstance(key, (bytes, bytearray)):
+        key = str(key).encode("utf-8")
+    return zlib.crc32(key) % shards
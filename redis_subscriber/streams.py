@@ -0,0 +1,226 @@
+"""
+Redis Streams 컨슈머 그룹 백엔드
+
+XREADGROUP으로 COUNT개씩 묶어서 읽고, 처리 결과는 XACK 하나로 모아서 확인한다.
+확인되지 않은 채 오래 방치된 항목은 XAUTOCLAIM으로 가져와 다시 처리한다.
+
+Author: Minseok kim
+"""
+
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from .codecs import Codec, Utf8Codec, DecodeError, decode_each
+from .forwarding import Forwarder
+
+
+class StreamConsumer:
+    """Redis Stream 하나에 대한 컨슈머 그룹 수신/확인 처리"""
+
+    def __init__(
+        self,
+        redis_client: Any,
+        stream: str,
+        group: str,
+        consumer: str,
+        field: str = "data",
+        start_id: str = "0",
+        codec: Optional[Codec] = None,
+        forwarder: Optional[Forwarder] = None,
+    ) -> None:
+        """
+        StreamConsumer 초기화
+
+        Args:
+            redis_client: Redis 클라이언트
+            stream: 스트림 키
+            group: 컨슈머 그룹 이름
+            consumer: 그룹 안에서 이 프로세스의 컨슈머 이름
+            field: 핸들러에 전달할 값이 담긴 필드 이름
+                항목에 이 필드가 없으면 필드 딕셔너리 전체를 전달한다.
+            start_id: 그룹을 새로 만들 때 읽기 시작할 ID ("0"이면 기존 기록부터, "$"이면 새 항목부터)
+            codec: 필드 값을 변환할 코덱 (기본값 UTF-8)
+            forwarder: 핸들러 출력을 전달할 Forwarder (선택사항)
+                지정하면 ack()와 함께 받은 출력을 XACK와 같은 MULTI로 전송한다.
+        """
+        self.redis_client = redis_client
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer
+        self.field = field
+        self.start_id = start_id
+        self.codec = codec or Utf8Codec()
+        self.forwarder = forwarder
+        # 클라이언트가 응답을 bytes로 받으므로 필드 이름도 bytes로 조회
+        self._field_key = field.encode("utf-8")
+        self._claim_cursor = "0-0"
+        self._pending: List[bytes] = []
+        self._outputs: List[bytes] = []
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def ensure_group(self) -> None:
+        """컨슈머 그룹이 없으면 생성 (스트림이 없으면 함께 생성)"""
+        try:
+            self.redis_client.xgroup_create(
+                self.stream, self.group, id=self.start_id, mkstream=True
+            )
+            self.logger.info(
+                f"컨슈머 그룹 생성됨: {self.stream} -> {self.group}"
+            )
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def fetch(
+        self, count: int, block_ms: int, client: Any = None
+    ) -> List[Tuple[bytes, Any]]:
+        """
+        그룹에 새로 들어온 항목을 최대 count개 수신
+
+        Args:
+            count: 한 번에 읽을 최대 항목 수
+            block_ms: 블로킹 대기 시간 (밀리초, 0이면 무제한)
+            client: 블로킹 명령에 사용할 클라이언트 (기본값은 redis_client)
+
+        Returns:
+            (항목 ID, 메시지) 목록 (타임아웃이면 빈 목록)
+        """
+        response = (client or self.redis_client).xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=count,
+            block=block_ms,
+        )
+        if not response:
+            return []
+        _, entries = response[0]
+        return self._to_messages(entries)
+
+    def claim(self, min_idle_ms: int, count: int) -> List[Tuple[bytes, Any]]:
+        """
+        다른 컨슈머(또는 자신)가 확인하지 않고 방치한 항목을 가져옴
+
+        Args:
+            min_idle_ms: 이 시간(밀리초) 이상 확인되지 않은 항목만 대상
+            count: 한 번에 가져올 최대 항목 수
+
+        Returns:
+            (항목 ID, 메시지) 목록
+        """
+        response = self.redis_client.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_ms,
+            start_id=self._claim_cursor,
+            count=count,
+        )
+        # Redis 7부터는 삭제된 ID 목록이 세 번째 요소로 추가됨
+        self._claim_cursor, entries = response[0], response[1]
+        return self._to_messages(entries)
+
+    def ack(
+        self, entry_id: bytes, outputs: Optional[List[bytes]] = None
+    ) -> None:
+        """
+        처리 성공 - 다음 flush() 때 XACK로 확인
+
+        Args:
+            entry_id: 처리한 항목 ID
+            outputs: 확인과 함께 다음 단계 큐로 보낼 핸들러 출력 (forwarder 지정 시)
+        """
+        with self._lock:
+            self._pending.append(entry_id)
+            if outputs:
+                self._outputs.extend(outputs)
+
+    def flush(self) -> None:
+        """모아 둔 항목 ID를 하나의 XACK 명령으로 확인 (출력이 있으면 같은 MULTI로 전송)"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            outputs, self._outputs = self._outputs, []
+        if not pending:
+            return
+        if not outputs or self.forwarder is None:
+            self.redis_client.xack(self.stream, self.group, *pending)
+            return
+
+        pipe = self.redis_client.pipeline(transaction=True)
+        self.forwarder.write(pipe, outputs)
+        pipe.xack(self.stream, self.group, *pending)
+        pipe.execute()
+
+    def release(self) -> None:
+        """종료 시 남은 확인 결과를 전송하고, 처리 중인 항목이 없으면 컨슈머 등록 해제"""
+        self.flush()
+        pending = self.redis_client.xpending_range(
+            self.stream,
+            self.group,
+            min="-",
+            max="+",
+            count=1,
+            consumername=self.consumer,
+        )
+        if not pending:
+            self.redis_client.xgroup_delconsumer(
+                self.stream, self.group, self.consumer
+            )
+
+    def _to_messages(
+        self, entries: List[Tuple[bytes, Dict[bytes, bytes]]]
+    ) -> List[Tuple[bytes, Any]]:
+        """
+        스트림 항목을 (항목 ID, 메시지) 목록으로 변환 - 필드 값은 한 번에 디코딩
+
+        Args:
+            entries: XREADGROUP/XAUTOCLAIM이 반환한 (항목 ID, 필드 딕셔너리) 목록
+
+        Returns:
+            (항목 ID, 메시지) 목록
+        """
+        entry_ids = []
+        payloads: List[Any] = []
+        for entry_id, fields in entries:
+            # XAUTOCLAIM은 이미 삭제된 항목을 필드 없이 반환할 수 있음
+            if fields is None:
+                self.ack(entry_id)
+                continue
+            entry_ids.append(entry_id)
+            payloads.append(fields.get(self._field_key, fields))
+
+        if not any(type(payload) is dict for payload in payloads):
+            return list(zip(entry_ids, decode_each(self.codec, payloads)))
+
+        # 필드가 없는 항목이 섞여 있으면 해당 항목은 필드 딕셔너리 전체를 변환해서 전달
+        messages = []
+        for entry_id, payload in zip(entry_ids, payloads):
+            if type(payload) is dict:
+                messages.append((entry_id, self._decode_fields(payload)))
+            else:
+                messages.append(
+                    (entry_id, decode_each(self.codec, [payload])[0])
+                )
+        return messages
+
+    def _decode_fields(self, fields: Dict[bytes, bytes]) -> Any:
+        """
+        필드 딕셔너리의 키는 문자열로, 값은 코덱으로 변환
+
+        Args:
+            fields: 스트림 항목의 필드 딕셔너리
+
+        Returns:
+            변환된 딕셔너리 (변환에 실패하면 DecodeError 객체)
+        """
+        try:
+            return {
+                key.decode("utf-8"): self.codec.decode(value)
+                for key, value in fields.items()
+            }
+        except Exception as e:
+            return DecodeError(fields, e)
@@ -4,197 +4,3144 @@ Redis Subscriber 프레임워크
 Author: Minseok kim
 """
 
+import functools
+import inspect
 import redis
+from redis.cluster import RedisCluster
 import threading
+import time
 import logging
 import signal
 import sys
-from typing import Dict, Callable, Any
+from typing import (
+    Dict,
+    Callable,
+    Any,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from .autoscale import QueueScaler
+from .backoff import Backoff
+from .batching import BatchResult
+from .dedup import Deduplicator
+from .forwarding import Forwarder
+from .workers import WorkerPool
+from .prefetch import PrefetchBuffer
+from .profiling import HandlerMonitor, ProfileSession, SlowCall, preview
+from .routing import Route, Router, parse_route
+from .ratelimit import QueueLimiter, SharedTokenBucket, TokenBucket, parse_rate
+from .scheduling import PriorityScheduler
+from .sharding import shard_names
+from .supervisor import ProcessSupervisor
+from .reliable import ReliableQueue, make_consumer_id
+from .retry import MOVE_LIMIT, RetryPolicy, RetryQueue, next_attempt, unwrap
+from .streams import StreamConsumer
+from .transport import RedisTransport, Transport
+from .metrics import MetricsRegistry, MetricsServer, merge_stats, summarize
+from .codecs import Codec, DecodeError, decode_each, get_codec
+
+# add_hook()으로 등록할 수 있는 이벤트
+HOOK_EVENTS = (
+    "on_fetch",
+    "on_handle_start",
+    "on_handle_end",
+    "on_slow_handler",
+)
+
+# 라우트에 맞는 핸들러가 없는 메시지의 처리 방식
+UNROUTED_MODES = ("drop", "dead_letter")
+
+# 종료 시 아직 블로킹 명령을 보내기 전이던 리스너를 다시 깨우는 주기 (초)
+UNBLOCK_INTERVAL = 0.05
+
+# 리스너가 이 시간(초) 이상 정상 동작한 뒤 실패하면 재연결 백오프를 처음부터 시작
+BACKOFF_RESET_AFTER = 30.0
+
+# 클러스터 모드에서 노드의 모든 큐가 비어 있을 때 한 키에서 블로킹 대기하는 시간 (초)
+# 클러스터에서는 다중 키 BLPOP이 같은 슬롯의 키에만 가능하므로 짧게 대기하고 다시 확인한다.
+# 계속 비어 있으면 대기 시간을 두 배씩 CLUSTER_IDLE_BLOCK_MAX까지 늘려 한가한 노드로 보내는 명령을 줄인다.
+CLUSTER_IDLE_BLOCK = 0.1
+CLUSTER_IDLE_BLOCK_MAX = 2.0
+
+# 재시도 스케줄러가 재전달 시각이 지난 메시지를 확인하는 간격 (초)
+RETRY_TICK = 0.1
+
+# subscribe_batch()로 등록하는 배치 핸들러
+BatchHandler = Callable[[List[Any]], Optional[BatchResult]]
 
 
 class RedisSubscriber:
     """Redis Queue에서 메시지를 구독하고 처리하는 프레임워크"""
-    
-    def __init__(self, redis_url: str, username: str = None, password: str = None):
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        fetchers: Optional[int] = None,
+        consumer_timeout: float = 30.0,
+        codec: Union[str, Codec] = "utf8",
+        block_timeout: float = 5.0,
+        shutdown_timeout: float = 10.0,
+        max_connections: Optional[int] = None,
+        socket_timeout: Optional[float] = None,
+        socket_connect_timeout: float = 5.0,
+        socket_keepalive: bool = True,
+        health_check_interval: float = 30.0,
+        reconnect_backoff: Tuple[float, float] = (0.1, 30.0),
+        cluster: bool = False,
+        autoscale_interval: float = 5.0,
+        autoscale_cooldown: float = 30.0,
+        transport: Optional[Transport] = None,
+        slow_handler_threshold: Optional[float] = None,
+        profile_signal: Optional[int] = None,
+        profile_seconds: float = 30.0,
+    ) -> None:
         """
         RedisSubscriber 초기화
-        
+
         Args:
             redis_url: Redis 연결 URL (예: "redis://localhost:6379")
             username: Redis 사용자명 (선택사항)
             password: Redis 비밀번호 (선택사항)
+            fetchers: 다중 키 BLPOP을 수행할 수신 스레드 수 (선택사항)
+                지정하면 큐마다 스레드를 만드는 대신, 구독한 큐를 fetchers개의
+                스레드에 나누어 하나의 BLPOP으로 여러 큐를 동시에 대기한다.
+                스레드와 연결 수는 큐 수와 관계없이 fetchers개로 유지된다.
+                concurrency가 1인 큐의 핸들러는 수신 스레드에서 실행되므로,
+                느린 핸들러는 concurrency로 워커 풀을 지정해야 다른 큐를 막지 않는다.
+            consumer_timeout: 신뢰성 큐 모드에서 생존 신호가 이 시간(초) 이상 끊긴
+                컨슈머를 죽은 것으로 보고 처리 중 메시지를 원래 큐로 되돌린다.
+            codec: 메시지를 핸들러에 전달하기 전에 변환할 기본 코덱 (기본값 "utf8")
+                "raw"(bytes 그대로), "utf8", "json"(orjson 우선), "msgpack" 또는
+                Codec 객체. subscribe()의 codec으로 큐별로 바꿀 수 있다.
+            block_timeout: 리스너의 BLPOP/BLMOVE 블로킹 대기 시간 (초, 0이면 무제한)
+                리스너마다 전용 연결을 사용하고 stop() 시 CLIENT UNBLOCK으로
+                즉시 깨우므로, 길게 잡아도 종료가 늦어지지 않고 한가한 큐의
+                Redis 호출만 줄어든다.
+            shutdown_timeout: stop() 시 실행 중인 핸들러와 워커 풀에 남은 메시지를
+                기다릴 최대 시간 (초)
+            max_connections: 확인(ACK), 지표, 관리 명령에 쓰는 공유 연결 풀의 최대 연결 수
+                (선택사항). 지정하면 연결이 모두 사용 중일 때 빈 연결을 기다린다.
+                블로킹 수신은 리스너마다 전용 연결을 사용하므로 이 풀을 차지하지 않는다.
+            socket_timeout: 일반 명령의 응답 대기 시간 (초, 선택사항)
+                리스너 전용 연결은 블로킹 대기 시간만큼 더 기다린다.
+            socket_connect_timeout: 연결 수립 대기 시간 (초, 기본값 5)
+            socket_keepalive: TCP keepalive 사용 여부 (기본값 True, Unix 소켓에서는 무시)
+                TCP_NODELAY는 redis-py가 항상 설정한다.
+            health_check_interval: 이 시간(초) 이상 쉬었던 연결은 사용 전에 PING으로
+                확인 (기본값 30, 0이면 사용하지 않음)
+            reconnect_backoff: 리스너 재연결 대기 시간의 (시작값, 상한) (초)
+                리스너는 에러가 나도 종료되지 않고, 지터가 있는 지수 백오프로 기다린 뒤
+                새 전용 연결로 다시 수신한다.
+            cluster: True이면 redis_url을 Redis Cluster의 시작 노드로 보고
+                RedisCluster로 연결 (기본값 False). 구독한 큐를 담당 노드별로 묶어 노드마다 수신 스레드 하나가
+                파이프라인 LPOP으로 한 번에 가져온다. 일반 큐(샤딩 포함)만 지원한다.
+            autoscale_interval: max_concurrency로 워커 수를 자동 조절하는 큐의 길이와
+                핸들러 지연을 확인하는 간격 (초, 기본값 5)
+            autoscale_cooldown: 큐의 워커 수를 바꾼 뒤 다시 바꾸지 않는 시간 (초, 기본값 30)
+            transport: 리스트 큐 전송 계층 (선택사항, 지정하면 redis_url 대신 사용)
+                MemoryTransport를 넘기면 Redis 없이 프로세스 안에서 같은 핸들러를 실행한다.
+                일반 큐, 우선순위 그룹, 샤딩, 배치, 프리페치, emit_to, 로컬 처리 속도 제한을
+                지원하며, Redis 서버 기능이 필요한 옵션은 start() 시 ValueError가 발생한다.
+            slow_handler_threshold: 이 시간(초)보다 오래 실행 중인 핸들러 호출을 보고 (선택사항)
+                감시 스레드가 해당 워커 스레드의 스택, 큐 이름, 잘린 메시지를 경고 로그,
+                slow_handlers 지표, on_slow_handler 훅으로 보고한다. 호출마다 한 번만 보고한다.
+            profile_signal: 받으면 profile(profile_seconds)를 시작할 시그널
+                (선택사항, 예: signal.SIGUSR1)
+                멀티프로세스 모드의 감독자는 받은 시그널을 모든 워커 프로세스에 전달한다.
+            profile_seconds: profile_signal로 시작한 프로파일 시간 (초, 기본값 30)
         """
+        if redis_url is None and transport is None:
+            raise ValueError("redis_url 또는 transport를 지정해야 합니다.")
+        if transport is not None and cluster:
+            raise ValueError("transport와 cluster는 함께 사용할 수 없습니다.")
+        if fetchers is not None and fetchers < 1:
+            raise ValueError(f"fetchers는 1 이상이어야 합니다: {fetchers}")
+        if block_timeout < 0:
+            raise ValueError(
+                f"block_timeout은 0 이상이어야 합니다: {block_timeout}"
+            )
+        if max_connections is not None and max_connections < 1:
+            raise ValueError(
+                f"max_connections는 1 이상이어야 합니다: {max_connections}"
+            )
+        if autoscale_interval <= 0:
+            raise ValueError(
+                f"autoscale_interval은 0보다 커야 합니다: {autoscale_interval}"
+            )
+        Backoff(*reconnect_backoff)  # 잘못된 값이면 ValueError
+
         self.redis_url = redis_url
         self.username = username
         self.password = password
+        self.fetchers = fetchers
+        self.consumer_timeout = consumer_timeout
+        self.codec = get_codec(codec)
+        self.block_timeout = block_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self.max_connections = max_connections
+        self.socket_timeout = socket_timeout
+        self.socket_connect_timeout = socket_connect_timeout
+        self.socket_keepalive = socket_keepalive
+        self.health_check_interval = health_check_interval
+        self.reconnect_backoff = reconnect_backoff
+        self.cluster = cluster
+        self.autoscale_interval = autoscale_interval
+        self.autoscale_cooldown = autoscale_cooldown
+        self.transport = transport
         self._handlers: Dict[str, Callable[[str], Any]] = {}
+        self._routes: Dict[str, List[Tuple[Any, Callable[[Any], Any]]]] = {}
+        # 처음 등록할 때 subscribe()에 넘긴 route 외의 인자 (다시 등록할 때 비교)
+        self._arguments: Dict[str, Dict[str, Any]] = {}
+        self._dispatch_table: Dict[str, Callable[[Any], Any]] = {}
+        self._options: Dict[str, Dict[str, Any]] = {}
         self._threads: Dict[str, threading.Thread] = {}
+        self._listener_clients: Dict[str, Tuple[Any, Optional[Hashable]]] = {}
+        self._retired_listeners: Set[str] = set()
+        self._pools: Dict[str, WorkerPool] = {}
+        self._prefetch: Dict[str, PrefetchBuffer] = {}
+        self._priority_groups: Dict[str, Dict[str, Any]] = {}
+        self._shard_groups: Dict[str, List[str]] = {}
+        self._reliable: Dict[str, ReliableQueue] = {}
+        self._retries: Dict[str, RetryQueue] = {}
+        self._limiters: Dict[str, QueueLimiter] = {}
+        self._forwarders: Dict[str, Forwarder] = {}
+        self._dedup: Dict[str, Deduplicator] = {}
+        self._retry_thread: Optional[threading.Thread] = None
+        self._scalers: Dict[str, QueueScaler] = {}
+        self._autoscaler_thread: Optional[threading.Thread] = None
+        self._streams: Dict[str, StreamConsumer] = {}
+        self._consumer_id = ""
+        self._maintainer_thread: Optional[threading.Thread] = None
         self._running = False
-        self._redis_client = None
-        self._main_thread = None
-        
+        self._shutdown = threading.Event()
+        self._wakeup = threading.Event()
+        # 클러스터 모드이면 RedisCluster (start()에서 연결하고 stop()에서 해제)
+        self._redis_client: Any = None
+        self._transport: Optional[Transport] = None
+        self._main_thread: Optional[threading.Thread] = None
+        self._supervisor: Optional[ProcessSupervisor] = None
+        self._metrics = MetricsRegistry()
+        self._retired_stats: Dict[str, Dict[str, Any]] = {}
+        self._metrics_server: Optional[MetricsServer] = None
+        self._hooks: Dict[str, List[Callable[..., Any]]] = {
+            event: [] for event in HOOK_EVENTS
+        }
+        self.profile_seconds = profile_seconds
+        # 감시도 프로파일도 하지 않으면 None으로 두어 핸들러 호출마다 비용이 없도록 함
+        self._monitor: Optional[HandlerMonitor] = None
+        if slow_handler_threshold is not None:
+            self._monitor = HandlerMonitor(
+                slow_handler_threshold, self._report_slow_handler
+            )
+        self._profile_session: Optional[ProfileSession] = None
+
         # 로깅 설정
         self.logger = logging.getLogger(__name__)
-        
+
         # 시그널 핸들러 설정
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
-    
-    def subscribe(self, queue_name: str):
+        if profile_signal is not None:
+            signal.signal(profile_signal, self._profile_signal_handler)
+
+    def subscribe(
+        self,
+        queue_name: Union[str, List[str]],
+        batch_size: int = 1,
+        concurrency: int = 1,
+        ordering_key: Optional[Callable[[str], Hashable]] = None,
+        reliable: bool = False,
+        stream: bool = False,
+        group: Optional[str] = None,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 60000,
+        stream_field: str = "data",
+        codec: Optional[Union[str, Codec]] = None,
+        prefetch: int = 0,
+        weights: Optional[List[int]] = None,
+        starvation_limit: int = 100,
+        shards: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+        dead_letter: Optional[str] = None,
+        max_attempts: int = 5,
+        rate_limit: Optional[Union[str, float]] = None,
+        rate_limit_burst: Optional[int] = None,
+        rate_limit_shared: bool = False,
+        max_in_flight: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        emit_to: Optional[Union[str, List[str]]] = None,
+        emit_codec: Optional[Union[str, Codec]] = None,
+        dedup_key: Optional[Callable[[Any], Hashable]] = None,
+        dedup_ttl: float = 3600.0,
+        dedup_cache_size: int = 10000,
+        dedup_bloom_bits: Optional[int] = None,
+        route: Optional[Route] = None,
+        unrouted: str = "drop",
+    ) -> Callable[..., Callable[[Any], Any]]:
         """
         Queue 구독을 위한 데코레이터
-        
+
+        start() 이후에 등록하면 다시 시작하지 않아도 해당 큐의 리스너와 워커 풀이 바로
+        시작된다. 이미 실행 중인 큐를 다시 등록하려면 먼저 unsubscribe()로 해제해야 한다.
+
+        같은 큐에 여러 번 등록하면 핸들러가 추가되어 하나의 리스너를 함께 사용한다.
+        다시 등록할 때 route만 지정하면 처음 등록한 큐 옵션을 그대로 사용하고, 다른 옵션을
+        지정하면 처음 등록할 때와 같아야 한다(다르면 ValueError). route로 핸들러마다 받을
+        메시지를 고른다.
+
         Args:
             queue_name: 구독할 Redis Queue 이름
-            
+                우선순위가 높은 순서의 큐 이름 목록을 주면 우선순위 그룹으로 구독한다.
+                그룹은 하나의 리스너가 매번 키 순서를 정해 다중 키 BLPOP으로 수신하며,
+                같은 핸들러가 큐마다 등록되고 지표도 큐별로 기록된다.
+                (reliable, stream, prefetch와 함께 사용할 수 없음)
+            batch_size: 한 번의 블로킹 대기 후 가져올 최대 메시지 수 (기본값 1)
+                1보다 크면 BLPOP이 반환된 직후 `LPOP key count`로 최대
+                batch_size - 1개의 메시지를 한 번의 왕복으로 추가로 가져온다.
+                핸들러는 여전히 메시지 단위로 호출된다. (Redis >= 6.2 필요)
+            concurrency: 핸들러를 동시에 실행할 워커 스레드 수 (기본값 1)
+                1보다 크면 리스너 스레드는 메시지 수신만 담당하고, 핸들러는
+                크기가 제한된 워커 풀에서 실행된다. 모든 워커가 바쁘면
+                리스너는 Redis에서 메시지를 더 가져오지 않는다.
+            ordering_key: 메시지에서 순서 보장 키를 추출하는 함수 (선택사항)
+                같은 키를 가진 메시지는 같은 워커에서 수신 순서대로 처리된다.
+            reliable: 신뢰성 큐 모드 사용 여부 (기본값 False)
+                True이면 메시지를 BLMOVE로 컨슈머별 처리 중 리스트에 옮긴 뒤
+                핸들러가 성공한 경우에만 제거한다. 핸들러가 실패한 메시지는
+                큐의 뒤쪽으로 되돌리되 max_attempts번 실패하면 데드레터 큐로 보내고,
+                디코딩할 수 없는 메시지는 바로 데드레터 큐로 보낸다. 죽은 컨슈머의
+                메시지는 다른 컨슈머가 되돌린다. (at-least-once, Redis >= 6.2 필요)
+            stream: True이면 queue_name을 Redis Stream으로 보고 컨슈머 그룹으로 구독
+                (기본값 False). batch_size는 XREADGROUP의 COUNT로 사용되고,
+                처리한 항목은 하나의 XACK로 모아서 확인한다. 핸들러가 실패한
+                항목은 확인하지 않으므로 claim_idle_ms 이후 다시 처리된다.
+            group: 스트림 컨슈머 그룹 이름 (stream=True일 때 필수)
+            block_ms: 스트림 XREADGROUP 블로킹 대기 시간 (밀리초, 기본값 1000)
+            claim_idle_ms: 이 시간(밀리초) 이상 확인되지 않은 스트림 항목을
+                XAUTOCLAIM으로 가져와 다시 처리 (기본값 60000)
+            stream_field: 핸들러에 전달할 값이 담긴 스트림 필드 이름 (기본값 "data")
+                항목에 이 필드가 없으면 필드 딕셔너리 전체를 전달한다.
+            codec: 이 큐의 메시지 코덱 (기본값은 RedisSubscriber의 codec)
+                한 번에 수신한 배치는 한 번에 변환하며, 변환에 실패한 메시지는
+                핸들러를 호출하지 않고 처리 실패로 기록한다.
+            prefetch: 로컬 프리페치 버퍼의 최대 깊이 (기본값 0, 사용하지 않음)
+                지정하면 리스너는 버퍼를 미리 채우는 역할만 하고, 별도의 디스패처
+                스레드가 버퍼에서 batch_size개씩 꺼내 핸들러(또는 워커 풀)로
+                전달하므로 네트워크 왕복과 핸들러 실행이 겹친다. 버퍼의 목표 깊이는
+                측정한 수신 왕복 시간과 핸들러 처리 시간에 맞춰 prefetch 이하로
+                조정된다. stop() 시 처리하지 못한 메시지는 큐의 앞쪽으로 되돌리며,
+                신뢰성 큐/스트림은 처리 중 리스트/미확인 목록에 남아 다시 처리된다.
+            weights: 우선순위 그룹의 큐별 가중치 (선택사항, queue_name 목록과 같은 길이)
+                지정하면 모든 큐에 메시지가 쌓여 있을 때 가중치 비율만큼 번갈아
+                꺼내고(가중 라운드 로빈), 지정하지 않으면 항상 앞쪽 큐부터 꺼낸다.
+            starvation_limit: 엄격한 우선순위에서 뒤쪽 큐가 이 횟수만큼 연속으로
+                밀리면 한 번은 먼저 꺼낸다 (기본값 100)
+            shards: 논리 큐를 나눈 샤드 수 (선택사항)
+                지정하면 "{queue_name}:{0}" ... "{queue_name}:{shards-1}" 키를 모두
+                구독한다. 샤드 번호가 해시 태그이므로 Redis Cluster에서는 여러 노드에
+                나누어 저장된다. 발행자는 RedisPublisher(shards=...)로 같은 키에 나누어
+                보낸다. 지표는 샤드 키별로 기록된다. (reliable, stream, prefetch와
+                함께 사용할 수 없음)
+            retry: 핸들러가 실패한 메시지의 재시도 정책 (선택사항)
+                지정하면 실패한 메시지를 "{queue_name}:retry" 정렬 집합에 재전달 시각과
+                함께 넣고, 재시도 스케줄러가 시각이 지난 메시지를 큐의 뒤쪽으로 옮긴다.
+                max_attempts번 실패한 메시지와 디코딩할 수 없는 메시지는 데드레터 큐로
+                보낸다. 신뢰성 큐이면 확인과 재시도 예약을 하나의 MULTI로 전송한다.
+                (stream과 함께 사용할 수 없음)
+            dead_letter: 데드레터 큐 이름 (기본값 "{queue_name}:dead")
+            max_attempts: retry 없이 신뢰성 큐로 구독할 때 처음 처리를 포함한 최대 시도 횟수
+                (기본값 5, retry를 지정하면 RetryPolicy의 max_attempts를 사용)
+            rate_limit: 처리 속도 상한 (선택사항, 예: "500/s", "1000/m", 초당 수를 숫자로)
+                리스너가 수신 전에 토큰 버킷에서 가져올 수만큼 토큰을 확보하므로,
+                한도에 걸리면 메시지를 꺼내 두지 않고 큐에 남긴 채 기다린다.
+            rate_limit_burst: 토큰 버킷에 쌓일 수 있는 최대 토큰 수 (기본값은 1초 분량)
+            rate_limit_shared: True이면 "{queue_name}:ratelimit" 키의 토큰 버킷을 모든
+                컨슈머 프로세스가 함께 사용 (기본값 False). 토큰은 0.1초 분량씩 빌려 와
+                로컬에서 나누어 쓰므로 메시지마다 Redis 왕복이 생기지 않는다.
+            max_in_flight: 수신했지만 처리가 끝나지 않은 메시지 수 상한 (선택사항)
+                워커 풀 대기열의 메시지도 포함하며, 상한에 도달하면 수신을 멈춘다.
+            max_concurrency: 워커 수 자동 조절 상한 (선택사항)
+                지정하면 concurrency를 최소로 하여 워커 수를 큐 길이와 핸들러 지연에 맞춰
+                concurrency ~ max_concurrency 사이에서 늘리고 줄인다.
+                (ordering_key, stream과 함께 사용할 수 없음)
+            emit_to: 핸들러 출력을 보낼 큐 이름 또는 목록 (선택사항)
+                지정하면 핸들러의 반환값을 emit_codec으로 인코딩해 대상 큐마다 보낸다.
+                반환값이 None이면 보내지 않고, 제너레이터이면 생성한 값을 각각 보낸다.
+                여러 메시지의 출력은 모아서 대상 큐마다 다중 값 RPUSH 하나로 전송하며,
+                신뢰성 큐/스트림은 입력 확인(LREM/XACK)과 같은 MULTI로 전송하므로
+                확인된 메시지의 출력은 반드시 함께 기록된다. 실패한 메시지는 출력을 보내지 않는다.
+            emit_codec: 핸들러 출력 코덱 (기본값은 이 큐의 codec)
+            dedup_key: 메시지에서 중복 판별 키를 추출하는 함수 (선택사항)
+                지정하면 수신한 배치에서 dedup_ttl 안에 이미 처리했거나 처리 중인 키의
+                메시지를 핸들러에 넘기지 않고 버린다(신뢰성 큐/스트림은 확인 처리).
+                최근 키는 로컬 LRU 캐시에서 먼저 찾고, 나머지는 배치마다 한 번의 파이프라인
+                SET NX EX로 모든 컨슈머가 공유하는 "{queue_name}:dedup:{key}"를 확인한다.
+                핸들러가 실패한 메시지의 키는 지워서 다시 처리할 수 있게 한다.
+                None을 반환하거나 디코딩할 수 없는 메시지는 판별하지 않는다.
+            dedup_ttl: 키를 기억할 시간 (초, 기본값 3600)
+            dedup_cache_size: 로컬 LRU 캐시의 최대 키 수 (기본값 10000, 0이면 사용하지 않음)
+            dedup_bloom_bits: 블룸 필터 비트맵 크기 (선택사항)
+                키 공간이 매우 커서 키마다 Redis 키를 만들기 어려우면 지정한다. 처리에 성공한
+                키를 dedup_ttl마다 바뀌는 비트맵에 기록하며(키를 기억하는 시간은 dedup_ttl ~
+                2 x dedup_ttl), 드물게 처음 받은 메시지를 중복으로 판단할 수 있다. 처리 중인 키는
+                Redis에 기록하지 않으므로, 다른 컨슈머가 같은 키의 메시지를 동시에 처리할 수 있다.
+            route: 이 핸들러가 받을 메시지 (선택사항, 기본값은 모든 메시지)
+                "필드=값"(예: "type=order.created")이면 딕셔너리 메시지의 필드 값이 같은
+                메시지만, 함수이면 메시지를 받아 참을 반환한 메시지만 받는다. "필드=값"
+                라우트는 start() 시 필드별 딕셔너리로 컴파일되어 메시지마다 한 번의 조회로
+                핸들러를 찾고(함수 라우트는 차례로 호출), 여러 핸들러가 맞으면 등록 순서대로
+                모두 호출한다. 맞는 핸들러가 없는 메시지는 unrouted에 따라 처리한다.
+                팬아웃에서 한 핸들러라도 실패하면 메시지는 실패로 처리되며, emit_to에는
+                성공한 경우 모든 핸들러의 반환값을 보낸다. retry, reliable, stream으로 다시
+                처리할 때는 맞는 핸들러를 모두 다시 호출하므로, 이미 성공한 핸들러도 같은
+                메시지를 다시 받는다(핸들러마다 at-least-once). 팬아웃하는 핸들러는 멱등하게
+                작성해야 한다. (배치 핸들러와 함께 사용할 수 없음)
+            unrouted: route에 맞는 핸들러가 없는 메시지의 처리 (기본값 "drop")
+                "drop"이면 경고 로그를 남기고 처리에 성공한 것으로 보고, "dead_letter"이면
+                큐의 codec으로 다시 인코딩해 데드레터 큐로 보낸다. 어느 쪽이든 stats()의
+                unrouted로 센다.
+
         Returns:
             데코레이터 함수
         """
-        def decorator(func: Callable[[str], Any]) -> Callable[[str], Any]:
+        arguments = {
+            key: value
+            for key, value in locals().items()
+            if key not in ("self", "queue_name", "route")
+        }
+        if batch_size < 1:
+            raise ValueError(f"batch_size는 1 이상이어야 합니다: {batch_size}")
+        if concurrency < 1:
+            raise ValueError(
+                f"concurrency는 1 이상이어야 합니다: {concurrency}"
+            )
+        if stream and not group:
+            raise ValueError(
+                "stream=True로 구독하려면 group을 지정해야 합니다."
+            )
+        if stream and reliable:
+            raise ValueError("stream과 reliable은 함께 사용할 수 없습니다.")
+        if prefetch < 0:
+            raise ValueError(f"prefetch는 0 이상이어야 합니다: {prefetch}")
+        if stream and retry is not None:
+            raise ValueError(
+                "스트림은 XAUTOCLAIM으로 다시 처리하므로 retry와 함께 사용할 수 없습니다."
+            )
+        if max_attempts < 1:
+            raise ValueError(
+                f"max_attempts는 1 이상이어야 합니다: {max_attempts}"
+            )
+        if unrouted not in UNROUTED_MODES:
+            raise ValueError(
+                f"지원하지 않는 unrouted 값입니다: {unrouted} "
+                f"(지원: {', '.join(UNROUTED_MODES)})"
+            )
+        rate = None if rate_limit is None else parse_rate(rate_limit)
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(
+                f"max_in_flight는 1 이상이어야 합니다: {max_in_flight}"
+            )
+        if (rate is not None or max_in_flight is not None) and (
+            not isinstance(queue_name, str)
+            or shards is not None
+            or stream
+            or prefetch
+        ):
+            raise ValueError(
+                "rate_limit, max_in_flight는 단일 큐의 일반/신뢰성 모드에서만 사용할 수 있습니다."
+            )
+        if max_concurrency is not None:
+            if max_concurrency < concurrency:
+                raise ValueError(
+                    "max_concurrency는 concurrency 이상이어야 합니다: "
+                    f"{max_concurrency} < {concurrency}"
+                )
+            if ordering_key is not None or stream:
+                raise ValueError(
+                    "max_concurrency는 ordering_key, stream과 함께 사용할 수 없습니다."
+                )
+
+        priority_group = None
+        shard_group = None
+        if shards is not None:
+            if not isinstance(queue_name, str):
+                raise ValueError(
+                    "shards는 큐 이름 하나로 구독할 때만 사용할 수 있습니다."
+                )
+            if shards < 1:
+                raise ValueError(f"shards는 1 이상이어야 합니다: {shards}")
+            if reliable or stream or prefetch:
+                raise ValueError(
+                    "샤딩된 큐는 reliable, stream, prefetch와 함께 사용할 수 없습니다."
+                )
+            queue_names = shard_names(queue_name, shards)
+            shard_group = queue_name
+        elif isinstance(queue_name, str):
+            queue_names = [queue_name]
+            if weights is not None:
+                raise ValueError(
+                    "weights는 큐 이름 목록으로 구독할 때만 사용할 수 있습니다."
+                )
+        else:
+            queue_names = list(queue_name)
+            if not queue_names or len(set(queue_names)) != len(queue_names):
+                raise ValueError(
+                    f"우선순위 그룹의 큐 이름 목록이 비어 있거나 중복되었습니다: {queue_names}"
+                )
+            if reliable or stream or prefetch:
+                raise ValueError(
+                    "우선순위 그룹은 reliable, stream, prefetch와 함께 사용할 수 없습니다."
+                )
+            if weights is not None and (
+                len(weights) != len(queue_names) or min(weights) < 1
+            ):
+                raise ValueError(
+                    f"weights는 큐 수와 같은 길이의 1 이상인 정수 목록이어야 합니다: {weights}"
+                )
+            if starvation_limit < 1:
+                raise ValueError(
+                    f"starvation_limit은 1 이상이어야 합니다: {starvation_limit}"
+                )
+            priority_group = "|".join(queue_names)
+        queue_codec = self.codec if codec is None else get_codec(codec)
+        emit_targets = (
+            [emit_to] if isinstance(emit_to, str) else list(emit_to or [])
+        )
+        if emit_codec is not None and not emit_targets:
+            raise ValueError("emit_codec은 emit_to와 함께 사용해야 합니다.")
+        if dedup_key is not None and (dedup_ttl <= 0 or dedup_cache_size < 0):
+            raise ValueError(
+                "dedup_ttl은 0보다, dedup_cache_size는 0 이상이어야 합니다: "
+                f"{dedup_ttl}, {dedup_cache_size}"
+            )
+        parsed_route = parse_route(route)
+
+        def decorator(
+            func: Callable[[Any], Any],
+            extra_options: Optional[Dict[str, Any]] = None,
+        ) -> Callable[[Any], Any]:
             """
             데코레이터 함수
-            
+
             Args:
                 func: 등록할 핸들러 함수
-                
+                extra_options: 함께 등록할 큐 옵션 (subscribe_batch()의 배치 핸들러 설정)
+
             Returns:
                 원본 함수
             """
-            self._handlers[queue_name] = func
-            self.logger.info(f"핸들러 등록됨: {queue_name} -> {func.__name__}")
+            if self._running and any(
+                name in self._handlers for name in queue_names
+            ):
+                raise ValueError(
+                    "이미 실행 중인 큐입니다. unsubscribe()로 해제한 뒤 "
+                    f"다시 등록하세요: {queue_names}"
+                )
+            batch = bool(extra_options and extra_options.get("batch_handler"))
+            existing = [name for name in queue_names if name in self._handlers]
+            if existing and (
+                batch
+                or any(
+                    self._options[name]["batch_handler"] for name in existing
+                )
+            ):
+                raise ValueError(
+                    f"배치 핸들러를 등록한 큐에는 핸들러를 추가할 수 없습니다: {existing}"
+                )
+            if batch and parsed_route is not None:
+                raise ValueError(
+                    "배치 핸들러는 route와 함께 사용할 수 없습니다."
+                )
+
+            defaults = inspect.signature(self.subscribe).parameters
+            # route만 지정해 다시 등록하면 처음 등록한 큐 옵션을 그대로 사용하고, 옵션을 지정했으면
+            # 하나의 리스너가 함께 사용하므로 처음 등록한 값과 같아야 함
+            if existing and any(
+                value != defaults[key].default
+                for key, value in arguments.items()
+            ):
+                for name in existing:
+                    changed = sorted(
+                        key
+                        for key, value in arguments.items()
+                        if self._arguments[name][key] != value
+                    )
+                    if changed:
+                        raise ValueError(
+                            "이미 등록한 큐에 다른 옵션으로 핸들러를 추가할 수 "
+                            f"없습니다 [{name}]: {', '.join(changed)}"
+                        )
+
+            for name in queue_names:
+                if name in self._handlers:
+                    self._routes[name].append((parsed_route, func))
+                    continue
+                self._handlers[name] = func
+                self._routes[name] = [(parsed_route, func)]
+                self._arguments[name] = arguments
+                self._options[name] = {
+                    "batch_size": batch_size,
+                    "concurrency": concurrency,
+                    "ordering_key": ordering_key,
+                    "reliable": reliable,
+                    "stream": stream,
+                    "group": group,
+                    "block_ms": block_ms,
+                    "claim_idle_ms": claim_idle_ms,
+                    "stream_field": stream_field,
+                    "codec": queue_codec,
+                    "prefetch": prefetch,
+                    "priority_group": priority_group,
+                    "shard_group": shard_group,
+                    "batch_handler": False,
+                    "max_wait_ms": 0,
+                    "retry": retry,
+                    "dead_letter": dead_letter or f"{name}:dead",
+                    "max_attempts": max_attempts,
+                    "rate_limit": rate,
+                    "rate_limit_burst": rate_limit_burst,
+                    "rate_limit_shared": rate_limit_shared,
+                    "max_in_flight": max_in_flight,
+                    "max_concurrency": max_concurrency,
+                    "emit_to": emit_targets,
+                    "emit_codec": (
+                        queue_codec
+                        if emit_codec is None
+                        else get_codec(emit_codec)
+                    ),
+                    "dedup_key": dedup_key,
+                    "dedup_ttl": dedup_ttl,
+                    "dedup_cache_size": dedup_cache_size,
+                    "dedup_bloom_bits": dedup_bloom_bits,
+                    "unrouted": unrouted,
+                }
+                self._options[name].update(extra_options or {})
+
+            if shard_group is not None:
+                self._shard_groups[shard_group] = queue_names
+            if priority_group is not None:
+                self._priority_groups[priority_group] = {
+                    "keys": queue_names,
+                    "weights": weights,
+                    "starvation_limit": starvation_limit,
+                }
+            label = (
+                f"{queue_name} (샤드 {shards}개)"
+                if shards
+                else priority_group or queue_name
+            )
+            if existing:
+                self.logger.info(
+                    f"핸들러 추가됨: {label} -> {func.__name__} (route={route!r})"
+                )
+                return func
+            self.logger.info(f"핸들러 등록됨: {label} -> {func.__name__}")
+
+            if self._supervisor is not None:
+                self.logger.warning(
+                    f"멀티프로세스 모드에서 실행 중에 등록한 핸들러는 워커 프로세스에 반영되지 않습니다: {label}"
+                )
+            elif self._running:
+                # 실행 중이면 다시 시작하지 않고 이 큐만 바로 수신 시작
+                try:
+                    self._start_queues(queue_names)
+                except Exception:
+                    self._unregister(queue_names)
+                    raise
+                self.logger.info(f"실행 중에 구독 시작됨: {label}")
             return func
-        
+
+        return decorator
+
+    def subscribe_batch(
+        self,
+        queue_name: str,
+        max_items: int = 1000,
+        max_wait_ms: float = 50,
+        concurrency: int = 1,
+        reliable: bool = False,
+        codec: Optional[Union[str, Codec]] = None,
+        retry: Optional[RetryPolicy] = None,
+        dead_letter: Optional[str] = None,
+        max_attempts: int = 5,
+        max_concurrency: Optional[int] = None,
+    ) -> Callable[[BatchHandler], BatchHandler]:
+        """
+        메시지 목록을 한 번에 받는 배치 핸들러 등록을 위한 데코레이터
+
+        리스너는 첫 메시지를 받은 뒤 max_wait_ms 동안 max_items개가 될 때까지 계속
+        수신하며, 매번 대기 중인 메시지를 `LPOP key count`로 한 번에 가져온다.
+        모인 메시지는 디코딩된 목록으로 핸들러에 한 번에 전달된다.
+
+        핸들러는 None(전체 성공) 또는 BatchResult를 반환한다. BatchResult로 지정한
+        메시지는 큐의 뒤쪽으로 되돌리거나(retry) 데드레터 큐로 보내고(dead_letter),
+        나머지는 성공으로 처리한다. 핸들러가 예외를 발생시키면 배치 전체가 실패하며,
+        신뢰성 큐이거나 retry를 지정했으면 모든 메시지를 다시 처리한다. retry를
+        지정하면 재시도할 메시지는 바로 되돌리지 않고 재시도 정책의 지연 후에
+        재전달된다. 디코딩에 실패한 메시지는 핸들러에 전달하지 않고 데드레터 큐로 보낸다.
+
+        Args:
+            queue_name: 구독할 Redis Queue 이름
+            max_items: 배치의 최대 메시지 수 (기본값 1000)
+            max_wait_ms: 첫 메시지를 받은 뒤 배치를 채우기 위해 기다릴 최대 시간
+                (밀리초, 기본값 50, 0이면 한 번의 수신으로 바로 전달)
+            concurrency: 배치 핸들러를 동시에 실행할 워커 스레드 수 (기본값 1)
+            reliable: 신뢰성 큐 모드 사용 여부 (기본값 False)
+            codec: 이 큐의 메시지 코덱 (기본값은 RedisSubscriber의 codec)
+            retry: 재시도 정책 (선택사항, subscribe()의 retry와 같음)
+            dead_letter: 데드레터 큐 이름 (기본값 "{queue_name}:dead")
+            max_attempts: retry 없이 되돌리는 메시지의 최대 시도 횟수 (기본값 5)
+                BatchResult.retry로 지정한 메시지와 신뢰성 큐에서 실패한 메시지는 시도 횟수를
+                기록해 큐의 뒤쪽으로 되돌리고, 이 횟수만큼 시도하면 데드레터 큐로 보낸다.
+            max_concurrency: 워커 수 자동 조절 상한
+                (선택사항, subscribe()의 max_concurrency와 같음)
+
+        Returns:
+            데코레이터 함수
+        """
+        if not isinstance(queue_name, str):
+            raise ValueError(
+                "배치 핸들러는 큐 이름 하나로만 구독할 수 있습니다."
+            )
+        if max_wait_ms < 0:
+            raise ValueError(
+                f"max_wait_ms는 0 이상이어야 합니다: {max_wait_ms}"
+            )
+        register = self.subscribe(
+            queue_name,
+            batch_size=max_items,
+            concurrency=concurrency,
+            reliable=reliable,
+            codec=codec,
+            retry=retry,
+            dead_letter=dead_letter,
+            max_attempts=max_attempts,
+            max_concurrency=max_concurrency,
+        )
+
+        def decorator(func: BatchHandler) -> BatchHandler:
+            """
+            데코레이터 함수
+
+            Args:
+                func: 등록할 배치 핸들러 함수
+
+            Returns:
+                원본 함수
+            """
+            return register(
+                func,
+                {
+                    "batch_handler": True,
+                    "max_wait_ms": max_wait_ms,
+                },
+            )
+
         return decorator
-    
-    def start(self):
-        """프레임워크 시작 - 모든 Queue Listener Thread 시작하고 메인 스레드 대기"""
+
+    def unsubscribe(
+        self,
+        queue_name: Union[str, List[str]],
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        큐 구독 해제
+
+        실행 중이면 해당 큐의 리스너만 멈추고, 이미 꺼낸 메시지는 마저 처리한 뒤
+        워커 풀, 프리페치 버퍼, 신뢰성 큐/스트림/재시도 상태를 stop()과 같은 방식으로
+        정리한다. 다른 큐의 처리는 멈추지 않는다.
+
+        Args:
+            queue_name: 해제할 큐 이름 (우선순위 그룹은 구독할 때의 큐 이름 목록,
+                샤딩된 큐는 논리 큐 이름). fetchers 수신 스레드나 클러스터 노드 수신
+                스레드가 다른 큐와 함께 수신하는 큐는 실행 중에 해제할 수 없다.
+            timeout: 이미 꺼낸 메시지의 처리를 기다릴 최대 시간
+                (초, 기본값은 shutdown_timeout)
+        """
+        if isinstance(queue_name, str) and queue_name in self._shard_groups:
+            queue_names = self._shard_groups[queue_name]
+            key = f"shards-{queue_name}"
+        elif isinstance(queue_name, str):
+            queue_names = [queue_name]
+            key = queue_name
+            options = self._options.get(queue_name)
+            if options is not None and (
+                options["priority_group"] or options["shard_group"]
+            ):
+                raise ValueError(
+                    "우선순위 그룹은 큐 이름 목록으로, 샤딩된 큐는 논리 큐 "
+                    f"이름으로 해제해야 합니다: {queue_name}"
+                )
+        else:
+            queue_names = list(queue_name)
+            key = f"priority-{'|'.join(queue_names)}"
+            if "|".join(queue_names) not in self._priority_groups:
+                raise ValueError(
+                    f"구독하지 않은 우선순위 그룹입니다: {queue_names}"
+                )
+        if any(name not in self._handlers for name in queue_names):
+            raise ValueError(f"구독하지 않은 큐입니다: {queue_name}")
+
         if self._running:
+            if self.cluster or key not in self._threads:
+                raise ValueError(
+                    f"다른 큐와 함께 수신하는 큐는 실행 중에 구독을 해제할 수 없습니다: {queue_name}"
+                )
+            self._stop_queues(queue_names, key, timeout)
+
+        self._unregister(queue_names)
+        self.logger.info(f"구독 해제됨: {queue_name}")
+
+    def start(self, processes: Optional[int] = None) -> None:
+        """
+        프레임워크 시작 - 모든 Queue Listener Thread 시작하고 메인 스레드 대기
+
+        Args:
+            processes: 워커 프로세스 수 (선택사항)
+                지정하면 현재 프로세스는 감독자가 되어 fork로 워커 프로세스를
+                띄운다. 각 워커는 자신만의 Redis 연결과 리스너 스레드를 가지며,
+                죽은 워커는 자동으로 다시 시작된다.
+        """
+        if self._running or self._supervisor is not None:
             self.logger.warning("프레임워크가 이미 실행 중입니다.")
             return
-        
+
+        if processes is not None:
+            if processes < 1:
+                raise ValueError(
+                    f"processes는 1 이상이어야 합니다: {processes}"
+                )
+            if self.transport is not None:
+                raise ValueError(
+                    "transport를 지정하면 processes를 사용할 수 없습니다."
+                )
+            self._run_supervisor(processes)
+            return
+
         # 이전에 실행된 적이 있다면 정리
         if self._threads:
             self.logger.info("이전 스레드 정보를 정리합니다.")
             self._threads.clear()
-        
+
         try:
-            # Redis 클라이언트 연결 (인증 정보 포함)
-            connection_kwargs = {'decode_responses': True}
-            
-            # 인증 정보가 제공된 경우 추가
-            if self.username:
-                connection_kwargs['username'] = self.username
-            if self.password:
-                connection_kwargs['password'] = self.password
-            
-            self._redis_client = redis.from_url(self.redis_url, **connection_kwargs)
-            self._redis_client.ping()  # 연결 테스트
-            
+            if self.transport is None:
+                self._redis_client = self._create_client()
+                self._redis_client.ping()  # 연결 테스트
+                self._transport = RedisTransport(
+                    self._redis_client,
+                    lambda: self._create_client(dedicated=True),
+                    cluster=self.cluster,
+                )
+            else:
+                self._transport = self.transport
+
             self._running = True
-            
-            # 각 큐별로 리스너 스레드 시작
-            for queue_name in self._handlers.keys():
-                thread = threading.Thread(
-                    target=self._queue_listener,
-                    args=(queue_name,),
-                    name=f"QueueListener-{queue_name}",
-                    daemon=True
-                )
-                thread.start()
-                self._threads[queue_name] = thread
-                self.logger.info(f"큐 리스너 스레드 시작됨: {queue_name}")
-            
+            self._shutdown.clear()
+            self._wakeup.clear()
+
+            if self._monitor is not None:
+                self._monitor.start()
+
+            # 핸들러 워커 풀과 리스너 스레드 시작
+            self._consumer_id = make_consumer_id()
+            self._start_queues(list(self._handlers), share_fetchers=True)
+
             self.logger.info("Redis Subscriber 프레임워크가 시작되었습니다.")
             self.logger.info("Ctrl+C를 눌러 종료할 수 있습니다.")
-            
+
             # 메인 스레드가 대기하도록 수정
             self._main_thread = threading.current_thread()
             self._wait_for_shutdown()
-            
+
         except Exception as e:
             self.logger.error(f"프레임워크 시작 실패: {e}")
             self.stop()
             raise
-    
-    def stop(self):
-        """프레임워크 종료 - 모든 Queue Listener Thread 안전 종료"""
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        프레임워크 종료 - 블로킹 대기 중인 리스너를 즉시 깨우고 실행 중인 핸들러를 기한 안에서 마무리
+
+        Args:
+            timeout: 실행 중인 핸들러와 워커 풀에 남은 메시지를 기다릴 최대 시간
+                (초, 기본값은 shutdown_timeout)
+        """
+        if self._supervisor is not None:
+            self.logger.info("워커 프로세스 종료 중...")
+            self._supervisor.stop()
+            return
+
         if not self._running:
             return
-        
+
         self._running = False
+        self._shutdown.set()
+        self._wakeup.set()
         self.logger.info("프레임워크 종료 중...")
-        
-        # 모든 스레드가 종료될 때까지 대기
-        for queue_name, thread in self._threads.items():
-            if thread.is_alive():
-                thread.join(timeout=1.0)
-                self.logger.info(f"큐 리스너 스레드 종료됨: {queue_name}")
-        
-        # Redis 연결 종료
-        if self._redis_client:
-            self._redis_client.close()
-            self._redis_client = None
-        
+        deadline = time.monotonic() + (
+            self.shutdown_timeout if timeout is None else timeout
+        )
+
+        # 프리페치 버퍼와 처리 한도를 닫아 자리나 토큰을 기다리는 리스너와 디스패처를 깨움
+        for buffer in list(self._prefetch.values()):
+            buffer.close()
+        for limiter in list(self._limiters.values()):
+            limiter.close()
+
+        # 블로킹 대기 중인 리스너를 CLIENT UNBLOCK으로 깨우고 종료 대기
+        self._stop_listeners(deadline)
+
+        # 종료 중인 워커 풀의 크기를 바꾸지 않도록 오토스케일러를 먼저 종료
+        if self._autoscaler_thread is not None:
+            self._autoscaler_thread.join(
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+            self._autoscaler_thread = None
+
+        queue_names = list(self._handlers)
+        self._drain_queues(queue_names, deadline)
+
+        # 관리 스레드와 재시도 스케줄러가 끝난 뒤 남은 확인 결과와 재시도 예약을 전송
+        if self._maintainer_thread is not None:
+            self._maintainer_thread.join(
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+            self._maintainer_thread = None
+        if self._retry_thread is not None:
+            self._retry_thread.join(
+                timeout=max(0.0, deadline - time.monotonic())
+            )
+            self._retry_thread = None
+        self._release_queues(queue_names)
+        if self._monitor is not None:
+            self._monitor.stop()
+        if self._profile_session is not None:
+            # 남은 시간을 기다리지 않고 지금까지 모은 프로파일을 출력
+            self._profile_session.cancel()
+
+        # Redis 연결 종료 (직접 넘겨받은 전송 계층은 호출한 쪽이 계속 사용할 수 있도록 닫지 않음)
+        for key in list(self._listener_clients):
+            self._disconnect_listener(key)
+        if (
+            self._transport is not None
+            and self._transport is not self.transport
+        ):
+            self._transport.close()
+        self._transport = None
+        self._redis_client = None
+
         # 스레드 정보 정리
         self._threads.clear()
         self.logger.info("Redis Subscriber 프레임워크가 종료되었습니다.")
-    
-    def _signal_handler(self, signum, frame):
+
+    def add_hook(self, event: str, func: Callable[..., Any]) -> None:
+        """
+        계측 훅 등록 - 훅이 없으면 호출 비용도 없다
+
+        Args:
+            event: 이벤트 이름
+                - on_fetch(queue_name, count, elapsed): 메시지 수신 직후
+                - on_handle_start(queue_name, message): 핸들러 호출 직전
+                - on_handle_end(queue_name, message, elapsed, error): 핸들러 종료 직후
+                  (error는 성공 시 None, 실패 시 발생한 예외)
+                - on_slow_handler(queue_name, payload, elapsed, stack):
+                  slow_handler_threshold보다 오래 실행 중인 핸들러 발견 시
+                  (payload는 잘린 메시지 repr, stack은 워커 스레드의 스택 문자열,
+                  감시 스레드에서 호출)
+            func: 호출할 함수 (훅에서 발생한 예외는 로그만 남기고 무시)
+        """
+        if event not in self._hooks:
+            raise ValueError(
+                f"지원하지 않는 훅 이벤트입니다: {event} (지원: {', '.join(HOOK_EVENTS)})"
+            )
+        self._hooks[event].append(func)
+
+    def stats(self, queue_depth: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        큐별 처리 지표 스냅샷 반환
+
+        멀티프로세스 모드에서는 모든 워커 프로세스의 지표를 합산한다.
+
+        Args:
+            queue_depth: True이면 LLEN/XLEN으로 조회한 큐 길이를 queue_depth로 포함
+                (모든 큐를 하나의 파이프라인으로 조회)
+
+        Returns:
+            큐 이름별 지표 딕셔너리
+                - received, processed, failed: 수신/성공/실패 메시지 수
+                - fetches, empty_polls: 수신 호출 수와 그중 빈 응답 수
+                - in_flight: 현재 실행 중인 핸들러 수
+                - handler_latency, fetch_latency: 지연 시간 히스토그램
+                - wait_latency: 수신한 메시지가 핸들러 시작까지 기다린 시간 히스토그램
+                  (워커 풀 대기 포함, 우선순위 그룹에서 큐별 지연 비교에 사용)
+                  (count, sum, buckets, mean, p50, p99 - 단위는 초)
+                - queue_depth: Redis에 남아 있는 메시지 수
+                - prefetched, prefetch_target: 프리페치 버퍼의 현재/목표 깊이
+                  (prefetch를 지정한 큐, 단일 프로세스 모드에서만)
+                - workers: 워커 풀의 현재 워커 수
+                  (워커 풀을 사용하는 큐, 단일 프로세스 모드에서만)
+                - dedup_local_hits, dedup_shared_hits, dedup_misses,
+                  dedup_hit_rate:
+                  로컬 캐시/Redis에서 찾은 중복 수, 처음 본 키 수, 중복 비율
+                - dedup_cache_size, dedup_cache_bytes: 로컬 캐시의 키 수와 메모리 추정치
+                  (dedup_key를 지정한 큐, 단일 프로세스 모드에서만)
+                - slow_handlers: slow_handler_threshold를 넘겨 보고된 핸들러 호출 수
+                - unrouted: route에 맞는 핸들러가 없던 메시지 수
+        """
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        merge_stats(snapshot, self._retired_stats)
+        if self._supervisor is not None:
+            merge_stats(snapshot, self._supervisor.stats())
+        else:
+            merge_stats(snapshot, self._metrics.snapshot())
+
+        for queue_name, buffer in list(self._prefetch.items()):
+            counters = snapshot.setdefault(queue_name, {})
+            counters["prefetched"] = len(buffer)
+            counters["prefetch_target"] = buffer.target
+        for queue_name, pool in list(self._pools.items()):
+            snapshot.setdefault(queue_name, {})["workers"] = pool.concurrency
+        for queue_name, dedup in list(self._dedup.items()):
+            snapshot.setdefault(queue_name, {}).update(dedup.stats())
+
+        if queue_depth and self._handlers:
+            try:
+                for queue_name, depth in self._queue_depths().items():
+                    snapshot.setdefault(queue_name, {})["queue_depth"] = depth
+            except Exception as e:
+                self.logger.warning(f"큐 길이 조회 실패: {e}")
+
+        return summarize(snapshot)
+
+    def profile(
+        self,
+        seconds: float = 30.0,
+        mode: str = "sample",
+        output: Optional[str] = None,
+    ) -> ProfileSession:
+        """
+        seconds 동안 핸들러별 프로파일을 모아 큐별 집계 결과를 로그(와 파일)로 출력
+
+        이미 진행 중인 프로파일이 있으면 그 세션을 반환한다. 프로파일이 끝나면
+        핸들러 호출 추적도 멈추므로 다시 비용이 없어진다.
+
+        Args:
+            seconds: 프로파일 시간 (초, 기본값 30)
+            mode: "sample"(기본값, 실행 중인 핸들러 스택을 5ms마다 샘플링) 또는
+                "cprofile"(핸들러 호출마다 cProfile - 정확하지만 핸들러가 느려짐)
+            output: 큐별 보고서를 저장할 파일 경로 (선택사항)
+
+        Returns:
+            ProfileSession 객체 (wait()로 끝날 때까지 기다려 큐별 보고서를 받을 수 있음)
+        """
+        session = self._profile_session
+        if session is not None:
+            self.logger.warning("이미 핸들러 프로파일이 진행 중입니다.")
+            return session
+
+        monitor = self._monitor or HandlerMonitor()
+        session = ProfileSession(
+            monitor,
+            seconds,
+            mode,
+            on_finish=lambda done: self._finish_profile(done, output),
+        )
+        monitor.session = session
+        self._profile_session = session
+        self._monitor = monitor
+        threading.Thread(
+            target=session.run, name="HandlerProfiler", daemon=True
+        ).start()
+        self.logger.info(f"핸들러 프로파일 시작: {seconds}초 ({mode})")
+        return session
+
+    def _finish_profile(
+        self, session: ProfileSession, output: Optional[str] = None
+    ) -> None:
+        """
+        끝난 프로파일의 보고서를 출력하고 더 필요 없으면 핸들러 호출 추적 중단
+
+        Args:
+            session: 끝난 프로파일 세션
+            output: 보고서를 저장할 파일 경로 (선택사항)
+        """
+        monitor = session.monitor
+        monitor.session = None
+        self._profile_session = None
+        if not monitor.active() and self._monitor is monitor:
+            self._monitor = None
+
+        if not session.reports:
+            self.logger.info("핸들러 프로파일 종료: 실행된 핸들러가 없습니다.")
+        for queue_name, report in session.reports.items():
+            self.logger.info(f"핸들러 프로파일 [{queue_name}]:\n{report}")
+        if output is not None:
+            try:
+                with open(output, "w", encoding="utf-8") as f:
+                    for queue_name, report in session.reports.items():
+                        f.write(f"== {queue_name} ==\n{report}\n\n")
+            except OSError as e:
+                self.logger.error(f"핸들러 프로파일 저장 실패 [{output}]: {e}")
+
+    def _report_slow_handler(self, call: SlowCall) -> None:
+        """
+        느린 핸들러 호출 보고 - 감시 스레드에서 호출
+
+        Args:
+            call: 기준 시간을 넘겨 실행 중인 호출
+        """
+        self.logger.warning(
+            f"느린 핸들러 [{call.queue_name}]: {call.elapsed:.2f}초째 실행 중 "
+            f"({call.thread_name}) "
+            f"- 메시지: {call.payload}\n{call.stack}"
+        )
+        self._metrics.queue(call.queue_name).record_slow()
+        if self._hooks["on_slow_handler"]:
+            self._run_hooks(
+                "on_slow_handler",
+                call.queue_name,
+                call.payload,
+                call.elapsed,
+                call.stack,
+            )
+
+    def serve_metrics(
+        self, port: int = 9100, host: str = "0.0.0.0"
+    ) -> MetricsServer:
+        """
+        Prometheus 텍스트 형식의 지표를 HTTP로 노출 (GET /metrics)
+
+        Args:
+            port: 바인딩할 포트 (0이면 임의 포트)
+            host: 바인딩할 주소
+
+        Returns:
+            MetricsServer 객체 (close()로 종료)
+        """
+        server = self._metrics_server
+        if server is None:
+            server = self._metrics_server = MetricsServer(
+                self.stats, host=host, port=port
+            )
+        return server
+
+    def _run_supervisor(self, processes: int) -> None:
+        """
+        멀티프로세스 모드 실행 - 워커 프로세스를 감독하며 메인 스레드 대기
+
+        Args:
+            processes: 워커 프로세스 수
+        """
+        # 워커의 stop()이 핸들러를 기다리는 시간보다 조금 더 기다린 뒤 강제 종료
+        supervisor = self._supervisor = ProcessSupervisor(
+            self, processes, shutdown_timeout=self.shutdown_timeout + 1.0
+        )
+        self.logger.info(
+            f"멀티프로세스 모드로 시작합니다. (워커 {processes}개)"
+        )
+        try:
+            supervisor.run()
+        except KeyboardInterrupt:
+            self.logger.info(
+                "키보드 인터럽트 수신됨. 프레임워크를 종료합니다..."
+            )
+        finally:
+            supervisor.stop()
+            # 종료 후에도 stats()로 최종 합산 결과를 확인할 수 있도록 보관
+            merge_stats(
+                self._retired_stats,
+                supervisor.stats(),
+                counters_only=True,
+            )
+            self._supervisor = None
+            self.logger.info("Redis Subscriber 프레임워크가 종료되었습니다.")
+
+    def _create_client(self, dedicated: bool = False) -> Any:
+        """
+        Redis 클라이언트 생성 (인증 정보와 연결 설정 포함)
+
+        Args:
+            dedicated: True이면 연결 풀 대신 하나의 연결만 사용하는 리스너 전용 클라이언트 생성
+                (블로킹 명령을 CLIENT UNBLOCK으로 깨울 수 있도록 연결 ID가 고정됨)
+
+        Returns:
+            Redis 클라이언트
+        """
+        redis_url = self.redis_url
+        if redis_url is None:
+            raise ValueError(
+                "redis_url 없이 Redis 클라이언트를 만들 수 없습니다."
+            )
+
+        # 응답은 bytes 그대로 받고 핸들러에 전달하기 직전에 큐별 코덱으로 변환
+        connection_kwargs: Dict[str, Any] = {
+            "decode_responses": False,
+            "socket_timeout": self.socket_timeout,
+            "socket_connect_timeout": self.socket_connect_timeout,
+            "health_check_interval": self.health_check_interval,
+        }
+        if not redis_url.startswith("unix://"):
+            connection_kwargs["socket_keepalive"] = self.socket_keepalive
+
+        # 인증 정보가 제공된 경우 추가
+        if self.username:
+            connection_kwargs["username"] = self.username
+        if self.password:
+            connection_kwargs["password"] = self.password
+
+        if self.cluster:
+            # 노드별 연결 풀과 MOVED/ASK 재시도는 RedisCluster가 관리
+            if self.max_connections is not None:
+                connection_kwargs["max_connections"] = self.max_connections
+            return RedisCluster.from_url(redis_url, **connection_kwargs)
+
+        if dedicated:
+            # 블로킹 명령이 응답 대기 시간에 걸리지 않도록 가장 긴 블로킹 대기 시간만큼 더 기다림
+            block = max(
+                [self.block_timeout]
+                + [
+                    options["block_ms"] / 1000
+                    for options in list(self._options.values())
+                    if options["stream"]
+                ]
+            )
+            if self.socket_timeout is not None and self.block_timeout:
+                connection_kwargs["socket_timeout"] = (
+                    self.socket_timeout + block
+                )
+            else:
+                connection_kwargs["socket_timeout"] = None
+            return redis.from_url(
+                redis_url,
+                single_connection_client=True,
+                **connection_kwargs,
+            )
+
+        if self.max_connections is not None:
+            # 연결이 모두 사용 중이면 에러 대신 빈 연결을 기다리는 공유 풀
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=self.max_connections,
+                **connection_kwargs,
+            )
+            return redis.Redis(connection_pool=pool)
+
+        return redis.from_url(redis_url, **connection_kwargs)
+
+    def _queue_depths(self) -> Dict[str, int]:
+        """
+        구독 중인 모든 큐의 길이를 하나의 파이프라인으로 조회
+
+        Returns:
+            큐 이름별 길이
+        """
+        if self.transport is not None:
+            # 사용자 전송 계층은 리스트 큐만 지원함
+            queue_names = list(self._handlers.keys())
+            return dict(zip(queue_names, self.transport.lengths(queue_names)))
+
+        client = self._redis_client
+        owns_client = client is None
+        if owns_client:
+            # 멀티프로세스 감독자 등 연결이 없는 경우 임시 연결 사용
+            client = self._create_client()
+
+        try:
+            queue_names = list(self._handlers.keys())
+            pipe = client.pipeline(transaction=False)
+            for queue_name in queue_names:
+                if self._options[queue_name]["stream"]:
+                    pipe.xlen(queue_name)
+                else:
+                    pipe.llen(queue_name)
+            return dict(zip(queue_names, pipe.execute()))
+        finally:
+            if owns_client:
+                client.close()
+
+    def _profile_signal_handler(self, signum: int, frame: Any) -> None:
+        """profile_signal 핸들러 - 프로파일 시작 (감독자는 워커 프로세스에 전달)"""
+        if self._supervisor is not None:
+            self._supervisor.signal_workers(signum)
+            return
+        self.profile(self.profile_seconds)
+
+    def _signal_handler(self, signum: int, frame: Any) -> None:
         """시그널 핸들러 - Ctrl+C 또는 SIGTERM 신호 처리"""
         self.logger.info(f"시그널 {signum} 수신됨. 프레임워크를 종료합니다...")
         self.stop()
         sys.exit(0)
-    
-    def _wait_for_shutdown(self):
-        """메인 스레드가 대기하도록 하는 메서드"""
+
+    def _wait_for_shutdown(self) -> None:
+        """메인 스레드가 대기하도록 하는 메서드 - 종료 요청이나 리스너 스레드 종료 시에만 깨어남"""
         try:
-            # 모든 큐 리스너 스레드가 살아있는 동안 대기
             while self._running:
-                # 모든 스레드가 살아있는지 확인
-                alive_threads = [name for name, thread in self._threads.items() if thread.is_alive()]
-                
-                if not alive_threads:
-                    self.logger.warning("모든 큐 리스너 스레드가 종료되었습니다.")
+                self._wakeup.wait()
+                self._wakeup.clear()
+
+                # 모든 스레드가 살아있는지 확인 (구독 해제 중인 리스너는 제외)
+                alive_threads = [
+                    name
+                    for name, thread in list(self._threads.items())
+                    if thread.is_alive()
+                ]
+
+                if (
+                    self._running
+                    and self._threads
+                    and not alive_threads
+                    and not self._retired_listeners
+                ):
+                    self.logger.warning(
+                        "모든 큐 리스너 스레드가 종료되었습니다."
+                    )
                     break
-                
-                # 1초마다 체크
-                threading.Event().wait(1.0)
-                
+
         except KeyboardInterrupt:
-            self.logger.info("키보드 인터럽트 수신됨. 프레임워크를 종료합니다...")
+            self.logger.info(
+                "키보드 인터럽트 수신됨. 프레임워크를 종료합니다..."
+            )
             self.stop()
         except Exception as e:
             self.logger.error(f"대기 중 에러 발생: {e}")
             self.stop()
-    
-    def _queue_listener(self, queue_name: str):
+
+    def _stop_listeners(
+        self, deadline: float, keys: Optional[List[str]] = None
+    ) -> None:
+        """
+        리스너 스레드를 깨워서 종료될 때까지 대기
+
+        CLIENT UNBLOCK을 보낸 시점에 아직 블로킹 명령을 보내기 전이던 리스너가
+        있을 수 있으므로, 남은 리스너가 있으면 짧은 주기로 다시 깨운다.
+
+        Args:
+            deadline: 대기를 포기할 시각 (time.monotonic)
+            keys: 종료를 기다릴 리스너 키 목록 (기본값은 모든 리스너)
+        """
+        pending = {
+            key: thread
+            for key, thread in list(self._threads.items())
+            if thread.is_alive() and (keys is None or key in keys)
+        }
+        while pending:
+            self._unblock_listeners(pending.keys())
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            next(iter(pending.values())).join(
+                timeout=min(UNBLOCK_INTERVAL, remaining)
+            )
+
+            for key in [
+                key for key, thread in pending.items() if not thread.is_alive()
+            ]:
+                del pending[key]
+                self.logger.info(f"큐 리스너 스레드 종료됨: {key}")
+
+        for key in pending:
+            self.logger.warning(
+                f"종료 기한 안에 끝나지 않은 큐 리스너 스레드가 있습니다: {key}"
+            )
+
+    def _unblock_listeners(self, keys: Iterable[str]) -> None:
+        """
+        리스너 전용 연결의 블로킹 명령을 하나의 파이프라인으로 해제
+
+        Args:
+            keys: 깨울 리스너 키 목록
+        """
+        # 재연결 중인 리스너는 연결이 없을 수 있음
+        entries = [self._listener_clients.get(key) for key in keys]
+        connection_ids: List[Hashable] = [
+            entry[1]
+            for entry in entries
+            if entry is not None and entry[1] is not None
+        ]
+        transport = self._transport
+        if not connection_ids or transport is None:
+            return
+
+        try:
+            transport.unblock(connection_ids)
+        except Exception as e:
+            self.logger.warning(f"리스너 블로킹 해제 실패: {e}")
+
+    def _listener_main(
+        self, key: str, target: Callable[..., Any], *args: Any
+    ) -> None:
+        """
+        리스너 스레드 진입점 - 에러가 나면 백오프 후 새 전용 연결로 다시 실행
+
+        리스너가 정상적으로 끝나거나(종료 요청, 프리페치 버퍼 닫힘) 어떤 이유로든
+        스레드가 끝나면 메인 스레드를 깨운다.
+
+        Args:
+            key: 리스너 키 (_listener_clients의 키)
+            target: 실행할 리스너 메서드 (첫 번째 인자로 전용 클라이언트를 받음)
+            *args: 리스너 메서드에 전달할 나머지 인자
+        """
+        backoff = Backoff(*self.reconnect_backoff)
+        try:
+            while self._listening(key):
+                started = time.monotonic()
+                try:
+                    client = (
+                        self._listener_clients[key][0]
+                        if key in self._listener_clients
+                        else self._connect_listener(key)
+                    )
+                    target(client, *args)
+                    break
+                except Exception as e:
+                    # 의도적인 종료나 구독 해제 중 연결이 닫힌 경우
+                    if not self._listening(key):
+                        break
+                    if time.monotonic() - started >= BACKOFF_RESET_AFTER:
+                        backoff.reset()
+                    delay = backoff.next_delay()
+                    self.logger.error(
+                        f"리스너 에러 [{key}]: {e} - {delay:.2f}초 후 다시 연결합니다."
+                    )
+                    self._disconnect_listener(key)
+                    if self._shutdown.wait(delay):
+                        break
+        finally:
+            self._wakeup.set()
+
+    @property
+    def _active_transport(self) -> Transport:
+        """
+        실행 중에 사용하는 전송 계층
+
+        Returns:
+            start()에서 준비한 전송 계층 (종료된 뒤에는 redis.ConnectionError)
+        """
+        transport = self._transport
+        if transport is None:
+            raise redis.ConnectionError("프레임워크가 종료되었습니다.")
+        return transport
+
+    def _connect_listener(self, key: str) -> Any:
+        """
+        리스너 전용 연결을 만들고 종료 시 깨울 수 있도록 연결 ID와 함께 등록
+
+        Args:
+            key: 리스너 키
+
+        Returns:
+            리스너 전용 연결 (RedisTransport이면 Redis 클라이언트)
+        """
+        transport = self._active_transport
+        client = transport.connect()
+        client_id = None
+        try:
+            client_id = transport.connection_id(client)
+        except redis.ResponseError as e:
+            # CLIENT ID를 쓸 수 없으면 종료 시 블로킹 타임아웃까지 기다림
+            self.logger.warning(f"리스너 연결 ID 조회 실패 [{key}]: {e}")
+        except Exception:
+            transport.disconnect(client)
+            raise
+        self._listener_clients[key] = (client, client_id)
+        if not self._listening(key):
+            # 재연결하는 사이에 종료되거나 구독이 해제된 경우
+            self._disconnect_listener(key)
+            raise redis.ConnectionError("프레임워크가 종료되었습니다.")
+        return client
+
+    def _listening(self, key: str) -> bool:
+        """
+        리스너가 계속 수신해야 하는지 여부
+
+        Args:
+            key: 리스너 키
+
+        Returns:
+            종료 요청이 없고 해당 리스너의 구독이 해제되지 않았으면 True
+        """
+        return self._running and key not in self._retired_listeners
+
+    def _disconnect_listener(self, key: str) -> None:
+        """
+        리스너 전용 연결을 닫고 등록 해제
+
+        Args:
+            key: 리스너 키
+        """
+        entry = self._listener_clients.pop(key, None)
+        if entry is None:
+            return
+        try:
+            self._active_transport.disconnect(entry[0])
+        except Exception:
+            pass
+
+    def _queue_listener(self, client: Any, queue_name: str) -> None:
         """
         Queue 리스너 스레드 메서드
-        
+
         Args:
+            client: 리스너 전용 Redis 클라이언트
             queue_name: 리스닝할 큐 이름
         """
-        handler = self._handlers[queue_name]
-        
-        while self._running:
-            try:
-                # BLPOP으로 메시지 대기 (1초 타임아웃)
-                result = self._redis_client.blpop(queue_name, timeout=1)
-                
-                if result is not None:
-                    # result는 (queue_name, message) 튜플
-                    _, message = result
-                    self.logger.debug(f"메시지 수신됨 [{queue_name}]: {message}")
-                    
-                    # 핸들러 함수 호출
-                    try:
-                        handler(message)
-                    except Exception as e:
-                        self.logger.error(f"핸들러 실행 중 에러 발생 [{queue_name}]: {e}")
-                
-            except Exception as e:
-                if self._running:  # 의도적인 종료가 아닌 경우에만 에러 로그
-                    self.logger.error(f"큐 리스너 에러 [{queue_name}]: {e}")
-                break
-        
-        self.logger.debug(f"큐 리스너 스레드 종료됨: {queue_name}")
+        buffer = self._prefetch.get(queue_name)
+        limiter = self._limiters.get(queue_name)
+        batch_size = count = self._options[queue_name]["batch_size"]
+        window = self._options[queue_name]["max_wait_ms"] > 0
+
+        while self._listening(queue_name):
+            if buffer is not None:
+                # 버퍼에 빈 자리가 생길 때까지 대기한 뒤 빈 자리만큼 수신
+                count = buffer.reserve()
+                if not count:
+                    break
+            elif limiter is not None:
+                # 처리 중 자리와 토큰을 먼저 확보한 만큼만 수신
+                count = limiter.acquire(batch_size)
+                if not count:
+                    break
+
+            # BLPOP으로 메시지 대기 (종료 시 CLIENT UNBLOCK으로 즉시 해제됨)
+            started = time.perf_counter()
+            result = self._active_transport.pop(
+                client, [queue_name], count, self.block_timeout
+            )
+
+            if result is None:
+                messages: List[bytes] = []
+                self._record_fetch(queue_name, messages, started)
+            else:
+                # result는 (queue_name, 메시지 목록) 튜플
+                _, messages = result
+                if window and len(messages) < count:
+                    self._fill_window(client, queue_name, messages, count)
+                self._record_fetch(queue_name, messages, started)
+            if limiter is not None:
+                limiter.unused(count - len(messages))
+            if messages:
+                self._deliver(queue_name, messages, count, started)
+
+        self.logger.debug(f"큐 리스너 스레드 종료됨: {queue_name}")
+
+    def _reliable_listener(self, client: Any, queue_name: str) -> None:
+        """
+        신뢰성 큐 리스너 스레드 메서드 - BLMOVE로 처리 중 리스트에 옮기며 수신
+
+        Args:
+            client: 리스너 전용 Redis 클라이언트
+            queue_name: 리스닝할 큐 이름
+        """
+        reliable = self._reliable[queue_name]
+        buffer = self._prefetch.get(queue_name)
+        limiter = self._limiters.get(queue_name)
+        batch_size = count = self._options[queue_name]["batch_size"]
+        window = self._options[queue_name]["max_wait_ms"] > 0
+
+        while self._listening(queue_name):
+            if buffer is not None:
+                # 버퍼에 빈 자리가 생길 때까지 대기한 뒤 빈 자리만큼 수신
+                count = buffer.reserve()
+                if not count:
+                    break
+            elif limiter is not None:
+                # 처리 중 자리와 토큰을 먼저 확보한 만큼만 수신
+                count = limiter.acquire(batch_size)
+                if not count:
+                    break
+
+            # 워커 풀이 처리한 메시지의 확인 결과를 수신 전에 전송
+            reliable.flush()
+
+            # BLMOVE로 메시지 대기 (종료 시 CLIENT UNBLOCK으로 즉시 해제됨)
+            started = time.perf_counter()
+            messages = reliable.fetch(
+                timeout=self.block_timeout, batch_size=count, client=client
+            )
+            if window and messages and len(messages) < count:
+                self._fill_window(client, queue_name, messages, count)
+            self._record_fetch(queue_name, messages, started)
+            if limiter is not None:
+                limiter.unused(count - len(messages))
+            if messages:
+                self._deliver(queue_name, messages, count, started)
+
+        self.logger.debug(f"큐 리스너 스레드 종료됨: {queue_name}")
+
+    def _stream_listener(self, client: Any, queue_name: str) -> None:
+        """
+        스트림 리스너 스레드 메서드 - XREADGROUP으로 묶어서 수신하고 방치된 항목 회수
+
+        Args:
+            client: 리스너 전용 Redis 클라이언트
+            queue_name: 리스닝할 스트림 키
+        """
+        consumer = self._streams[queue_name]
+        options = self._options[queue_name]
+        buffer = self._prefetch.get(queue_name)
+        count = options["batch_size"]
+        claim_interval = options["claim_idle_ms"] / 2000
+        next_claim = 0.0
+
+        while self._listening(queue_name):
+            if buffer is not None:
+                # 버퍼에 빈 자리가 생길 때까지 대기한 뒤 빈 자리만큼 수신
+                count = buffer.reserve()
+                if not count:
+                    break
+
+            # 워커 풀이 처리한 항목의 확인 결과를 수신 전에 전송
+            consumer.flush()
+
+            # 확인되지 않고 방치된 항목을 주기적으로 회수
+            if time.monotonic() >= next_claim:
+                started = time.perf_counter()
+                claimed = consumer.claim(options["claim_idle_ms"], count)
+                if claimed:
+                    self._record_fetch(queue_name, claimed, started)
+                    self.logger.info(
+                        f"방치된 스트림 항목 회수됨 [{queue_name}]: {len(claimed)}개"
+                    )
+                    self._deliver(queue_name, claimed, count, started)
+                    continue
+                next_claim = time.monotonic() + claim_interval
+
+            started = time.perf_counter()
+            entries = consumer.fetch(count, options["block_ms"], client=client)
+            self._record_fetch(queue_name, entries, started)
+            if entries:
+                self._deliver(queue_name, entries, count, started)
+
+        self.logger.debug(f"스트림 리스너 스레드 종료됨: {queue_name}")
+
+    def _reliable_maintainer(self) -> None:
+        """
+        신뢰성 큐 관리 스레드 메서드
+
+        주기적으로 밀린 확인 결과를 전송하고, 생존 신호를 기록하며,
+        죽은 컨슈머의 처리 중 메시지를 원래 큐로 되돌린다.
+        """
+        while not self._shutdown.wait(1.0):
+            try:
+                pipe = self._redis_client.pipeline(transaction=False)
+                # 실행 중에 구독/해제된 큐가 있을 수 있으므로 복사본을 순회
+                reliables = list(self._reliable.items())
+                for _, reliable in reliables:
+                    reliable.flush()
+                    reliable.heartbeat(pipe)
+                pipe.execute()
+
+                for queue_name, reliable in reliables:
+                    recovered, dead = reliable.reap(self.consumer_timeout)
+                    if recovered or dead:
+                        self._metrics.queue(queue_name).record_retries(
+                            recovered, dead
+                        )
+                        self.logger.warning(
+                            "죽은 컨슈머의 메시지를 큐로 되돌림 "
+                            f"[{queue_name}]: {recovered}개 "
+                            f"(시도 횟수를 모두 써서 데드레터 큐로 보냄: {dead}개)"
+                        )
+            except Exception as e:
+                if self._running:
+                    self.logger.error(f"신뢰성 큐 관리 에러: {e}")
+
+    def _retry_scheduler(self) -> None:
+        """
+        재시도 스케줄러 스레드 메서드
+
+        RETRY_TICK마다 워커 풀이 모아 둔 재시도 예약을 전송하고, 모든 재시도 큐에서
+        재전달 시각이 지난 메시지를 옮기는 스크립트를 하나의 파이프라인으로 실행한다.
+        정렬 집합의 시각 범위 조회 한 번으로 옮기므로 대기 중인 재시도가 많아도
+        메시지마다 타이머를 두지 않으며, 한 번에 MOVE_LIMIT개를 옮긴 큐가 있으면
+        기다리지 않고 이어서 옮긴다.
+        """
+        delay = RETRY_TICK
+        while not self._shutdown.wait(delay):
+            delay = RETRY_TICK
+            try:
+                retries = list(self._retries.items())
+                for queue_name, retry in retries:
+                    # 신뢰성 큐의 재시도 예약은 확인 결과와 함께 전송되어야 하므로 제외
+                    if queue_name not in self._reliable:
+                        retry.flush()
+
+                pipe = self._redis_client.pipeline(transaction=False)
+                now = time.time()
+                for _, retry in retries:
+                    retry.move_due(pipe, now)
+                if max(pipe.execute(), default=0) >= MOVE_LIMIT:
+                    delay = 0
+            except Exception as e:
+                if self._running:
+                    self.logger.error(f"재시도 스케줄러 에러: {e}")
+
+    def _multiplex_listener(
+        self, client: Any, queue_names: List[str], key: str
+    ) -> None:
+        """
+        다중 큐 수신 스레드 메서드 - 하나의 BLPOP으로 여러 큐를 동시에 대기
+
+        BLPOP은 키 순서상 가장 앞의 비어 있지 않은 큐에서 꺼내므로, 매 호출마다
+        키 순서를 회전시켜 메시지가 많은 큐가 다른 큐를 굶기지 않도록 한다.
+
+        Args:
+            client: 리스너 전용 Redis 클라이언트
+            queue_names: 이 스레드가 담당할 큐 이름 목록
+            key: 리스너 키
+        """
+        keys = list(queue_names)
+        counts = {
+            queue_name: self._options[queue_name]["batch_size"]
+            for queue_name in queue_names
+        }
+
+        while self._listening(key):
+            started = time.perf_counter()
+            result = self._active_transport.pop(
+                client, keys, counts, self.block_timeout
+            )
+
+            # 공정성을 위해 다음 호출의 키 순서를 회전
+            keys.append(keys.pop(0))
+
+            if result is not None:
+                queue_name, messages = result
+                self._record_fetch(queue_name, messages, started)
+                self._dispatch(queue_name, messages)
+
+        self.logger.debug(f"다중 큐 수신 스레드 종료됨: {queue_names}")
+
+    def _priority_listener(self, client: Any, group_name: str) -> None:
+        """
+        우선순위 그룹 수신 스레드 메서드 - 스케줄러가 정한 키 순서로 다중 키 BLPOP
+
+        Args:
+            client: 리스너 전용 Redis 클라이언트
+            group_name: 우선순위 그룹 이름
+        """
+        group = self._priority_groups[group_name]
+        scheduler = PriorityScheduler(
+            group["keys"], group["weights"], group["starvation_limit"]
+        )
+        counts = {
+            queue_name: self._options[queue_name]["batch_size"]
+            for queue_name in group["keys"]
+        }
+
+        while self._listening(f"priority-{group_name}"):
+            started = time.perf_counter()
+            result = self._active_transport.pop(
+                client, scheduler.order(), counts, self.block_timeout
+            )
+
+            if result is not None:
+                queue_name, messages = result
+                scheduler.served(queue_name)
+                self._record_fetch(queue_name, messages, started)
+                self._dispatch(queue_name, messages)
+
+        self.logger.debug(f"우선순위 그룹 수신 스레드 종료됨: {group_name}")
+
+    def _cluster_fetcher(
+        self, client: Any, queue_names: List[str], key: str
+    ) -> None:
+        """
+        클러스터 노드 수신 스레드 메서드 - 노드의 큐를 하나의 파이프라인 LPOP으로 수신
+
+        클러스터에서는 서로 다른 슬롯의 키를 하나의 BLPOP으로 대기할 수 없으므로
+        (CROSSSLOT), 노드가 담당하는 모든 큐에서 `LPOP key count`를 파이프라인으로
+        한 번에 보낸다. 모두 비어 있으면 한 큐에서 CLUSTER_IDLE_BLOCK초 동안만
+        블로킹 대기하고, 대기할 큐는 매번 회전시킨다. 계속 비어 있으면 대기 시간을
+        CLUSTER_IDLE_BLOCK_MAX초까지 두 배씩 늘리고, 메시지를 받으면 처음 값으로 되돌린다.
+
+        Args:
+            client: 리스너 전용 RedisCluster 클라이언트
+            queue_names: 이 스레드가 담당할 큐 이름 목록 (같은 노드의 키)
+            key: 리스너 키
+        """
+        keys = list(queue_names)
+        counts = [
+            self._options[queue_name]["batch_size"] for queue_name in keys
+        ]
+        idle_index = 0
+        idle_block = CLUSTER_IDLE_BLOCK
+
+        while self._listening(key):
+            started = time.perf_counter()
+            pipe = client.pipeline(transaction=False)
+            for queue_name, count in zip(keys, counts):
+                pipe.lpop(queue_name, count)
+            results = pipe.execute()
+
+            received = False
+            for queue_name, messages in zip(keys, results):
+                self._record_fetch(queue_name, messages or [], started)
+                if messages:
+                    received = True
+                    self._dispatch(queue_name, messages)
+            if received:
+                idle_block = CLUSTER_IDLE_BLOCK
+                continue
+
+            # 모든 큐가 비어 있으면 한 큐에서 짧게 블로킹 대기
+            queue_name = keys[idle_index % len(keys)]
+            idle_index += 1
+            started = time.perf_counter()
+            result = self._active_transport.pop(
+                client,
+                [queue_name],
+                self._options[queue_name]["batch_size"],
+                idle_block,
+            )
+            if result is not None:
+                idle_block = CLUSTER_IDLE_BLOCK
+                _, messages = result
+                self._record_fetch(queue_name, messages, started)
+                self._dispatch(queue_name, messages)
+            else:
+                idle_block = min(idle_block * 2, CLUSTER_IDLE_BLOCK_MAX)
+
+        self.logger.debug(f"클러스터 노드 수신 스레드 종료됨: {queue_names}")
+
+    def _record_fetch(
+        self, queue_name: str, messages: List[Any], started: float
+    ) -> None:
+        """
+        수신 지표 기록 및 on_fetch 훅 호출
+
+        Args:
+            queue_name: 수신한 큐 이름
+            messages: 수신한 메시지 목록 (빈 목록이면 빈 폴링)
+            started: 수신을 시작한 시각 (time.perf_counter)
+        """
+        elapsed = time.perf_counter() - started
+        self._metrics.queue(queue_name).record_fetch(len(messages), elapsed)
+        if self._hooks["on_fetch"]:
+            self._run_hooks("on_fetch", queue_name, len(messages), elapsed)
+
+    def _run_hooks(self, event: str, *args: Any) -> None:
+        """
+        등록된 훅 호출 - 훅의 예외가 메시지 처리에 영향을 주지 않도록 격리
+
+        Args:
+            event: 이벤트 이름
+            *args: 훅에 전달할 인자
+        """
+        for hook in self._hooks[event]:
+            try:
+                hook(*args)
+            except Exception as e:
+                self.logger.error("훅 실행 중 에러 발생 [%s]: %s", event, e)
+
+    def _fill_window(
+        self, client: Any, queue_name: str, messages: List[bytes], count: int
+    ) -> None:
+        """
+        배치 핸들러 큐의 수집 창 - max_wait_ms 동안 count개가 될 때까지 추가 수신
+
+        Args:
+            client: 리스너 전용 Redis 클라이언트
+            queue_name: 수신할 큐 이름
+            messages: 이미 수신한 메시지 목록 (수신한 메시지가 추가됨)
+            count: 배치의 최대 메시지 수
+        """
+        reliable = self._reliable.get(queue_name)
+        deadline = (
+            time.monotonic() + self._options[queue_name]["max_wait_ms"] / 1000
+        )
+
+        while len(messages) < count and self._listening(queue_name):
+            remaining = deadline - time.monotonic()
+            # Redis는 블로킹 대기 시간을 밀리초로 자르므로 1ms 미만이면 0(무제한 대기)이 됨
+            if remaining < 0.001:
+                break
+
+            needed = count - len(messages)
+            if reliable is not None:
+                received = reliable.fetch(
+                    timeout=remaining, batch_size=needed, client=client
+                )
+            else:
+                result = self._active_transport.pop(
+                    client, [queue_name], needed, remaining
+                )
+                received = [] if result is None else result[1]
+            if not received:
+                break
+            messages.extend(received)
+
+    def _deliver(
+        self,
+        queue_name: str,
+        messages: List[Any],
+        requested: int,
+        started: float,
+    ) -> None:
+        """
+        수신한 메시지를 프리페치 버퍼에 넣거나 바로 전달
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            messages: 수신한 메시지 목록
+            requested: 요청한 메시지 수
+            started: 수신을 시작한 시각 (time.perf_counter)
+        """
+        buffer = self._prefetch.get(queue_name)
+        if buffer is None:
+            self._dispatch(queue_name, messages)
+            return
+
+        # 요청한 만큼 모두 받았다면 블로킹 대기 없이 응답한 것이므로 왕복 시간으로 기록
+        if len(messages) >= requested:
+            buffer.observe_fetch(time.perf_counter() - started)
+        buffer.put(messages)
+
+    def _return_prefetched(self, queue_names: List[str]) -> None:
+        """
+        프리페치 버퍼에 남은 메시지를 수신 순서대로 큐의 앞쪽에 되돌림
+
+        Args:
+            queue_names: 버퍼를 정리할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            buffer = self._prefetch.pop(queue_name, None)
+            if buffer is None:
+                continue
+            remaining = buffer.drain()
+            if not remaining:
+                continue
+
+            if queue_name in self._reliable or queue_name in self._streams:
+                # 처리 중 리스트/미확인 목록에 남아 있으므로 release() 또는 XAUTOCLAIM으로 다시 처리됨
+                self.logger.info(
+                    f"처리하지 못한 프리페치 메시지 [{queue_name}]: "
+                    f"{len(remaining)}개 (확인하지 않고 남겨 둠)"
+                )
+                continue
+
+            try:
+                self._active_transport.push(queue_name, remaining, front=True)
+                self.logger.info(
+                    "처리하지 못한 프리페치 메시지를 큐로 반환함 "
+                    f"[{queue_name}]: {len(remaining)}개"
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"프리페치 메시지 반환 실패 [{queue_name}]: "
+                    f"{len(remaining)}개 유실 - {e}"
+                )
+
+    def _dispatch(self, queue_name: str, messages: List[Any]) -> None:
+        """
+        수신한 메시지를 배치 단위로 디코딩한 뒤 워커 풀 또는 현재 스레드의 핸들러로 전달
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            messages: 처리할 원본 메시지 목록 (스트림이면 디코딩된 (항목 ID, 메시지) 목록)
+        """
+        pool = self._pools.get(queue_name)
+        fetched_at = time.perf_counter()
+        options = self._options[queue_name]
+        retry = self._retries.get(queue_name)
+        # 재전달된 메시지는 시도 횟수 봉투를 벗긴 뒤 디코딩
+        if (
+            retry is None
+            and queue_name not in self._reliable
+            and not options["batch_handler"]
+        ):
+            payloads = messages
+        else:
+            payloads = [unwrap(message)[0] for message in messages]
+
+        if options["batch_handler"]:
+            # 재시도/데드레터 처리에 원본 메시지가 필요하므로 함께 전달
+            batch = list(
+                zip(messages, decode_each(options["codec"], payloads))
+            )
+            if pool is not None:
+                pool.submit((batch, fetched_at))
+                return
+            self._process_batch(queue_name, batch, fetched_at)
+            acker: Optional[
+                Union[ReliableQueue, StreamConsumer, RetryQueue]
+            ] = (self._reliable.get(queue_name) or retry)
+            if acker is not None:
+                acker.flush()
+            return
+
+        if queue_name in self._streams:
+            # 스트림 항목은 StreamConsumer가 필드를 꺼내면서 이미 디코딩함
+            items = messages
+        elif queue_name in self._reliable or retry is not None:
+            # 처리 결과 확인(LREM)과 재시도 예약에는 원본 메시지가 필요하므로 함께 전달
+            items = list(
+                zip(messages, decode_each(options["codec"], payloads))
+            )
+        else:
+            items = decode_each(options["codec"], messages)
+
+        dedup = self._dedup.get(queue_name)
+        if dedup is not None:
+            items = self._drop_duplicates(queue_name, dedup, items)
+
+        # 이미 큐에서 꺼낸 메시지이므로 종료 요청과 관계없이 모두 처리
+        for message in items:
+            if pool is not None:
+                # 워커가 모두 바쁘면 여기서 블로킹되어 수신이 멈춤
+                pool.submit((message, fetched_at))
+            else:
+                self._process_message(queue_name, message, fetched_at)
+
+        # 현재 스레드에서 처리한 배치의 확인 결과와 출력은 한 번에 전송
+        acker = (
+            self._reliable.get(queue_name)
+            or self._streams.get(queue_name)
+            or retry
+        )
+        if acker is not None and pool is None:
+            acker.flush()
+        forwarder = self._forwarders.get(queue_name)
+        if forwarder is not None and pool is None:
+            forwarder.flush()
+
+    def _drop_duplicates(
+        self, queue_name: str, dedup: Deduplicator, items: List[Any]
+    ) -> List[Any]:
+        """
+        디코딩한 배치에서 중복 메시지를 걸러내고, 신뢰성 큐/스트림이면 버린 메시지를 확인 처리
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            dedup: 이 큐의 Deduplicator
+            items: _dispatch()가 디코딩한 항목 목록
+                (스트림이면 (항목 ID, 메시지), 신뢰성 큐/재시도이면 (원본, 메시지) 튜플)
+
+        Returns:
+            중복이 아닌 항목 목록
+        """
+        consumer = self._streams.get(queue_name)
+        reliable = self._reliable.get(queue_name)
+        paired = (
+            consumer is not None
+            or reliable is not None
+            or queue_name in self._retries
+        )
+        duplicates = dedup.check(
+            [item[1] for item in items] if paired else items
+        )
+        if not any(duplicates):
+            return items
+
+        kept = []
+        for item, duplicate in zip(items, duplicates):
+            if not duplicate:
+                kept.append(item)
+            elif consumer is not None:
+                consumer.ack(item[0])
+            elif reliable is not None:
+                reliable.ack(item[0])
+
+        limiter = self._limiters.get(queue_name)
+        if limiter is not None:
+            limiter.done(len(items) - len(kept))
+        self.logger.debug(
+            "중복 메시지 건너뜀 [%s]: %s개", queue_name, len(items) - len(kept)
+        )
+        return kept
+
+    def _start_queues(
+        self, queue_names: List[str], share_fetchers: bool = False
+    ) -> None:
+        """
+        큐의 처리 상태, 워커 풀, 프리페치 버퍼와 리스너 시작 - start()와 실행 중 subscribe()에서 사용
+
+        Args:
+            queue_names: 시작할 큐 이름 목록
+            share_fetchers: fetchers 수신 스레드에 큐를 나누어 배정할지 여부
+                (실행 중에 구독한 큐는 전용 리스너를 사용하므로 False)
+        """
+        if self.cluster:
+            self._check_cluster(queue_names)
+        if self.transport is not None:
+            self._check_transport(queue_names)
+        self._start_routers(queue_names)
+        self._start_retries(queue_names)
+        self._start_limiters(queue_names)
+        self._start_forwarders(queue_names)
+        self._start_dedup(queue_names)
+        self._start_reliable(queue_names)
+        self._start_streams(queue_names)
+        for queue_name in queue_names:
+            self._start_pool(queue_name)
+            self._start_prefetch(queue_name)
+        self._start_listeners(queue_names, share_fetchers)
+        self._start_autoscaler()
+
+    def _check_cluster(self, queue_names: List[str]) -> None:
+        """
+        클러스터 모드에서 지원하지 않는 옵션으로 구독한 큐 확인
+
+        Args:
+            queue_names: 확인할 큐 이름 목록
+        """
+        unsupported = [
+            name
+            for name in queue_names
+            if any(
+                self._options[name][option]
+                for option in (
+                    "reliable",
+                    "stream",
+                    "prefetch",
+                    "priority_group",
+                    "retry",
+                    "rate_limit",
+                    "max_in_flight",
+                )
+            )
+        ]
+        if unsupported:
+            raise ValueError(
+                "클러스터 모드에서는 reliable, stream, prefetch, retry, "
+                "rate_limit, max_in_flight, 우선순위 그룹을 사용할 수 없습니다: "
+                f"{unsupported}"
+            )
+
+    def _check_transport(self, queue_names: List[str]) -> None:
+        """
+        transport를 지정했을 때 Redis 서버 기능이 필요한 옵션으로 구독한 큐 확인
+
+        Args:
+            queue_names: 확인할 큐 이름 목록
+        """
+        unsupported = [
+            name
+            for name in queue_names
+            if any(
+                self._options[name][option]
+                for option in (
+                    "reliable",
+                    "stream",
+                    "retry",
+                    "rate_limit_shared",
+                    "dedup_key",
+                )
+            )
+        ]
+        if unsupported:
+            raise ValueError(
+                "transport를 지정하면 reliable, stream, retry, "
+                f"rate_limit_shared, dedup_key를 사용할 수 없습니다: {unsupported}"
+            )
+
+    def _stop_queues(
+        self, queue_names: List[str], key: str, timeout: Optional[float] = None
+    ) -> None:
+        """
+        실행 중인 큐 하나(또는 우선순위/샤드 그룹)의 리스너를 멈추고 남은 작업 정리
+
+        Args:
+            queue_names: 정리할 큐 이름 목록
+            key: 이 큐들을 수신하는 리스너 키
+            timeout: 이미 꺼낸 메시지의 처리를 기다릴 최대 시간 (초, 기본값은 shutdown_timeout)
+        """
+        deadline = time.monotonic() + (
+            self.shutdown_timeout if timeout is None else timeout
+        )
+        self._retired_listeners.add(key)
+        try:
+            for queue_name in queue_names:
+                # 오토스케일러가 더 이상 이 큐의 워커 풀 크기를 바꾸지 않도록 먼저 제거
+                self._scalers.pop(queue_name, None)
+                if queue_name in self._prefetch:
+                    self._prefetch[queue_name].close()
+                if queue_name in self._limiters:
+                    self._limiters[queue_name].close()
+
+            self._stop_listeners(deadline, [key])
+            self._drain_queues(queue_names, deadline)
+            self._release_queues(queue_names)
+            self._disconnect_listener(key)
+            self._threads.pop(key, None)
+        finally:
+            self._retired_listeners.discard(key)
+
+    def _drain_queues(self, queue_names: List[str], deadline: float) -> None:
+        """
+        리스너가 멈춘 큐의 프리페치 디스패처와 워커 풀을 마무리하고 남은 프리페치 메시지 반환
+
+        Args:
+            queue_names: 정리할 큐 이름 목록
+            deadline: 대기를 포기할 시각 (time.monotonic)
+        """
+        # 디스패처가 전달 중인 배치를 마칠 때까지 대기
+        for queue_name in queue_names:
+            buffer = self._prefetch.get(queue_name)
+            if buffer is not None and not buffer.join(
+                timeout=max(0.0, deadline - time.monotonic())
+            ):
+                self.logger.warning(
+                    f"종료 기한 안에 끝나지 않은 프리페치 디스패처가 있습니다 [{queue_name}]"
+                )
+
+        # 워커 풀에 남은 메시지를 기한 안에서 모두 처리한 뒤 종료
+        for queue_name in queue_names:
+            pool = self._pools.pop(queue_name, None)
+            if pool is None:
+                continue
+            if pool.shutdown(timeout=max(0.0, deadline - time.monotonic())):
+                self.logger.info(f"큐 워커 풀 종료됨: {queue_name}")
+            else:
+                self.logger.warning(
+                    f"종료 기한 안에 끝나지 않은 핸들러가 있습니다 [{queue_name}]"
+                )
+
+        self._return_prefetched(queue_names)
+
+    def _release_queues(self, queue_names: List[str]) -> None:
+        """
+        처리가 끝난 큐의 신뢰성 큐, 재시도, 스트림 상태를 정리하고 처리 한도 해제
+
+        Args:
+            queue_names: 정리할 큐 이름 목록
+        """
+        # 신뢰성 큐: 남은 확인 결과 전송 후 처리하지 못한 메시지를 원래 큐로 반환
+        for queue_name in queue_names:
+            reliable = self._reliable.pop(queue_name, None)
+            if reliable is None:
+                continue
+            try:
+                returned = reliable.release()
+                if returned:
+                    self.logger.info(
+                        f"처리하지 못한 메시지를 큐로 반환함 [{queue_name}]: {returned}개"
+                    )
+            except Exception as e:
+                self.logger.error(f"신뢰성 큐 정리 실패 [{queue_name}]: {e}")
+
+        # 재시도: 남은 재시도 예약과 데드레터 메시지 전송
+        for queue_name in queue_names:
+            retry = self._retries.pop(queue_name, None)
+            if retry is None:
+                continue
+            try:
+                retry.flush()
+            except Exception as e:
+                self.logger.error(f"재시도 예약 전송 실패 [{queue_name}]: {e}")
+
+        # 중복 제거: 블룸 필터에 남은 처리 성공 키 기록
+        for queue_name in queue_names:
+            dedup = self._dedup.pop(queue_name, None)
+            if dedup is None:
+                continue
+            try:
+                dedup.flush()
+            except Exception as e:
+                self.logger.error(
+                    f"중복 판별 키 기록 실패 [{queue_name}]: {e}"
+                )
+
+        # 출력 전달: 일반 큐에서 처리에 성공한 메시지의 남은 출력 전송
+        for queue_name in queue_names:
+            forwarder = self._forwarders.pop(queue_name, None)
+            if forwarder is None:
+                continue
+            try:
+                forwarder.flush()
+            except Exception as e:
+                self.logger.error(f"핸들러 출력 전달 실패 [{queue_name}]: {e}")
+
+        # 스트림: 남은 XACK 전송 후 처리 중인 항목이 없으면 컨슈머 등록 해제
+        for queue_name in queue_names:
+            consumer = self._streams.pop(queue_name, None)
+            if consumer is None:
+                continue
+            try:
+                consumer.release()
+            except Exception as e:
+                self.logger.error(
+                    f"스트림 컨슈머 정리 실패 [{queue_name}]: {e}"
+                )
+
+        for queue_name in queue_names:
+            self._limiters.pop(queue_name, None)
+            self._scalers.pop(queue_name, None)
+
+    def _unregister(self, queue_names: List[str]) -> None:
+        """
+        큐의 핸들러와 옵션 등록 해제
+
+        Args:
+            queue_names: 해제할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            self._handlers.pop(queue_name, None)
+            self._routes.pop(queue_name, None)
+            self._arguments.pop(queue_name, None)
+            self._dispatch_table.pop(queue_name, None)
+            options = self._options.pop(queue_name, None)
+            if options is None:
+                continue
+            if options["shard_group"] is not None:
+                self._shard_groups.pop(options["shard_group"], None)
+            if options["priority_group"] is not None:
+                self._priority_groups.pop(options["priority_group"], None)
+
+    def _start_listeners(
+        self, queue_names: List[str], share_fetchers: bool = False
+    ) -> None:
+        """
+        큐 리스너 스레드 시작 - fetchers 지정 시 다중 키 수신 스레드로 대체
+
+        Args:
+            queue_names: 리스너를 시작할 큐 이름 목록
+            share_fetchers: fetchers 수신 스레드에 큐를 나누어 배정할지 여부
+        """
+        # 신뢰성 큐는 BLMOVE가 단일 키만 지원하므로 항상 전용 리스너 사용
+        for queue_name in queue_names:
+            if queue_name in self._reliable:
+                self._start_listener(
+                    queue_name,
+                    f"QueueListener-{queue_name}",
+                    self._reliable_listener,
+                    queue_name,
+                )
+                self.logger.info(
+                    f"신뢰성 큐 리스너 스레드 시작됨: {queue_name}"
+                )
+
+        for queue_name in queue_names:
+            if queue_name in self._streams:
+                self._start_listener(
+                    queue_name,
+                    f"StreamListener-{queue_name}",
+                    self._stream_listener,
+                    queue_name,
+                )
+                self.logger.info(f"스트림 리스너 스레드 시작됨: {queue_name}")
+
+        # 우선순위 그룹은 키 순서를 직접 정해야 하므로 그룹마다 전용 리스너 사용
+        priority_groups = dict.fromkeys(
+            self._options[name]["priority_group"]
+            for name in queue_names
+            if self._options[name]["priority_group"] is not None
+        )
+        for group_name in priority_groups:
+            self._start_listener(
+                f"priority-{group_name}",
+                f"PriorityListener-{group_name}",
+                self._priority_listener,
+                group_name,
+            )
+            self.logger.info(f"우선순위 그룹 수신 스레드 시작됨: {group_name}")
+
+        plain_queues = [
+            name
+            for name in queue_names
+            if name not in self._reliable
+            and name not in self._streams
+            and self._options[name]["priority_group"] is None
+        ]
+        if not plain_queues:
+            return
+
+        if self.cluster:
+            # 실행 중에 구독한 큐는 기존 노드 수신 스레드와 겹치지 않도록 키에 큐 이름을 붙임
+            label = (
+                None
+                if share_fetchers
+                else self._options[plain_queues[0]]["shard_group"]
+                or plain_queues[0]
+            )
+            self._start_cluster_fetchers(plain_queues, label)
+            return
+
+        if self.fetchers and share_fetchers:
+            # 프리페치 큐는 버퍼의 빈 자리만큼, 배치 핸들러 큐는 수집 창 동안 한 키에서,
+            # 처리 한도가 있는 큐는 확보한 수만큼 수신해야 하므로 항상 전용 리스너 사용
+            dedicated = [
+                name
+                for name in plain_queues
+                if name in self._prefetch
+                or name in self._limiters
+                or self._options[name]["batch_handler"]
+            ]
+            multiplexed = [
+                name for name in plain_queues if name not in dedicated
+            ]
+        else:
+            # 샤딩된 큐는 샤드 키 전체를 하나의 다중 키 BLPOP으로 대기
+            shard_groups = dict.fromkeys(
+                self._options[name]["shard_group"]
+                for name in plain_queues
+                if self._options[name]["shard_group"] is not None
+            )
+            for group_name in shard_groups:
+                keys = self._shard_groups[group_name]
+                self._start_listener(
+                    f"shards-{group_name}",
+                    f"ShardListener-{group_name}",
+                    self._multiplex_listener,
+                    keys,
+                    f"shards-{group_name}",
+                )
+                self.logger.info(
+                    f"샤딩된 큐 수신 스레드 시작됨: {group_name} ({len(keys)}개 샤드)"
+                )
+            dedicated = [
+                name
+                for name in plain_queues
+                if self._options[name]["shard_group"] is None
+            ]
+            multiplexed = []
+
+        # 각 큐별로 리스너 스레드 시작
+        for queue_name in dedicated:
+            self._start_listener(
+                queue_name,
+                f"QueueListener-{queue_name}",
+                self._queue_listener,
+                queue_name,
+            )
+            self.logger.info(f"큐 리스너 스레드 시작됨: {queue_name}")
+
+        # 나머지 큐를 수신 스레드에 고르게 분배
+        step = self.fetchers or 0
+        for index in range(min(step, len(multiplexed))):
+            assigned = multiplexed[index::step]
+            self._start_listener(
+                f"fetcher-{index}",
+                f"QueueFetcher-{index}",
+                self._multiplex_listener,
+                assigned,
+                f"fetcher-{index}",
+            )
+            self.logger.info(
+                f"다중 큐 수신 스레드 시작됨: fetcher-{index} ({len(assigned)}개 큐)"
+            )
+
+    def _start_cluster_fetchers(
+        self, queue_names: List[str], label: Optional[str] = None
+    ) -> None:
+        """
+        클러스터 모드 수신 스레드 시작 - 큐를 담당 노드별로 묶어 노드마다 스레드 하나 사용
+
+        Args:
+            queue_names: 수신할 큐 이름 목록
+            label: 리스너 키와 스레드 이름에 붙일 이름 (실행 중에 구독한 큐 이름, 선택사항)
+        """
+        by_node: Dict[str, List[str]] = {}
+        for queue_name in queue_names:
+            node = self._redis_client.get_node_from_key(queue_name)
+            by_node.setdefault(node.name, []).append(queue_name)
+
+        for node_name, keys in by_node.items():
+            name = node_name if label is None else f"{node_name}-{label}"
+            self._start_listener(
+                f"node-{name}",
+                f"ClusterFetcher-{name}",
+                self._cluster_fetcher,
+                keys,
+                f"node-{name}",
+            )
+            self.logger.info(
+                f"클러스터 노드 수신 스레드 시작됨: {name} ({len(keys)}개 큐)"
+            )
+
+    def _start_listener(
+        self,
+        key: str,
+        thread_name: str,
+        target: Callable[..., Any],
+        *args: Any,
+    ) -> None:
+        """
+        전용 연결을 가진 리스너 스레드 시작
+
+        Args:
+            key: 리스너 키 (_threads와 _listener_clients의 키)
+            thread_name: 스레드 이름
+            target: 리스너 메서드 (첫 번째 인자로 전용 클라이언트를 받음)
+            *args: 리스너 메서드에 전달할 나머지 인자
+        """
+        self._connect_listener(key)
+
+        thread = threading.Thread(
+            target=self._listener_main,
+            args=(key, target) + args,
+            name=thread_name,
+            daemon=True,
+        )
+        thread.start()
+        self._threads[key] = thread
+
+    def _start_reliable(self, queue_names: List[str]) -> None:
+        """
+        신뢰성 큐 모드로 구독한 큐의 처리 상태와 관리 스레드 준비
+
+        Args:
+            queue_names: 준비할 큐 이름 목록
+        """
+        started = []
+        for queue_name in queue_names:
+            if self._options[queue_name]["reliable"]:
+                self._reliable[queue_name] = ReliableQueue(
+                    self._redis_client,
+                    queue_name,
+                    self._consumer_id,
+                    retry=self._retries.get(queue_name),
+                    forwarder=self._forwarders.get(queue_name),
+                    max_attempts=self._options[queue_name]["max_attempts"],
+                    dead_letter=self._options[queue_name]["dead_letter"],
+                )
+                started.append(self._reliable[queue_name])
+
+        if not started:
+            return
+
+        # 리스너 시작 전에 생존 신호를 먼저 기록
+        pipe = self._redis_client.pipeline(transaction=False)
+        for reliable in started:
+            reliable.heartbeat(pipe)
+        pipe.execute()
+
+        if self._maintainer_thread is not None:
+            return
+        self._maintainer_thread = threading.Thread(
+            target=self._reliable_maintainer,
+            name="ReliableMaintainer",
+            daemon=True,
+        )
+        self._maintainer_thread.start()
+        self.logger.info(
+            f"신뢰성 큐 모드 시작됨 (컨슈머 ID: {self._consumer_id})"
+        )
+
+    def _start_retries(self, queue_names: List[str]) -> None:
+        """
+        재시도 정책을 지정한 큐의 재시도 상태와 스케줄러 스레드 준비
+
+        Args:
+            queue_names: 준비할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            options = self._options[queue_name]
+            if options["retry"] is not None:
+                self._retries[queue_name] = RetryQueue(
+                    self._redis_client,
+                    queue_name,
+                    options["retry"],
+                    options["dead_letter"],
+                )
+
+        if not self._retries or self._retry_thread is not None:
+            return
+
+        self._retry_thread = threading.Thread(
+            target=self._retry_scheduler, name="RetryScheduler", daemon=True
+        )
+        self._retry_thread.start()
+        self.logger.info(f"재시도 스케줄러 시작됨: {len(self._retries)}개 큐")
+
+    def _start_limiters(self, queue_names: List[str]) -> None:
+        """
+        rate_limit 또는 max_in_flight를 지정한 큐의 처리 한도 준비
+
+        Args:
+            queue_names: 준비할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            options = self._options[queue_name]
+            rate = options["rate_limit"]
+            if rate is None and options["max_in_flight"] is None:
+                continue
+
+            bucket: Optional[TokenBucket] = None
+            if rate is not None and options["rate_limit_shared"]:
+                bucket = SharedTokenBucket(
+                    self._redis_client,
+                    f"{queue_name}:ratelimit",
+                    rate,
+                    options["rate_limit_burst"],
+                )
+            elif rate is not None:
+                bucket = TokenBucket(rate, options["rate_limit_burst"])
+            self._limiters[queue_name] = QueueLimiter(
+                bucket, options["max_in_flight"]
+            )
+            self.logger.info(
+                f"처리 한도 설정됨 [{queue_name}]: 초당 {rate or '제한 없음'}, "
+                f"처리 중 최대 {options['max_in_flight'] or '제한 없음'}"
+            )
+
+    def _start_routers(self, queue_names: List[str]) -> None:
+        """
+        큐마다 메시지를 전달할 핸들러 결정 - 여러 핸들러나 route가 있으면 디스패치 테이블로 컴파일
+
+        Args:
+            queue_names: 준비할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            routes = self._routes[queue_name]
+            if len(routes) == 1 and routes[0][0] is None:
+                self._dispatch_table[queue_name] = self._handlers[queue_name]
+                continue
+            self._dispatch_table[queue_name] = Router(
+                queue_name,
+                routes,
+                on_unrouted=functools.partial(self._unrouted, queue_name),
+            )
+            self.logger.info(
+                f"핸들러 라우팅 설정됨 [{queue_name}]: {len(routes)}개 핸들러"
+            )
+
+    def _unrouted(self, queue_name: str, message: Any) -> None:
+        """
+        route에 맞는 핸들러가 없는 메시지 처리 - unrouted 옵션에 따라 버리거나 데드레터 큐로 보냄
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            message: 디코딩된 메시지
+        """
+        options = self._options[queue_name]
+        metrics = self._metrics.queue(queue_name)
+        metrics.record_unrouted()
+        if options["unrouted"] == "dead_letter":
+            # 전송에 실패하면 예외가 전파되어 메시지가 처리 실패로 기록됨
+            self._active_transport.push(
+                options["dead_letter"], [options["codec"].encode(message)]
+            )
+            metrics.record_retries(0, 1)
+            self.logger.warning(
+                "라우트에 맞는 핸들러가 없는 메시지를 데드레터 큐로 보냄 [%s]: %s",
+                queue_name,
+                preview(message),
+            )
+            return
+        self.logger.warning(
+            "라우트에 맞는 핸들러가 없는 메시지를 버림 [%s]: %s",
+            queue_name,
+            preview(message),
+        )
+
+    def _start_forwarders(self, queue_names: List[str]) -> None:
+        """
+        emit_to를 지정한 큐의 핸들러 출력 전달 준비
+
+        Args:
+            queue_names: 준비할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            options = self._options[queue_name]
+            if not options["emit_to"]:
+                continue
+            self._forwarders[queue_name] = Forwarder(
+                self._active_transport,
+                options["emit_to"],
+                options["emit_codec"],
+            )
+            self.logger.info(
+                f"핸들러 출력 전달 설정됨: {queue_name} -> "
+                f"{', '.join(options['emit_to'])}"
+            )
+
+    def _start_dedup(self, queue_names: List[str]) -> None:
+        """
+        dedup_key를 지정한 큐의 중복 판별 준비
+
+        Args:
+            queue_names: 준비할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            options = self._options[queue_name]
+            if options["dedup_key"] is None:
+                continue
+            # 샤딩된 큐는 모든 샤드가 논리 큐 이름의 키를 공유
+            self._dedup[queue_name] = Deduplicator(
+                self._redis_client,
+                options["shard_group"] or queue_name,
+                options["dedup_key"],
+                options["dedup_ttl"],
+                cache_size=options["dedup_cache_size"],
+                bloom_bits=options["dedup_bloom_bits"],
+            )
+            self.logger.info(
+                f"중복 제거 설정됨 [{queue_name}]: {options['dedup_ttl']}초, "
+                f"로컬 캐시 {options['dedup_cache_size']}개"
+                + (
+                    f", 블룸 필터 {options['dedup_bloom_bits']}비트"
+                    if options["dedup_bloom_bits"]
+                    else ""
+                )
+            )
+
+    def _start_streams(self, queue_names: List[str]) -> None:
+        """
+        스트림으로 구독한 큐의 컨슈머 그룹 준비
+
+        Args:
+            queue_names: 준비할 큐 이름 목록
+        """
+        for queue_name in queue_names:
+            options = self._options[queue_name]
+            if not options["stream"]:
+                continue
+            consumer = StreamConsumer(
+                self._redis_client,
+                queue_name,
+                options["group"],
+                self._consumer_id,
+                field=options["stream_field"],
+                codec=options["codec"],
+                forwarder=self._forwarders.get(queue_name),
+            )
+            consumer.ensure_group()
+            self._streams[queue_name] = consumer
+
+    def _start_autoscaler(self) -> None:
+        """max_concurrency를 지정한 큐가 있으면 오토스케일러 스레드 시작"""
+        if not self._scalers or self._autoscaler_thread is not None:
+            return
+
+        self._autoscaler_thread = threading.Thread(
+            target=self._autoscaler, name="Autoscaler", daemon=True
+        )
+        self._autoscaler_thread.start()
+        self.logger.info(
+            f"오토스케일러 시작됨 (확인 간격 {self.autoscale_interval}초)"
+        )
+
+    def _autoscaler(self) -> None:
+        """
+        오토스케일러 스레드 메서드
+
+        autoscale_interval마다 자동 조절 대상인 모든 큐의 길이를 하나의 파이프라인
+        LLEN으로 조회하고, 큐별 처리 수와 핸들러 실행 시간 합계와 함께 QueueScaler에
+        넘겨 워커 풀의 크기를 바꾼다.
+        """
+        while not self._shutdown.wait(self.autoscale_interval):
+            try:
+                # 실행 중에 구독/해제된 큐가 있을 수 있으므로 복사본을 순회
+                scalers = list(self._scalers.items())
+                if not scalers:
+                    continue
+
+                depths = self._active_transport.lengths(
+                    [queue_name for queue_name, _ in scalers]
+                )
+                now = time.monotonic()
+
+                for (queue_name, scaler), depth in zip(scalers, depths):
+                    pool = self._pools.get(queue_name)
+                    if pool is None:
+                        continue
+                    buffer = self._prefetch.get(queue_name)
+                    if buffer is not None:
+                        depth += len(buffer)
+                    snapshot = self._metrics.queue(queue_name).snapshot()
+                    workers = scaler.observe(
+                        now,
+                        pool.concurrency,
+                        depth,
+                        snapshot["processed"] + snapshot["failed"],
+                        snapshot["handler_latency"]["sum"],
+                    )
+                    if workers is None or queue_name not in self._scalers:
+                        continue
+                    self.logger.info(
+                        f"워커 수 변경 [{queue_name}]: "
+                        f"{pool.concurrency} -> {workers} "
+                        f"(큐 길이 {depth}, 부하 {scaler.load:.2f})"
+                    )
+                    pool.resize(workers)
+            except Exception as e:
+                if self._running:
+                    self.logger.error(f"오토스케일러 에러: {e}")
+
+    def _start_pool(self, queue_name: str) -> None:
+        """
+        concurrency가 1보다 크거나 max_concurrency를 지정한 큐의 워커 풀 시작
+
+        Args:
+            queue_name: 워커 풀을 시작할 큐 이름
+        """
+        options = self._options[queue_name]
+        if options["concurrency"] <= 1 and options["max_concurrency"] is None:
+            return
+
+        key_func = options["ordering_key"]
+        # 스트림/신뢰성 큐 메시지는 (항목 ID 또는 원본, 메시지) 형태
+        nested = options["stream"] or options["reliable"]
+        process = (
+            self._process_batch
+            if options["batch_handler"]
+            else self._process_message
+        )
+
+        def ordering_key(entry: Tuple[Any, float]) -> Any:
+            # 워커 풀에는 (메시지, 전달 시각) 형태로 넘기므로 메시지만 키 함수에 전달
+            return key_func(entry[0][1] if nested else entry[0])
+
+        def target(entry: Tuple[Any, float]) -> None:
+            process(queue_name, *entry)
+
+        pool = WorkerPool(
+            name=queue_name,
+            concurrency=options["concurrency"],
+            target=target,
+            ordering_key=ordering_key if key_func is not None else None,
+        )
+        pool.start()
+        self._pools[queue_name] = pool
+        if options["max_concurrency"] is not None:
+            self._scalers[queue_name] = QueueScaler(
+                options["concurrency"],
+                options["max_concurrency"],
+                cooldown=self.autoscale_cooldown,
+            )
+            self.logger.info(
+                f"큐 워커 풀 시작됨: {queue_name} (워커 "
+                f"{options['concurrency']}~{options['max_concurrency']}개 "
+                "자동 조절)"
+            )
+        else:
+            self.logger.info(
+                f"큐 워커 풀 시작됨: {queue_name} (워커 {options['concurrency']}개)"
+            )
+
+    def _start_prefetch(self, queue_name: str) -> None:
+        """
+        prefetch를 지정한 큐의 프리페치 버퍼와 디스패처 스레드 시작
+
+        Args:
+            queue_name: 프리페치 버퍼를 시작할 큐 이름
+        """
+        options = self._options[queue_name]
+        if not options["prefetch"]:
+            return
+
+        buffer = PrefetchBuffer(
+            name=queue_name,
+            max_depth=options["prefetch"],
+            dispatch=lambda messages: self._dispatch(queue_name, messages),
+            batch_size=options["batch_size"],
+        )
+        buffer.start()
+        self._prefetch[queue_name] = buffer
+        self.logger.info(
+            f"프리페치 버퍼 시작됨: {queue_name} (최대 {options['prefetch']}개)"
+        )
+
+    def _process_message(
+        self, queue_name: str, message: Any, fetched_at: Optional[float] = None
+    ) -> None:
+        """
+        단일 메시지 처리 - 핸들러 호출 후 신뢰성 큐이면 처리 결과 기록
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            message: 디코딩된 메시지
+                (스트림이면 (항목 ID, 메시지), 신뢰성 큐이면 (원본, 메시지) 튜플)
+            fetched_at: 메시지 전달을 시작한 시각 (time.perf_counter, 선택사항)
+        """
+        forwarder = self._forwarders.get(queue_name)
+        # 핸들러 출력은 처리에 성공한 경우에만 확인 결과와 함께 전송
+        outputs: Optional[List[bytes]] = None if forwarder is None else []
+        consumer = self._streams.get(queue_name)
+        if consumer is not None:
+            entry_id, message = message
+            # 실패한 항목은 확인하지 않고 남겨 두어 XAUTOCLAIM으로 다시 처리
+            if self._handle_message(
+                queue_name,
+                self._dispatch_table[queue_name],
+                message,
+                fetched_at,
+                outputs,
+            ):
+                consumer.ack(entry_id, outputs)
+            return
+
+        reliable = self._reliable.get(queue_name)
+        retry = self._retries.get(queue_name)
+        if reliable is None and retry is None:
+            if (
+                self._handle_message(
+                    queue_name,
+                    self._dispatch_table[queue_name],
+                    message,
+                    fetched_at,
+                    outputs,
+                )
+                and forwarder is not None
+                and outputs
+            ):
+                self._forward(queue_name, forwarder, outputs)
+            return
+
+        raw, message = message
+        if self._handle_message(
+            queue_name,
+            self._dispatch_table[queue_name],
+            message,
+            fetched_at,
+            outputs,
+        ):
+            if reliable is not None:
+                reliable.ack(raw, outputs)
+            elif forwarder is not None and outputs:
+                self._forward(queue_name, forwarder, outputs)
+            return
+
+        if retry is not None:
+            # 다시 처리해도 디코딩할 수 없는 메시지는 바로 데드레터 큐로 보냄
+            if type(message) is not DecodeError and retry.schedule(raw):
+                self._metrics.queue(queue_name).record_retries(1, 0)
+            else:
+                if type(message) is DecodeError:
+                    retry.dead(raw)
+                self._metrics.queue(queue_name).record_retries(0, 1)
+            if reliable is not None:
+                # 재시도 예약 뒤에 확인해야 같은 flush()에서 함께 전송됨
+                reliable.ack(raw)
+        elif reliable is not None:
+            # 디코딩할 수 없는 메시지와 시도 횟수를 모두 쓴 메시지는 데드레터 큐로 보냄
+            if type(message) is DecodeError:
+                reliable.dead(raw)
+                self._metrics.queue(queue_name).record_retries(0, 1)
+            elif reliable.nack(raw):
+                self._metrics.queue(queue_name).record_retries(1, 0)
+            else:
+                self._metrics.queue(queue_name).record_retries(0, 1)
+
+    def _forward(
+        self, queue_name: str, forwarder: Forwarder, outputs: List[bytes]
+    ) -> None:
+        """
+        신뢰성 큐/스트림이 아닌 큐의 핸들러 출력 보관 - 워커 풀이면 바로 전송 시도
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            forwarder: 이 큐의 Forwarder
+            outputs: 인코딩된 핸들러 출력
+        """
+        forwarder.add(outputs)
+        if queue_name not in self._pools:
+            # 리스너 스레드에서 처리했으면 _dispatch()가 배치 끝에 한 번에 전송
+            return
+        try:
+            # 다른 워커가 전송 중이면 그 워커가 이어서 함께 보냄
+            forwarder.flush()
+        except Exception as e:
+            self.logger.error("핸들러 출력 전달 실패 [%s]: %s", queue_name, e)
+
+    def _process_batch(
+        self,
+        queue_name: str,
+        batch: List[Tuple[bytes, Any]],
+        fetched_at: Optional[float] = None,
+    ) -> None:
+        """
+        배치 처리 - 배치 핸들러 호출 후 BatchResult에 따라 메시지별로 확인, 재시도, 데드레터 처리
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            batch: (원본, 디코딩된 메시지) 목록
+            fetched_at: 배치 전달을 시작한 시각 (time.perf_counter, 선택사항)
+        """
+        reliable = self._reliable.get(queue_name)
+        retry_queue = self._retries.get(queue_name)
+        dead_letter = self._options[queue_name]["dead_letter"]
+
+        raws = []
+        messages = []
+        dead = []
+        for raw, message in batch:
+            if type(message) is DecodeError:
+                self.logger.error(
+                    "메시지 디코딩 실패 [%s]: %s", queue_name, message
+                )
+                dead.append(raw)
+            else:
+                raws.append(raw)
+                messages.append(message)
+
+        metrics = self._metrics.queue(queue_name)
+        metrics.handle_started(
+            None if fetched_at is None else time.perf_counter() - fetched_at
+        )
+        if self._hooks["on_handle_start"]:
+            self._run_hooks("on_handle_start", queue_name, messages)
+
+        error = None
+        retry = []
+        succeeded = raws
+        started = time.perf_counter()
+        if messages:
+            monitor = self._monitor
+            if monitor is not None:
+                monitor.enter(queue_name, messages)
+            try:
+                result = self._dispatch_table[queue_name](messages)
+            except Exception as e:
+                error = e
+                self.logger.error(
+                    "배치 핸들러 실행 중 에러 발생 [%s]: %s개 - %s",
+                    queue_name,
+                    len(messages),
+                    e,
+                )
+            else:
+                if result is not None:
+                    retry_indexes, dead_indexes = result.partition(len(raws))
+                    retry = [raws[index] for index in sorted(retry_indexes)]
+                    dead.extend(raws[index] for index in sorted(dead_indexes))
+                    succeeded = [
+                        raw
+                        for index, raw in enumerate(raws)
+                        if index not in retry_indexes
+                        and index not in dead_indexes
+                    ]
+            finally:
+                if monitor is not None:
+                    monitor.exit()
+        elapsed = time.perf_counter() - started
+
+        if error is not None:
+            # 메시지 단위 핸들러와 같이 재시도 정책이 없는 일반 큐는 버리고, 나머지는 모두 다시 처리
+            succeeded = []
+            if reliable is not None or retry_queue is not None:
+                retry = raws
+
+        metrics.handle_batch_finished(
+            elapsed, len(succeeded), len(batch) - len(succeeded)
+        )
+        if self._hooks["on_handle_end"]:
+            self._run_hooks(
+                "on_handle_end", queue_name, messages, elapsed, error
+            )
+
+        if retry_queue is not None:
+            scheduled = sum(1 for raw in retry if retry_queue.schedule(raw))
+            for raw in dead:
+                retry_queue.dead(raw)
+            metrics.record_retries(
+                scheduled, len(retry) - scheduled + len(dead)
+            )
+            if reliable is not None:
+                # 재시도 예약 뒤에 확인해야 같은 flush()에서 함께 전송됨
+                for raw, _ in batch:
+                    reliable.ack(raw)
+            return
+
+        if reliable is not None:
+            for raw in succeeded:
+                reliable.ack(raw)
+            requeued = sum(1 for raw in retry if reliable.nack(raw))
+            for raw in dead:
+                reliable.dead(raw)
+            metrics.record_retries(requeued, len(retry) - requeued + len(dead))
+            return
+
+        # 일반 큐는 시도 횟수 봉투로 감싸 되돌리고, 시도 횟수를 모두 쓴 메시지는 데드레터 큐로 보냄
+        max_attempts = self._options[queue_name]["max_attempts"]
+        pending: List[bytes] = []
+        dead = [unwrap(raw)[0] for raw in dead]
+        for raw in retry:
+            moved, requeue = next_attempt(raw, max_attempts)
+            (pending if requeue else dead).append(moved)
+        retry = pending
+        metrics.record_retries(len(retry), len(dead))
+        if not retry and not dead:
+            return
+        try:
+            self._active_transport.push_many(
+                [(queue_name, retry), (dead_letter, dead)]
+            )
+        except Exception as e:
+            self.logger.error(
+                f"재시도/데드레터 메시지 전송 실패 [{queue_name}]: "
+                f"{len(retry) + len(dead)}개 유실 - {e}"
+            )
+
+    def _handle_message(
+        self,
+        queue_name: str,
+        handler: Callable[[Any], Any],
+        message: Any,
+        fetched_at: Optional[float] = None,
+        outputs: Optional[List[bytes]] = None,
+    ) -> bool:
+        """
+        단일 메시지를 핸들러에 전달
+
+        Args:
+            queue_name: 메시지를 수신한 큐 이름
+            handler: 호출할 핸들러 함수
+            message: 디코딩된 메시지 (디코딩에 실패했으면 DecodeError 객체)
+            fetched_at: 메시지 전달을 시작한 시각 (time.perf_counter, 선택사항)
+            outputs: 인코딩한 핸들러 출력을 추가할 목록 (emit_to를 지정한 큐, 선택사항)
+
+        Returns:
+            핸들러 성공 여부
+        """
+        # 핫 패스이므로 로그 메시지는 디버그 레벨이 켜진 경우에만 포맷
+        self.logger.debug("메시지 수신됨 [%s]: %s", queue_name, message)
+
+        metrics = self._metrics.queue(queue_name)
+        metrics.handle_started(
+            None if fetched_at is None else time.perf_counter() - fetched_at
+        )
+        if self._hooks["on_handle_start"]:
+            self._run_hooks("on_handle_start", queue_name, message)
+
+        # 핸들러 함수 호출
+        error: Optional[Exception] = None
+        started = time.perf_counter()
+        if type(message) is DecodeError:
+            # 디코딩하지 못한 메시지는 핸들러를 호출하지 않고 실패로 기록
+            error = message
+            self.logger.error(
+                "메시지 디코딩 실패 [%s]: %s", queue_name, message
+            )
+        else:
+            monitor = self._monitor
+            if monitor is not None:
+                monitor.enter(queue_name, message)
+            try:
+                result = handler(message)
+                if outputs is not None:
+                    # 제너레이터 핸들러는 여기서 실행되므로 같은 예외 처리 안에서 인코딩
+                    outputs.extend(self._forwarders[queue_name].encode(result))
+            except Exception as e:
+                error = e
+                self.logger.error(
+                    "핸들러 실행 중 에러 발생 [%s]: %s", queue_name, e
+                )
+            finally:
+                if monitor is not None:
+                    monitor.exit()
+        elapsed = time.perf_counter() - started
+
+        metrics.handle_finished(elapsed, error is None)
+        if self._hooks["on_handle_end"]:
+            self._run_hooks(
+                "on_handle_end", queue_name, message, elapsed, error
+            )
+        limiter = self._limiters.get(queue_name)
+        if limiter is not None:
+            limiter.done()
+        dedup = self._dedup.get(queue_name)
+        if dedup is not None:
+            # 실패한 메시지의 키는 여기서 지워야 재전달된 메시지가 중복으로 버려지지 않음
+            dedup.done(message, error is None)
+
+        return error is None
@@ -0,0 +1,221 @@
+"""
+멀티프로세스 실행 모드 감독자
+
+Author: Minseok kim
+"""
+
+import os
+import signal
+import threading
+import time
+import logging
+import multiprocessing
+import multiprocessing.connection
+from multiprocessing.process import BaseProcess
+from typing import Dict, Any
+
+from .metrics import merge_stats
+
+# 워커 프로세스가 통계를 보고하는 주기 (초)
+STATS_INTERVAL = 1.0
+
+# 시작 직후 죽은 워커를 다시 띄우기 전 대기 시간 (초)
+RESTART_DELAY = 1.0
+
+
+class ProcessSupervisor:
+    """
+    RedisSubscriber 워커 프로세스 감독자
+
+    fork로 워커 프로세스를 N개 띄우고, 각 워커는 자신만의 Redis 연결과
+    큐 리스너 스레드로 동작한다. 감독자는 죽은 워커를 다시 띄우고,
+    종료 시 SIGTERM을 모든 워커에 전달하며, 워커가 보고한 통계를 합산한다.
+    """
+
+    def __init__(
+        self, subscriber: Any, processes: int, shutdown_timeout: float = 10.0
+    ) -> None:
+        """
+        ProcessSupervisor 초기화
+
+        Args:
+            subscriber: 워커 프로세스에서 실행할 RedisSubscriber
+            processes: 워커 프로세스 수
+            shutdown_timeout: 종료 시 워커를 기다릴 최대 시간 (초)
+        """
+        self.subscriber = subscriber
+        self.processes = processes
+        self.shutdown_timeout = shutdown_timeout
+        self._context = multiprocessing.get_context("fork")
+        self._stats_queue = self._context.Queue()
+        self._workers: Dict[int, BaseProcess] = {}
+        self._started_at: Dict[int, float] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._worker_stats: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self._retired_stats: Dict[str, Dict[str, Any]] = {}
+        self._stats_lock = threading.Lock()
+        self._running = False
+        self.logger = logging.getLogger(__name__)
+
+    def run(self) -> None:
+        """워커 프로세스를 시작하고 종료 요청이 올 때까지 감독"""
+        self._running = True
+        for index in range(self.processes):
+            self._spawn(index)
+
+        while self._running:
+            # 워커 프로세스가 죽으면 즉시 깨어남
+            sentinels = [worker.sentinel for worker in self._workers.values()]
+            multiprocessing.connection.wait(sentinels, timeout=STATS_INTERVAL)
+            self._collect_stats()
+
+            now = time.monotonic()
+            for index, worker in list(self._workers.items()):
+                if worker.is_alive() or not self._running:
+                    continue
+
+                if index not in self._restart_at:
+                    self.logger.warning(
+                        f"워커 프로세스 종료 감지: #{index} "
+                        f"(pid={worker.pid}, exitcode={worker.exitcode})"
+                    )
+                    self._retire(index)
+                    # 시작 직후 죽는 워커가 재시작을 반복하지 않도록 지연
+                    lifetime = now - self._started_at[index]
+                    self._restart_at[index] = now + (
+                        RESTART_DELAY if lifetime < RESTART_DELAY else 0
+                    )
+
+                if now >= self._restart_at[index]:
+                    del self._restart_at[index]
+                    self._spawn(index)
+
+    def stop(self) -> None:
+        """모든 워커 프로세스에 SIGTERM을 전달하고 종료될 때까지 대기"""
+        if not self._running:
+            return
+        self._running = False
+
+        for worker in self._workers.values():
+            if worker.is_alive() and worker.pid is not None:
+                os.kill(worker.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for index, worker in self._workers.items():
+            worker.join(timeout=max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                self.logger.warning(
+                    f"워커 프로세스 강제 종료: #{index} (pid={worker.pid})"
+                )
+                worker.kill()
+                worker.join()
+            self.logger.info(f"워커 프로세스 종료됨: #{index}")
+
+        self._collect_stats()
+        for index in list(self._workers):
+            self._retire(index)
+        self._workers.clear()
+
+    def signal_workers(self, signum: int) -> None:
+        """
+        살아 있는 모든 워커 프로세스에 시그널 전달
+
+        Args:
+            signum: 전달할 시그널 번호
+        """
+        for worker in list(self._workers.values()):
+            if worker.is_alive() and worker.pid is not None:
+                os.kill(worker.pid, signum)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        모든 워커 프로세스의 지표를 합산한 스냅샷 반환
+
+        Returns:
+            큐 이름별 합산 가능한 지표 딕셔너리
+        """
+        self._collect_stats()
+        with self._stats_lock:
+            combined: Dict[str, Dict[str, Any]] = {}
+            merge_stats(combined, self._retired_stats)
+            for snapshot in self._worker_stats.values():
+                merge_stats(combined, snapshot)
+            return combined
+
+    def _spawn(self, index: int) -> None:
+        """
+        워커 프로세스 시작
+
+        Args:
+            index: 워커 슬롯 번호
+        """
+        worker = self._context.Process(
+            target=self._worker_main,
+            args=(index,),
+            name=f"SubscriberWorker-{index}",
+            daemon=False,
+        )
+        worker.start()
+        self._workers[index] = worker
+        self._started_at[index] = time.monotonic()
+        self.logger.info(f"워커 프로세스 시작됨: #{index} (pid={worker.pid})")
+
+    def _retire(self, index: int) -> None:
+        """
+        종료된 워커의 마지막 통계를 누적 통계로 옮김 (실행 중 핸들러 수 같은 게이지는 제외)
+
+        Args:
+            index: 워커 슬롯 번호
+        """
+        with self._stats_lock:
+            snapshot = self._worker_stats.pop(index, None)
+            if snapshot:
+                merge_stats(self._retired_stats, snapshot, counters_only=True)
+
+    def _collect_stats(self) -> None:
+        """워커 프로세스가 보고한 통계를 모두 수집"""
+        with self._stats_lock:
+            while True:
+                try:
+                    index, pid, snapshot = self._stats_queue.get_nowait()
+                except Exception:
+                    break
+                worker = self._workers.get(index)
+                # 이미 교체된 이전 워커의 늦은 보고는 무시
+                if worker is not None and worker.pid == pid:
+                    self._worker_stats[index] = snapshot
+
+    def _worker_main(self, index: int) -> None:
+        """
+        워커 프로세스 진입점
+
+        Args:
+            index: 워커 슬롯 번호
+        """
+        subscriber = self.subscriber
+        # 워커 프로세스 안에서는 일반 단일 프로세스 모드로 동작
+        subscriber._supervisor = None
+
+        # 종료는 감독자가 SIGTERM으로 조율하므로 터미널의 SIGINT는 무시
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, subscriber._signal_handler)
+
+        reporter_stop = threading.Event()
+
+        def report() -> None:
+            self._stats_queue.put(
+                (index, os.getpid(), subscriber._metrics.snapshot())
+            )
+
+        def reporter() -> None:
+            while not reporter_stop.wait(STATS_INTERVAL):
+                report()
+
+        threading.Thread(
+            target=reporter, name="StatsReporter", daemon=True
+        ).start()
+        try:
+            subscriber.start()
+        finally:
+            reporter_stop.set()
+            report()
@@ -0,0 +1,404 @@
+"""
+리스트 큐 전송 계층
+
+RedisSubscriber는 리스트 큐의 수신(블로킹 다중 키 대기 + 배치 꺼내기), 메시지 넣기,
+큐 길이 조회, 블로킹 해제를 Transport를 통해 수행한다.
+
+- RedisTransport: BLPOP/LPOP/RPUSH/LLEN/CLIENT UNBLOCK을 사용하는 기본 전송 계층
+- MemoryTransport: 프로세스 안의 스레드 안전한 큐. 네트워크 없이 같은 핸들러를 실행하므로
+  로컬 파이프라인, 빠르고 결정적인 테스트, 프레임워크 자체 오버헤드 측정에 사용한다.
+
+신뢰성 큐, 스트림, 재시도, 중복 제거, 공유 처리 속도 제한, 클러스터 모드는 Redis의
+서버 측 원자적 연산(BLMOVE, MULTI, Lua, 컨슈머 그룹)에 의존하므로 RedisTransport에서만 동작한다.
+
+Author: Minseok kim
+"""
+
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+
+import redis
+
+
+class Transport:
+    """
+    리스트 큐 전송 계층 인터페이스
+
+    리스너는 connect()로 만든 전용 연결에서 pop()으로 블로킹 수신하고, stop() 시에는
+    connection_id()로 얻은 식별자를 unblock()에 넘겨 대기 중인 pop()을 즉시 깨운다.
+    나머지 연산은 전송 계층이 가진 공유 연결을 사용한다.
+    """
+
+    def connect(self) -> Any:
+        """
+        리스너 전용 연결 생성
+
+        Returns:
+            pop()에 넘길 연결 객체
+        """
+        raise NotImplementedError
+
+    def connection_id(self, connection: Any) -> Optional[Hashable]:
+        """
+        unblock()으로 깨울 때 사용할 연결 식별자
+
+        Args:
+            connection: connect()로 만든 연결
+
+        Returns:
+            연결 식별자 (깨울 수 없으면 None - 블로킹 대기 시간이 지나야 종료됨)
+        """
+        return None
+
+    def disconnect(self, connection: Any) -> None:
+        """
+        리스너 전용 연결 종료
+
+        Args:
+            connection: connect()로 만든 연결
+        """
+
+    def pop(
+        self,
+        connection: Any,
+        keys: List[str],
+        count: Union[int, Dict[str, int]],
+        timeout: float,
+    ) -> Optional[Tuple[str, List[bytes]]]:
+        """
+        여러 큐 중 키 순서상 가장 앞의 비어 있지 않은 큐에서 최대 count개를 꺼냄
+
+        모든 큐가 비어 있으면 메시지가 들어오거나 timeout이 지나거나 unblock()될 때까지 대기한다.
+
+        Args:
+            connection: connect()로 만든 연결
+            keys: 대기할 큐 이름 목록 (앞쪽이 우선)
+            count: 꺼낼 최대 메시지 수 (큐마다 다르면 큐 이름별 딕셔너리)
+            timeout: 최대 대기 시간 (초, 0이면 무제한)
+
+        Returns:
+            (큐 이름, 메시지 목록), 대기 시간이 지나거나 깨워졌으면 None
+        """
+        raise NotImplementedError
+
+    def push(self, key: str, messages: List[Any], front: bool = False) -> None:
+        """
+        큐에 메시지를 넣음
+
+        Args:
+            key: 큐 이름
+            messages: 넣을 메시지 목록
+            front: True이면 목록 순서를 유지한 채 큐의 앞쪽에 넣음 (처리하지 못한 메시지 반환)
+        """
+        self.push_many([(key, messages)], front=front)
+
+    def push_many(
+        self, batches: List[Tuple[str, List[Any]]], front: bool = False
+    ) -> None:
+        """
+        여러 큐에 메시지를 한 번에 넣음
+
+        Args:
+            batches: (큐 이름, 메시지 목록) 목록
+            front: True이면 목록 순서를 유지한 채 큐의 앞쪽에 넣음
+        """
+        raise NotImplementedError
+
+    def lengths(self, keys: List[str]) -> List[int]:
+        """
+        큐 길이를 한 번에 조회
+
+        Args:
+            keys: 큐 이름 목록
+
+        Returns:
+            큐별 길이 목록
+        """
+        raise NotImplementedError
+
+    def unblock(self, connection_ids: List[Hashable]) -> None:
+        """
+        pop()에서 대기 중인 리스너를 깨움 (대기 중인 pop()은 None을 반환)
+
+        Args:
+            connection_ids: connection_id()로 얻은 식별자 목록
+        """
+
+    def close(self) -> None:
+        """공유 연결 종료"""
+
+
+class RedisTransport(Transport):
+    """Redis 리스트 명령을 사용하는 전송 계층"""
+
+    def __init__(
+        self,
+        client: Any,
+        connect: Optional[Callable[[], Any]] = None,
+        cluster: bool = False,
+    ) -> None:
+        """
+        RedisTransport 초기화
+
+        Args:
+            client: 공유 Redis 클라이언트 (넣기, 길이 조회, 블로킹 해제에 사용)
+            connect: 리스너 전용 클라이언트를 만드는 함수 (기본값은 공유 클라이언트 사용)
+            cluster: RedisCluster 클라이언트 여부 (전용 연결을 CLIENT UNBLOCK으로 깨우지 않음)
+        """
+        self.client = client
+        self._connect = connect
+        self.cluster = cluster
+
+    def connect(self) -> Any:
+        return self.client if self._connect is None else self._connect()
+
+    def connection_id(self, connection: Any) -> Optional[Hashable]:
+        if self.cluster:
+            # 클러스터 수신 스레드는 짧게만 블로킹하므로 CLIENT UNBLOCK 없이 종료됨
+            connection.ping()
+            return None
+        client_id: int = connection.client_id()
+        return client_id
+
+    def disconnect(self, connection: Any) -> None:
+        if connection is not self.client:
+            connection.close()
+
+    def pop(
+        self,
+        connection: Any,
+        keys: List[str],
+        count: Union[int, Dict[str, int]],
+        timeout: float,
+    ) -> Optional[Tuple[str, List[bytes]]]:
+        # BLPOP으로 대기한 뒤 남은 메시지를 `LPOP key count` 한 번으로 추가 수신 (Redis >= 6.2)
+        result = connection.blpop(keys, timeout=timeout)
+        if result is None:
+            return None
+        key, message = result
+        key = key.decode("utf-8")
+        if not isinstance(count, int):
+            count = count[key]
+        messages = [message]
+        if count > 1:
+            extra = connection.lpop(key, count - 1)
+            if extra:
+                messages.extend(extra)
+        return key, messages
+
+    def push_many(
+        self, batches: List[Tuple[str, List[Any]]], front: bool = False
+    ) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key, messages in batches:
+            if not messages:
+                continue
+            if front:
+                # LPUSH는 인자 순서대로 앞에 넣으므로 역순으로 전달해야 원래 순서가 유지됨
+                pipe.lpush(key, *reversed(messages))
+            else:
+                pipe.rpush(key, *messages)
+        pipe.execute()
+
+    def lengths(self, keys: List[str]) -> List[int]:
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.llen(key)
+        lengths: List[int] = pipe.execute()
+        return lengths
+
+    def unblock(self, connection_ids: List[Hashable]) -> None:
+        if not connection_ids:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for connection_id in connection_ids:
+            # 타임아웃과 같은 빈 응답을 반환하도록 해제
+            pipe.client_unblock(connection_id)
+        pipe.execute()
+
+    def close(self) -> None:
+        self.client.close()
+        if not self.cluster:
+            self.client.connection_pool.disconnect()
+
+
+class MemoryConnection:
+    """MemoryTransport 리스너 연결 - 자신만의 조건 변수로 대기하므로 넣은 큐의 대기자만 깨움"""
+
+    __slots__ = ("condition", "signalled", "unblocked")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        """
+        MemoryConnection 초기화
+
+        Args:
+            lock: MemoryTransport의 잠금 (모든 연결의 조건 변수가 공유)
+        """
+        self.condition = threading.Condition(lock)
+        self.signalled = False
+        self.unblocked = False
+
+
+class MemoryTransport(Transport):
+    """
+    프로세스 안의 스레드 안전한 리스트 큐
+
+    큐마다 deque를 두고 하나의 잠금으로 보호한다. 비어 있는 큐를 기다리는 리스너는
+    대기하는 키마다 자신의 조건 변수를 등록하고, push()는 해당 큐의 대기자만 깨우므로
+    폴링 없이 동작한다. 같은 객체를 RedisSubscriber(transport=...)에 넘기고 push()로
+    메시지를 넣으면 된다.
+    """
+
+    def __init__(self) -> None:
+        """MemoryTransport 초기화"""
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Deque[bytes]] = {}
+        self._waiters: Dict[str, Set[MemoryConnection]] = {}
+
+    def connect(self) -> MemoryConnection:
+        return MemoryConnection(self._lock)
+
+    def connection_id(
+        self, connection: MemoryConnection
+    ) -> Optional[Hashable]:
+        return connection
+
+    def pop(
+        self,
+        connection: MemoryConnection,
+        keys: List[str],
+        count: Union[int, Dict[str, int]],
+        timeout: float,
+    ) -> Optional[Tuple[str, List[bytes]]]:
+        with self._lock:
+            # 대기하기 전에 도착한 unblock()도 한 번 반영 (CLIENT UNBLOCK과 달리 유실되지 않음)
+            if connection.unblocked:
+                connection.unblocked = False
+                return None
+            result = self._take(keys, count)
+            if result is not None:
+                return result
+
+            for key in keys:
+                self._waiters.setdefault(key, set()).add(connection)
+            try:
+                remaining = timeout or None
+                deadline = (
+                    None if remaining is None else time.monotonic() + remaining
+                )
+                while True:
+                    connection.condition.wait(remaining)
+                    connection.signalled = False
+                    if connection.unblocked:
+                        connection.unblocked = False
+                        return None
+                    result = self._take(keys, count)
+                    if result is not None:
+                        return result
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return None
+            finally:
+                for key in keys:
+                    waiters = self._waiters.get(key)
+                    if waiters is not None:
+                        waiters.discard(connection)
+                        if not waiters:
+                            del self._waiters[key]
+
+    def push_many(
+        self, batches: List[Tuple[str, List[Any]]], front: bool = False
+    ) -> None:
+        with self._lock:
+            for key, messages in batches:
+                if not messages:
+                    continue
+                queue = self._queues.get(key)
+                if queue is None:
+                    queue = self._queues[key] = deque()
+                encoded = [_encode(message) for message in messages]
+                if front:
+                    queue.extendleft(reversed(encoded))
+                else:
+                    queue.extend(encoded)
+                waiters = self._waiters.get(key)
+                if waiters:
+                    # 이미 깨운 대기자를 빼고 넣은 메시지 수만큼의 대기자만 깨움
+                    pending = len(encoded)
+                    for connection in waiters:
+                        if pending == 0:
+                            break
+                        if not connection.signalled:
+                            connection.signalled = True
+                            connection.condition.notify()
+                            pending -= 1
+
+    def lengths(self, keys: List[str]) -> List[int]:
+        with self._lock:
+            return [len(self._queues.get(key, ())) for key in keys]
+
+    def unblock(self, connection_ids: List[Hashable]) -> None:
+        with self._lock:
+            for connection_id in connection_ids:
+                connection = cast(MemoryConnection, connection_id)
+                connection.unblocked = True
+                connection.condition.notify()
+
+    def _take(
+        self, keys: List[str], count: Union[int, Dict[str, int]]
+    ) -> Optional[Tuple[str, List[bytes]]]:
+        """
+        키 순서상 가장 앞의 비어 있지 않은 큐에서 최대 count개를 꺼냄 - _lock 안에서 호출
+
+        Args:
+            keys: 큐 이름 목록
+            count: 꺼낼 최대 메시지 수 (큐 이름별 딕셔너리 가능)
+
+        Returns:
+            (큐 이름, 메시지 목록), 모두 비어 있으면 None
+        """
+        for key in keys:
+            queue = self._queues.get(key)
+            if queue:
+                limit = count if isinstance(count, int) else count[key]
+                popleft = queue.popleft
+                return key, [popleft() for _ in range(min(limit, len(queue)))]
+        return None
+
+
+def _encode(message: Any) -> bytes:
+    """
+    Redis에 넣었다가 꺼낸 것과 같은 bytes로 변환 (redis-py의 인자 변환과 같은 규칙)
+
+    Args:
+        message: 넣을 메시지 (bytes, str, 숫자)
+
+    Returns:
+        bytes 메시지
+    """
+    if isinstance(message, bytes):
+        return message
+    if isinstance(message, (bytearray, memoryview)):
+        return bytes(message)
+    if isinstance(message, str):
+        return message.encode("utf-8")
+    if isinstance(message, (int, float)):
+        return repr(message).encode("utf-8")
+    raise redis.DataError(
+        f"bytes, str, 숫자만 넣을 수 있습니다: {type(message).__name__}"
+    )
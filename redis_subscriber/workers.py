@@ -0,0 +1,226 @@
+"""
+큐별 핸들러 워커 풀
+
+Author: Minseok kim
+"""
+
+import itertools
+import queue
+import threading
+import time
+import logging
+from typing import Callable, Any, List, Optional, Hashable
+
+# 워커 종료를 알리는 센티널
+_STOP = object()
+
+# 워커 수를 줄일 때 쉬고 있는 워커를 깨워 종료시키는 센티널
+_SHRINK = object()
+
+
+class WorkerPool:
+    """
+    큐 하나에 연결된 고정 크기 핸들러 워커 스레드 풀
+
+    리스너 스레드는 submit()으로 메시지를 넘기고, 워커들이 핸들러를 실행한다.
+    대기 버퍼의 크기가 제한되어 있어 모든 워커가 바쁘면 submit()이 블로킹되고,
+    그동안 리스너는 Redis에서 메시지를 더 가져오지 않는다. (백프레셔)
+
+    ordering_key가 주어지면 같은 키의 메시지는 항상 같은 워커에 배정되어
+    수신 순서대로 처리된다.
+
+    ordering_key가 없는 풀은 resize()로 실행 중에 워커 수를 바꿀 수 있다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        target: Callable[[Any], Any],
+        ordering_key: Optional[Callable[[Any], Hashable]] = None,
+    ) -> None:
+        """
+        WorkerPool 초기화
+
+        Args:
+            name: 스레드 이름에 사용할 풀 이름 (보통 큐 이름)
+            concurrency: 워커 스레드 수
+            target: 워커가 메시지마다 호출할 함수
+            ordering_key: 메시지에서 순서 보장 키를 추출하는 함수 (선택사항)
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self._target = target
+        self._ordering_key = ordering_key
+        self._threads: List[threading.Thread] = []
+        self._index = itertools.count()
+        self._lock = threading.Lock()
+        self._excess = 0
+        self._closed = False
+        self.logger = logging.getLogger(__name__)
+
+        if ordering_key is None:
+            # 모든 워커가 하나의 버퍼를 공유
+            shared: queue.Queue = queue.Queue(maxsize=concurrency)
+            self._queues = [shared] * concurrency
+        else:
+            # 키별 순서 보장을 위해 워커마다 전용 버퍼 사용
+            self._queues = [queue.Queue(maxsize=1) for _ in range(concurrency)]
+
+    def start(self) -> None:
+        """워커 스레드 시작"""
+        for index in range(self.concurrency):
+            self._start_worker(self._queues[index])
+
+    def resize(self, concurrency: int) -> None:
+        """
+        워커 수 변경 - 늘리면 바로 새 워커를 시작하고, 줄이면 남는 워커가
+        처리 중인 메시지를 마친 뒤 종료된다. 대기 버퍼의 크기도 워커 수에 맞춘다.
+
+        Args:
+            concurrency: 새 워커 스레드 수
+        """
+        if self._ordering_key is not None:
+            raise ValueError(
+                "ordering_key를 지정한 워커 풀은 키별 워커 배정이 바뀌므로 크기를 바꿀 수 없습니다."
+            )
+        if concurrency < 1:
+            raise ValueError(
+                f"concurrency는 1 이상이어야 합니다: {concurrency}"
+            )
+
+        shared = self._queues[0]
+        with self._lock:
+            if self._closed:
+                return
+            self._threads = [
+                thread for thread in self._threads if thread.is_alive()
+            ]
+            current = len(self._threads) - self._excess
+            if concurrency > current:
+                # 아직 종료하지 않은 워커가 있으면 먼저 되살린 뒤 모자란 만큼 시작
+                revived = min(self._excess, concurrency - current)
+                self._excess -= revived
+                for _ in range(concurrency - current - revived):
+                    self._start_worker(shared)
+            else:
+                self._excess += current - concurrency
+            self.concurrency = concurrency
+            self._queues = [shared] * concurrency
+
+            with shared.mutex:
+                # 버퍼가 커졌으면 자리를 기다리던 submit()을 깨움
+                shared.maxsize = concurrency
+                shared.not_full.notify_all()
+
+        # 쉬고 있는 워커는 메시지가 올 때까지 깨어나지 않으므로 자리가 있으면 직접 깨움
+        for _ in range(max(0, current - concurrency)):
+            try:
+                shared.put_nowait(_SHRINK)
+            except queue.Full:
+                break
+
+    def submit(self, message: Any) -> None:
+        """
+        메시지를 워커에 전달 - 버퍼가 가득 차면 빈 자리가 생길 때까지 블로킹
+
+        Args:
+            message: 처리할 메시지
+        """
+        if self._ordering_key is None:
+            self._queues[0].put(message)
+            return
+
+        try:
+            key = self._ordering_key(message)
+        except Exception as e:
+            self.logger.error(f"순서 보장 키 추출 실패 [{self.name}]: {e}")
+            key = None
+        self._queues[hash(key) % self.concurrency].put(message)
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        버퍼에 남은 메시지를 모두 처리한 뒤 워커 스레드 종료
+
+        Args:
+            timeout: 풀 전체의 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            모든 워커가 기한 안에 종료되었는지 여부
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return (
+                None
+                if deadline is None
+                else max(0.0, deadline - time.monotonic())
+            )
+
+        with self._lock:
+            # 줄이기로 한 워커도 종료 센티널을 하나씩 받아 종료
+            self._closed = True
+            self._excess = 0
+            if self._ordering_key is None:
+                alive = sum(1 for thread in self._threads if thread.is_alive())
+                worker_queues = self._queues[:1] * alive
+            else:
+                worker_queues = self._queues
+
+        try:
+            for worker_queue in worker_queues:
+                worker_queue.put(_STOP, timeout=remaining())
+        except queue.Full:
+            # 워커가 기한 안에 버퍼를 비우지 못함 (데몬 스레드이므로 남겨 둠)
+            return False
+
+        for thread in self._threads:
+            thread.join(timeout=remaining())
+        finished = not any(thread.is_alive() for thread in self._threads)
+        self._threads.clear()
+        return finished
+
+    def _worker(self, worker_queue: queue.Queue) -> None:
+        """
+        워커 스레드 메서드
+
+        Args:
+            worker_queue: 이 워커가 메시지를 꺼내는 버퍼
+        """
+        while True:
+            message = worker_queue.get()
+            if message is _STOP:
+                break
+            if message is not _SHRINK:
+                self._target(message)
+            if self._excess and self._retire():
+                break
+
+    def _retire(self) -> bool:
+        """
+        줄이기로 한 워커 수가 남아 있으면 하나를 차지하여 현재 워커를 종료시킴
+
+        Returns:
+            현재 워커가 종료해야 하는지 여부
+        """
+        with self._lock:
+            if self._excess <= 0:
+                return False
+            self._excess -= 1
+            return True
+
+    def _start_worker(self, worker_queue: queue.Queue) -> None:
+        """
+        워커 스레드 하나 시작
+
+        Args:
+            worker_queue: 이 워커가 메시지를 꺼내는 버퍼
+        """
+        thread = threading.Thread(
+            target=self._worker,
+            args=(worker_queue,),
+            name=f"QueueWorker-{self.name}-{next(self._index)}",
+            daemon=True,
+        )
+        thread.start()
+        self._threads.append(thread)
@@ -4,12 +4,22 @@ Redis Subscriber 프레임워크 통합 테스트 스위트
 Author: Minseok kim
 """
 
+import os
+import signal
 import pytest
+import asyncio
+import json
 import time
 import threading
+import urllib.request
 import redis
 from testcontainers.redis import RedisContainer
-from redis_subscriber import RedisSubscriber
+from redis_subscriber import (
+    RedisSubscriber, AsyncRedisSubscriber, RedisPublisher, AsyncRedisPublisher, QueueFullError,
+    BatchResult, RetryPolicy, MemoryTransport
+)
+from redis_subscriber.retry import RETRY_PREFIX, wrap
+from redis_subscriber.routing import Router, parse_route
 
 class TestRedisSubscriberIntegration:
     """Redis Subscriber 프레임워크 통합 테스트 클래스"""
@@ -146,6 +156,57 @@ class TestBasicFunctionality(TestRedisSubscriberIntegration):
         # 메시지가 정상 처리되었는지 확인
         assert len(received_messages) >= 1
         assert "test_message" in received_messages
+    
+    def test_stop_is_immediate_with_many_idle_queues(self, redis_container, redis_client):
+        """
+        테스트 케이스: 이벤트 기반 종료
+        - 무제한 블로킹 대기 중인 한가한 큐가 많아도 stop()이 즉시 끝나는지 확인
+        - 종료 후 모든 리스너 스레드가 끝났는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, block_timeout=0)
+        
+        for index in range(50):
+            subscriber.subscribe(f"idle_queue_{index}")(lambda msg: None)
+        
+        start_thread = self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)  # 모든 리스너가 블로킹 대기에 들어갈 때까지 대기
+        threads = list(subscriber._threads.values())
+        
+        started = time.monotonic()
+        subscriber.stop()
+        elapsed = time.monotonic() - started
+        
+        assert elapsed < 1.0
+        assert not any(thread.is_alive() for thread in threads)
+        start_thread.join(timeout=1.0)
+        assert not start_thread.is_alive()
+    
+    def test_stop_grace_deadline(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: 종료 기한
+        - 기한 안에 끝나는 핸들러는 stop()이 완료될 때까지 기다리는지 확인
+        - 기한을 넘기는 핸들러가 있어도 stop()이 기한 안에 반환되는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, shutdown_timeout=0.5)
+        finished = []
+        
+        @subscriber.subscribe(test_queue_name, concurrency=2)
+        def handler(msg):
+            time.sleep(0.2 if msg == "fast" else 3.0)
+            finished.append(msg)
+        
+        redis_client.rpush(test_queue_name, "fast", "slow")
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.1)  # 두 핸들러가 실행될 때까지 대기
+        
+        started = time.monotonic()
+        subscriber.stop()
+        elapsed = time.monotonic() - started
+        
+        assert elapsed < 1.0
+        assert finished == ["fast"]
 
 
 class TestMessageProcessing(TestRedisSubscriberIntegration):
@@ -220,6 +281,153 @@ class TestMessageProcessing(TestRedisSubscriberIntegration):
         assert not any("queue1" in msg for msg in queue2_messages + queue3_messages)
         assert not any("queue2" in msg for msg in queue1_messages + queue3_messages)
         assert not any("queue3" in msg for msg in queue1_messages + queue2_messages)
+    
+    def test_batch_dequeue(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 배치 디큐 모드
+        - batch_size 지정 시 대기 중인 메시지를 한 번에 가져와 모두 처리하는지 확인
+        - 메시지가 큐에 쌓인 순서대로 핸들러에 전달되는지 확인
+        """
+        received_messages = []
+        
+        @subscriber.subscribe(test_queue_name, batch_size=10)
+        def batch_handler(msg):
+            received_messages.append(msg)
+        
+        # 구독 시작 전에 메시지를 미리 적재
+        test_messages = [f"batch_msg_{i}" for i in range(25)]
+        redis_client.rpush(test_queue_name, *test_messages)
+        
+        # 프레임워크 시작 (별도 스레드에서)
+        self.start_subscriber_in_thread(subscriber)
+        
+        # 메시지 처리 대기
+        time.sleep(0.5)
+        
+        # 프레임워크 종료
+        subscriber.stop()
+        
+        # 모든 메시지가 순서대로 처리되었는지 확인
+        assert received_messages == test_messages
+        assert redis_client.llen(test_queue_name) == 0
+    
+    def test_concurrent_worker_pool(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 큐별 워커 풀
+        - concurrency 지정 시 느린 핸들러가 여러 워커에서 동시에 실행되는지 확인
+        - ordering_key가 같은 메시지는 수신 순서대로 처리되는지 확인
+        """
+        received_messages = []
+        worker_threads = set()
+        ordered_messages = {}
+        lock = threading.Lock()
+        
+        @subscriber.subscribe(test_queue_name, concurrency=5)
+        def slow_handler(msg):
+            time.sleep(0.2)
+            with lock:
+                received_messages.append(msg)
+                worker_threads.add(threading.current_thread().ident)
+        
+        @subscriber.subscribe("ordered_queue", concurrency=4, ordering_key=lambda msg: msg.split(":")[0])
+        def ordered_handler(msg):
+            key, seq = msg.split(":")
+            with lock:
+                ordered_messages.setdefault(key, []).append(int(seq))
+        
+        # 프레임워크 시작 (별도 스레드에서)
+        self.start_subscriber_in_thread(subscriber)
+        
+        # 순차 처리라면 2초가 걸리는 10개의 메시지 전송
+        redis_client.rpush(test_queue_name, *[f"slow_msg_{i}" for i in range(10)])
+        redis_client.rpush("ordered_queue", *[f"key{i % 3}:{i}" for i in range(30)])
+        
+        # 5개 워커로 병렬 처리되므로 약 0.4초면 충분
+        time.sleep(0.8)
+        
+        # 프레임워크 종료
+        subscriber.stop()
+        
+        # 병렬 처리 확인
+        assert len(received_messages) == 10
+        assert len(worker_threads) > 1
+        
+        # 키별 순서 보장 확인
+        assert sum(len(seqs) for seqs in ordered_messages.values()) == 30
+        for seqs in ordered_messages.values():
+            assert seqs == sorted(seqs)
+    
+    def test_multiplexed_fetchers(self, redis_container, redis_client):
+        """
+        테스트 케이스: 다중 키 BLPOP 수신 모드
+        - 큐 수와 관계없이 fetchers개의 수신 스레드만 생성되는지 확인
+        - 메시지가 많은 큐가 있어도 다른 큐의 메시지가 처리되는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, fetchers=2)
+        received = {}
+        lock = threading.Lock()
+        
+        def register(queue_name):
+            @subscriber.subscribe(queue_name)
+            def handler(msg):
+                with lock:
+                    received.setdefault(queue_name, []).append(msg)
+        
+        queue_names = [f"mux_queue_{i}" for i in range(10)]
+        for queue_name in queue_names:
+            register(queue_name)
+        
+        # 첫 번째 큐에만 메시지를 대량으로 적재
+        redis_client.rpush(queue_names[0], *[f"hot_{i}" for i in range(500)])
+        for queue_name in queue_names[1:]:
+            redis_client.rpush(queue_name, f"{queue_name}_msg")
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.0)
+        
+        # 수신 스레드 수는 큐 수가 아닌 fetchers 값과 같아야 함
+        assert len(subscriber._threads) == 2
+        
+        subscriber.stop()
+        
+        assert len(received[queue_names[0]]) == 500
+        for queue_name in queue_names[1:]:
+            assert received[queue_name] == [f"{queue_name}_msg"]
+    
+    def test_prefetch_buffer_returns_unhandled_messages(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 프리페치 버퍼
+        - 프리페치 버퍼를 거쳐도 메시지가 수신 순서대로 처리되는지 확인
+        - stop() 시 버퍼에 남은 메시지가 원래 순서대로 큐의 앞쪽에 되돌아가는지 확인
+        """
+        received_messages = []
+        
+        @subscriber.subscribe(test_queue_name, prefetch=50)
+        def slow_handler(msg):
+            time.sleep(0.01)
+            received_messages.append(msg)
+        
+        test_messages = [f"prefetch_msg_{i}" for i in range(200)]
+        redis_client.rpush(test_queue_name, *test_messages)
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        subscriber.stop()
+        
+        returned = redis_client.lrange(test_queue_name, 0, -1)
+        
+        # 처리한 메시지와 되돌린 메시지를 이으면 원래 순서와 같아야 함 (유실/중복 없음)
+        assert 0 < len(received_messages) < len(test_messages)
+        assert received_messages + returned == test_messages
+    
+    def test_invalid_batch_size(self, subscriber, test_queue_name):
+        """
+        테스트 케이스: 잘못된 batch_size 지정
+        - 1 미만의 batch_size는 ValueError가 발생하는지 확인
+        """
+        with pytest.raises(ValueError):
+            subscriber.subscribe(test_queue_name, batch_size=0)
 
 
 class TestErrorHandling(TestRedisSubscriberIntegration):
@@ -298,6 +506,39 @@ class TestErrorHandling(TestRedisSubscriberIntegration):
             # start() 메서드가 메인 스레드를 대기시키므로 직접 호출
             invalid_subscriber.start()
     
+    def test_listener_reconnects_after_connection_loss(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: 리스너 재연결
+        - 리스너 연결이 끊겨도 스레드가 종료되지 않고 새 연결로 계속 수신하는지 확인
+        - 재연결 후 새 연결 ID로 종료 시 즉시 깨울 수 있는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, max_connections=4, reconnect_backoff=(0.05, 0.5))
+        received_messages = []
+        
+        @subscriber.subscribe(test_queue_name)
+        def handler(msg):
+            received_messages.append(msg)
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.2)
+        
+        # 서버 쪽에서 리스너 연결을 강제로 끊음
+        _, client_id = subscriber._listener_clients[test_queue_name]
+        redis_client.client_kill_filter(_id=client_id)
+        time.sleep(0.5)
+        
+        redis_client.rpush(test_queue_name, "after_reconnect")
+        time.sleep(0.3)
+        
+        assert received_messages == ["after_reconnect"]
+        assert subscriber._threads[test_queue_name].is_alive()
+        assert subscriber._listener_clients[test_queue_name][1] != client_id
+        
+        started_at = time.monotonic()
+        subscriber.stop()
+        assert time.monotonic() - started_at < 1.0
+    
     def test_handler_function_timeout_handling(self, subscriber, redis_client, test_queue_name):
         """
         테스트 케이스: 핸들러 함수 타임아웃 처리
@@ -425,6 +666,1309 @@ class TestRealWorldScenarios(TestRedisSubscriberIntegration):
             assert f"order_confirmation_{order_id}" in emails
 
 
+class TestMetrics(TestRedisSubscriberIntegration):
+    """처리 지표 및 계측 훅 통합 테스트"""
+    
+    def test_stats_hooks_and_prometheus_endpoint(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 처리 지표
+        - stats()가 수신/성공/실패 건수, 지연 시간, 큐 길이를 반환하는지 확인
+        - 등록한 훅이 수신/처리 시점에 호출되는지 확인
+        - Prometheus 텍스트 엔드포인트가 지표를 노출하는지 확인
+        """
+        fetch_events = []
+        handled_events = []
+        
+        @subscriber.subscribe(test_queue_name, batch_size=10)
+        def handler(msg):
+            if msg == "error_message":
+                raise ValueError("의도된 에러")
+        
+        subscriber.add_hook("on_fetch", lambda queue, count, elapsed: fetch_events.append(count))
+        subscriber.add_hook("on_handle_end",
+                            lambda queue, msg, elapsed, error: handled_events.append((msg, error is None)))
+        
+        with pytest.raises(ValueError):
+            subscriber.add_hook("on_unknown", lambda: None)
+        
+        redis_client.rpush(test_queue_name, *[f"metric_msg_{i}" for i in range(20)], "error_message")
+        server = subscriber.serve_metrics(port=0, host="127.0.0.1")
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        
+        stats = subscriber.stats()[test_queue_name]
+        assert stats['received'] == 21
+        assert stats['processed'] == 20
+        assert stats['failed'] == 1
+        assert stats['in_flight'] == 0
+        assert stats['queue_depth'] == 0
+        assert stats['handler_latency']['count'] == 21
+        assert stats['handler_latency']['p99'] >= stats['handler_latency']['p50']
+        
+        assert sum(fetch_events) == 21
+        assert ("error_message", False) in handled_events
+        
+        body = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics").read().decode()
+        assert f'redis_subscriber_messages_processed_total{{queue="{test_queue_name}"}} 20' in body
+        assert "redis_subscriber_handler_latency_seconds_bucket" in body
+        
+        subscriber.stop()
+        server.close()
+
+
+class TestCodecs(TestRedisSubscriberIntegration):
+    """메시지 코덱 통합 테스트"""
+    
+    def test_builtin_codecs_and_decode_failure(self, redis_container, redis_client):
+        """
+        테스트 케이스: 메시지 코덱
+        - json 코덱 큐의 핸들러가 파싱된 객체를 받는지 확인
+        - raw 코덱 큐의 핸들러가 bytes를 그대로 받는지 확인
+        - 디코딩에 실패한 메시지는 핸들러를 호출하지 않고 실패로 기록되는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, codec="json")
+        json_messages = []
+        raw_messages = []
+        
+        @subscriber.subscribe("json_queue", batch_size=10)
+        def json_handler(msg):
+            json_messages.append(msg)
+        
+        @subscriber.subscribe("raw_queue", codec="raw")
+        def raw_handler(msg):
+            raw_messages.append(msg)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe("unknown_codec_queue", codec="unknown")
+        
+        redis_client.rpush("json_queue", '{"order_id": 1}', "not json", '[1, 2, 3]')
+        redis_client.rpush("raw_queue", "raw_payload")
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+        
+        assert json_messages == [{"order_id": 1}, [1, 2, 3]]
+        assert raw_messages == [b"raw_payload"]
+        assert stats["json_queue"]["processed"] == 2
+        assert stats["json_queue"]["failed"] == 1
+
+
+class TestPriorityQueues(TestRedisSubscriberIntegration):
+    """우선순위 큐 그룹 통합 테스트"""
+    
+    def test_strict_priority_and_weights(self, subscriber, redis_client):
+        """
+        테스트 케이스: 우선순위 큐 그룹
+        - 엄격한 우선순위에서 앞쪽 큐의 메시지를 모두 먼저 처리하는지 확인
+        - 가중치를 지정하면 가중치 비율대로 번갈아 처리하는지 확인
+        - 큐별 대기 지연 지표가 기록되는지 확인
+        """
+        strict_order = []
+        weighted_order = []
+        
+        @subscriber.subscribe(["urgent", "normal"])
+        def strict_handler(msg):
+            strict_order.append(msg)
+        
+        @subscriber.subscribe(["heavy", "light"], weights=[3, 1])
+        def weighted_handler(msg):
+            weighted_order.append(msg)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe(["a", "b"], weights=[1])
+        with pytest.raises(ValueError):
+            subscriber.subscribe(["a", "b"], reliable=True)
+        
+        # 리스너가 시작되기 전에 두 큐에 메시지를 쌓아 둠
+        redis_client.rpush("normal", *[f"n{i}" for i in range(5)])
+        redis_client.rpush("urgent", *[f"u{i}" for i in range(5)])
+        redis_client.rpush("heavy", *[f"h{i}" for i in range(12)])
+        redis_client.rpush("light", *[f"l{i}" for i in range(4)])
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+        
+        assert strict_order == [f"u{i}" for i in range(5)] + [f"n{i}" for i in range(5)]
+        assert len(weighted_order) == 16
+        # 처음 8개 중 heavy:light = 3:1
+        assert sum(1 for msg in weighted_order[:8] if msg.startswith("h")) == 6
+        assert stats["urgent"]["wait_latency"]["count"] == 5
+        assert stats["normal"]["wait_latency"]["count"] == 5
+
+
+class TestBatchHandler(TestRedisSubscriberIntegration):
+    """배치 핸들러 통합 테스트"""
+    
+    def test_batch_window_and_partial_failure(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 배치 핸들러
+        - 수집 창 동안 도착한 메시지가 하나의 목록으로 전달되는지 확인
+        - BatchResult로 지정한 메시지가 재시도되거나 데드레터 큐로 가는지 확인
+        """
+        batches = []
+        retried = []
+        dead_letter_queue = f"{test_queue_name}:dead"
+        redis_client.delete(dead_letter_queue)
+        
+        @subscriber.subscribe_batch(test_queue_name, max_items=50, max_wait_ms=200)
+        def batch_handler(messages):
+            batches.append(list(messages))
+            result = BatchResult()
+            for index, msg in enumerate(messages):
+                if msg == "poison":
+                    result.dead_letter(index)
+                elif msg == "flaky" and not retried:
+                    retried.append(msg)
+                    result.retry(index)
+            return result
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.2)
+        
+        # 수집 창(200ms) 안에 나누어 도착한 메시지가 한 배치로 모여야 함
+        redis_client.rpush(test_queue_name, "m0", "m1")
+        time.sleep(0.05)
+        redis_client.rpush(test_queue_name, "m2", "poison", "flaky")
+        time.sleep(0.6)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+        
+        assert batches[0] == ["m0", "m1", "m2", "poison", "flaky"]
+        assert batches[1] == ["flaky"]
+        assert redis_client.lrange(dead_letter_queue, 0, -1) == ["poison"]
+        assert stats[test_queue_name]["processed"] == 4
+        assert stats[test_queue_name]["retried"] == 1
+        assert stats[test_queue_name]["dead_lettered"] == 1
+        redis_client.delete(dead_letter_queue)
+    
+    def test_batch_retry_is_capped(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 재시도 정책 없는 일반 큐의 BatchResult.retry
+        - 계속 retry로 지정한 메시지가 max_attempts번 전달된 뒤 데드레터 큐로 가는지 확인
+        """
+        seen = []
+        dead_letter_queue = f"{test_queue_name}:dead"
+        redis_client.delete(dead_letter_queue)
+        
+        @subscriber.subscribe_batch(test_queue_name, max_items=10, max_wait_ms=0, max_attempts=3)
+        def batch_handler(messages):
+            seen.extend(messages)
+            return BatchResult(retry=[index for index, msg in enumerate(messages) if msg == "stuck"])
+        
+        redis_client.rpush(test_queue_name, "ok", "stuck")
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+        
+        assert seen == ["ok", "stuck", "stuck", "stuck"]
+        assert redis_client.lrange(dead_letter_queue, 0, -1) == ["stuck"]
+        assert redis_client.llen(test_queue_name) == 0
+        assert stats[test_queue_name]["retried"] == 2
+        assert stats[test_queue_name]["dead_lettered"] == 1
+        redis_client.delete(dead_letter_queue)
+
+
+class TestRetryPolicy(TestRedisSubscriberIntegration):
+    """재시도 정책 통합 테스트"""
+    
+    def test_delayed_retry_and_dead_letter(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 재시도 정책
+        - 실패한 메시지가 지연 후 다시 전달되어 처리되는지 확인
+        - max_attempts번 실패한 메시지가 데드레터 큐로 가는지 확인
+        """
+        attempts = {}
+        dead_letter_queue = f"{test_queue_name}:dead"
+        redis_client.delete(dead_letter_queue, f"{test_queue_name}:retry")
+        
+        @subscriber.subscribe(test_queue_name, retry=RetryPolicy(max_attempts=3, base_delay=0.05, max_delay=0.1))
+        def handler(msg):
+            attempts[msg] = attempts.get(msg, 0) + 1
+            if msg == "poison" or attempts[msg] < 3:
+                raise RuntimeError(f"처리 실패: {msg}")
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe("stream_key", stream=True, group="g", retry=RetryPolicy())
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.2)
+        redis_client.rpush(test_queue_name, "flaky", "poison")
+        time.sleep(1.0)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+        
+        assert attempts == {"flaky": 3, "poison": 3}
+        assert redis_client.lrange(dead_letter_queue, 0, -1) == ["poison"]
+        assert redis_client.zcard(f"{test_queue_name}:retry") == 0
+        assert stats[test_queue_name]["processed"] == 1
+        assert stats[test_queue_name]["retried"] == 4
+        assert stats[test_queue_name]["dead_lettered"] == 1
+        redis_client.delete(dead_letter_queue)
+
+
+    def test_unparsable_envelope_is_plain_message(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 재전달 봉투처럼 보이는 메시지
+        - 봉투 접두사로 시작하지만 형식이 맞지 않는 메시지가 그대로 핸들러에 전달되는지 확인
+        """
+        received = []
+        
+        @subscriber.subscribe(test_queue_name, codec="raw", retry=RetryPolicy(max_attempts=2, base_delay=0.05))
+        def handler(msg):
+            received.append(msg)
+        
+        malformed = [b"\x00\x01Rabc", RETRY_PREFIX + b"abc", RETRY_PREFIX + b"x:1"]
+        redis_client.rpush(test_queue_name, *malformed, wrap(b"payload", 1))
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        subscriber.stop()
+        
+        assert received == malformed + [b"payload"]
+
+
+class TestRateLimit(TestRedisSubscriberIntegration):
+    """처리 속도 제한과 처리 중 메시지 수 상한 통합 테스트"""
+    
+    def test_rate_limit_and_max_in_flight(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 처리 한도
+        - 토큰 버킷 한도를 넘는 메시지를 꺼내지 않고 큐에 남겨 두는지 확인
+        - 처리 중 메시지 수가 max_in_flight를 넘지 않는지 확인
+        """
+        limited_queue = f"{test_queue_name}_limited"
+        received_messages = []
+        running = []
+        peak = []
+        lock = threading.Lock()
+        
+        @subscriber.subscribe(test_queue_name, rate_limit="20/s", rate_limit_burst=5, batch_size=10)
+        def rate_limited_handler(msg):
+            received_messages.append(msg)
+        
+        @subscriber.subscribe(limited_queue, max_in_flight=2, concurrency=4)
+        def slow_handler(msg):
+            with lock:
+                running.append(msg)
+                peak.append(len(running))
+            time.sleep(0.02)
+            with lock:
+                running.remove(msg)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe("bad_rate", rate_limit="fast")
+        
+        redis_client.rpush(test_queue_name, *[f"m{i}" for i in range(50)])
+        redis_client.rpush(limited_queue, *[f"s{i}" for i in range(20)])
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.0)
+        subscriber.stop()
+        remaining = redis_client.llen(test_queue_name)
+        redis_client.delete(test_queue_name, limited_queue)
+        
+        # 처음 5개(burst) + 초당 20개 - 1초 동안 대략 25개, 나머지는 꺼내지 않고 큐에 남음
+        assert 15 <= len(received_messages) <= 30
+        assert remaining == 50 - len(received_messages)
+        assert len(peak) == 20
+        assert max(peak) <= 2
+
+
+class TestAutoscaling(TestRedisSubscriberIntegration):
+    """워커 수 자동 조절과 실행 중 구독/해제 통합 테스트"""
+    
+    def test_autoscale_grows_and_shrinks_workers(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: 워커 수 자동 조절
+        - 밀린 메시지가 많으면 워커 수가 max_concurrency 이하에서 늘어나는지 확인
+        - 큐가 비면 워커 수가 concurrency로 줄어드는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, autoscale_interval=0.2, autoscale_cooldown=0.2)
+        
+        @subscriber.subscribe(test_queue_name, concurrency=1, max_concurrency=6)
+        def slow_handler(msg):
+            time.sleep(0.01)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe("bad_autoscale", concurrency=4, max_concurrency=2)
+        
+        redis_client.rpush(test_queue_name, *[f"msg_{i}" for i in range(2000)])
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.0)
+        grown = subscriber.stats(queue_depth=False)[test_queue_name]['workers']
+        
+        # 밀린 메시지를 지우면 부하가 줄어 최소 워커 수로 돌아감
+        redis_client.delete(test_queue_name)
+        time.sleep(1.0)
+        shrunk = subscriber.stats(queue_depth=False)[test_queue_name]['workers']
+        subscriber.stop()
+        
+        assert 1 < grown <= 6
+        assert shrunk == 1
+    
+    def test_subscribe_and_unsubscribe_while_running(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 실행 중 구독/해제
+        - start() 이후에 등록한 핸들러가 다시 시작하지 않아도 메시지를 받는지 확인
+        - unsubscribe() 이후에는 해당 큐의 메시지를 더 꺼내지 않는지 확인
+        - 다른 큐의 처리는 계속되는지 확인
+        """
+        late_queue = f"{test_queue_name}_late"
+        received_messages = []
+        late_messages = []
+        
+        @subscriber.subscribe(test_queue_name)
+        def handler(msg):
+            received_messages.append(msg)
+        
+        self.start_subscriber_in_thread(subscriber)
+        
+        @subscriber.subscribe(late_queue, batch_size=10, concurrency=2)
+        def late_handler(msg):
+            late_messages.append(msg)
+        
+        redis_client.rpush(late_queue, *[f"late_{i}" for i in range(20)])
+        time.sleep(0.3)
+        assert len(late_messages) == 20
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe(late_queue)(late_handler)
+        
+        subscriber.unsubscribe(late_queue)
+        redis_client.rpush(late_queue, "after_unsubscribe")
+        redis_client.rpush(test_queue_name, "still_running")
+        time.sleep(0.3)
+        subscriber.stop()
+        
+        assert len(late_messages) == 20
+        assert redis_client.llen(late_queue) == 1
+        assert received_messages == ["still_running"]
+        
+        with pytest.raises(ValueError):
+            subscriber.unsubscribe(late_queue)
+
+
+class TestChaining(TestRedisSubscriberIntegration):
+    """핸들러 출력 전달(emit_to) 통합 테스트"""
+    
+    def test_emit_to_chains_handlers(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 핸들러 체인
+        - 반환값과 제너레이터가 생성한 값이 다음 큐로 전달되는지 확인
+        - None을 반환하거나 실패한 메시지는 출력을 보내지 않는지 확인
+        - 워커 풀에서 처리한 메시지의 출력도 모두 전달되는지 확인
+        """
+        email_queue = f"{test_queue_name}_email"
+        audit_queue = f"{test_queue_name}_audit"
+        emails = []
+        
+        @subscriber.subscribe(test_queue_name, batch_size=10, concurrency=4, emit_to=[email_queue, audit_queue])
+        def order_handler(msg):
+            if msg == "skip":
+                return None
+            if msg == "bad":
+                raise ValueError("의도된 에러")
+            kind, order_id = msg.split(":")
+            if kind == "bulk":
+                return (f"email:{order_id}:{i}" for i in range(3))
+            return f"email:{order_id}"
+        
+        @subscriber.subscribe(email_queue, batch_size=10)
+        def email_handler(msg):
+            emails.append(msg)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe("bad_emit", emit_codec="json")
+        
+        redis_client.rpush(test_queue_name, *[f"order:{i}" for i in range(50)], "bulk:x", "skip", "bad")
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.0)
+        subscriber.stop()
+        
+        expected = [f"email:{i}" for i in range(50)] + [f"email:x:{i}" for i in range(3)]
+        assert sorted(emails) == sorted(expected)
+        # 두 번째 대상 큐에도 같은 출력이 쌓임
+        assert sorted(redis_client.lrange(audit_queue, 0, -1)) == sorted(expected)
+        redis_client.delete(audit_queue)
+    
+    def test_reliable_emit_is_atomic_with_ack(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: 신뢰성 큐의 출력 전달
+        - 확인된 메시지의 출력이 모두 전달되고 처리 중 리스트가 비워지는지 확인
+        - 실패 후 재처리된 메시지의 출력이 한 번만 전달되는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url)
+        next_queue = f"{test_queue_name}_next"
+        failed_once = set()
+        
+        @subscriber.subscribe(test_queue_name, reliable=True, batch_size=10, emit_to=next_queue, emit_codec="json")
+        def handler(msg):
+            if msg.startswith("flaky") and msg not in failed_once:
+                failed_once.add(msg)
+                raise ValueError(f"의도된 에러: {msg}")
+            return {"source": msg}
+        
+        test_messages = [f"msg_{i}" for i in range(20)] + ["flaky_msg"]
+        redis_client.rpush(test_queue_name, *test_messages)
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.5)
+        subscriber.stop()
+        
+        forwarded = [json.loads(v) for v in redis_client.lrange(next_queue, 0, -1)]
+        redis_client.delete(next_queue)
+        assert sorted(item["source"] for item in forwarded) == sorted(test_messages)
+        assert redis_client.keys(f"{test_queue_name}:processing:*") == []
+
+
+class TestDeduplication(TestRedisSubscriberIntegration):
+    """중복 메시지 제거 통합 테스트"""
+    
+    def test_dedup_key_skips_duplicates(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: SET NX 기반 중복 제거
+        - 같은 배치와 이후 배치의 중복 메시지가 핸들러에 전달되지 않는지 확인
+        - 다른 컨슈머가 이미 처리한 키(Redis에 남은 키)의 메시지를 버리는지 확인
+        - 핸들러가 실패한 메시지는 다시 전달되면 처리되는지 확인
+        - 적중률과 로컬 캐시 지표가 stats()에 포함되는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url)
+        received_messages = []
+        failed_once = set()
+        
+        @subscriber.subscribe(test_queue_name, reliable=True, batch_size=10, concurrency=2,
+                              dedup_key=lambda msg: msg.split(":")[0], dedup_cache_size=5)
+        def handler(msg):
+            if msg.startswith("flaky") and msg not in failed_once:
+                failed_once.add(msg)
+                raise ValueError(f"의도된 에러: {msg}")
+            received_messages.append(msg)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe("bad_dedup", dedup_key=lambda msg: msg, dedup_ttl=0)
+        
+        # 다른 컨슈머가 이미 처리한 키
+        redis_client.set(f"{test_queue_name}:dedup:done_elsewhere", 1, ex=60)
+        redis_client.rpush(test_queue_name, *[f"order{i}:first" for i in range(20)],
+                           "order0:again", "order1:again", "done_elsewhere:x", "flaky:first")
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        redis_client.rpush(test_queue_name, *[f"order{i}:late" for i in range(20)])
+        time.sleep(1.5)
+        stats = subscriber.stats(queue_depth=False)[test_queue_name]
+        subscriber.stop()
+        
+        assert sorted(received_messages) == sorted([f"order{i}:first" for i in range(20)] + ["flaky:first"])
+        assert stats['dedup_local_hits'] + stats['dedup_shared_hits'] == 23
+        assert stats['dedup_cache_size'] <= 5
+        assert stats['dedup_cache_bytes'] > 0
+        assert 0 < stats['dedup_hit_rate'] < 1
+        assert redis_client.keys(f"{test_queue_name}:processing:*") == []
+    
+    def test_bloom_filter_dedup(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 블룸 필터 기반 중복 제거
+        - 처리에 성공한 키의 메시지가 이후에 다시 오면 버려지는지 확인
+        - 키마다 Redis 키를 만들지 않는지 확인
+        """
+        received_messages = []
+        
+        @subscriber.subscribe(test_queue_name, batch_size=10, dedup_key=lambda msg: msg,
+                              dedup_cache_size=0, dedup_bloom_bits=1 << 16)
+        def handler(msg):
+            received_messages.append(msg)
+        
+        redis_client.rpush(test_queue_name, *[f"id_{i}" for i in range(100)])
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        redis_client.rpush(test_queue_name, *[f"id_{i}" for i in range(100)], "id_new")
+        time.sleep(0.5)
+        stats = subscriber.stats(queue_depth=False)[test_queue_name]
+        subscriber.stop()
+        
+        assert sorted(received_messages) == sorted([f"id_{i}" for i in range(100)] + ["id_new"])
+        assert stats['dedup_shared_hits'] == 100
+        assert stats['dedup_bloom_bytes'] == 2 * (1 << 13)
+        assert redis_client.keys(f"{test_queue_name}:dedup:*") == []
+        assert len(redis_client.keys(f"{{{test_queue_name}}}:dedup:bloom:*")) == 1
+
+
+class TestMemoryTransport(TestRedisSubscriberIntegration):
+    """메모리 전송 계층 테스트 (Redis 불필요)"""
+    
+    def test_memory_transport_pop_push_unblock(self):
+        """
+        테스트 케이스: MemoryTransport 기본 동작
+        - 키 순서상 앞의 큐에서 큐별 개수만큼 배치로 꺼내는지 확인
+        - 빈 큐에서 대기하다가 메시지가 들어오거나 unblock()되면 바로 깨어나는지 확인
+        - 앞쪽에 넣은 메시지가 순서를 유지하는지 확인
+        """
+        transport = MemoryTransport()
+        conn = transport.connect()
+        transport.push("low", ["l1", "l2"])
+        transport.push("high", [b"h1", 2, 3.5])
+        
+        assert transport.pop(conn, ["high", "low"], {"high": 2, "low": 10}, 1.0) == ("high", [b"h1", b"2"])
+        assert transport.pop(conn, ["high", "low"], {"high": 2, "low": 10}, 1.0) == ("high", [b"3.5"])
+        transport.push("low", ["l0"], front=True)
+        transport.push("low", ["a", "b"], front=True)
+        assert transport.pop(conn, ["high", "low"], 10, 1.0) == ("low", [b"a", b"b", b"l0", b"l1", b"l2"])
+        assert transport.lengths(["high", "low", "none"]) == [0, 0, 0]
+        
+        started = time.monotonic()
+        assert transport.pop(conn, ["low"], 1, 0.1) is None
+        assert time.monotonic() - started >= 0.1
+        
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(transport.pop(conn, ["low", "high"], 5, 0)))
+        waiter.start()
+        time.sleep(0.1)
+        transport.push("high", ["late"])
+        waiter.join(timeout=1.0)
+        assert results == [("high", [b"late"])]
+        
+        waiter = threading.Thread(target=lambda: results.append(transport.pop(conn, ["low"], 5, 0)))
+        waiter.start()
+        time.sleep(0.1)
+        started = time.monotonic()
+        transport.unblock([transport.connection_id(conn)])
+        waiter.join(timeout=1.0)
+        assert not waiter.is_alive()
+        assert time.monotonic() - started < 0.5
+        assert results[-1] is None
+    
+    def test_subscriber_runs_on_memory_transport(self):
+        """
+        테스트 케이스: Redis 없이 MemoryTransport로 실행
+        - 일반 큐(배치, 워커 풀), 우선순위 그룹, 프리페치, emit_to가 동작하는지 확인
+        - 무제한 블로킹 대기 중에도 stop()이 바로 끝나는지 확인
+        - 종료 시 처리하지 못한 프리페치 메시지가 큐 앞쪽으로 돌아오는지 확인
+        """
+        transport = MemoryTransport()
+        subscriber = RedisSubscriber(transport=transport, block_timeout=0)
+        emails = []
+        priority_order = []
+        release = threading.Event()
+        slow_seen = []
+        
+        @subscriber.subscribe("orders", batch_size=10, concurrency=4, emit_to="emails")
+        def order_handler(msg):
+            return f"email:{msg}"
+        
+        @subscriber.subscribe("emails", batch_size=10)
+        def email_handler(msg):
+            emails.append(msg)
+        
+        @subscriber.subscribe(["urgent", "normal"])
+        def priority_handler(msg):
+            priority_order.append(msg)
+        
+        @subscriber.subscribe("slow", prefetch=5)
+        def slow_handler(msg):
+            slow_seen.append(msg)
+            release.wait(1.0)
+        
+        transport.push("normal", [f"n{i}" for i in range(3)])
+        transport.push("urgent", [f"u{i}" for i in range(3)])
+        transport.push("slow", [f"s{i}" for i in range(20)])
+        self.start_subscriber_in_thread(subscriber)
+        transport.push("orders", [str(i) for i in range(100)])
+        time.sleep(0.5)
+        stats = subscriber.stats()
+        
+        release.set()
+        started = time.monotonic()
+        subscriber.stop(timeout=2.0)
+        elapsed = time.monotonic() - started
+        
+        assert sorted(emails) == sorted(f"email:{i}" for i in range(100))
+        assert priority_order == [f"u{i}" for i in range(3)] + [f"n{i}" for i in range(3)]
+        assert stats["orders"]["processed"] == 100
+        # 프리페치 버퍼 크기만큼만 미리 꺼냄
+        assert 20 - 5 - 2 <= stats["slow"]["queue_depth"] < 20
+        assert elapsed < 0.5
+        # 처리하지 못한 메시지는 원래 순서대로 큐에 남음
+        remaining = transport.pop(transport.connect(), ["slow"], 100, 0.1)[1]
+        assert remaining == [f"s{i}".encode() for i in range(len(slow_seen), 20)]
+    
+    def test_memory_transport_rejects_redis_only_options(self):
+        """
+        테스트 케이스: Redis 서버 기능이 필요한 옵션 거부
+        - redis_url과 transport가 모두 없거나 cluster와 함께 쓰면 ValueError
+        - reliable, retry 등으로 구독한 큐가 있으면 start()에서 ValueError
+        """
+        with pytest.raises(ValueError):
+            RedisSubscriber()
+        with pytest.raises(ValueError):
+            RedisSubscriber(transport=MemoryTransport(), cluster=True)
+        
+        for options in ({"reliable": True}, {"retry": RetryPolicy(max_attempts=2)}, {"dedup_key": str}):
+            subscriber = RedisSubscriber(transport=MemoryTransport())
+            subscriber.subscribe("jobs", **options)(lambda msg: None)
+            with pytest.raises(ValueError):
+                subscriber.start()
+            assert not subscriber._running
+        
+        with pytest.raises(ValueError):
+            RedisSubscriber(transport=MemoryTransport()).start(processes=2)
+
+
+class TestHandlerDiagnostics(TestRedisSubscriberIntegration):
+    """느린 핸들러 감시와 프로파일링 테스트 (MemoryTransport 사용, Redis 불필요)"""
+    
+    def test_slow_handler_watchdog(self):
+        """
+        테스트 케이스: 느린 핸들러 감시
+        - 기준 시간을 넘긴 호출만 워커 스레드 스택, 큐 이름, 잘린 메시지와 함께 한 번 보고되는지 확인
+        - slow_handlers 지표가 기록되는지 확인
+        - 감시와 프로파일을 사용하지 않으면 모니터가 없는지 확인
+        """
+        assert RedisSubscriber(transport=MemoryTransport())._monitor is None
+        transport = MemoryTransport()
+        subscriber = RedisSubscriber(transport=transport, slow_handler_threshold=0.2)
+        reports = []
+        subscriber.add_hook('on_slow_handler', lambda *args: reports.append(args))
+        
+        def stuck_in_handler():
+            time.sleep(0.6)
+        
+        @subscriber.subscribe("jobs", concurrency=2)
+        def handler(msg):
+            if msg.startswith("slow"):
+                stuck_in_handler()
+        
+        self.start_subscriber_in_thread(subscriber)
+        transport.push("jobs", ["fast"] * 10 + ["slow" + "x" * 1000])
+        time.sleep(1.0)
+        stats = subscriber.stats()
+        subscriber.stop()
+        
+        assert len(reports) == 1
+        queue_name, payload, elapsed, stack = reports[0]
+        assert queue_name == "jobs"
+        assert payload.startswith("'slowxxx") and len(payload) <= 203
+        assert elapsed >= 0.2
+        assert "stuck_in_handler" in stack
+        assert stats["jobs"]["slow_handlers"] == 1
+    
+    @pytest.mark.parametrize("mode", ["sample", "cprofile"])
+    def test_on_demand_profile(self, mode, tmp_path):
+        """
+        테스트 케이스: 요청 시 프로파일링
+        - profile()로 정해진 시간 동안 핸들러별 프로파일을 모아 큐별 보고서를 만드는지 확인
+        - 보고서를 파일로 저장하는지 확인
+        - 프로파일이 끝나면 핸들러 호출 추적이 멈추는지 확인
+        - 시그널로 프로파일을 시작할 수 있는지 확인
+        """
+        transport = MemoryTransport()
+        subscriber = RedisSubscriber(transport=transport, profile_signal=signal.SIGUSR1, profile_seconds=0.3)
+        
+        def busy_work(n):
+            return sum(i * i for i in range(n))
+        
+        @subscriber.subscribe("work", concurrency=2)
+        def handler(msg):
+            busy_work(300000)
+        
+        self.start_subscriber_in_thread(subscriber)
+        output = tmp_path / "profile.txt"
+        session = subscriber.profile(seconds=0.5, mode=mode, output=str(output))
+        assert subscriber.profile(seconds=0.5) is session
+        transport.push("work", ["m"] * 30)
+        reports = session.wait(timeout=5.0)
+        
+        assert subscriber._monitor is None
+        assert "busy_work" in reports["work"]
+        assert "busy_work" in output.read_text()
+        
+        os.kill(os.getpid(), signal.SIGUSR1)
+        signalled = subscriber._profile_session
+        assert signalled is not None and signalled is not session
+        assert signalled.wait(timeout=5.0) is not None
+        subscriber.stop()
+        signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+
+
+class TestRouting(TestRedisSubscriberIntegration):
+    """큐 하나의 여러 핸들러와 내용 기반 라우팅 통합 테스트"""
+    
+    def test_routes_and_fan_out(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 내용 기반 라우팅
+        - "필드=값" 라우트와 함수 라우트가 맞는 핸들러만 호출하는지 확인
+        - 여러 핸들러가 맞으면 등록 순서대로 모두 호출하는지(팬아웃) 확인
+        - 팬아웃 중 한 핸들러가 실패하면 메시지가 실패로 기록되는지 확인
+        - 맞는 핸들러가 없는 메시지가 unrouted로 세어지고, unrouted="dead_letter"이면 데드레터 큐로 가는지 확인
+        - 라우트가 없는 큐는 핸들러를 직접 호출하는지 확인
+        """
+        received = []
+        lock = threading.Lock()
+        
+        def record(name, msg):
+            with lock:
+                received.append((name, msg["id"]))
+        
+        @subscriber.subscribe(test_queue_name, codec="json", concurrency=2, route="type=order.created")
+        def created(msg):
+            record("created", msg)
+        
+        @subscriber.subscribe(test_queue_name, route="type=order.cancelled")
+        def cancelled(msg):
+            record("cancelled", msg)
+            if msg.get("fail"):
+                raise ValueError("의도된 에러")
+        
+        @subscriber.subscribe(test_queue_name, route=lambda msg: msg.get("amount", 0) > 100)
+        def large(msg):
+            record("large", msg)
+        
+        @subscriber.subscribe(test_queue_name, route="priority=1")
+        def urgent(msg):
+            record("urgent", msg)
+        
+        @subscriber.subscribe("plain_queue")
+        def plain(msg):
+            record("plain", {"id": msg})
+        
+        # 맞는 핸들러가 없는 메시지를 데드레터 큐로 보내는 큐
+        redis_client.delete("routed_queue", "routed_queue:dead")
+        
+        @subscriber.subscribe("routed_queue", codec="json", route="type=a", unrouted="dead_letter")
+        def routed(msg):
+            record("routed", msg)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe(test_queue_name, route="no-separator")
+        with pytest.raises(ValueError):
+            subscriber.subscribe_batch(test_queue_name)(lambda msgs: None)
+        # 처음 등록한 것과 다른 큐 옵션으로는 핸들러를 추가할 수 없음
+        with pytest.raises(ValueError, match="reliable"):
+            subscriber.subscribe(test_queue_name, route="type=a", reliable=True)(lambda msg: None)
+        # 같은 옵션을 다시 지정하면 추가됨
+        @subscriber.subscribe(test_queue_name, codec="json", concurrency=2, route="type=order.refunded")
+        def refunded(msg):
+            record("refunded", msg)
+        
+        # 큐 옵션과 처음 등록한 핸들러는 유지됨
+        assert subscriber._handlers[test_queue_name] is created
+        assert subscriber._options[test_queue_name]['concurrency'] == 2
+        
+        messages = [
+            {"id": 1, "type": "order.created", "amount": 10},
+            {"id": 2, "type": "order.created", "amount": 500, "priority": 1},
+            {"id": 3, "type": "order.cancelled"},
+            {"id": 4, "type": "order.cancelled", "fail": True},
+            {"id": 5, "type": "unknown"},
+            {"id": 6, "type": "order.refunded"},
+        ]
+        redis_client.rpush(test_queue_name, *[json.dumps(msg) for msg in messages])
+        redis_client.rpush("plain_queue", "p1")
+        redis_client.rpush("routed_queue", json.dumps({"id": 7, "type": "a"}), json.dumps({"id": 8, "type": "b"}))
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        stats = subscriber.stats(queue_depth=False)
+        assert isinstance(subscriber._dispatch_table[test_queue_name], Router)
+        assert subscriber._dispatch_table["plain_queue"] is plain
+        subscriber.stop()
+        
+        assert sorted(received) == sorted([
+            ("created", 1), ("created", 2), ("large", 2), ("urgent", 2),
+            ("cancelled", 3), ("cancelled", 4), ("refunded", 6), ("plain", "p1"), ("routed", 7),
+        ])
+        assert stats[test_queue_name]["processed"] == 5
+        assert stats[test_queue_name]["failed"] == 1
+        assert stats[test_queue_name]["unrouted"] == 1
+        assert stats["routed_queue"]["unrouted"] == 1
+        assert stats["routed_queue"]["dead_lettered"] == 1
+        assert [json.loads(msg) for msg in redis_client.lrange("routed_queue:dead", 0, -1)] == [{"id": 8, "type": "b"}]
+        redis_client.delete("routed_queue:dead")
+    
+    def test_fan_out_retry_reruns_every_handler(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 팬아웃 중 한 핸들러가 실패한 메시지의 재시도
+        - 재시도 시 이미 성공한 핸들러도 다시 호출되는지(핸들러마다 at-least-once) 확인
+        - 모든 핸들러가 성공하면 메시지가 처리된 것으로 기록되는지 확인
+        """
+        calls = []
+        lock = threading.Lock()
+        redis_client.delete(f"{test_queue_name}:dead", f"{test_queue_name}:retry")
+        retry = RetryPolicy(max_attempts=3, base_delay=0.05, max_delay=0.1)
+        
+        @subscriber.subscribe(test_queue_name, codec="json", retry=retry, route="type=a")
+        def stable(msg):
+            with lock:
+                calls.append("stable")
+        
+        @subscriber.subscribe(test_queue_name, route="type=a")
+        def flaky(msg):
+            with lock:
+                calls.append("flaky")
+                if calls.count("flaky") == 1:
+                    raise RuntimeError("의도된 에러")
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.2)
+        redis_client.rpush(test_queue_name, json.dumps({"type": "a"}))
+        time.sleep(0.8)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+        
+        assert calls == ["stable", "flaky", "stable", "flaky"]
+        assert stats[test_queue_name]["processed"] == 1
+        assert stats[test_queue_name]["failed"] == 1
+        assert stats[test_queue_name]["retried"] == 1
+        assert redis_client.llen(f"{test_queue_name}:dead") == 0
+    
+    def test_same_handler_on_several_routes(self):
+        """
+        테스트 케이스: 같은 함수를 여러 라우트로 등록
+        - 필드 테이블 하나만 있는 경우와 여러 테이블/함수 라우트가 있는 경우 모두 한 번만 호출되는지 확인
+        - 처음 등록한 순서로 호출되는지 확인
+        """
+        def first(msg):
+            pass
+        
+        def second(msg):
+            pass
+        
+        single = Router("q", [(parse_route("type=a"), first), (None, second), (None, first)])
+        assert single.match({"type": "a"}) == (first, second)
+        assert single.match({"type": "b"}) == (first, second)
+        
+        mixed = Router("q", [
+            (parse_route("type=a"), second), (parse_route("region=eu"), first),
+            (lambda msg: True, second), (None, first),
+        ])
+        assert mixed.match({"type": "a", "region": "eu"}) == (second, first)
+        assert mixed.match({"type": "b"}) == (second, first)
+
+
+class TestReliableQueue(TestRedisSubscriberIntegration):
+    """신뢰성 큐 모드 통합 테스트"""
+    
+    def test_ack_and_redelivery(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: 신뢰성 큐 모드
+        - 핸들러가 실패한 메시지가 큐로 되돌아가 다시 처리되는지 확인
+        - 죽은 컨슈머의 처리 중 메시지가 다른 컨슈머에 의해 복구되는지 확인
+        - 처리가 끝나면 처리 중 리스트가 비워지는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, consumer_timeout=2.0)
+        received_messages = []
+        failed_once = set()
+        
+        @subscriber.subscribe(test_queue_name, reliable=True, batch_size=10)
+        def handler(msg):
+            # 첫 번째 시도에서만 실패
+            if msg.startswith("flaky") and msg not in failed_once:
+                failed_once.add(msg)
+                raise ValueError(f"의도된 에러: {msg}")
+            received_messages.append(msg)
+        
+        # 이미 죽은 컨슈머가 처리 중이던 메시지
+        dead_consumer = "dead-host:1:deadbeef"
+        redis_client.rpush(f"{test_queue_name}:processing:{dead_consumer}", "orphan_1", "orphan_2")
+        redis_client.zadd(f"{test_queue_name}:consumers", {dead_consumer: time.time() - 60})
+        
+        test_messages = [f"reliable_msg_{i}" for i in range(20)] + ["flaky_msg"]
+        redis_client.rpush(test_queue_name, *test_messages)
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(2.5)  # 처리 및 복구 대기
+        subscriber.stop()
+        
+        # 실패한 메시지와 죽은 컨슈머의 메시지까지 모두 처리되었는지 확인
+        for msg in test_messages + ["orphan_1", "orphan_2"]:
+            assert msg in received_messages
+        assert "flaky_msg" in failed_once
+        
+        # 처리 중 리스트가 남아있지 않아야 함
+        assert redis_client.keys(f"{test_queue_name}:processing:*") == []
+        assert redis_client.llen(test_queue_name) == 0
+
+    def test_poison_message_dead_lettered(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: retry 없는 신뢰성 큐의 데드레터 처리
+        - 항상 실패하는 메시지가 max_attempts번 처리된 뒤 데드레터 큐로 가는지 확인
+        - 디코딩할 수 없는 메시지는 핸들러를 호출하지 않고 바로 데드레터 큐로 가는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, consumer_timeout=2.0)
+        dead_letter_queue = f"{test_queue_name}:dead"
+        redis_client.delete(dead_letter_queue)
+        attempts = []
+
+        @subscriber.subscribe(test_queue_name, reliable=True, codec="json", max_attempts=3)
+        def handler(msg):
+            attempts.append(msg)
+            raise RuntimeError(f"처리 실패: {msg}")
+
+        redis_client.rpush(test_queue_name, '{"id": 1}', "not json")
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.0)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+
+        assert attempts == [{"id": 1}] * 3
+        assert sorted(redis_client.lrange(dead_letter_queue, 0, -1)) == ["not json", '{"id": 1}']
+        assert redis_client.llen(test_queue_name) == 0
+        assert redis_client.keys(f"{test_queue_name}:processing:*") == []
+        assert stats[test_queue_name]["retried"] == 2
+        assert stats[test_queue_name]["dead_lettered"] == 2
+        redis_client.delete(dead_letter_queue)
+
+
+    def test_reaped_message_counts_as_attempt(self, redis_container, redis_client, test_queue_name):
+        """
+        테스트 케이스: 죽은 컨슈머에게서 되돌린 메시지의 시도 횟수
+        - 되돌린 메시지가 한 번의 시도로 세어져 재전달 봉투와 함께 큐로 돌아가는지 확인
+        - 시도 횟수를 모두 쓴 메시지는 핸들러를 호출하지 않고 데드레터 큐로 가는지 확인
+        """
+        redis_url = f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+        subscriber = RedisSubscriber(redis_url=redis_url, consumer_timeout=2.0)
+        dead_letter_queue = f"{test_queue_name}:dead"
+        redis_client.delete(dead_letter_queue)
+        received = []
+        
+        @subscriber.subscribe(test_queue_name, reliable=True, max_attempts=3)
+        def handler(msg):
+            received.append(msg)
+        
+        # 이미 두 번 시도한 메시지(프로세스를 죽게 만든 메시지)와 처음 시도한 메시지
+        dead_consumer = "dead-host:1:deadbeef"
+        redis_client.rpush(f"{test_queue_name}:processing:{dead_consumer}", wrap(b"crasher", 2), "fresh")
+        redis_client.zadd(f"{test_queue_name}:consumers", {dead_consumer: time.time() - 60})
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.5)
+        stats = subscriber.stats(queue_depth=False)
+        subscriber.stop()
+        
+        assert received == ["fresh"]
+        assert redis_client.lrange(dead_letter_queue, 0, -1) == ["crasher"]
+        assert stats[test_queue_name]["retried"] == 1
+        assert stats[test_queue_name]["dead_lettered"] == 1
+        redis_client.delete(dead_letter_queue)
+
+
+class TestStreamBackend(TestRedisSubscriberIntegration):
+    """Redis Streams 컨슈머 그룹 백엔드 통합 테스트"""
+    
+    def test_consumer_group_batching_and_claim(self, subscriber, redis_client):
+        """
+        테스트 케이스: 스트림 컨슈머 그룹 구독
+        - XREADGROUP으로 묶어서 읽은 항목이 모두 처리되고 확인되는지 확인
+        - 핸들러가 실패한 항목이 XAUTOCLAIM으로 다시 처리되는지 확인
+        - 서로 다른 그룹은 같은 항목을 각자 받는지 확인
+        """
+        billing_messages = []
+        audit_messages = []
+        failed_once = set()
+        
+        @subscriber.subscribe("events", stream=True, group="billing", batch_size=50,
+                              block_ms=200, claim_idle_ms=500)
+        def billing_handler(msg):
+            if msg == "flaky_event" and msg not in failed_once:
+                failed_once.add(msg)
+                raise ValueError("의도된 에러")
+            billing_messages.append(msg)
+        
+        @subscriber.subscribe("events_audit", stream=True, group="audit")
+        def audit_handler(msg):
+            audit_messages.append(msg)
+        
+        for i in range(100):
+            redis_client.xadd("events", {"data": f"event_{i}"})
+        redis_client.xadd("events", {"data": "flaky_event"})
+        redis_client.xadd("events_audit", {"type": "login", "user": "alice"})
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(1.5)  # 처리 및 회수 대기
+        subscriber.stop()
+        
+        assert len(billing_messages) == 101
+        assert "flaky_event" in billing_messages
+        assert redis_client.xpending("events", "billing")['pending'] == 0
+        
+        # data 필드가 없는 항목은 필드 딕셔너리 전체가 전달됨
+        assert audit_messages == [{"type": "login", "user": "alice"}]
+    
+    def test_stream_requires_group(self, subscriber):
+        """
+        테스트 케이스: 잘못된 스트림 구독 설정
+        - group 없이 stream=True로 구독하면 ValueError가 발생하는지 확인
+        """
+        with pytest.raises(ValueError):
+            subscriber.subscribe("events", stream=True)
+
+
+class TestMultiprocessMode(TestRedisSubscriberIntegration):
+    """멀티프로세스 실행 모드 통합 테스트"""
+    
+    def test_worker_processes_and_combined_stats(self, subscriber, redis_client, test_queue_name):
+        """
+        테스트 케이스: 멀티프로세스 모드
+        - start(processes=N) 호출 시 워커 프로세스가 메시지를 나누어 처리하는지 확인
+        - 죽은 워커 프로세스가 자동으로 다시 시작되는지 확인
+        - stats()가 모든 워커의 통계를 합산하는지 확인
+        - 종료된 워커의 게이지 지표는 누적 통계에 더하지 않는지 확인
+        """
+        @subscriber.subscribe(test_queue_name)
+        def handler(msg):
+            if msg == "crash":
+                os._exit(1)
+            if msg == "error":
+                raise ValueError("의도된 에러")
+        
+        start_thread = threading.Thread(target=subscriber.start, kwargs={'processes': 2}, daemon=True)
+        start_thread.start()
+        time.sleep(1.0)  # 워커 프로세스 시작 대기
+        
+        original_pids = {worker.pid for worker in subscriber._supervisor._workers.values()}
+        assert len(original_pids) == 2
+        
+        # 워커 하나를 강제로 종료시킨 뒤 재시작 확인
+        redis_client.rpush(test_queue_name, "crash")
+        time.sleep(2.0)
+        restarted_pids = {worker.pid for worker in subscriber._supervisor._workers.values()}
+        assert len(restarted_pids) == 2
+        assert restarted_pids != original_pids
+        
+        # 재시작 이후에도 메시지가 처리되는지 확인
+        redis_client.rpush(test_queue_name, *[f"mp_msg_{i}" for i in range(50)], "error")
+        time.sleep(2.0)  # 처리 및 통계 보고 대기
+        
+        stats = subscriber.stats()
+        assert stats[test_queue_name]['processed'] == 50
+        assert stats[test_queue_name]['failed'] == 1
+        
+        # 핸들러 실행 중에 죽은 워커의 in_flight 게이지는 누적 통계에 남지 않아야 함
+        supervisor = subscriber._supervisor
+        with supervisor._stats_lock:
+            supervisor._worker_stats[99] = {test_queue_name: {'processed': 1, 'in_flight': 1}}
+        supervisor._retire(99)
+        stats = subscriber.stats()
+        assert stats[test_queue_name]['processed'] == 51
+        assert stats[test_queue_name]['in_flight'] == 0
+        
+        subscriber.stop()
+        start_thread.join(timeout=5.0)
+        assert not start_thread.is_alive()
+        assert subscriber.stats()[test_queue_name]['processed'] == 51
+
+class TestAsyncSubscriber(TestRedisSubscriberIntegration):
+    """asyncio 기반 Subscriber 통합 테스트"""
+    
+    @pytest.fixture
+    def redis_url(self, redis_container):
+        """Redis 연결 URL 픽스처"""
+        return f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+    
+    @pytest.mark.asyncio
+    async def test_async_handlers_with_concurrency_limit(self, redis_url, redis_client, test_queue_name):
+        """
+        테스트 케이스: async def 핸들러 동시 실행
+        - async def 핸들러와 일반 함수 핸들러가 모두 호출되는지 확인
+        - 동시에 실행되는 핸들러 수가 concurrency 한도를 넘지 않는지 확인
+        """
+        subscriber = AsyncRedisSubscriber(redis_url=redis_url)
+        async_messages = []
+        sync_messages = []
+        in_flight = 0
+        max_in_flight = 0
+        
+        @subscriber.subscribe(test_queue_name, concurrency=20, batch_size=50)
+        async def async_handler(msg):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.1)
+            in_flight -= 1
+            async_messages.append(msg)
+        
+        @subscriber.subscribe("sync_queue")
+        def sync_handler(msg):
+            sync_messages.append(msg)
+        
+        # 순차 처리라면 10초가 걸리는 100개의 메시지 전송
+        redis_client.rpush(test_queue_name, *[f"async_msg_{i}" for i in range(100)])
+        redis_client.rpush("sync_queue", "sync_msg_1", "sync_msg_2")
+        
+        await subscriber.start()
+        await asyncio.sleep(1.0)
+        await subscriber.stop()
+        
+        # 모든 메시지가 동시성 한도 안에서 처리되었는지 확인
+        assert len(async_messages) == 100
+        assert 1 < max_in_flight <= 20
+        assert sync_messages == ["sync_msg_1", "sync_msg_2"]
+    
+    @pytest.mark.asyncio
+    async def test_multiplexed_fetchers_and_cancel_during_batch(self, redis_url, redis_client, test_queue_name):
+        """
+        테스트 케이스: 다중 큐 수신 태스크와 수신 중 종료
+        - fetchers를 지정하면 여러 큐를 적은 수의 수신 태스크로 처리하는지 확인
+        - BLPOP 이후 추가 수신(LPOP) 중에 stop()해도 이미 꺼낸 메시지를 모두 처리하는지 확인
+        """
+        subscriber = AsyncRedisSubscriber(redis_url=redis_url, fetchers=2)
+        received = []
+        queue_names = [f"{test_queue_name}_{i}" for i in range(6)]
+        redis_client.delete(*queue_names)
+        
+        for queue_name in queue_names:
+            @subscriber.subscribe(queue_name, concurrency=2)
+            async def handler(msg):
+                received.append(msg)
+        
+        redis_client.rpush(queue_names[0], "a", "b")
+        redis_client.rpush(queue_names[5], "c")
+        await subscriber.start()
+        assert len(subscriber._tasks) == 2
+        await asyncio.sleep(0.3)
+        with pytest.raises(ValueError):
+            await subscriber.unsubscribe(queue_names[0])
+        await subscriber.stop()
+        assert sorted(received) == ["a", "b", "c"]
+        
+        # 추가 수신이 느린 경우 수신 도중 종료
+        subscriber = AsyncRedisSubscriber(redis_url=redis_url)
+        batched = []
+        
+        @subscriber.subscribe(test_queue_name, batch_size=10, concurrency=10)
+        async def batch_handler(msg):
+            batched.append(msg)
+        
+        await subscriber.start()
+        lpop = subscriber._redis_client.lpop
+        
+        async def slow_lpop(*args):
+            await asyncio.sleep(0.3)
+            return await lpop(*args)
+        
+        subscriber._redis_client.lpop = slow_lpop
+        redis_client.rpush(test_queue_name, *[f"m{i}" for i in range(5)])
+        await asyncio.sleep(0.1)
+        await subscriber.stop()
+        
+        assert sorted(batched) == [f"m{i}" for i in range(5)]
+        assert redis_client.llen(test_queue_name) == 0
+
+
+
+class TestPublisher(TestRedisSubscriberIntegration):
+    """발행자 통합 테스트"""
+    
+    @pytest.fixture
+    def redis_url(self, redis_container):
+        """Redis 연결 URL 픽스처"""
+        return f"redis://{redis_container.get_container_host_ip()}:{redis_container.get_exposed_port(6379)}"
+    
+    def test_batched_publish_roundtrip(self, redis_url, redis_client, test_queue_name):
+        """
+        테스트 케이스: 배치 발행
+        - 개수 조건과 linger_ms 조건으로 메시지가 순서대로 전송되는지 확인
+        - 압축 코덱으로 발행한 메시지를 같은 코덱의 구독자가 읽는지 확인
+        """
+        with RedisPublisher(redis_url, batch_size=100, linger_ms=20) as publisher:
+            for i in range(250):
+                publisher.publish(test_queue_name, f"msg_{i}")
+            # 200개는 개수 조건으로 바로 전송되고 나머지는 linger_ms 이후 전송
+            assert redis_client.llen(test_queue_name) == 200
+            time.sleep(0.2)
+            assert redis_client.llen(test_queue_name) == 250
+        assert redis_client.lrange(test_queue_name, 0, 2) == ["msg_0", "msg_1", "msg_2"]
+        
+        documents = [{"id": 1, "body": "x" * 4096}, {"id": 2}]
+        with RedisPublisher(redis_url, codec="zlib+json") as publisher:
+            publisher.publish_many("compressed_queue", documents)
+        
+        subscriber = RedisSubscriber(redis_url=redis_url, codec="zlib+json")
+        received = []
+        
+        @subscriber.subscribe("compressed_queue")
+        def handler(msg):
+            received.append(msg)
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        subscriber.stop()
+        
+        assert received == documents
+    
+    def test_queue_length_cap(self, redis_url, redis_client, test_queue_name):
+        """
+        테스트 케이스: 큐 길이 상한
+        - 상한까지만 추가하고 QueueFullError가 발생하는지 확인
+        - 전송하지 못한 메시지가 버퍼에 남아 자리가 나면 순서대로 전송되는지 확인
+        """
+        publisher = RedisPublisher(redis_url, max_queue_length=3, linger_ms=0)
+        publisher.publish_many(test_queue_name, ["a", "b", "c", "d", "e"])
+        with pytest.raises(QueueFullError):
+            publisher.flush()
+        assert redis_client.lrange(test_queue_name, 0, -1) == ["a", "b", "c"]
+        assert publisher.pending() == 2
+        
+        redis_client.delete(test_queue_name)
+        publisher.close()
+        assert redis_client.lrange(test_queue_name, 0, -1) == ["d", "e"]
+    
+    @pytest.mark.asyncio
+    async def test_async_publisher(self, redis_url, redis_client, test_queue_name):
+        """
+        테스트 케이스: asyncio 발행자
+        - linger_ms 조건과 close()로 남은 메시지가 모두 전송되는지 확인
+        """
+        publisher = AsyncRedisPublisher(redis_url, codec="json", linger_ms=10)
+        await publisher.publish(test_queue_name, {"n": 1})
+        await asyncio.sleep(0.1)
+        assert redis_client.llen(test_queue_name) == 1
+        
+        await publisher.publish_many(test_queue_name, [{"n": 2}, {"n": 3}])
+        await publisher.close()
+        assert [json.loads(item) for item in redis_client.lrange(test_queue_name, 0, -1)] == [{"n": 1}, {"n": 2}, {"n": 3}]
+    
+    def test_sharded_queue(self, redis_url, redis_client, subscriber, test_queue_name):
+        """
+        테스트 케이스: 샤딩된 큐
+        - 같은 파티션 키의 메시지가 같은 샤드로 순서대로 들어가는지 확인
+        - 구독자가 모든 샤드의 메시지를 처리하는지 확인
+        """
+        received_messages = []
+        
+        @subscriber.subscribe(test_queue_name, shards=4, batch_size=10)
+        def handler(msg):
+            received_messages.append(msg)
+        
+        with pytest.raises(ValueError):
+            subscriber.subscribe(test_queue_name, shards=2, reliable=True)
+        
+        publisher = RedisPublisher(redis_url, shards={test_queue_name: 4}, linger_ms=0)
+        for i in range(20):
+            publisher.publish(test_queue_name, f"order-{i}", key="customer-1")
+        publisher.publish_many(test_queue_name, [f"any-{i}" for i in range(8)])
+        publisher.flush()
+        
+        lengths = [redis_client.llen(f"{test_queue_name}:{{{index}}}") for index in range(4)]
+        assert sum(lengths) == 28
+        assert max(lengths) >= 20
+        
+        self.start_subscriber_in_thread(subscriber)
+        time.sleep(0.5)
+        subscriber.stop()
+        publisher.close()
+        
+        assert len(received_messages) == 28
+        orders = [msg for msg in received_messages if msg.startswith("order-")]
+        assert orders == [f"order-{i}" for i in range(20)]
+
 # 테스트 실행을 위한 메인 함수
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])